@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Benchmark which measures how long it takes to sign EC2 requests using the
+AWS signature version 4 algorithm.
+
+Usage: python contrib/benchmarks/benchmark_aws_sigv4.py [count]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+
+from libcloud.common import aws
+from libcloud.compute.drivers.ec2 import EC2NodeDriver
+
+DEFAULT_COUNT = 100000
+
+
+def get_request_params(index):
+    return {
+        'Action': 'DescribeInstances',
+        'Version': '2013-10-15',
+        'Filter.1.Name': 'instance-state-name',
+        'Filter.1.Value.1': 'running',
+        'InstanceId.1': 'i-%08x' % (index % 100)
+    }
+
+
+def get_request_headers():
+    return {
+        'Host': 'ec2.eu-central-1.amazonaws.com',
+        'Accept-Encoding': 'gzip,deflate',
+        'User-Agent': 'libcloud/0.18.0 (Amazon EC2 (eu-central-1))'
+    }
+
+
+def sign_requests(signer, count, clear_caches=False):
+    start = time.time()
+
+    for index in range(0, count):
+        if clear_caches:
+            signer._signing_keys_cache.clear()
+            aws._quoted_values_cache.clear()
+
+        params = signer.get_request_params(params=get_request_params(index))
+        signer.get_request_headers(params=params,
+                                   headers=get_request_headers(),
+                                   method='GET', path='/')
+
+    return time.time() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+
+    driver = EC2NodeDriver('access key', 'secret key', region='eu-central-1')
+    signer = driver.connection.signer
+
+    for name, clear_caches in [('uncached', True), ('cached', False)]:
+        duration = sign_requests(signer=signer, count=count,
+                                 clear_caches=clear_caches)
+        print('%-10s %d requests signed in %.2f seconds (%.2f us / request)' %
+              (name, count, duration, (duration / count) * 1000000))
+
+
+if __name__ == '__main__':
+    main()
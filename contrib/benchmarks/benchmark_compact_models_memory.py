@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Benchmark which compares memory usage of Node and CompactNode objects.
+
+Nodes are created the same way a driver would create them when parsing an API
+response (every node gets its own copy of the strings, extra dictionary,
+size and image object).
+
+Requires Python 3.4 or higher (tracemalloc module).
+
+Usage: python contrib/benchmarks/benchmark_compact_models_memory.py [count]
+"""
+
+from __future__ import print_function
+
+import sys
+import gc
+import tracemalloc
+
+from libcloud.compute.base import Node, NodeSize, NodeImage, CompactNode
+from libcloud.compute.types import NodeState
+from libcloud.compute.drivers.dummy import DummyNodeDriver
+
+DEFAULT_COUNT = 100000
+
+ZONES = ['us-east-1a', 'us-east-1b', 'us-east-1c']
+INSTANCE_TYPES = ['t2.micro', 'm3.medium', 'm3.large', 'c3.xlarge']
+IMAGES = ['ami-%08x' % (index) for index in range(0, 10)]
+
+
+def copy_string(value):
+    # Strings parsed from a response are separate objects
+    return ''.join(list(value))
+
+
+def get_node(driver, index):
+    image_id = copy_string(IMAGES[index % len(IMAGES)])
+    instance_type = copy_string(INSTANCE_TYPES[index % len(INSTANCE_TYPES)])
+
+    extra = {
+        'availability': copy_string(ZONES[index % len(ZONES)]),
+        'instancetype': instance_type,
+        'image_id': image_id,
+        'key_name': copy_string('production-key'),
+        'status': copy_string('running'),
+        'architecture': copy_string('x86_64'),
+        'root_device_type': copy_string('ebs'),
+        'root_device_name': copy_string('/dev/sda1'),
+        'virtualization_type': copy_string('hvm'),
+        'hypervisor': copy_string('xen'),
+        'ebs_optimized': copy_string('false'),
+        'monitoring': copy_string('disabled'),
+        'launch_time': copy_string('2015-05-04T10:%02d:00.000Z' %
+                                   (index % 60)),
+        'private_dns': 'ip-10-0-%d-%d.ec2.internal' % (index // 256 % 256,
+                                                       index % 256),
+        'dns_name': 'ec2-54-0-%d-%d.compute-1.amazonaws.com' %
+                    (index // 256 % 256, index % 256)
+    }
+
+    size = NodeSize(id=instance_type, name=instance_type, ram=1024, disk=8,
+                    bandwidth=None, price=0.1, driver=driver)
+    image = NodeImage(id=image_id, name=image_id, driver=driver,
+                      extra={'architecture': copy_string('x86_64')})
+
+    return Node(id='i-%08x' % (index), name='node-%d' % (index),
+                state=NodeState.RUNNING,
+                public_ips=['54.0.%d.%d' % (index // 256 % 256, index % 256)],
+                private_ips=['10.0.%d.%d' % (index // 256 % 256,
+                                             index % 256)],
+                driver=driver, size=size, image=image, extra=extra)
+
+
+def measure(func):
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    driver = DummyNodeDriver(0)
+
+    nodes, node_memory = measure(
+        lambda: [get_node(driver, index) for index in range(0, count)])
+    del nodes
+
+    compact_nodes, compact_memory = measure(
+        lambda: [CompactNode.from_node(get_node(driver, index))
+                 for index in range(0, count)])
+
+    for name, memory in [('Node', node_memory),
+                         ('CompactNode', compact_memory)]:
+        print('%-12s %d nodes use %.2f MB (%d bytes / node)' %
+              (name, count, memory / 1024.0 / 1024.0, memory / count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Benchmark which measures how long it takes to parse EC2 DescribeInstances
+response with a large number of instances into Node objects.
+
+The response is built by repeating the instance from the test fixture
+(libcloud/test/compute/fixtures/ec2/describe_instances.xml).
+
+"legacy" mode re-creates the namespaced xpath on every lookup and extracts
+the extra attributes one xpath at a time (behavior before the xpath cache
+and XPathExtractor were added).
+
+"lazy" mode enables lazy "extra" dictionaries (values are only parsed when
+accessed, which they aren't in this benchmark).
+
+Usage: python contrib/benchmarks/benchmark_ec2_list_nodes.py [count]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+from xml.etree import ElementTree as ET
+
+import libcloud.utils.xml
+
+from libcloud.compute.drivers import ec2
+from libcloud.compute.drivers.ec2 import EC2NodeDriver, NAMESPACE
+
+DEFAULT_COUNT = 5000
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), '../../libcloud/test/'
+                            'compute/fixtures/ec2/describe_instances.xml')
+
+
+def legacy_fixxpath(xpath, namespace=None):
+    if not namespace:
+        return xpath
+
+    return '/'.join(['{%s}%s' % (namespace, e) for e in xpath.split('/')])
+
+
+def legacy_get_extra_dict(self, element, mapping):
+    extra = {}
+    for attribute, values in mapping.items():
+        value = libcloud.utils.xml.findattr(element=element,
+                                            xpath=values['xpath'],
+                                            namespace=NAMESPACE)
+        if value is not None:
+            extra[attribute] = values['transform_func'](value)
+        else:
+            extra[attribute] = None
+
+    return extra
+
+
+def get_response(count):
+    root = ET.parse(FIXTURE_PATH).getroot()
+    reservations = root.find(legacy_fixxpath('reservationSet', NAMESPACE))
+
+    # Only keep the first reservation with a single instance
+    for reservation in list(reservations)[1:]:
+        reservations.remove(reservation)
+
+    instances = reservations[0].find(legacy_fixxpath('instancesSet',
+                                                     NAMESPACE))
+    instance = instances[0]
+
+    for item in list(instances)[1:]:
+        instances.remove(item)
+
+    for index in range(1, count):
+        instances.append(instance)
+
+    return root
+
+
+def parse_nodes(driver, response):
+    start = time.time()
+    nodes = driver._to_nodes(response, 'reservationSet/item/instancesSet/item')
+    return nodes, time.time() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+
+    driver = EC2NodeDriver('access key', 'secret key')
+    response = get_response(count=count)
+
+    original = (libcloud.utils.xml.fixxpath, ec2.fixxpath,
+                EC2NodeDriver._get_extra_dict)
+
+    for name in ['legacy', 'current', 'lazy']:
+        if name == 'legacy':
+            libcloud.utils.xml.fixxpath = legacy_fixxpath
+            ec2.fixxpath = legacy_fixxpath
+            EC2NodeDriver._get_extra_dict = legacy_get_extra_dict
+        else:
+            (libcloud.utils.xml.fixxpath, ec2.fixxpath,
+             EC2NodeDriver._get_extra_dict) = original
+            driver.lazy_extra = (name == 'lazy')
+
+        nodes, duration = parse_nodes(driver=driver, response=response)
+        assert len(nodes) == count
+
+        print('%-10s %d nodes parsed in %.2f seconds (%.2f us / node)' %
+              (name, count, duration, (duration / count) * 1000000))
+
+
+if __name__ == '__main__':
+    main()
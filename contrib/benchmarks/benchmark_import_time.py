@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Benchmark which measures how long it takes to import libcloud and to
+instantiate commonly used drivers in a fresh interpreter.
+
+Each snippet is executed in a new process using "python -X importtime" and
+the total import time and the slowest modules (by self time) are reported.
+
+Requires Python 3.7 or higher (-X importtime option).
+
+Usage: python contrib/benchmarks/benchmark_import_time.py [count]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import subprocess
+
+DEFAULT_COUNT = 5
+
+# Number of the slowest modules reported for each snippet
+TOP_MODULES_COUNT = 10
+
+SNIPPETS = [
+    ('import libcloud', 'import libcloud'),
+    ('compute get_driver(EC2)',
+     'from libcloud.compute.types import Provider\n'
+     'from libcloud.compute.providers import get_driver\n'
+     'get_driver(Provider.EC2)'),
+    ('compute get_driver(GCE)',
+     'from libcloud.compute.types import Provider\n'
+     'from libcloud.compute.providers import get_driver\n'
+     'get_driver(Provider.GCE)'),
+    ('storage get_driver(S3)',
+     'from libcloud.storage.types import Provider\n'
+     'from libcloud.storage.providers import get_driver\n'
+     'get_driver(Provider.S3)')
+]
+
+
+def get_import_times(code):
+    """
+    Run the provided code in a new interpreter and return a list of
+    (module, self time, cumulative time) tuples (times in microseconds).
+    """
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join([os.getcwd()] +
+                                        sys.path[1:])
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c',
+                                code], stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, env=env)
+    _, stderr = process.communicate()
+
+    if process.returncode != 0:
+        raise Exception('Snippet failed: %s' % (stderr.decode('utf-8')))
+
+    result = []
+
+    for line in stderr.decode('utf-8').splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        values = line[len('import time:'):].split('|')
+        result.append((values[2].strip(), int(values[0]), int(values[1])))
+
+    return result
+
+
+def main():
+    if sys.version_info < (3, 7):
+        print('Python 3.7 or higher is required')
+        sys.exit(1)
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+
+    for name, code in SNIPPETS:
+        runs = [get_import_times(code) for _ in range(0, count)]
+
+        # Use the fastest run to reduce the noise
+        times = min(runs, key=lambda run: sum([item[1] for item in run]))
+        total = sum([item[1] for item in times])
+
+        print('%s: %.2f ms' % (name, total / 1000.0))
+
+        slowest = sorted(times, key=lambda item: item[1], reverse=True)
+        for module, self_time, cumulative in slowest[:TOP_MODULES_COUNT]:
+            print('    %-40s %8.2f ms (cumulative %.2f ms)' %
+                  (module, self_time / 1000.0, cumulative / 1000.0))
+
+
+if __name__ == '__main__':
+    main()
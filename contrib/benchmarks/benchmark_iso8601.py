@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+#
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""
+Benchmark which compares the ISO 8601 date parser fast path with the generic
+regular expression based parser (best of 3 runs is reported).
+
+Usage: python contrib/benchmarks/benchmark_iso8601.py [count]
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+
+from libcloud.utils import iso8601
+
+DEFAULT_COUNT = 100000
+
+VALUES = [
+    # EC2
+    '2013-10-09T05:41:37.000Z',
+    # GCE
+    '2013-12-16T22:32:51.527-08:00',
+    # OpenStack
+    '2014-09-06T14:13:12Z'
+]
+
+
+def legacy_parse_date(datestring):
+    # Behavior before the fast path and time zone cache were added
+    iso8601._timezone_cache.clear()
+    return iso8601._parse_date_regex(datestring)
+
+
+def parse_dates(func, value, count, repeat=3):
+    durations = []
+
+    for _ in range(0, repeat):
+        start = time.time()
+
+        for index in range(0, count):
+            func(value)
+
+        durations.append(time.time() - start)
+
+    return min(durations)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+
+    for value in VALUES:
+        for name, func in [('legacy', legacy_parse_date),
+                           ('current', iso8601.parse_date),
+                           ('lazy', iso8601.parse_date_lazy)]:
+            duration = parse_dates(func=func, value=value, count=count)
+            print('%-32s %-10s %.2f us / date' %
+                  (value, name, (duration / count) * 1000000))
+
+
+if __name__ == '__main__':
+    main()
@@ -23,24 +23,104 @@ __all__ = ['__version__', 'enable_debug']
 __version__ = '0.18.0'
 
 import os
+import sys
 import codecs
 
-try:
-    import paramiko
-    have_paramiko = True
-except ImportError:
-    have_paramiko = False
+
+def _is_module_available(name):
+    """
+    Return True if the provided top level module can be imported. The module
+    itself is not imported.
+    """
+    if name in sys.modules:
+        return sys.modules[name] is not None
+
+    # Same lookup as importlib.util.find_spec() which is slow to import
+    for finder in sys.meta_path:
+        find_spec = getattr(finder, 'find_spec', None)
+
+        if find_spec is not None and find_spec(name, None) is not None:
+            return True
+
+    if sys.version_info >= (3, 4):
+        return False
+
+    try:
+        import imp
+        imp.find_module(name)
+    except ImportError:
+        return False
+
+    return True
 
 
-def enable_debug(fo):
+# paramiko is slow to import so it's only imported once it's actually used
+have_paramiko = _is_module_available('paramiko')
+
+
+def enable_debug(fo, structured=False, sample_rate=None, max_body_size=None,
+                 redacted_headers=None, log_bodies=None, redacted_fields=None):
     """
     Enable library wide debugging to a file-like object.
 
     :param fo: Where to append debugging information
     :type fo: File like object, only write operations are used.
+
+    :param structured: Log requests as JSON records (one per line) without
+                       re-parsing the responses. See
+                       :mod:`libcloud.common.debug`.
+    :type structured: ``bool``
+
+    :param sample_rate: Fraction of requests which are logged (structured
+                        logging only).
+    :type sample_rate: ``float``
+
+    :param max_body_size: Maximum number of body bytes logged per request and
+                          response (structured logging only).
+    :type max_body_size: ``int``
+
+    :param redacted_headers: Names of the headers which values are redacted
+                             (structured logging only).
+    :type redacted_headers: ``list`` of ``str``
+
+    :param log_bodies: Log the request and response bodies (structured
+                       logging only, disabled by default).
+    :type log_bodies: ``bool``
+
+    :param redacted_fields: Names of the query parameters and body fields
+                            which values are redacted (structured logging
+                            only).
+    :type redacted_fields: ``list`` of ``str``
     """
-    from libcloud.common.base import (Connection,
-                                      LoggingHTTPConnection,
+    from libcloud.common.base import Connection
+
+    if structured:
+        from libcloud.common.debug import (StructuredLoggingConnection,
+                                           StructuredLoggingHTTPConnection,
+                                           StructuredLoggingHTTPSConnection)
+        StructuredLoggingConnection.log = fo
+
+        if sample_rate is not None:
+            StructuredLoggingConnection.sample_rate = sample_rate
+
+        if max_body_size is not None:
+            StructuredLoggingConnection.max_body_size = max_body_size
+
+        if redacted_headers is not None:
+            StructuredLoggingConnection.redacted_headers = \
+                [name.lower() for name in redacted_headers]
+
+        if log_bodies is not None:
+            StructuredLoggingConnection.log_bodies = log_bodies
+
+        if redacted_fields is not None:
+            StructuredLoggingConnection.redacted_fields = redacted_fields
+
+        Connection.conn_classes = (StructuredLoggingHTTPConnection,
+                                   StructuredLoggingHTTPSConnection)
+        return
+
+    from libcloud.common.base import (LoggingHTTPConnection,
                                       LoggingHTTPSConnection)
     LoggingHTTPSConnection.log = fo
     LoggingHTTPConnection.log = fo
@@ -54,6 +134,11 @@ def _init_once():
 
     This checks for the LIBCLOUD_DEBUG environment variable, which if it exists
     is where we will log debug information about the provider transports.
+
+    If LIBCLOUD_DEBUG_FORMAT is set to "json", structured logging is used and
+    LIBCLOUD_DEBUG_SAMPLE_RATE, LIBCLOUD_DEBUG_MAX_BODY_SIZE and
+    LIBCLOUD_DEBUG_LOG_BODIES environment variables are also taken into
+    account.
     """
     path = os.getenv('LIBCLOUD_DEBUG')
     if path:
@@ -69,9 +154,36 @@ def _init_once():
             mode = 'w'
 
         fo = codecs.open(path, mode, encoding='utf8')
-        enable_debug(fo)
 
-    if have_paramiko:
-        paramiko.common.logging.basicConfig(level=paramiko.common.DEBUG)
+        if os.getenv('LIBCLOUD_DEBUG_FORMAT', '').lower() == 'json':
+            sample_rate = os.getenv('LIBCLOUD_DEBUG_SAMPLE_RATE', None)
+            max_body_size = os.getenv('LIBCLOUD_DEBUG_MAX_BODY_SIZE', None)
+            log_bodies = os.getenv('LIBCLOUD_DEBUG_LOG_BODIES', None)
+
+            if sample_rate is not None:
+                sample_rate = float(sample_rate)
+
+            if max_body_size is not None:
+                max_body_size = int(max_body_size)
+
+            if log_bodies is not None:
+                log_bodies = log_bodies.lower() in ['1', 'true', 'yes']
+
+            enable_debug(fo, structured=True, sample_rate=sample_rate,
+                         max_body_size=max_body_size, log_bodies=log_bodies)
+        else:
+            enable_debug(fo)
+
+        if have_paramiko:
+            try:
+                import paramiko
+            except ImportError:
+                # Broken installation, SSH clients fall back as if paramiko
+                # wasn't installed
+                paramiko = None
+
+            if paramiko is not None:
+                paramiko.common.logging.basicConfig(
+                    level=paramiko.common.DEBUG)
 
 _init_once()
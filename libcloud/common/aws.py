@@ -45,6 +45,19 @@ __all__ = [
 
 DEFAULT_SIGNATURE_VERSION = '2'
 
+# Maximum number of derived signing keys cached by a single V4 signer. Keys
+# only change with the date, region and service so this is plenty.
+SIGNING_KEYS_CACHE_MAX_SIZE = 10
+
+# Maximum number of url quoted query parameter keys and values which are
+# cached and re-used when building canonical requests.
+QUOTED_VALUES_CACHE_MAX_SIZE = 2048
+
+# Only values shorter than this are cached. Long values (UserData, policy
+# documents, ...) rarely repeat and often contain secrets which shouldn't
+# be kept around for the life of the process.
+QUOTED_VALUE_MAX_CACHED_LENGTH = 64
+
 
 class AWSBaseResponse(XmlResponse):
     namespace = None
@@ -235,6 +248,14 @@ class AWSRequestSignerAlgorithmV2(AWSRequestSigner):
 
 
 class AWSRequestSignerAlgorithmV4(AWSRequestSigner):
+    def __init__(self, access_key, access_secret, version, connection):
+        super(AWSRequestSignerAlgorithmV4, self).__init__(
+            access_key=access_key, access_secret=access_secret,
+            version=version, connection=connection)
+
+        # Derived signing keys keyed by (date, region, service) tuple
+        self._signing_keys_cache = {}
+
     def get_request_params(self, params, method='GET', path='/'):
         params['Version'] = self.version
         return params
@@ -274,14 +295,30 @@ class AWSRequestSignerAlgorithmV4(AWSRequestSigner):
         return _sign(key=key, msg=string_to_sign, hex=True)
 
     def _get_key_to_sign_with(self, dt):
-        return _sign(
-            _sign(
+        # Deriving a key requires four chained HMAC operations, but the key
+        # only changes with the date, region and service so we cache it
+        date = dt.strftime('%Y%m%d')
+        region_name = self.connection.driver.region_name
+        service_name = self.connection.service_name
+
+        cache_key = (date, region_name, service_name)
+        key = self._signing_keys_cache.get(cache_key, None)
+
+        if key is None:
+            key = _sign(
                 _sign(
-                    _sign(('AWS4' + self.access_secret),
-                          dt.strftime('%Y%m%d')),
-                    self.connection.driver.region_name),
-                self.connection.service_name),
-            'aws4_request')
+                    _sign(
+                        _sign(('AWS4' + self.access_secret), date),
+                        region_name),
+                    service_name),
+                'aws4_request')
+
+            if len(self._signing_keys_cache) >= SIGNING_KEYS_CACHE_MAX_SIZE:
+                self._signing_keys_cache.clear()
+
+            self._signing_keys_cache[cache_key] = key
+
+        return key
 
     def _get_string_to_sign(self, params, headers, dt, method, path):
         canonical_request = self._get_canonical_request(params=params,
@@ -308,12 +345,12 @@ class AWSRequestSignerAlgorithmV4(AWSRequestSigner):
                           for k, v in sorted(headers.items())]) + '\n'
 
     def _get_payload_hash(self):
-        return _hash('')
+        return EMPTY_PAYLOAD_HASH
 
     def _get_request_params(self, params):
         # For self.method == GET
         return '&'.join(["%s=%s" %
-                         (urlquote(k, safe=''), urlquote(str(v), safe='~'))
+                         (_quote(k, safe=''), _quote(str(v), safe='~'))
                          for k, v in sorted(params.items())])
 
     def _get_canonical_request(self, params, headers, method, path):
@@ -379,6 +416,37 @@ def _hash(msg):
     return hashlib.sha256(b(msg)).hexdigest()
 
 
+# Most of the requests are GET requests with an empty payload
+EMPTY_PAYLOAD_HASH = _hash('')
+
+_quoted_values_cache = {}
+
+
+def _quote(value, safe):
+    """
+    Url quote the provided value.
+
+    Query parameter names (Action, Version, Filter.N.Name, ...) and a lot of
+    the values repeat between requests so the quoted short values are
+    cached.
+    """
+    if len(value) >= QUOTED_VALUE_MAX_CACHED_LENGTH:
+        return urlquote(value, safe=safe)
+
+    cache_key = (value, safe)
+    quoted = _quoted_values_cache.get(cache_key, None)
+
+    if quoted is None:
+        quoted = urlquote(value, safe=safe)
+
+        if len(_quoted_values_cache) >= QUOTED_VALUES_CACHE_MAX_SIZE:
+            _quoted_values_cache.clear()
+
+        _quoted_values_cache[cache_key] = quoted
+
+    return quoted
+
+
 class AWSDriver(BaseDriver):
     def __init__(self, key, secret=None, secure=True, host=None, port=None,
                  api_version=None, region=None, token=None, **kwargs):
@@ -17,18 +17,16 @@ import os
 import sys
 import ssl
 import copy
+import hashlib
 import binascii
+import threading
 import time
 
-import xml.dom.minidom
-
 try:
     from lxml import etree as ET
 except ImportError:
     from xml.etree import ElementTree as ET
 
-from pipes import quote as pquote
-
 try:
     import simplejson as json
 except:
@@ -47,13 +45,17 @@ from libcloud.utils.py3 import b
 from libcloud.utils.misc import lowercase_keys, retry
 from libcloud.utils.compression import decompress_data
 
+from libcloud.common.cache import ResponseCacheEntry
 from libcloud.common.exceptions import exception_from_message
+from libcloud.common.instrumentation import RequestMetrics
+from libcloud.common.instrumentation import get_observers, notify_observers
 from libcloud.common.types import LibcloudError, MalformedResponseError
 from libcloud.httplib_ssl import LibcloudHTTPConnection
 from libcloud.httplib_ssl import LibcloudHTTPSConnection
 
 __all__ = [
     'RETRY_FAILED_HTTP_REQUESTS',
+    'COALESCE_HTTP_REQUESTS',
 
     'BaseDriver',
 
@@ -75,6 +77,17 @@ __all__ = [
 # Module level variable indicates if the failed HTTP requests should be retried
 RETRY_FAILED_HTTP_REQUESTS = False
 
+# Module level variable indicates if identical GET requests which are
+# performed at the same time using the same connection should be coalesced
+# into a single HTTP request. Only callers which share the same Connection
+# instance are coalesced.
+COALESCE_HTTP_REQUESTS = False
+
+# Requests which are currently in flight and can be joined by other callers
+# keyed by (connection id, request key)
+_inflight_requests = {}
+_inflight_requests_lock = threading.Lock()
+
 
 class HTTPResponse(httplib.HTTPResponse):
     # On python 2.6 some calls can hang because HEAD isn't quite properly
@@ -286,6 +299,38 @@ class RawResponse(Response):
         return self._reason
 
 
+class InFlightRequest(object):
+    """
+    Request which is currently in progress and whose result is shared with
+    all the callers which perform the same request at the same time.
+    """
+
+    def __init__(self):
+        self.response = None
+        self.exc_info = None
+        self._event = threading.Event()
+
+    def set_response(self, response):
+        self.response = response
+        self._event.set()
+
+    def set_exception(self, exc_info):
+        self.exc_info = exc_info
+        self._event.set()
+
+    def wait(self):
+        """
+        Wait for the request to complete and return the response or re-raise
+        the exception which was thrown by the request.
+        """
+        self._event.wait()
+
+        if self.exc_info:
+            raise self.exc_info[1]
+
+        return self.response
+
+
 # TODO: Move this to a better location/package
 class LoggingConnection():
     """
@@ -353,6 +398,8 @@ class LoggingConnection():
                     pass
             elif pretty_print and content_type == 'text/xml':
                 try:
+                    # Only imported when needed because it's slow to import
+                    import xml.dom.minidom
                     elem = xml.dom.minidom.parseString(body.decode('utf-8'))
                     body = elem.toprettyxml()
                 except Exception:
@@ -377,6 +424,8 @@ class LoggingConnection():
         return (rr, rv)
 
     def _log_curl(self, method, url, body, headers):
+        from pipes import quote as pquote
+
         cmd = ["curl"]
 
         if self.http_proxy_used:
@@ -486,8 +535,11 @@ class Connection(object):
     driver = None
     action = None
     cache_busting = False
+    coalesce_requests = False
+    response_cache = None
     backoff = None
     retry_delay = None
+    rate_limiter = None
 
     allow_insecure = True
 
@@ -695,6 +747,136 @@ class Connection(object):
         :rtype: :class:`Response` instance
 
         """
+        if get_observers():
+            return self._instrumented_request(action=action, params=params,
+                                              data=data, headers=headers,
+                                              method=method, raw=raw)
+
+        return self._dispatch_request(action=action, params=params, data=data,
+                                      headers=headers, method=method, raw=raw)
+
+    def _instrumented_request(self, action, params=None, data=None,
+                              headers=None, method='GET', raw=False):
+        """
+        Perform a request and report its metrics to the registered
+        observers.
+        """
+        operation = None
+
+        if isinstance(params, dict):
+            operation = params.get('Action', None)
+
+        metrics = RequestMetrics(driver_name=getattr(self.driver, 'name',
+                                                     None),
+                                 operation=operation or action,
+                                 method=method, action=action)
+
+        try:
+            response = self._dispatch_request(action=action, params=params,
+                                              data=data, headers=headers,
+                                              method=method, raw=raw,
+                                              metrics=metrics)
+
+            # Coalesced requests don't go through _request
+            if metrics.status is None and not raw:
+                metrics.status = response.status
+
+            return response
+        except:
+            metrics.exception = sys.exc_info()[1]
+            raise
+        finally:
+            metrics.timings['total'] = time.time() - metrics.start_time
+            notify_observers(metrics)
+
+    def _dispatch_request(self, action, params=None, data=None, headers=None,
+                          method='GET', raw=False, metrics=None):
+        """
+        Perform a request, coalescing it with identical requests in progress
+        if enabled.
+
+        :param metrics: Metrics which are filled in for this request (if
+                        any).
+        :type metrics: :class:`RequestMetrics`
+        """
+        coalesce_enabled = os.environ.get('LIBCLOUD_COALESCE_HTTP_REQUESTS',
+                                          False) or COALESCE_HTTP_REQUESTS
+        coalesce_enabled = coalesce_enabled or self.coalesce_requests
+
+        # Only idempotent requests without a body can be safely coalesced
+        if coalesce_enabled and method.upper() == 'GET' and not data and \
+                not raw:
+            return self._coalesced_request(action=action, params=params,
+                                           headers=headers, method=method,
+                                           metrics=metrics)
+
+        return self._request(action=action, params=params, data=data,
+                             headers=headers, method=method, raw=raw,
+                             metrics=metrics)
+
+    def _coalesced_request(self, action, params=None, headers=None,
+                           method='GET', metrics=None):
+        """
+        Perform a request or, if the same request is already in progress,
+        wait for it to finish and return the same response.
+
+        Requests are only coalesced with requests performed using this
+        Connection instance. Waiters never use the underlying HTTP
+        connection (which is not thread-safe) or touch the connection
+        context, which belongs to the request in progress and is reset once
+        it has completed.
+        """
+        key = (id(self), self._get_request_key(action=action, params=params,
+                                               headers=headers,
+                                               method=method))
+
+        with _inflight_requests_lock:
+            inflight_request = _inflight_requests.get(key, None)
+            in_progress = inflight_request is not None
+
+            if not in_progress:
+                inflight_request = InFlightRequest()
+                _inflight_requests[key] = inflight_request
+
+        if in_progress:
+            return inflight_request.wait()
+
+        try:
+            response = self._request(action=action, params=params,
+                                     headers=headers, method=method,
+                                     metrics=metrics)
+        except:
+            exc_info = sys.exc_info()
+
+            with _inflight_requests_lock:
+                _inflight_requests.pop(key, None)
+
+            inflight_request.set_exception(exc_info)
+            raise
+
+        with _inflight_requests_lock:
+            _inflight_requests.pop(key, None)
+
+        inflight_request.set_response(response)
+        return response
+
+    def _get_request_key(self, action, params=None, headers=None,
+                         method='GET'):
+        """
+        Return a key which identifies a request with the provided arguments.
+
+        :rtype: ``str``
+        """
+        if isinstance(params, dict):
+            params = sorted(params.items())
+
+        if isinstance(headers, dict):
+            headers = sorted(headers.items())
+
+        return repr((method.upper(), action, params or [], headers or []))
+
+    def _request(self, action, params=None, data=None, headers=None,
+                 method='GET', raw=False, metrics=None):
         if params is None:
             params = {}
         else:
@@ -712,6 +894,38 @@ class Connection(object):
         self.action = action
         self.method = method
 
+        cache = self.response_cache
+        cache_key = None
+        cache_entry = None
+        cache_ttl = 0
+        invalidate_cache = False
+
+        if cache is not None and not raw:
+            path = action.split('?', 1)[0]
+
+            if method.upper() == 'GET' and not data:
+                cache_ttl = cache.get_ttl(path=path, params=params)
+
+            if cache_ttl:
+                cache_key = self._get_cache_key(action=action, params=params,
+                                                headers=headers)
+                cache_entry = cache.get(cache_key)
+
+                if cache_entry is not None and not cache_entry.is_expired():
+                    if metrics is not None:
+                        metrics.from_cache = True
+
+                    return self._response_from_cache_entry(cache_entry)
+
+                if cache_entry is not None and cache_entry.can_revalidate():
+                    headers.update(cache_entry.get_conditional_headers())
+                else:
+                    cache_entry = None
+            elif not cache.is_read_only_request(method=method, params=params):
+                # Request can modify the resource, cached responses for it
+                # are stale once the request has completed
+                invalidate_cache = True
+
         # Extend default parameters
         params = self.add_default_params(params)
 
@@ -757,43 +971,106 @@ class Connection(object):
         else:
             url = action
 
-        # Removed terrible hack...this a less-bad hack that doesn't execute a
-        # request twice, but it's still a hack.
-        self.connect()
-        try:
-            # @TODO: Should we just pass File object as body to request method
-            # instead of dealing with splitting and sending the file ourselves?
+        limiter = self.rate_limiter
+        deadline = None
+        attempt = 0
+
+        if limiter is not None and limiter.deadline is not None:
+            deadline = time.time() + limiter.deadline
+
+        while True:
+            if limiter is not None:
+                limiter.acquire()
+
+            # Removed terrible hack...this a less-bad hack that doesn't
+            # execute a request twice, but it's still a hack.
+            self.connect()
+
+            if metrics is not None:
+                # Underlying HTTP connection records DNS, connect and TLS
+                # timings
+                self.connection.timings = metrics.timings
+                metrics.host = self.host
+                metrics.bytes_sent = self._get_request_size(method=method,
+                                                            url=url,
+                                                            data=data,
+                                                            headers=headers)
+                send_time = time.time()
+            try:
+                # @TODO: Should we just pass File object as body to request
+                # method instead of dealing with splitting and sending the
+                # file ourselves?
+                if raw:
+                    self.connection.putrequest(method, url)
+
+                    for key, value in list(headers.items()):
+                        self.connection.putheader(key, str(value))
+
+                    self.connection.endheaders()
+                else:
+                    if retry_enabled:
+                        retry_request = retry(timeout=self.timeout,
+                                              retry_delay=self.retry_delay,
+                                              backoff=self.backoff)
+                        retry_request(self.connection.request)(
+                            method=method, url=url, body=data,
+                            headers=headers)
+                    else:
+                        self.connection.request(method=method, url=url,
+                                                body=data, headers=headers)
+            except ssl.SSLError:
+                e = sys.exc_info()[1]
+                self.reset_context()
+                raise ssl.SSLError(str(e))
+            finally:
+                if metrics is not None:
+                    # Timings must not be recorded into these metrics by the
+                    # requests which are performed later
+                    self.connection.timings = None
+
             if raw:
-                self.connection.putrequest(method, url)
+                break
 
-                for key, value in list(headers.items()):
-                    self.connection.putheader(key, str(value))
+            http_response = self.connection.getresponse()
 
-                self.connection.endheaders()
-            else:
-                if retry_enabled:
-                    retry_request = retry(timeout=self.timeout,
-                                          retry_delay=self.retry_delay,
-                                          backoff=self.backoff)
-                    retry_request(self.connection.request)(method=method,
-                                                           url=url,
-                                                           body=data,
-                                                           headers=headers)
-                else:
-                    self.connection.request(method=method, url=url, body=data,
-                                            headers=headers)
-        except ssl.SSLError:
-            e = sys.exc_info()[1]
-            self.reset_context()
-            raise ssl.SSLError(str(e))
+            if limiter is None:
+                break
+
+            delay = limiter.get_retry_delay(
+                status=http_response.status,
+                retry_after=http_response.getheader('retry-after', None),
+                attempt=attempt, deadline=deadline, method=method)
+
+            if delay is None:
+                break
+
+            # Request has been throttled, discard the response and retry
+            http_response.read()
+            time.sleep(delay)
+            attempt += 1
 
         if raw:
             responseCls = self.rawResponseCls
             kwargs = {'connection': self}
         else:
             responseCls = self.responseCls
+
+            if metrics is not None:
+                metrics.timings['first_byte'] = time.time() - send_time
+                metrics.status = http_response.status
+                metrics.bytes_received = int(
+                    http_response.getheader('content-length', None) or 0)
+
+            if cache_entry is not None and \
+                    http_response.status == httplib.NOT_MODIFIED:
+                # Cached response is still valid
+                http_response.read()
+                cache_entry.expires = time.time() + cache_ttl
+                cache.set(cache_key, cache_entry)
+                return self._response_from_cache_entry(cache_entry)
+
             kwargs = {'connection': self,
-                      'response': self.connection.getresponse()}
+                      'response': http_response}
 
         try:
             response = responseCls(**kwargs)
@@ -801,8 +1078,64 @@ class Connection(object):
             # Always reset the context after the request has completed
             self.reset_context()
 
+            if invalidate_cache:
+                cache.invalidate(path)
+
+        if metrics is not None and not raw and not metrics.bytes_received:
+            metrics.bytes_received = len(response.body or '')
+
+        if cache_key is not None:
+            cache_entry = ResponseCacheEntry.from_response(response=response,
+                                                           path=path,
+                                                           ttl=cache_ttl)
+            cache.set(cache_key, cache_entry)
+
         return response
 
+    def _get_request_size(self, method, url, data, headers):
+        """
+        Return approximate size (in bytes) of the request line, headers and
+        body.
+
+        :rtype: ``int``
+        """
+        size = len(method) + len(url) + len(' HTTP/1.1\r\n')
+
+        for key, value in headers.items():
+            size += len(key) + len(str(value)) + len(': \r\n')
+
+        if data and hasattr(data, '__len__'):
+            size += len(data)
+
+        return size + len('\r\n')
+
+    def _get_cache_key(self, action, params=None, headers=None):
+        """
+        Return a key under which the response for the provided request is
+        stored in the response cache.
+
+        Key includes the endpoint and the credentials so different accounts
+        and endpoints never share cached responses.
+
+        :rtype: ``str``
+        """
+        request_key = self._get_request_key(action=action, params=params,
+                                            headers=headers)
+        value = repr((self.__class__.__name__, self.host, self.port,
+                      self.secure, getattr(self, 'user_id', None),
+                      getattr(self, 'key', None), request_key))
+        return hashlib.sha1(b(value)).hexdigest()
+
+    def _response_from_cache_entry(self, cache_entry):
+        """
+        Construct a response object from the provided cache entry.
+        """
+        try:
+            return self.responseCls(connection=self,
+                                    response=cache_entry.to_http_response())
+        finally:
+            self.reset_context()
+
     def morph_action_hook(self, action):
         return self.request_path + action
 
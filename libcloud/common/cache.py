@@ -0,0 +1,539 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Response caches which can be used with the :class:`Connection` class to
+cache the responses of read-only (GET) requests.
+
+Only responses of the requests which match one of the TTL policies are
+cached. Query based APIs (such as EC2) also send mutating actions as GET
+requests, so requests with an ``Action`` parameter are only cached if the
+action is read-only (e.g. ``DescribeRegions``).
+
+Example usage:
+
+    cache = MemoryResponseCache(ttl_policies={'DescribeRegions': 3600,
+                                              '*/flavors*': 600})
+    driver.connection.response_cache = cache
+"""
+
+from __future__ import with_statement
+
+import os
+import sys
+import time
+import errno
+import shutil
+import fnmatch
+import hashlib
+import tempfile
+import threading
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+from libcloud.utils.py3 import b
+
+__all__ = [
+    'ResponseCacheEntry',
+    'BaseResponseCache',
+    'MemoryResponseCache',
+    'FileResponseCache'
+]
+
+DEFAULT_MAX_SIZE = 1000
+
+# Prefixes of the ``Action`` parameter values which don't modify any resources
+READ_ONLY_ACTION_PREFIXES = ['Describe', 'List', 'Get']
+
+
+class CachedHTTPResponse(object):
+    """
+    Minimal ``httplib.HTTPResponse`` compatible object which is passed to the
+    Response class when a response is served from the cache.
+    """
+
+    def __init__(self, status, reason, headers, body):
+        self.status = status
+        self.reason = reason
+        self._headers = headers
+        self._body = body
+
+    def getheaders(self):
+        return list(self._headers.items())
+
+    def getheader(self, name, default=None):
+        return self._headers.get(name.lower(), default)
+
+    def read(self, amt=None):
+        return b(self._body)
+
+
+class ResponseCacheEntry(object):
+    """
+    Cached response.
+    """
+
+    def __init__(self, status, reason, headers, body, path, expires):
+        """
+        :param status: Response status code.
+        :type status: ``int``
+
+        :param reason: Response reason.
+        :type reason: ``str``
+
+        :param headers: Response headers (lower cased names).
+        :type headers: ``dict``
+
+        :param body: Response body (already decompressed).
+        :type body: ``str``
+
+        :param path: Request path this response belongs to.
+        :type path: ``str``
+
+        :param expires: Timestamp at which this entry expires.
+        :type expires: ``float``
+        """
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.path = path
+        self.expires = expires
+
+    @property
+    def etag(self):
+        return self.headers.get('etag', None)
+
+    @property
+    def last_modified(self):
+        return self.headers.get('last-modified', None)
+
+    def is_expired(self):
+        return self.expires <= time.time()
+
+    def can_revalidate(self):
+        """
+        Return True if the provider supports conditional requests for this
+        response.
+        """
+        return bool(self.etag or self.last_modified)
+
+    def get_conditional_headers(self):
+        """
+        Return headers which are used to revalidate the entry with a
+        conditional request.
+
+        :rtype: ``dict``
+        """
+        headers = {}
+
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        return headers
+
+    def to_http_response(self):
+        """
+        :rtype: :class:`CachedHTTPResponse`
+        """
+        return CachedHTTPResponse(status=self.status, reason=self.reason,
+                                  headers=self.headers, body=self.body)
+
+    def to_dict(self):
+        return {'status': self.status, 'reason': self.reason,
+                'headers': self.headers, 'body': self.body,
+                'path': self.path, 'expires': self.expires}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(status=data['status'], reason=data['reason'],
+                   headers=data['headers'], body=data['body'],
+                   path=data['path'], expires=data['expires'])
+
+    @classmethod
+    def from_response(cls, response, path, ttl):
+        """
+        Create an entry from the provided :class:`Response` instance.
+        """
+        headers = dict(response.headers)
+
+        # Body is stored already decompressed
+        headers.pop('content-encoding', None)
+
+        return cls(status=response.status, reason=response.error,
+                   headers=headers, body=response.body, path=path,
+                   expires=time.time() + ttl)
+
+
+class BaseResponseCache(object):
+    """
+    Base class for the response caches.
+
+    :param ttl_policies: Dictionary mapping a request "action" to a TTL in
+                         seconds. Keys are shell style patterns which are
+                         matched against the ``Action`` query parameter (for
+                         query based APIs such as EC2) and the request path.
+                         Requests which don't match any policy aren't cached.
+    :type ttl_policies: ``dict``
+    """
+
+    def __init__(self, ttl_policies=None):
+        self.ttl_policies = ttl_policies or {}
+
+    def get_ttl(self, path, params=None):
+        """
+        Return for how long the response of the provided GET request can be
+        cached (0 if it can't be cached).
+
+        :rtype: ``int``
+        """
+        action = self._get_action(params=params)
+
+        if action and not self._is_read_only_action(action):
+            return 0
+
+        for pattern, ttl in self.ttl_policies.items():
+            if action and fnmatch.fnmatchcase(action, pattern):
+                return ttl
+
+            if fnmatch.fnmatchcase(path, pattern):
+                return ttl
+
+        return 0
+
+    def is_read_only_request(self, method, params=None):
+        """
+        Return True if the provided request doesn't modify any resources, so
+        the cached responses don't need to be invalidated.
+
+        :rtype: ``bool``
+        """
+        if method.upper() not in ['GET', 'HEAD']:
+            return False
+
+        action = self._get_action(params=params)
+        return not action or self._is_read_only_action(action)
+
+    def get(self, key):
+        """
+        Return entry for the provided key or None if the key is not cached.
+
+        Note: Expired entries are also returned so they can be revalidated.
+
+        :rtype: :class:`ResponseCacheEntry` or ``None``
+        """
+        raise NotImplementedError('get not implemented for this cache')
+
+    def set(self, key, entry):
+        """
+        Store entry under the provided key.
+        """
+        raise NotImplementedError('set not implemented for this cache')
+
+    def delete(self, key):
+        raise NotImplementedError('delete not implemented for this cache')
+
+    def invalidate(self, path):
+        """
+        Remove all the entries belonging to the provided resource path, its
+        sub resources and the parent collection.
+
+        :param path: Resource path which has been modified.
+        :type path: ``str``
+        """
+        raise NotImplementedError('invalidate not implemented for this cache')
+
+    def clear(self):
+        raise NotImplementedError('clear not implemented for this cache')
+
+    def _get_action(self, params=None):
+        if isinstance(params, dict):
+            return params.get('Action', None)
+
+        return None
+
+    def _is_read_only_action(self, action):
+        for prefix in READ_ONLY_ACTION_PREFIXES:
+            if action.startswith(prefix):
+                return True
+
+        return False
+
+    def _is_affected_path(self, modified_path, path):
+        """
+        Return True if the entries for ``path`` need to be invalidated when
+        ``modified_path`` is modified.
+        """
+        modified_path = modified_path.rstrip('/') or '/'
+        path = path.rstrip('/') or '/'
+
+        if path == modified_path:
+            return True
+
+        # Sub resource
+        if path.startswith(modified_path.rstrip('/') + '/'):
+            return True
+
+        # Parent collection (e.g. a listing which includes modified resource)
+        parent_path = modified_path.rsplit('/', 1)[0] or '/'
+        return path == parent_path
+
+
+class MemoryResponseCache(BaseResponseCache):
+    """
+    In-memory LRU response cache.
+
+    :param max_size: Maximum number of cached responses.
+    :type max_size: ``int``
+    """
+
+    def __init__(self, ttl_policies=None, max_size=DEFAULT_MAX_SIZE):
+        super(MemoryResponseCache, self).__init__(ttl_policies=ttl_policies)
+        self.max_size = max_size
+
+        self._entries = {}
+
+        # Maps a key to the counter value at which it was last used
+        self._used = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key, None)
+
+            if entry is not None:
+                self._mark_used(key)
+
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._mark_used(key)
+
+            while len(self._entries) > self.max_size:
+                # Remove the least recently used entry
+                oldest_key = min(self._used, key=self._used.get)
+                del self._entries[oldest_key]
+                del self._used[oldest_key]
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._used.pop(key, None)
+
+    def invalidate(self, path):
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if self._is_affected_path(path, entry.path):
+                    del self._entries[key]
+                    del self._used[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._used.clear()
+
+    def _mark_used(self, key):
+        self._counter += 1
+        self._used[key] = self._counter
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileResponseCache(BaseResponseCache):
+    """
+    Response cache which stores responses as JSON files on disk so they can
+    be shared between processes and survive restarts.
+
+    Entries are stored in the "entries" sub directory. For every request
+    path there is also a directory under "paths" which references all the
+    entries for that path so they can be invalidated without reading all the
+    cached responses.
+
+    Modification time of each entry file is set to the expiration time of
+    the entry. Expired entries are removed when a new entry is stored and if
+    the cache still holds more than ``max_size`` entries, the entries which
+    expire first are removed.
+
+    :param directory: Directory where the responses are stored.
+    :type directory: ``str``
+
+    :param max_size: Maximum number of cached responses.
+    :type max_size: ``int``
+    """
+
+    def __init__(self, directory, ttl_policies=None,
+                 max_size=DEFAULT_MAX_SIZE):
+        super(FileResponseCache, self).__init__(ttl_policies=ttl_policies)
+        self.directory = directory
+        self.max_size = max_size
+        self.entries_directory = os.path.join(directory, 'entries')
+        self.paths_directory = os.path.join(directory, 'paths')
+
+        for path in [self.entries_directory, self.paths_directory]:
+            self._makedirs(path)
+
+    def get(self, key):
+        try:
+            with open(self._get_entry_file_path(key=key), 'r') as f:
+                return ResponseCacheEntry.from_dict(json.loads(f.read()))
+        except (IOError, ValueError, KeyError):
+            return None
+
+    def set(self, key, entry):
+        name = self._hash(key)
+        entry_file_path = self._get_entry_file_path(key=key)
+        self._write_file(entry_file_path, json.dumps(entry.to_dict()))
+
+        try:
+            os.utime(entry_file_path, (time.time(), entry.expires))
+        except OSError:
+            # Removed by another process
+            pass
+
+        # Reference is written after the entry so it's never removed as a
+        # stale reference while the entry is being stored
+        path_directory = os.path.join(self.paths_directory,
+                                      self._hash(entry.path))
+        self._makedirs(path_directory)
+
+        path_file = os.path.join(path_directory, '.path')
+        if not os.path.exists(path_file):
+            self._write_file(path_file, entry.path)
+
+        self._write_file(os.path.join(path_directory, name), '')
+        self._prune(keep=name)
+
+    def delete(self, key):
+        self._remove_file(self._get_entry_file_path(key=key))
+
+    def invalidate(self, path):
+        for name in os.listdir(self.paths_directory):
+            path_directory = os.path.join(self.paths_directory, name)
+
+            try:
+                with open(os.path.join(path_directory, '.path'), 'r') as f:
+                    cached_path = f.read()
+            except IOError:
+                continue
+
+            if not self._is_affected_path(path, cached_path):
+                continue
+
+            for entry_name in os.listdir(path_directory):
+                if entry_name != '.path':
+                    self._remove_file(os.path.join(self.entries_directory,
+                                                   entry_name))
+
+            shutil.rmtree(path_directory, ignore_errors=True)
+
+    def clear(self):
+        for path in [self.entries_directory, self.paths_directory]:
+            shutil.rmtree(path, ignore_errors=True)
+            self._makedirs(path)
+
+    def _prune(self, keep=None):
+        """
+        Remove the expired entries and, if there are still more than
+        ``max_size`` entries, the entries which expire first.
+        """
+        now = time.time()
+        entries = []
+
+        for name in os.listdir(self.entries_directory):
+            try:
+                expires = os.stat(os.path.join(self.entries_directory,
+                                               name)).st_mtime
+            except OSError:
+                continue
+
+            entries.append((expires, name))
+
+        entries.sort()
+        remove_count = max(len(entries) - self.max_size, 0)
+        removed = False
+
+        for expires, name in entries:
+            if name == keep:
+                continue
+
+            if expires > now and remove_count <= 0:
+                break
+
+            self._remove_file(os.path.join(self.entries_directory, name))
+            remove_count -= 1
+            removed = True
+
+        if removed:
+            self._remove_stale_path_references()
+
+    def _remove_stale_path_references(self):
+        """
+        Remove the references to the entries which no longer exist.
+        """
+        for name in os.listdir(self.paths_directory):
+            path_directory = os.path.join(self.paths_directory, name)
+
+            try:
+                entry_names = os.listdir(path_directory)
+            except OSError:
+                continue
+
+            for entry_name in entry_names:
+                if entry_name == '.path' or os.path.exists(
+                        os.path.join(self.entries_directory, entry_name)):
+                    continue
+
+                self._remove_file(os.path.join(path_directory, entry_name))
+
+    def _get_entry_file_path(self, key):
+        return os.path.join(self.entries_directory, self._hash(key))
+
+    def _makedirs(self, path):
+        try:
+            os.makedirs(path)
+        except OSError:
+            e = sys.exc_info()[1]
+            if e.errno != errno.EEXIST:
+                raise
+
+    def _remove_file(self, file_path):
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+    def _write_file(self, file_path, data):
+        # Write to a temporary file first so readers never see partial data
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path))
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+
+        if hasattr(os, 'replace'):
+            os.replace(tmp_path, file_path)
+        else:
+            os.rename(tmp_path, file_path)
+
+    def _hash(self, value):
+        return hashlib.sha1(b(value)).hexdigest()
@@ -0,0 +1,449 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Low overhead structured debug logging for the HTTP requests performed by the
+drivers.
+
+Unlike :class:`libcloud.common.base.LoggingConnection` this logger doesn't
+read and re-parse the response before handing it to the driver. A single
+JSON record is written per request once the response body has been read.
+
+Request and response bodies are only logged if ``log_bodies`` is enabled, in
+which case the response body is copied (up to ``max_body_size`` bytes) as
+the driver consumes it.
+
+Requests can be sampled (``sample_rate``). Values of sensitive headers,
+query parameters (e.g. request signatures and API keys) and credential
+fields in the bodies (e.g. passwords and access tokens) are redacted before
+they are written to the log.
+"""
+
+from __future__ import with_statement
+
+import re
+import sys
+import zlib
+import time
+import random
+import threading
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+from libcloud.utils.py3 import b
+from libcloud.utils.py3 import httplib
+from libcloud.httplib_ssl import LibcloudHTTPConnection
+from libcloud.httplib_ssl import LibcloudHTTPSConnection
+
+__all__ = [
+    'DEFAULT_MAX_BODY_SIZE',
+    'DEFAULT_REDACTED_HEADERS',
+    'DEFAULT_REDACTED_FIELDS',
+
+    'redact_headers',
+    'redact_url',
+    'redact_body',
+
+    'ResponseBodyTee',
+    'StructuredLoggingConnection',
+    'StructuredLoggingHTTPConnection',
+    'StructuredLoggingHTTPSConnection'
+]
+
+# Maximum number of request and response body bytes included in a record
+DEFAULT_MAX_BODY_SIZE = 4096
+
+# Headers which values are never written to the log (lower case)
+DEFAULT_REDACTED_HEADERS = [
+    'authorization',
+    'proxy-authorization',
+    'cookie',
+    'set-cookie',
+    'x-auth-token',
+    'x-subject-token',
+    'x-storage-token',
+    'x-auth-key',
+    'x-amz-security-token',
+    'x-goog-api-key'
+]
+
+# Query parameters and body fields (JSON or form encoded) which values are
+# never written to the log (matched case insensitively)
+DEFAULT_REDACTED_FIELDS = [
+    'password',
+    'secret',
+    'client_secret',
+    'access_token',
+    'refresh_token',
+    'id_token',
+    'assertion',
+    'private_key',
+    'apikey',
+    'api_key',
+    'secretkey',
+    'signature',
+    'awsaccesskeyid',
+    'x-amz-credential',
+    'x-amz-signature',
+    'x-amz-security-token',
+    'x-goog-credential',
+    'x-goog-signature',
+    'temp_url_sig',
+    'key'
+]
+
+REDACTED_VALUE = '<redacted>'
+
+# Chunk size used when the response is consumed as an iterator
+CHUNK_SIZE = 8096
+
+# Serializes writes so records from different threads are not interleaved
+_log_lock = threading.Lock()
+
+
+def redact_headers(headers, redacted_headers=None):
+    """
+    Return a copy of the provided headers with values of the sensitive
+    headers replaced.
+
+    :param headers: Headers as a dictionary or list of (name, value) tuples.
+    :type headers: ``dict`` or ``list``
+
+    :param redacted_headers: Lower case names of the headers to redact.
+    :type redacted_headers: ``list`` of ``str``
+
+    :rtype: ``dict``
+    """
+    if redacted_headers is None:
+        redacted_headers = DEFAULT_REDACTED_HEADERS
+
+    if isinstance(headers, dict):
+        headers = headers.items()
+
+    result = {}
+
+    for name, value in headers:
+        if name.lower() in redacted_headers:
+            value = REDACTED_VALUE
+
+        result[name] = str(value)
+
+    return result
+
+
+def redact_url(url, redacted_fields=None):
+    """
+    Return the provided URL with values of the sensitive query parameters
+    replaced.
+
+    :param url: Request URL (path and query string).
+    :type url: ``str``
+
+    :param redacted_fields: Names of the query parameters to redact.
+    :type redacted_fields: ``list`` of ``str``
+
+    :rtype: ``str``
+    """
+    if '?' not in url:
+        return url
+
+    path, query = url.split('?', 1)
+    return '%s?%s' % (path, _redact_form_fields(query, redacted_fields))
+
+
+def redact_body(body, redacted_fields=None):
+    """
+    Return the provided (possibly truncated) body with values of the
+    sensitive JSON string and form encoded fields replaced.
+
+    :param body: Request or response body.
+    :type body: ``str``
+
+    :param redacted_fields: Names of the fields to redact.
+    :type redacted_fields: ``list`` of ``str``
+
+    :rtype: ``str``
+    """
+    pattern = _get_fields_pattern(redacted_fields)
+    regex = re.compile(r'("(?:%s)"\s*:\s*)"(?:[^"\\]|\\.)*"?' % (pattern),
+                       re.IGNORECASE)
+    body = regex.sub(r'\1"%s"' % (REDACTED_VALUE), body)
+    return _redact_form_fields(body, redacted_fields)
+
+
+def _redact_form_fields(data, redacted_fields=None):
+    pattern = _get_fields_pattern(redacted_fields)
+    regex = re.compile(r'(^|&)(%s)=[^&]*' % (pattern), re.IGNORECASE)
+    return regex.sub(r'\1\2=%s' % (REDACTED_VALUE), data)
+
+
+def _get_fields_pattern(redacted_fields=None):
+    if redacted_fields is None:
+        redacted_fields = DEFAULT_REDACTED_FIELDS
+
+    return '|'.join([re.escape(name) for name in redacted_fields])
+
+
+def _body_to_str(data, encoding=None):
+    """
+    Return (possibly truncated) body in a form which can be included in a
+    JSON record.
+    """
+    if encoding in ['gzip', 'x-gzip', 'zlib', 'deflate']:
+        wbits = zlib.MAX_WBITS
+
+        if encoding in ['gzip', 'x-gzip']:
+            wbits = 16 + zlib.MAX_WBITS
+
+        try:
+            # Body may be truncated so only decompress what is available
+            data = zlib.decompressobj(wbits).decompress(data)
+        except zlib.error:
+            return '<%d bytes of compressed data>' % (len(data))
+
+    return b(data).decode('utf-8', 'replace')
+
+
+class ResponseBodyTee(object):
+    """
+    Wrapper around ``httplib.HTTPResponse`` which copies the beginning of the
+    response body as it's read and logs the record once the whole body has
+    been consumed (or the response has been closed).
+
+    All the other attributes are proxied to the wrapped response.
+    """
+
+    def __init__(self, response, record, connection):
+        """
+        :param response: Wrapped response.
+        :type response: :class:`httplib.HTTPResponse`
+
+        :param record: Record with the request information.
+        :type record: ``dict``
+
+        :param connection: Connection which performed the request.
+        :type connection: :class:`StructuredLoggingConnection`
+        """
+        self._response = response
+        self._record = record
+        self._connection = connection
+
+        self._body = b('')
+        self._body_size = 0
+        self._logged = False
+
+    def read(self, amt=None):
+        if amt is None:
+            data = self._response.read()
+        else:
+            data = self._response.read(amt)
+
+        self._body_size += len(data)
+
+        if self._connection.log_bodies:
+            remaining = self._connection.max_body_size - len(self._body)
+
+            if remaining > 0 and data:
+                self._body += b(data[:remaining])
+
+        if amt is None or not data:
+            self._log()
+
+        return data
+
+    def close(self):
+        try:
+            return self._response.close()
+        finally:
+            self._log()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        data = self.read(CHUNK_SIZE)
+
+        if not data:
+            raise StopIteration
+
+        return data
+
+    next = __next__
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def _log(self):
+        if self._logged:
+            return
+
+        self._logged = True
+
+        headers = self._response.getheaders()
+        encoding = None
+
+        for name, value in headers:
+            if name.lower() == 'content-encoding':
+                encoding = value.lower()
+
+        record = self._record
+        record['duration'] = time.time() - record.pop('start_time')
+        connection = self._connection
+        record['response_body'] = None
+        record['response_body_size'] = self._body_size
+        record['response_body_truncated'] = False
+
+        if connection.log_bodies:
+            body = _body_to_str(self._body, encoding=encoding)
+            record['response_body'] = redact_body(
+                body, connection.redacted_fields)
+            record['response_body_truncated'] = (self._body_size >
+                                                 len(self._body))
+        self._connection._write_record(record)
+
+        self._body = None
+
+
+class StructuredLoggingConnection(object):
+    """
+    Debug class which logs all HTTP(s) requests as JSON records (one per
+    line).
+
+    :cvar log: file-like object that logs entries are written to.
+    :cvar sample_rate: Fraction (0.0 - 1.0) of requests which are logged.
+    :cvar always_log_errors: Log all requests which failed (status code >=
+                             400) regardless of the sample rate.
+    :cvar log_bodies: Log the request and response bodies. Bodies can
+                      contain credentials which aren't covered by
+                      ``redacted_fields``, so they are not logged by default.
+    :cvar max_body_size: Maximum number of request and response body bytes
+                         written to the log.
+    :cvar redacted_headers: Lower case names of the headers which values are
+                            redacted.
+    :cvar redacted_fields: Names of the query parameters and body fields
+                           which values are redacted.
+    """
+
+    log = None
+    sample_rate = 1.0
+    always_log_errors = True
+    log_bodies = False
+    max_body_size = DEFAULT_MAX_BODY_SIZE
+    redacted_headers = DEFAULT_REDACTED_HEADERS
+    redacted_fields = DEFAULT_REDACTED_FIELDS
+
+    _debug_record = None
+
+    def putrequest(self, method, url, *args, **kwargs):
+        if self.log is not None:
+            self._debug_record = {
+                'request_id': '%d:%d' % (id(self), int(time.time() * 1000)),
+                'protocol': self.protocol,
+                'host': self.host,
+                'port': self.port,
+                'method': method,
+                'url': redact_url(url, self.redacted_fields),
+                'request_headers': [],
+                'request_body': None,
+                'request_body_size': None,
+                'start_time': time.time()
+            }
+
+        return self._base_connection_class.putrequest(self, method, url,
+                                                      *args, **kwargs)
+
+    def putheader(self, header, *values):
+        if self._debug_record is not None:
+            value = ', '.join([str(item) for item in values])
+            self._debug_record['request_headers'].append((header, value))
+
+        return self._base_connection_class.putheader(self, header, *values)
+
+    def request(self, method, url, body=None, headers=None):
+        result = self._base_connection_class.request(self, method, url, body,
+                                                     headers or {})
+
+        if self._debug_record is not None and body is not None and \
+                hasattr(body, '__len__'):
+            record = self._debug_record
+            record['request_body_size'] = len(body)
+
+            if self.log_bodies:
+                record['request_body'] = redact_body(
+                    _body_to_str(body[:self.max_body_size]),
+                    self.redacted_fields)
+
+        return result
+
+    def getresponse(self):
+        response = self._base_connection_class.getresponse(self)
+        record = self._debug_record
+        self._debug_record = None
+
+        if self.log is None or record is None:
+            return response
+
+        failed = response.status >= httplib.BAD_REQUEST
+
+        if not (failed and self.always_log_errors) and \
+                random.random() >= self.sample_rate:
+            return response
+
+        record['request_headers'] = redact_headers(
+            record['request_headers'], self.redacted_headers)
+        record['first_byte'] = time.time() - record['start_time']
+        record['status'] = response.status
+        record['reason'] = response.reason
+        record['response_headers'] = redact_headers(response.getheaders(),
+                                                    self.redacted_headers)
+
+        return ResponseBodyTee(response=response, record=record,
+                               connection=self)
+
+    def _write_record(self, record):
+        line = json.dumps(record, sort_keys=True)
+
+        with _log_lock:
+            try:
+                self.log.write(line + '\n')
+                self.log.flush()
+            except Exception:
+                # Logging should never break the request
+                e = sys.exc_info()[1]
+                sys.stderr.write('Failed to write debug record: %s\n' %
+                                 (str(e)))
+
+
+class StructuredLoggingHTTPSConnection(StructuredLoggingConnection,
+                                       LibcloudHTTPSConnection):
+    """
+    Utility Class for structured logging of HTTPS connections
+    """
+
+    protocol = 'https'
+    _base_connection_class = LibcloudHTTPSConnection
+
+
+class StructuredLoggingHTTPConnection(StructuredLoggingConnection,
+                                      LibcloudHTTPConnection):
+    """
+    Utility Class for structured logging of HTTP connections
+    """
+
+    protocol = 'http'
+    _base_connection_class = LibcloudHTTPConnection
@@ -81,6 +81,14 @@ import logging
 import os
 import socket
 import sys
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # Advisory file locking is not available on this platform
+    fcntl = None
 
 from libcloud.utils.connection import get_response_object
 from libcloud.utils.py3 import b, httplib, urlencode, urlparse, PY3
@@ -103,6 +111,40 @@ except ImportError:
 
 TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
 
+# How many seconds before the token expiration time a background token
+# refresh is triggered. This way requests don't need to block on a token
+# request once the token has expired.
+TOKEN_REFRESH_AHEAD_SECONDS = 300
+
+# Timeout (in seconds) of the token requests
+TOKEN_REQUEST_TIMEOUT = 60
+
+# How long (in seconds) a connection waits for the token store lock which
+# is held by another thread or process while it requests a new token. Once
+# the timeout expires, the connection uses the store without the lock (and
+# possibly requests a token itself) so a stalled token request doesn't
+# block every process which shares the credential file.
+TOKEN_STORE_LOCK_TIMEOUT = TOKEN_REQUEST_TIMEOUT + 5
+
+# How often (in seconds) the token store lock is polled
+TOKEN_STORE_LOCK_POLL_INTERVAL = 0.05
+
+
+def _wait_for(func, deadline):
+    """
+    Call func until it returns True or the deadline (a time.time() value)
+    passes.
+
+    :rtype: ``bool``
+    """
+    while not func():
+        if time.time() >= deadline:
+            return False
+
+        time.sleep(TOKEN_STORE_LOCK_POLL_INTERVAL)
+
+    return True
+
 
 def _is_gce():
     http_code, http_reason, body = _get_gce_metadata()
@@ -283,6 +325,212 @@ class GoogleBaseDriver(object):
     name = "Google API"
 
 
+class GoogleTokenStore(object):
+    """
+    Store for the token information which is cached in a credential file.
+
+    A single store instance is shared by all the connections which use the
+    same credential file. Access to the file is protected with a lock (thread
+    lock and an advisory file lock on platforms which support it) so multiple
+    threads and processes don't overwrite each other's token. The lock is
+    waited for at most ``TOKEN_STORE_LOCK_TIMEOUT`` seconds. New token
+    information is written to a temporary file which is then atomically
+    renamed, so the file stays consistent even without the lock.
+    """
+
+    _stores = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, filename):
+        """
+        :param  filename: Absolute path to the credential file.
+        :type   filename: ``str``
+        """
+        self.filename = filename
+        self.lock_filename = filename + '.lock'
+
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_file = None
+        self._local = threading.local()
+
+    @classmethod
+    def get_store(cls, credential_file):
+        """
+        Return a store for the provided credential file.
+
+        :param  credential_file: Path to the credential file.
+        :type   credential_file: ``str``
+
+        :rtype: :class:`GoogleTokenStore`
+        """
+        filename = os.path.realpath(os.path.expanduser(credential_file))
+
+        with cls._stores_lock:
+            store = cls._stores.get(filename, None)
+
+            if store is None:
+                store = cls(filename=filename)
+                cls._stores[filename] = store
+
+        return store
+
+    def acquire(self, timeout=None):
+        """
+        Acquire the store lock.
+
+        :param  timeout: How long to wait for the lock (defaults to
+                         ``TOKEN_STORE_LOCK_TIMEOUT``).
+        :type   timeout: ``float``
+
+        :return: False if the lock (or the file lock) couldn't be acquired
+                 in time and the store is used without it.
+        :rtype: ``bool``
+        """
+        if timeout is None:
+            timeout = TOKEN_STORE_LOCK_TIMEOUT
+
+        deadline = time.time() + timeout
+        held = _wait_for(lambda: self._lock.acquire(False), deadline)
+        acquired = held
+
+        if held:
+            if self._lock_depth == 0 and fcntl:
+                self._lock_file, acquired = \
+                    self._lock_credential_file(deadline)
+
+            self._lock_depth += 1
+
+        if not acquired:
+            logger = logging.getLogger(__name__)
+            logger.warning('Timed out waiting for the lock of %s, using it '
+                           'without the lock', self.filename)
+
+        self._get_held_locks().append(held)
+        return acquired
+
+    def release(self):
+        if not self._get_held_locks().pop():
+            return
+
+        self._lock_depth -= 1
+
+        if self._lock_depth == 0 and self._lock_file:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+        self._lock.release()
+
+    def _lock_credential_file(self, deadline):
+        """
+        Lock the lock file with an exclusive advisory lock.
+
+        :return: (lock file or None if it's not locked, False if the lock
+                 timed out) tuple.
+        :rtype: ``tuple``
+        """
+        try:
+            lock_file = open(self.lock_filename, 'a')
+        except IOError:
+            # Directory is not writable, only use a thread lock
+            return None, True
+
+        def lock():
+            try:
+                fcntl.flock(lock_file.fileno(),
+                            fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except IOError:
+                e = sys.exc_info()[1]
+
+                if e.errno not in (errno.EAGAIN, errno.EACCES):
+                    raise e
+
+                return False
+
+            return True
+
+        try:
+            locked = _wait_for(lock, deadline)
+        except IOError:
+            # File system doesn't support locking, only use a thread lock
+            lock_file.close()
+            return None, True
+
+        if not locked:
+            lock_file.close()
+            return None, False
+
+        return lock_file, True
+
+    def _get_held_locks(self):
+        """
+        Return the stack of the acquire results of the current thread.
+        """
+        held_locks = getattr(self._local, 'held_locks', None)
+
+        if held_locks is None:
+            held_locks = self._local.held_locks = []
+
+        return held_locks
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.release()
+
+    def read(self):
+        """
+        Read token information from the credential file.
+
+        :return:  Token information dictionary, or None
+        :rtype:   ``dict`` or ``None``
+        """
+        with self:
+            try:
+                with open(self.filename, 'r') as f:
+                    data = f.read()
+            except IOError:
+                return None
+
+        try:
+            return json.loads(data)
+        except ValueError:
+            # Partially written file by an older version
+            return None
+
+    def write(self, token_info):
+        """
+        Atomically write token information to the credential file.
+
+        :param  token_info: Token information dictionary.
+        :type   token_info: ``dict``
+        """
+        data = json.dumps(token_info)
+        dirname = os.path.dirname(self.filename)
+        basename = os.path.basename(self.filename)
+
+        with self:
+            fd, tmp_filename = tempfile.mkstemp(prefix='.%s.' % (basename),
+                                                dir=dirname)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(data)
+
+                if hasattr(os, 'replace'):
+                    os.replace(tmp_filename, self.filename)
+                else:
+                    if os.name == 'nt' and os.path.exists(self.filename):
+                        os.remove(self.filename)
+                    os.rename(tmp_filename, self.filename)
+            except Exception:
+                if os.path.exists(tmp_filename):
+                    os.remove(tmp_filename)
+                raise
+
+
 class GoogleBaseAuthConnection(ConnectionUserAndKey):
     """
     Base class for Google Authentication.  Should be subclassed for specific
@@ -290,6 +538,7 @@ class GoogleBaseAuthConnection(ConnectionUserAndKey):
     """
     driver = GoogleBaseDriver
     responseCls = GoogleResponse
+    timeout = TOKEN_REQUEST_TIMEOUT
     name = 'Google Auth'
     host = 'accounts.google.com'
     auth_path = '/o/oauth2/auth'
@@ -595,6 +844,9 @@ class GoogleBaseConnection(ConnectionUserAndKey, PollingConnection):
         :type     scopes: ``list``
         """
         self.credential_file = credential_file or '~/.gce_libcloud_auth'
+        self.token_store = GoogleTokenStore.get_store(self.credential_file)
+        self._token_refresh_thread = None
+        self._token_refresh_failed = False
 
         if auth_type is None:
             # Try to guess.
@@ -614,8 +866,6 @@ class GoogleBaseConnection(ConnectionUserAndKey, PollingConnection):
                 'https://www.googleapis.com/auth/devstorage.full_control',
                 'https://www.googleapis.com/auth/ndev.clouddns.readwrite',
             ]
-        self.token_info = self._get_token_info_from_file()
-
         if auth_type == 'GCE':
             self.auth_conn = GoogleGCEServiceAcctAuthConnection(
                 user_id, self.scopes, **kwargs)
@@ -631,9 +881,14 @@ class GoogleBaseConnection(ConnectionUserAndKey, PollingConnection):
         else:
             raise GoogleAuthError('Invalid auth_type: %s' % str(auth_type))
 
-        if self.token_info is None:
-            self.token_info = self.auth_conn.get_new_token()
-            self._write_token_info_to_file()
+        # Hold the store lock so only one of the connections which share the
+        # same credential file requests a new token
+        with self.token_store:
+            self.token_info = self._get_token_info_from_file()
+
+            if self.token_info is None:
+                self.token_info = self.auth_conn.get_new_token()
+                self._write_token_info_to_file()
 
         self.token_expire_time = datetime.datetime.strptime(
             self.token_info['expire_time'], TIMESTAMP_FORMAT)
@@ -664,11 +919,19 @@ class GoogleBaseConnection(ConnectionUserAndKey, PollingConnection):
         @inherits: :class:`Connection.pre_connect_hook`
         """
         now = self._now()
-        if self.token_expire_time < now:
-            self.token_info = self.auth_conn.refresh_token(self.token_info)
-            self.token_expire_time = datetime.datetime.strptime(
-                self.token_info['expire_time'], TIMESTAMP_FORMAT)
-            self._write_token_info_to_file()
+        refresh_time = self.token_expire_time - datetime.timedelta(
+            seconds=TOKEN_REFRESH_AHEAD_SECONDS)
+
+        if self.token_expire_time < now or self._token_refresh_failed:
+            # Background refresh failed, retry it synchronously so the error
+            # is raised to the caller
+            self._token_refresh_failed = False
+            self._refresh_token_info()
+        elif refresh_time < now:
+            # Token is about to expire, refresh it in the background and
+            # keep using the current token in the mean time
+            self._refresh_token_info_in_background()
+
         headers['Authorization'] = 'Bearer %s' % (
             self.token_info['access_token'])
 
@@ -699,6 +962,64 @@ class GoogleBaseConnection(ConnectionUserAndKey, PollingConnection):
         # One more time, then give up.
         return super(GoogleBaseConnection, self).request(*args, **kwargs)
 
+    def _refresh_token_info(self):
+        """
+        Refresh the token, unless another connection or process which shares
+        the same credential file has already done so.
+        """
+        with self.token_store:
+            token_info = self._get_token_info_from_file()
+
+            if self._is_token_info_newer(token_info):
+                self.token_info = token_info
+            else:
+                self.token_info = self.auth_conn.refresh_token(
+                    self.token_info)
+                self._write_token_info_to_file()
+
+            self.token_expire_time = datetime.datetime.strptime(
+                self.token_info['expire_time'], TIMESTAMP_FORMAT)
+
+    def _refresh_token_info_in_background(self):
+        """
+        Refresh the token in a background thread. Only a single refresh
+        thread is started at a time.
+        """
+        thread = self._token_refresh_thread
+
+        if thread is not None and thread.is_alive():
+            return
+
+        thread = threading.Thread(target=self._refresh_token_info_in_thread)
+        thread.daemon = True
+        self._token_refresh_thread = thread
+        thread.start()
+
+    def _refresh_token_info_in_thread(self):
+        """
+        Target of the background refresh thread. A failed refresh is logged
+        and retried synchronously on the next request.
+        """
+        try:
+            self._refresh_token_info()
+        except Exception:
+            self._token_refresh_failed = True
+            logger = logging.getLogger(__name__)
+            logger.warning('Failed to refresh token in background',
+                           exc_info=True)
+
+    def _is_token_info_newer(self, token_info):
+        """
+        Return True if the provided token information expires later than the
+        token which is currently used by this connection.
+        """
+        if not token_info or 'expire_time' not in token_info:
+            return False
+
+        expire_time = datetime.datetime.strptime(token_info['expire_time'],
+                                                 TIMESTAMP_FORMAT)
+        return expire_time > self.token_expire_time
+
     def _get_token_info_from_file(self):
         """
         Read credential file and return token information.
@@ -706,25 +1027,13 @@ class GoogleBaseConnection(ConnectionUserAndKey, PollingConnection):
         :return:  Token information dictionary, or None
         :rtype:   ``dict`` or ``None``
         """
-        token_info = None
-        filename = os.path.realpath(os.path.expanduser(self.credential_file))
-
-        try:
-            with open(filename, 'r') as f:
-                data = f.read()
-            token_info = json.loads(data)
-        except IOError:
-            pass
-        return token_info
+        return self.token_store.read()
 
     def _write_token_info_to_file(self):
         """
         Write token_info to credential file.
         """
-        filename = os.path.realpath(os.path.expanduser(self.credential_file))
-        data = json.dumps(self.token_info)
-        with open(filename, 'w') as f:
-            f.write(data)
+        self.token_store.write(self.token_info)
 
     def has_completed(self, response):
         """
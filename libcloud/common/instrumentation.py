@@ -0,0 +1,142 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Lightweight instrumentation for the HTTP requests performed by the drivers.
+
+Observers are callables which are called with a :class:`RequestMetrics`
+instance after each request has completed. When no observer is registered,
+instrumentation has virtually no overhead.
+
+Example usage:
+
+    def observer(metrics):
+        histogram.observe(metrics.driver_name, metrics.operation,
+                          metrics.timings['total'])
+
+    register_observer(observer)
+"""
+
+import time
+import logging
+
+__all__ = [
+    'RequestMetrics',
+
+    'register_observer',
+    'unregister_observer',
+    'get_observers',
+    'notify_observers'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Registered observers. Observers are only added and removed by replacing the
+# whole list so it can be safely iterated over without a lock.
+_observers = []
+
+
+class RequestMetrics(object):
+    """
+    Metrics for a single HTTP request.
+
+    All the timings are in seconds. Timings which could not be measured (for
+    example, ``dns``, ``connect`` and ``tls`` when an existing connection is
+    re-used) are not present in the ``timings`` dictionary.
+
+    Available timings:
+
+    - ``dns`` - host name resolution
+    - ``connect`` - TCP connection establishment
+    - ``tls`` - TLS handshake
+    - ``first_byte`` - time between sending the request and receiving the
+      response status line and headers
+    - ``total`` - total time spent in ``Connection.request``
+    """
+
+    def __init__(self, driver_name, operation, method, action):
+        """
+        :param driver_name: Name of the driver which performed the request.
+        :type driver_name: ``str``
+
+        :param operation: Logical operation (``Action`` parameter for query
+                          based APIs such as EC2, request path otherwise).
+        :type operation: ``str``
+
+        :param method: HTTP method.
+        :type method: ``str``
+
+        :param action: Request path.
+        :type action: ``str``
+        """
+        self.driver_name = driver_name
+        self.operation = operation
+        self.method = method
+        self.action = action
+
+        self.host = None
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.from_cache = False
+        self.exception = None
+
+        self.timings = {}
+        self.start_time = time.time()
+
+    def __repr__(self):
+        return ('<RequestMetrics driver_name=%s, operation=%s, method=%s, '
+                'status=%s, timings=%s>' %
+                (self.driver_name, self.operation, self.method, self.status,
+                 self.timings))
+
+
+def register_observer(observer):
+    """
+    Register an observer which is called with a :class:`RequestMetrics`
+    instance after every request.
+
+    :param observer: Callable which accepts a single argument.
+    :type observer: ``callable``
+    """
+    global _observers
+    _observers = _observers + [observer]
+
+
+def unregister_observer(observer):
+    """
+    Unregister a previously registered observer.
+    """
+    global _observers
+    _observers = [item for item in _observers if item != observer]
+
+
+def get_observers():
+    """
+    :rtype: ``list`` of ``callable``
+    """
+    return _observers
+
+
+def notify_observers(metrics):
+    """
+    Call all the registered observers with the provided metrics. Exceptions
+    thrown by the observers are logged and never propagated to the caller.
+    """
+    for observer in _observers:
+        try:
+            observer(metrics)
+        except Exception:
+            LOG.exception('Request observer %r failed' % (observer))
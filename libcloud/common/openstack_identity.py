@@ -194,6 +194,11 @@ class OpenStackServiceCatalog(object):
                          key=lambda x: x.service_type + (x.service_name or ''))
         self._entries = entries  # stories all the service catalog entries
 
+        # Lookup indexes which are built once at parse time so endpoint
+        # resolution doesn't need to scan all the entries on every request
+        self._endpoints_index, self._regions_index = self._build_indexes(
+            entries=entries)
+
     def get_entries(self):
         """
         Return all the entries for this service catalog.
@@ -230,19 +235,8 @@ class OpenStackServiceCatalog(object):
 
         :rtype: ``list`` of :class:`.OpenStackServiceCatalogEntryEndpoint`
         """
-        endpoints = []
-
-        for entry in self._entries:
-            if service_type and entry.service_type != service_type:
-                continue
-
-            if name and entry.service_name != name:
-                continue
-
-            for endpoint in entry.endpoints:
-                endpoints.append(endpoint)
-
-        return endpoints
+        key = (service_type or None, name or None, None, None)
+        return list(self._endpoints_index.get(key, []))
 
     def get_endpoint(self, service_type=None, name=None, region=None,
                      endpoint_type=OpenStackIdentityEndpointType.EXTERNAL):
@@ -252,23 +246,9 @@ class OpenStackServiceCatalog(object):
         Note: If no or more than one matching endpoint is found, an exception
         is thrown.
         """
-        endpoints = []
-
-        for entry in self._entries:
-            if service_type and entry.service_type != service_type:
-                continue
-
-            if name and entry.service_name != name:
-                continue
-
-            for endpoint in entry.endpoints:
-                if region and endpoint.region != region:
-                    continue
-
-                if endpoint_type and endpoint.endpoint_type != endpoint_type:
-                    continue
-
-                endpoints.append(endpoint)
+        key = (service_type or None, name or None, region or None,
+               endpoint_type or None)
+        endpoints = self._endpoints_index.get(key, [])
 
         if len(endpoints) == 1:
             return endpoints[0]
@@ -287,17 +267,7 @@ class OpenStackServiceCatalog(object):
 
         :rtype: ``list`` of ``str``
         """
-        regions = set()
-
-        for entry in self._entries:
-            if service_type and entry.service_type != service_type:
-                continue
-
-            for endpoint in entry.endpoints:
-                if endpoint.region:
-                    regions.add(endpoint.region)
-
-        return sorted(list(regions))
+        return list(self._regions_index.get(service_type or None, []))
 
     def get_service_types(self, region=None):
         """
@@ -352,6 +322,52 @@ class OpenStackServiceCatalog(object):
 
         return sorted(list(names))
 
+    def _build_indexes(self, entries):
+        """
+        Build endpoint and region lookup indexes for the provided entries.
+
+        Each endpoint is stored under every combination of its
+        (service_type, service_name, region, endpoint_type) values where any
+        of the values can also be replaced with ``None`` which acts as a
+        wildcard. This way every ``get_endpoint`` / ``get_endpoints`` query
+        resolves to a single dictionary lookup.
+
+        :rtype: ``tuple`` of (``dict``, ``dict``)
+        """
+        endpoints_index = {}
+        regions_index = {}
+
+        for entry in entries:
+            for endpoint in entry.endpoints:
+                values = (entry.service_type or None,
+                          entry.service_name or None,
+                          endpoint.region or None,
+                          endpoint.endpoint_type or None)
+
+                keys = []
+                for mask in range(2 ** len(values)):
+                    key = tuple([value if mask & (1 << index) else None
+                                 for index, value in enumerate(values)])
+
+                    # Values which are None already act as a wildcard so
+                    # different masks can result in the same key
+                    if key not in keys:
+                        keys.append(key)
+
+                for key in keys:
+                    endpoints_index.setdefault(key, []).append(endpoint)
+
+                if endpoint.region:
+                    for service_type in set([None, entry.service_type]):
+                        regions = regions_index.setdefault(service_type,
+                                                           set())
+                        regions.add(endpoint.region)
+
+        for service_type, regions in regions_index.items():
+            regions_index[service_type] = sorted(list(regions))
+
+        return endpoints_index, regions_index
+
     def _parse_service_catalog_auth_v1(self, service_catalog):
         entries = []
 
@@ -0,0 +1,348 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Client side rate limiting which can be used with the :class:`Connection`
+class.
+
+The limiter is a token bucket which rate adapts to the provider responses.
+The rate is slowly increased while requests succeed and cut when the
+provider starts throttling (HTTP 429 and 503 responses). Throttled requests
+are retried with a jittered exponential backoff, ``Retry-After`` header is
+honored by all the connections which share the limiter.
+
+A 503 response doesn't guarantee that the request hasn't been processed, so
+by default it's only retried for idempotent (read-only) requests.
+
+Example usage:
+
+    limiter = get_rate_limiter('ec2-us-east-1', rate=20)
+    driver.connection.rate_limiter = limiter
+"""
+
+from __future__ import with_statement
+
+import time
+import random
+import threading
+
+from email.utils import parsedate_tz, mktime_tz
+
+from libcloud.utils.py3 import httplib
+
+__all__ = [
+    'AdaptiveRateLimiter',
+
+    'get_rate_limiter',
+    'parse_retry_after'
+]
+
+# Status codes which indicate that the client is sending too many requests
+# and the request hasn't been processed
+DEFAULT_RETRY_STATUSES = [429]
+
+# Status codes which indicate throttling, but the request may have been
+# processed, so only idempotent requests are retried
+DEFAULT_IDEMPOTENT_RETRY_STATUSES = [httplib.SERVICE_UNAVAILABLE]
+
+# Methods of the requests which can be safely sent again
+IDEMPOTENT_METHODS = ['GET', 'HEAD', 'OPTIONS']
+
+# Shared limiters keyed by name
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def parse_retry_after(value, now=None):
+    """
+    Parse value of the ``Retry-After`` header (either a number of seconds or
+    a HTTP date).
+
+    :param value: Header value.
+    :type value: ``str``
+
+    :return: Number of seconds to wait or None if the value is not valid.
+    :rtype: ``float``
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parsed = parsedate_tz(value)
+
+    if parsed is None:
+        return None
+
+    now = now or time.time()
+    return max(0.0, mktime_tz(parsed) - now)
+
+
+class AdaptiveRateLimiter(object):
+    """
+    Thread safe token bucket rate limiter which adapts its rate based on the
+    responses returned by the provider.
+
+    The same limiter can be (and should be) shared by all the connections
+    and threads talking to the same provider endpoint so they share the
+    request budget.
+    """
+
+    def __init__(self, rate=10.0, burst=None, min_rate=0.5, max_rate=None,
+                 increase_step=None, decrease_factor=0.5,
+                 retry_statuses=None, idempotent_retry_statuses=None,
+                 max_retries=5, backoff_base=0.5, backoff_max=30,
+                 deadline=300):
+        """
+        :param rate: Initial number of requests per second.
+        :type rate: ``float``
+
+        :param burst: Maximum number of requests which can be sent at once
+                      (bucket size). Defaults to the initial rate.
+        :type burst: ``int``
+
+        :param min_rate: Rate is never decreased below this value.
+        :type min_rate: ``float``
+
+        :param max_rate: Rate is never increased above this value (defaults
+                         to 10 times the initial rate).
+        :type max_rate: ``float``
+
+        :param increase_step: By how much the rate is increased per second of
+                              requests which haven't been throttled.
+                              Defaults to 5% of the initial rate.
+        :type increase_step: ``float``
+
+        :param decrease_factor: Rate is multiplied by this factor when a
+                                request is throttled.
+        :type decrease_factor: ``float``
+
+        :param retry_statuses: Status codes of the throttled responses
+                               which are retried for all the requests.
+        :type retry_statuses: ``list`` of ``int``
+
+        :param idempotent_retry_statuses: Status codes of the throttled
+                                          responses which are only retried
+                                          for idempotent requests.
+        :type idempotent_retry_statuses: ``list`` of ``int``
+
+        :param max_retries: Maximum number of times a throttled request is
+                            retried.
+        :type max_retries: ``int``
+
+        :param backoff_base: Base delay (in seconds) of the exponential
+                             backoff.
+        :type backoff_base: ``float``
+
+        :param backoff_max: Maximum backoff delay (in seconds).
+        :type backoff_max: ``float``
+
+        :param deadline: Maximum time (in seconds) spent retrying a single
+                         request. None means no limit.
+        :type deadline: ``float``
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, rate))
+        self.min_rate = min(float(min_rate), self.rate)
+        self.max_rate = float(max_rate or rate * 10)
+        self.increase_step = float(increase_step or rate * 0.05)
+        self.decrease_factor = decrease_factor
+        self.retry_statuses = retry_statuses or DEFAULT_RETRY_STATUSES
+
+        if idempotent_retry_statuses is None:
+            idempotent_retry_statuses = DEFAULT_IDEMPOTENT_RETRY_STATUSES
+
+        self.idempotent_retry_statuses = idempotent_retry_statuses
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+        self._blocked_until = 0
+        self._last_decrease = 0
+
+    def acquire(self):
+        """
+        Wait until a request can be sent.
+
+        :return: Number of seconds spent waiting.
+        :rtype: ``float``
+        """
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = self._refill()
+
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+
+                wait = max(self._blocked_until - now,
+                           (1 - self._tokens) / self.rate)
+
+            time.sleep(wait)
+            waited += wait
+
+    def is_throttled(self, status):
+        """
+        Return True if the response status code indicates that the request
+        has been throttled.
+
+        :rtype: ``bool``
+        """
+        return status in self.retry_statuses or \
+            status in self.idempotent_retry_statuses
+
+    def can_retry(self, status, method=None):
+        """
+        Return True if a throttled request with the provided method can be
+        retried.
+
+        :param method: HTTP method of the request (None if unknown).
+        :type method: ``str``
+
+        :rtype: ``bool``
+        """
+        if status in self.retry_statuses:
+            return True
+
+        return method is not None and \
+            method.upper() in IDEMPOTENT_METHODS
+
+    def on_success(self):
+        """
+        Record a request which hasn't been throttled.
+        """
+        with self._lock:
+            # Rate grows by increase_step per second of successful requests
+            self.rate = min(self.max_rate,
+                            self.rate + self.increase_step / self.rate)
+
+    def on_throttle(self, retry_after=None):
+        """
+        Record a throttled request.
+
+        :param retry_after: Number of seconds to wait before sending more
+                            requests.
+        :type retry_after: ``float``
+        """
+        with self._lock:
+            now = self._refill()
+
+            # Concurrent requests which have been throttled at the same time
+            # only decrease the rate once
+            if now - self._last_decrease >= 1.0 / self.rate:
+                self.rate = max(self.min_rate,
+                                self.rate * self.decrease_factor)
+                self._last_decrease = now
+
+            self._tokens = min(self._tokens, 0)
+
+            if retry_after:
+                self._blocked_until = max(self._blocked_until,
+                                          now + retry_after)
+
+    def get_backoff(self, attempt):
+        """
+        Return jittered ("full jitter") exponential backoff delay for the
+        provided attempt.
+
+        :rtype: ``float``
+        """
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, delay)
+
+    def get_retry_delay(self, status, retry_after=None, attempt=0,
+                        deadline=None, method=None):
+        """
+        Update the rate based on the response and return how long to wait
+        before retrying the request.
+
+        :param status: Response status code.
+        :type status: ``int``
+
+        :param retry_after: Value of the ``Retry-After`` header.
+        :type retry_after: ``str``
+
+        :param attempt: Number of times the request has already been retried.
+        :type attempt: ``int``
+
+        :param deadline: Time (timestamp) after which the request shouldn't
+                         be retried anymore.
+        :type deadline: ``float``
+
+        :param method: HTTP method of the request. Requests with an unknown
+                       method are treated as non-idempotent.
+        :type method: ``str``
+
+        :return: Delay in seconds or None if the request shouldn't be retried.
+        :rtype: ``float``
+        """
+        if not self.is_throttled(status):
+            self.on_success()
+            return None
+
+        retry_after = parse_retry_after(retry_after)
+        self.on_throttle(retry_after=retry_after)
+
+        if attempt >= self.max_retries or \
+                not self.can_retry(status=status, method=method):
+            return None
+
+        # Retry-After is enforced for all the requests by acquire()
+        delay = self.get_backoff(attempt)
+
+        if deadline is not None and \
+                time.time() + max(delay, retry_after or 0) > deadline:
+            return None
+
+        return delay
+
+    def _refill(self):
+        now = time.time()
+        elapsed = max(0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+        return now
+
+
+def get_rate_limiter(name, **kwargs):
+    """
+    Return a rate limiter shared by all the callers which use the same name
+    (e.g. provider and region). The limiter is created using the provided
+    arguments when it doesn't exist yet.
+
+    :param name: Limiter name.
+    :type name: ``str``
+
+    :rtype: :class:`AdaptiveRateLimiter`
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(name, None)
+
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(**kwargs)
+            _rate_limiters[name] = limiter
+
+    return limiter
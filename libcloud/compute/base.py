@@ -30,7 +30,7 @@ import binascii
 from libcloud.utils.py3 import b
 
 import libcloud.compute.ssh
-from libcloud.pricing import get_size_price
+from libcloud.pricing import get_size_price, get_size_prices
 from libcloud.compute.types import NodeState, StorageVolumeState,\
     DeploymentError
 from libcloud.compute.ssh import SSHClient
@@ -41,15 +41,11 @@ from libcloud.compute.ssh import have_paramiko
 
 from libcloud.utils.networking import is_private_subnet
 from libcloud.utils.networking import is_valid_ip_address
+from libcloud.utils.compact import intern_value, intern_extra, freeze_extra
+from libcloud.utils.compact import get_shared, get_shared_key
 
-if have_paramiko:
-    from paramiko.ssh_exception import SSHException
-    from paramiko.ssh_exception import AuthenticationException
-
-    SSH_TIMEOUT_EXCEPTION_CLASSES = (AuthenticationException, SSHException,
-                                     IOError, socket.gaierror, socket.error)
-else:
-    SSH_TIMEOUT_EXCEPTION_CLASSES = (IOError, socket.gaierror, socket.error)
+# paramiko exceptions are added by _get_ssh_timeout_exception_classes()
+SSH_TIMEOUT_EXCEPTION_CLASSES = (IOError, socket.gaierror, socket.error)
 
 # How long to wait for the node to come online after creating it
 NODE_ONLINE_WAIT_TIMEOUT = 10 * 60
@@ -73,17 +69,46 @@ __all__ = [
     'StorageVolumeState',
     'VolumeSnapshot',
 
+    'CompactNode',
+    'CompactNodeSize',
+    'CompactNodeImage',
+    'CompactStorageVolume',
+
     # Deprecated, moved to libcloud.utils.networking
     'is_private_subnet',
     'is_valid_ip_address'
 ]
 
 
+def _get_ssh_timeout_exception_classes():
+    """
+    Return exception classes on which connecting to the SSH server is
+    retried.
+
+    paramiko is only imported here (when a deployment is actually running)
+    because it's slow to import.
+    """
+    if not have_paramiko:
+        return SSH_TIMEOUT_EXCEPTION_CLASSES
+
+    try:
+        from paramiko.ssh_exception import SSHException
+        from paramiko.ssh_exception import AuthenticationException
+    except ImportError:
+        return SSH_TIMEOUT_EXCEPTION_CLASSES
+
+    return ((AuthenticationException, SSHException) +
+            SSH_TIMEOUT_EXCEPTION_CLASSES)
+
+
 class UuidMixin(object):
     """
     Mixin class for get_uuid function.
     """
 
+    # Empty so the compact (__slots__ based) classes don't get a __dict__
+    __slots__ = ()
+
     def __init__(self):
         self._uuid = None
 
@@ -632,6 +657,184 @@ class KeyPair(object):
                 (self.name, self.fingerprint, self.driver.name))
 
 
+class CompactNodeSize(UuidMixin):
+    """
+    Memory efficient variant of :class:`NodeSize`.
+
+    It uses ``__slots__`` instead of a per instance ``__dict__``, interns
+    the string attributes and stores ``extra`` as an immutable dictionary
+    which is shared between sizes with the same extra attributes.
+    """
+
+    __slots__ = ('id', 'name', 'ram', 'disk', 'bandwidth', 'price', 'driver',
+                 'extra', '_uuid', '__weakref__')
+
+    def __init__(self, id, name, ram, disk, bandwidth, price,
+                 driver, extra=None):
+        self.id = intern_value(str(id))
+        self.name = intern_value(name)
+        self.ram = ram
+        self.disk = disk
+        self.bandwidth = bandwidth
+        self.price = price
+        self.driver = driver
+        self.extra = freeze_extra(extra)
+        UuidMixin.__init__(self)
+
+    @classmethod
+    def from_size(cls, size):
+        """
+        :param size: Size to convert.
+        :type size: :class:`NodeSize`
+
+        :rtype: :class:`CompactNodeSize`
+        """
+        return cls(id=size.id, name=size.name, ram=size.ram, disk=size.disk,
+                   bandwidth=size.bandwidth, price=size.price,
+                   driver=size.driver, extra=size.extra)
+
+    # Methods are taken from the function objects so they also work on
+    # Python 2 where unbound methods check the type of "self"
+    __repr__ = NodeSize.__dict__['__repr__']
+
+
+class CompactNodeImage(UuidMixin):
+    """
+    Memory efficient variant of :class:`NodeImage`.
+
+    See :class:`CompactNodeSize` for details.
+    """
+
+    __slots__ = ('id', 'name', 'driver', 'extra', '_uuid', '__weakref__')
+
+    def __init__(self, id, name, driver, extra=None):
+        self.id = intern_value(str(id))
+        self.name = intern_value(name)
+        self.driver = driver
+        self.extra = freeze_extra(extra)
+        UuidMixin.__init__(self)
+
+    @classmethod
+    def from_image(cls, image):
+        """
+        :param image: Image to convert.
+        :type image: :class:`NodeImage`
+
+        :rtype: :class:`CompactNodeImage`
+        """
+        return cls(id=image.id, name=image.name, driver=image.driver,
+                   extra=image.extra)
+
+    __repr__ = NodeImage.__dict__['__repr__']
+
+
+class CompactNode(UuidMixin):
+    """
+    Memory efficient variant of :class:`Node` which is useful when a large
+    number of nodes is kept in memory.
+
+    It has the same public attributes and methods as :class:`Node`, but it
+    uses ``__slots__`` (no arbitrary attributes can be set) and interns the
+    extra dictionary keys and string values. Referenced sizes and images are
+    converted to :class:`CompactNodeSize` and :class:`CompactNodeImage`
+    objects which are shared by all the nodes referencing the same size or
+    image.
+    """
+
+    __slots__ = ('id', 'name', 'state', 'public_ips', 'private_ips', 'driver',
+                 'size', 'image', 'extra', '_uuid')
+
+    def __init__(self, id, name, state, public_ips, private_ips,
+                 driver, size=None, image=None, extra=None):
+        self.id = str(id) if id else None
+        self.name = name
+        self.state = state
+        self.public_ips = public_ips if public_ips else []
+        self.private_ips = private_ips if private_ips else []
+        self.driver = driver
+        self.size = _get_shared_compact(size, NodeSize,
+                                        CompactNodeSize.from_size,
+                                        ['id', 'name', 'ram', 'disk',
+                                         'bandwidth', 'price'])
+        self.image = _get_shared_compact(image, NodeImage,
+                                         CompactNodeImage.from_image,
+                                         ['id', 'name'])
+        self.extra = intern_extra(extra)
+        UuidMixin.__init__(self)
+
+    @classmethod
+    def from_node(cls, node):
+        """
+        :param node: Node to convert.
+        :type node: :class:`Node`
+
+        :rtype: :class:`CompactNode`
+        """
+        return cls(id=node.id, name=node.name, state=node.state,
+                   public_ips=node.public_ips, private_ips=node.private_ips,
+                   driver=node.driver, size=node.size, image=node.image,
+                   extra=node.extra)
+
+    reboot = Node.__dict__['reboot']
+    destroy = Node.__dict__['destroy']
+    __repr__ = Node.__dict__['__repr__']
+
+
+class CompactStorageVolume(UuidMixin):
+    """
+    Memory efficient variant of :class:`StorageVolume`.
+
+    See :class:`CompactNode` for details.
+    """
+
+    __slots__ = ('id', 'name', 'size', 'driver', 'extra', 'state', '_uuid')
+
+    def __init__(self, id, name, size, driver,
+                 state=None, extra=None):
+        self.id = id
+        self.name = name
+        self.size = size
+        self.driver = driver
+        self.extra = intern_extra(extra) if extra is not None else None
+        self.state = state
+        UuidMixin.__init__(self)
+
+    @classmethod
+    def from_volume(cls, volume):
+        """
+        :param volume: Volume to convert.
+        :type volume: :class:`StorageVolume`
+
+        :rtype: :class:`CompactStorageVolume`
+        """
+        return cls(id=volume.id, name=volume.name, size=volume.size,
+                   driver=volume.driver, state=volume.state,
+                   extra=volume.extra)
+
+    list_snapshots = StorageVolume.__dict__['list_snapshots']
+    attach = StorageVolume.__dict__['attach']
+    detach = StorageVolume.__dict__['detach']
+    snapshot = StorageVolume.__dict__['snapshot']
+    destroy = StorageVolume.__dict__['destroy']
+    __repr__ = StorageVolume.__dict__['__repr__']
+
+
+def _get_shared_compact(value, cls, factory, attributes):
+    """
+    Return a shared compact copy of the provided size or image.
+
+    Copy is only shared with the sizes or images which have the same values
+    of the provided attributes and the same extra dictionary, so e.g. an
+    image which only has an id doesn't replace the full image.
+    """
+    if not isinstance(value, cls):
+        return intern_value(value)
+
+    values = [getattr(value, name) for name in attributes]
+    key = get_shared_key(factory, value.driver, values, value.extra)
+    return get_shared(value, key, factory)
+
+
 class NodeDriver(BaseDriver):
     """
     A base NodeDriver class to derive from
@@ -662,6 +865,13 @@ class NodeDriver(BaseDriver):
 
     NODE_STATE_MAP = {}
 
+    # If True, drivers which support it return "extra" dictionaries which
+    # values are only parsed from the response when they are first accessed
+    # (see :class:`libcloud.utils.lazy.LazyDict`). Parsing errors are raised
+    # on access and the parsed response is kept in memory as long as the
+    # object is.
+    lazy_extra = False
+
     def __init__(self, key, secret=None, secure=True, host=None, port=None,
                  api_version=None, **kwargs):
         super(NodeDriver, self).__init__(key=key, secret=secret, secure=secure,
@@ -870,9 +1080,12 @@ class NodeDriver(BaseDriver):
                                    'public_ips', other option is 'private_ips'.
         :type ssh_interface: ``str``
         """
-        if not libcloud.compute.ssh.have_paramiko:
-            raise RuntimeError('paramiko is not installed. You can install ' +
-                               'it using pip: pip install paramiko')
+        ssh = libcloud.compute.ssh
+
+        if not ssh.have_paramiko or not ssh._is_paramiko_usable():
+            raise RuntimeError('paramiko is not installed (or can\'t be ' +
+                               'imported). You can install it using pip: ' +
+                               'pip install paramiko')
 
         if 'auth' in kwargs:
             auth = kwargs['auth']
@@ -1425,11 +1638,12 @@ class NodeDriver(BaseDriver):
         """
         start = time.time()
         end = start + timeout
+        exception_classes = _get_ssh_timeout_exception_classes()
 
         while time.time() < end:
             try:
                 ssh_client.connect()
-            except SSH_TIMEOUT_EXCEPTION_CLASSES:
+            except exception_classes:
                 e = sys.exc_info()[1]
                 message = str(e).lower()
                 expected_msg = 'no such file or directory'
@@ -1521,6 +1735,20 @@ class NodeDriver(BaseDriver):
                               driver_name=self.api_name,
                               size_id=size_id)
 
+    def _get_size_prices(self, size_ids):
+        """
+        Return pricing information for multiple size ids.
+
+        :rtype: ``dict``
+        :return: Dictionary where a key is a size id and a value is a price.
+
+        :raises KeyError: If there is no pricing for the driver or no price
+                          for one of the sizes.
+        """
+        return get_size_prices(driver_type='compute',
+                               driver_name=self.api_name,
+                               size_ids=size_ids)
+
 
 if __name__ == '__main__':
     import doctest
@@ -0,0 +1,145 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Indexed collection of node sizes which can be queried by the size
+attributes (e.g. "cheapest size with at least 4 GB of RAM").
+"""
+
+from bisect import bisect_left
+
+__all__ = [
+    'NodeSizeCatalog'
+]
+
+
+def _price_key(size):
+    # Sizes without a price are sorted last
+    return (size.price is None, size.price or 0, size.ram or 0, size.id)
+
+
+class NodeSizeCatalog(object):
+    """
+    Immutable collection of :class:`libcloud.compute.base.NodeSize` objects
+    indexed by id, price and RAM.
+
+    >>> from libcloud.compute.drivers.dummy import DummyNodeDriver
+    >>> catalog = NodeSizeCatalog(DummyNodeDriver(0).list_sizes())
+    >>> catalog.get_cheapest(min_ram=512).id
+    '2'
+    """
+
+    def __init__(self, sizes):
+        """
+        :param sizes: Sizes in the catalog.
+        :type sizes: ``list`` of :class:`libcloud.compute.base.NodeSize`
+        """
+        self.sizes = tuple(sizes)
+
+        self._by_id = dict([(size.id, size) for size in self.sizes])
+        self._by_price = sorted(self.sizes, key=_price_key)
+        self._by_ram = sorted(self.sizes, key=lambda size: size.ram or 0)
+        self._ram_keys = [size.ram or 0 for size in self._by_ram]
+
+    def __iter__(self):
+        return iter(self.sizes)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __contains__(self, size_id):
+        return size_id in self._by_id
+
+    def get(self, size_id, default=None):
+        """
+        Return size with the provided id.
+
+        :rtype: :class:`libcloud.compute.base.NodeSize`
+        """
+        return self._by_id.get(size_id, default)
+
+    def to_list(self):
+        """
+        Return a new list with all the sizes (in the original order).
+
+        :rtype: ``list`` of :class:`libcloud.compute.base.NodeSize`
+        """
+        return list(self.sizes)
+
+    def filter(self, min_ram=None, min_disk=None, min_cpus=None,
+               max_price=None):
+        """
+        Return sizes matching all the provided criteria ordered by price
+        (cheapest first, sizes without a price last).
+
+        :param min_ram: Minimum amount of RAM (in MB).
+        :type min_ram: ``int``
+
+        :param min_disk: Minimum disk size (in GB).
+        :type min_disk: ``int``
+
+        :param min_cpus: Minimum number of CPUs (``cpu`` extra attribute).
+                         Sizes without this attribute never match.
+        :type min_cpus: ``int``
+
+        :param max_price: Maximum price. Sizes without a price never match.
+        :type max_price: ``float``
+
+        :rtype: ``list`` of :class:`libcloud.compute.base.NodeSize`
+        """
+        if min_ram is not None:
+            candidates = self._by_ram[bisect_left(self._ram_keys, min_ram):]
+            candidates = sorted(candidates, key=_price_key)
+        else:
+            candidates = self._by_price
+
+        return [size for size in candidates if
+                self._matches(size, min_disk=min_disk, min_cpus=min_cpus,
+                              max_price=max_price)]
+
+    def get_cheapest(self, min_ram=None, min_disk=None, min_cpus=None,
+                     max_price=None):
+        """
+        Return the cheapest size matching all the provided criteria.
+
+        Takes the same arguments as :meth:`filter`.
+
+        :rtype: :class:`libcloud.compute.base.NodeSize` or ``None``
+        """
+        for size in self._by_price:
+            if min_ram is not None and (size.ram or 0) < min_ram:
+                continue
+
+            if self._matches(size, min_disk=min_disk, min_cpus=min_cpus,
+                             max_price=max_price):
+                return size
+
+        return None
+
+    def _matches(self, size, min_disk=None, min_cpus=None, max_price=None):
+        if min_disk is not None and (size.disk or 0) < min_disk:
+            return False
+
+        if min_cpus is not None:
+            cpus = (size.extra or {}).get('cpu', None)
+
+            if cpus is None or cpus < min_cpus:
+                return False
+
+        if max_price is not None:
+            if size.price is None or size.price > max_price:
+                return False
+
+        return True
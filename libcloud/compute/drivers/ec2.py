@@ -31,9 +31,12 @@ except ImportError:
 from libcloud.utils.py3 import b, basestring, ensure_string
 
 from libcloud.utils.xml import fixxpath, findtext, findattr, findall
+from libcloud.utils.xml import XPathExtractor
 from libcloud.utils.publickey import get_pubkey_ssh2_fingerprint
 from libcloud.utils.publickey import get_pubkey_comment
 from libcloud.utils.iso8601 import parse_date
+from libcloud.utils.lazy import LazyDict
+from libcloud.pricing import get_pricing
 from libcloud.common.aws import AWSBaseResponse, SignedAWSConnection
 from libcloud.common.aws import DEFAULT_SIGNATURE_VERSION
 from libcloud.common.types import (InvalidCredsError, MalformedResponseError,
@@ -42,6 +45,7 @@ from libcloud.compute.providers import Provider
 from libcloud.compute.base import Node, NodeDriver, NodeLocation, NodeSize
 from libcloud.compute.base import NodeImage, StorageVolume, VolumeSnapshot
 from libcloud.compute.base import KeyPair
+from libcloud.compute.catalog import NodeSizeCatalog
 from libcloud.compute.types import NodeState, KeyPairDoesNotExistError, \
     StorageVolumeState
 
@@ -1706,6 +1710,10 @@ RESOURCE_EXTRA_ATTRIBUTES_MAP = {
     }
 }
 
+# Compiled xpath extractors for the extra attribute mappings (keyed by id of
+# the mapping)
+_extra_dict_extractors = {}
+
 VALID_EC2_REGIONS = REGION_DETAILS.keys()
 VALID_EC2_REGIONS = [r for r in VALID_EC2_REGIONS if r != 'nimbus']
 
@@ -2107,6 +2115,9 @@ class BaseEC2NodeDriver(NodeDriver):
         'error_deleting': StorageVolumeState.ERROR
     }
 
+    # Size catalogs keyed by (region name, pricing driver name)
+    _size_catalogs = None
+
     def list_nodes(self, ex_node_ids=None, ex_filters=None):
         """
         List all nodes
@@ -2149,14 +2160,54 @@ class BaseEC2NodeDriver(NodeDriver):
         return nodes
 
     def list_sizes(self, location=None):
+        """
+        List sizes available in the driver region.
+
+        Sizes are only built once per region (and again when pricing data is
+        reloaded) so the returned :class:`NodeSize` objects are shared
+        between calls and shouldn't be modified.
+
+        @inherits: :class:`NodeDriver.list_sizes`
+        """
+        return self.ex_get_size_catalog(location=location).to_list()
+
+    def ex_get_size_catalog(self, location=None):
+        """
+        Return catalog of sizes available in the driver region which can be
+        queried by RAM, disk, CPU count and price.
+
+        :param      location: Unused, sizes are listed for the driver region.
+        :type       location: :class:`NodeLocation`
+
+        :rtype: :class:`libcloud.compute.catalog.NodeSizeCatalog`
+        """
+        key = (self.region_name, self.api_name)
+        pricing = get_pricing(driver_type='compute',
+                              driver_name=self.api_name)
+
+        if self._size_catalogs is None:
+            self._size_catalogs = {}
+
+        cached = self._size_catalogs.get(key, None)
+
+        # Catalog is rebuilt when pricing data has been reloaded
+        if cached is not None and cached[0] is pricing:
+            return cached[1]
+
+        catalog = NodeSizeCatalog(self._build_sizes())
+        self._size_catalogs[key] = (pricing, catalog)
+        return catalog
+
+    def _build_sizes(self):
         available_types = REGION_DETAILS[self.region_name]['instance_types']
         sizes = []
 
+        prices = self._get_size_prices(size_ids=available_types)
+
         for instance_type in available_types:
             attributes = INSTANCE_TYPES[instance_type]
             attributes = copy.deepcopy(attributes)
-            price = self._get_size_price(size_id=instance_type)
-            attributes.update({'price': price})
+            attributes.update({'price': prices[instance_type]})
             sizes.append(NodeSize(driver=self, **attributes))
         return sizes
 
@@ -4749,27 +4800,30 @@ class BaseEC2NodeDriver(NodeDriver):
         private_ip = findtext(element=element, xpath='privateIpAddress',
                               namespace=NAMESPACE)
         private_ips = [private_ip] if private_ip else []
-        product_codes = []
-        for p in findall(element=element,
-                         xpath="productCodesSet/item/productCode",
-                         namespace=NAMESPACE):
-            product_codes.append(p)
 
         # Get our tags
         tags = self._get_resource_tags(element)
         name = tags.get('Name', instance_id)
 
         # Get our extra dictionary
-        extra = self._get_extra_dict(
-            element, RESOURCE_EXTRA_ATTRIBUTES_MAP['node'])
+        mapping = RESOURCE_EXTRA_ATTRIBUTES_MAP['node']
+        extra = LazyDict()
+        extra.set_lazy_group(
+            mapping.keys(), lambda: self._get_extra_dict(element, mapping))
 
         # Add additional properties to our extra dictionary
-        extra['block_device_mapping'] = self._to_device_mappings(element)
-        extra['groups'] = self._get_security_groups(element)
-        extra['network_interfaces'] = self._to_interfaces(element)
-        extra['product_codes'] = product_codes
+        extra.set_lazy('block_device_mapping',
+                       lambda: self._to_device_mappings(element))
+        extra.set_lazy('groups', lambda: self._get_security_groups(element))
+        extra.set_lazy('network_interfaces',
+                       lambda: self._to_interfaces(element))
+        extra.set_lazy('product_codes',
+                       lambda: self._get_product_codes(element))
         extra['tags'] = tags
 
+        if not self.lazy_extra:
+            extra = extra.copy()
+
         return Node(id=instance_id, name=name, state=state,
                     public_ips=public_ips, private_ips=private_ips,
                     driver=self.connection.driver, extra=extra)
@@ -4784,19 +4838,19 @@ class BaseEC2NodeDriver(NodeDriver):
         id = findtext(element=element, xpath='imageId', namespace=NAMESPACE)
         name = findtext(element=element, xpath='name', namespace=NAMESPACE)
 
-        # Build block device mapping
-        block_device_mapping = self._to_device_mappings(element)
-
-        # Get our tags
-        tags = self._get_resource_tags(element)
-
         # Get our extra dictionary
-        extra = self._get_extra_dict(
-            element, RESOURCE_EXTRA_ATTRIBUTES_MAP['image'])
+        mapping = RESOURCE_EXTRA_ATTRIBUTES_MAP['image']
+        extra = LazyDict()
+        extra.set_lazy_group(
+            mapping.keys(), lambda: self._get_extra_dict(element, mapping))
 
         # Add our tags and block device mapping
-        extra['tags'] = tags
-        extra['block_device_mapping'] = block_device_mapping
+        extra.set_lazy('tags', lambda: self._get_resource_tags(element))
+        extra.set_lazy('block_device_mapping',
+                       lambda: self._to_device_mappings(element))
+
+        if not self.lazy_extra:
+            extra = extra.copy()
 
         return NodeImage(id=id, name=name, driver=self, extra=extra)
 
@@ -5456,11 +5510,12 @@ class BaseEC2NodeDriver(NodeDriver):
         :rtype: ``dict``
         """
         extra = {}
+        found = self._get_extra_dict_extractor(mapping).extract(element)
+
         for attribute, values in mapping.items():
             transform_func = values['transform_func']
-            value = findattr(element=element,
-                             xpath=values['xpath'],
-                             namespace=NAMESPACE)
+            value = found[values['xpath']]
+
             if value is not None:
                 extra[attribute] = transform_func(value)
             else:
@@ -5468,6 +5523,34 @@ class BaseEC2NodeDriver(NodeDriver):
 
         return extra
 
+    def _get_extra_dict_extractor(self, mapping):
+        """
+        Return (cached) extractor for all the xpaths in the provided extra
+        mapping.
+
+        :rtype: :class:`XPathExtractor`
+        """
+        # Mappings are module level constants so they are cached by identity
+        cached = _extra_dict_extractors.get(id(mapping), None)
+
+        if cached is not None and cached[0] is mapping:
+            return cached[1]
+
+        xpaths = [values['xpath'] for values in mapping.values()]
+        extractor = XPathExtractor(xpaths=xpaths, namespace=NAMESPACE)
+        _extra_dict_extractors[id(mapping)] = (mapping, extractor)
+        return extractor
+
+    def _get_product_codes(self, element):
+        """
+        Return product code elements for the provided instance element.
+
+        :rtype: ``list`` of :class:`xml.etree.ElementTree.Element`
+        """
+        return list(findall(element=element,
+                            xpath='productCodesSet/item/productCode',
+                            namespace=NAMESPACE))
+
     def _get_resource_tags(self, element):
         """
         Parse tags from the provided element and return a dictionary with
@@ -6104,9 +6187,9 @@ class OutscaleNodeDriver(BaseEC2NodeDriver):
         """
         raise NotImplementedError(self._not_implemented_msg)
 
-    def list_sizes(self, location=None):
+    def _build_sizes(self):
         """
-        List available instance flavors/sizes
+        Build available instance flavors/sizes
 
         This override the EC2 default method in order to use Outscale infos.
 
@@ -6116,11 +6199,12 @@ class OutscaleNodeDriver(BaseEC2NodeDriver):
             self.region_details[self.region_name]['instance_types']
         sizes = []
 
+        prices = self._get_size_prices(size_ids=available_types)
+
         for instance_type in available_types:
             attributes = OUTSCALE_INSTANCE_TYPES[instance_type]
             attributes = copy.deepcopy(attributes)
-            price = self._get_size_price(size_id=instance_type)
-            attributes.update({'price': price})
+            attributes.update({'price': prices[instance_type]})
             sizes.append(NodeSize(driver=self, **attributes))
         return sizes
 
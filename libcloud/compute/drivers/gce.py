@@ -34,6 +34,7 @@ from libcloud.compute.base import UuidMixin
 from libcloud.compute.providers import Provider
 from libcloud.compute.types import NodeState
 from libcloud.utils.iso8601 import parse_date
+from libcloud.utils.lazy import LazyDict
 
 API_VERSION = 'v1'
 DEFAULT_TASK_COMPLETION_TIMEOUT = 180
@@ -5248,12 +5249,12 @@ class GCENodeDriver(NodeDriver):
         """
         public_ips = []
         private_ips = []
-        extra = {}
+        extra = LazyDict()
 
         extra['status'] = node.get('status', "UNKNOWN")
         extra['statusMessage'] = node.get('statusMessage')
         extra['description'] = node.get('description')
-        extra['zone'] = self.ex_get_zone(node['zone'])
+        extra.set_lazy('zone', lambda: self.ex_get_zone(node['zone']))
         extra['image'] = node.get('image')
         extra['machineType'] = node.get('machineType')
         extra['disks'] = node.get('disks', [])
@@ -5270,12 +5271,8 @@ class GCENodeDriver(NodeDriver):
         extra['canIpForward'] = node.get('canIpForward')
         extra['serviceAccounts'] = node.get('serviceAccounts', [])
         extra['scheduling'] = node.get('scheduling', {})
-        extra['boot_disk'] = None
-
-        for disk in extra['disks']:
-            if disk.get('boot') and disk.get('type') == 'PERSISTENT':
-                bd = self._get_components_from_path(disk['source'])
-                extra['boot_disk'] = self.ex_get_volume(bd['name'], bd['zone'])
+        extra.set_lazy('boot_disk',
+                       lambda: self._get_boot_disk(extra['disks']))
 
         if 'items' in node['tags']:
             tags = node['tags']['items']
@@ -5303,11 +5300,34 @@ class GCENodeDriver(NodeDriver):
             extra['image'] = image
         size = self._get_components_from_path(node['machineType'])['name']
 
+        if not self.lazy_extra:
+            extra = extra.copy()
+
         return Node(id=node['id'], name=node['name'],
                     state=self.NODE_STATE_MAP[node['status']],
                     public_ips=public_ips, private_ips=private_ips,
                     driver=self, size=size, image=image, extra=extra)
 
+    def _get_boot_disk(self, disks):
+        """
+        Return the persistent boot disk from the list of the disks attached
+        to a node.
+
+        :param  disks: The list of dictionaries describing the attached disks.
+        :type   disks: ``list``
+
+        :return: StorageVolume object for the boot disk or None
+        :rtype: :class:`StorageVolume` or ``None``
+        """
+        boot_disk = None
+
+        for disk in disks:
+            if disk.get('boot') and disk.get('type') == 'PERSISTENT':
+                bd = self._get_components_from_path(disk['source'])
+                boot_disk = self.ex_get_volume(bd['name'], bd['zone'])
+
+        return boot_disk
+
     def _to_node_size(self, machine_type):
         """
         Return a Size object from the JSON-response dictionary.
@@ -41,6 +41,7 @@ from libcloud.common.openstack import OpenStackDriverMixin
 from libcloud.common.openstack import OpenStackException
 from libcloud.common.openstack import OpenStackResponse
 from libcloud.utils.networking import is_public_subnet
+from libcloud.utils.lazy import LazyDict
 from libcloud.compute.base import NodeSize, NodeImage
 from libcloud.compute.base import (NodeDriver, Node, NodeLocation,
                                    StorageVolume, VolumeSnapshot)
@@ -2085,6 +2086,38 @@ class OpenStack_1_1_NodeDriver(OpenStackNodeDriver):
         config_drive = api_node.get("config_drive", False)
         volumes_attached = api_node.get('os-extended-volumes:volumes_attached')
 
+        extra = LazyDict(
+            hostId=api_node['hostId'],
+            access_ip=api_node.get('accessIPv4'),
+            access_ipv6=api_node.get('accessIPv6', None),
+            # Docs says "tenantId", but actual is "tenant_id". *sigh*
+            # Best handle both.
+            tenantId=api_node.get('tenant_id') or api_node['tenantId'],
+            userId=api_node.get('user_id', None),
+            imageId=image_id,
+            flavorId=api_node['flavor']['id'],
+            metadata=api_node['metadata'],
+            password=api_node.get('adminPass', None),
+            created=api_node['created'],
+            updated=api_node['updated'],
+            key_name=api_node.get('key_name', None),
+            disk_config=api_node.get('OS-DCF:diskConfig', None),
+            config_drive=config_drive,
+            availability_zone=api_node.get('OS-EXT-AZ:availability_zone'),
+            volumes_attached=volumes_attached,
+            task_state=api_node.get("OS-EXT-STS:task_state", None),
+            vm_state=api_node.get("OS-EXT-STS:vm_state", None),
+            power_state=api_node.get("OS-EXT-STS:power_state", None),
+            progress=api_node.get("progress", None),
+            fault=api_node.get('fault')
+        )
+        extra.set_lazy('uri', lambda: next(link['href'] for link in
+                                           api_node['links'] if
+                                           link['rel'] == 'self'))
+
+        if not self.lazy_extra:
+            extra = extra.copy()
+
         return Node(
             id=api_node['id'],
             name=api_node['name'],
@@ -2093,33 +2126,7 @@ class OpenStack_1_1_NodeDriver(OpenStackNodeDriver):
             public_ips=public_ips,
             private_ips=private_ips,
             driver=self,
-            extra=dict(
-                hostId=api_node['hostId'],
-                access_ip=api_node.get('accessIPv4'),
-                access_ipv6=api_node.get('accessIPv6', None),
-                # Docs says "tenantId", but actual is "tenant_id". *sigh*
-                # Best handle both.
-                tenantId=api_node.get('tenant_id') or api_node['tenantId'],
-                userId=api_node.get('user_id', None),
-                imageId=image_id,
-                flavorId=api_node['flavor']['id'],
-                uri=next(link['href'] for link in api_node['links'] if
-                         link['rel'] == 'self'),
-                metadata=api_node['metadata'],
-                password=api_node.get('adminPass', None),
-                created=api_node['created'],
-                updated=api_node['updated'],
-                key_name=api_node.get('key_name', None),
-                disk_config=api_node.get('OS-DCF:diskConfig', None),
-                config_drive=config_drive,
-                availability_zone=api_node.get('OS-EXT-AZ:availability_zone'),
-                volumes_attached=volumes_attached,
-                task_state=api_node.get("OS-EXT-STS:task_state", None),
-                vm_state=api_node.get("OS-EXT-STS:vm_state", None),
-                power_state=api_node.get("OS-EXT-STS:power_state", None),
-                progress=api_node.get("progress", None),
-                fault=api_node.get('fault')
-            ),
+            extra=extra
         )
 
     def _to_volume(self, api_node):
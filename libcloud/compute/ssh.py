@@ -17,17 +17,12 @@
 Wraps multiple ways to communicate over SSH.
 """
 
-have_paramiko = False
-
-try:
-    import paramiko
-    have_paramiko = True
-except ImportError:
-    pass
-
+# paramiko is slow to import so it's only imported when ParamikoSSHClient is
+# used.
 # Depending on your version of Paramiko, it may cause a deprecation
 # warning on Python 2.6.
 # Ref: https://bugs.launchpad.net/paramiko/+bug/392973
+from libcloud import have_paramiko
 
 import os
 import time
@@ -230,6 +225,7 @@ class ParamikoSSHClient(BaseSSHClient):
 
         self.key_material = key_material
 
+        import paramiko
         self.client = paramiko.SSHClient()
         self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         self.logger = self._get_and_setup_logger()
@@ -442,6 +438,7 @@ class ParamikoSSHClient(BaseSSHClient):
         """
         Try to detect private key type and return paramiko.PKey object.
         """
+        import paramiko
 
         for cls in [paramiko.RSAKey, paramiko.DSSKey, paramiko.ECDSAKey]:
             try:
@@ -555,3 +552,27 @@ class MockSSHClient(BaseSSHClient):
 SSHClient = ParamikoSSHClient
 if not have_paramiko:
     SSHClient = MockSSHClient
+
+
+def _is_paramiko_usable():
+    """
+    Import paramiko and return True if it can be used.
+
+    When libcloud is imported, paramiko is only looked up (not imported), so
+    a broken installation (e.g. a missing cryptography backend) is detected
+    here. In that case the module falls back to the same client which is
+    used when paramiko is not installed.
+    """
+    global have_paramiko, SSHClient
+
+    if not have_paramiko:
+        return False
+
+    try:
+        import paramiko  # NOQA
+    except ImportError:
+        have_paramiko = False
+        SSHClient = MockSSHClient
+        return False
+
+    return True
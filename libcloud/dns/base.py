@@ -19,11 +19,13 @@ import datetime
 
 from libcloud import __version__
 from libcloud.common.base import ConnectionUserAndKey, BaseDriver
+from libcloud.utils.compact import intern_value, intern_extra
 from libcloud.dns.types import RecordType
 
 __all__ = [
     'Zone',
     'Record',
+    'CompactRecord',
     'DNSDriver'
 ]
 
@@ -144,6 +146,48 @@ class Record(object):
                  self.driver.name))
 
 
+class CompactRecord(object):
+    """
+    Memory efficient variant of :class:`Record` which is useful when a large
+    number of records is kept in memory.
+
+    It has the same public attributes and methods as :class:`Record`, but it
+    uses ``__slots__`` (no arbitrary attributes can be set) and interns the
+    repeated strings (record type, data and extra dictionary keys and string
+    values).
+    """
+
+    __slots__ = ('id', 'name', 'type', 'data', 'zone', 'driver', 'extra')
+
+    def __init__(self, id, name, type, data, zone, driver, extra=None):
+        self.id = str(id) if id else None
+        self.name = name
+        self.type = intern_value(type)
+        self.data = intern_value(data)
+        self.zone = zone
+        self.driver = driver
+        self.extra = intern_extra(extra)
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        :param record: Record to convert.
+        :type record: :class:`Record`
+
+        :rtype: :class:`CompactRecord`
+        """
+        return cls(id=record.id, name=record.name, type=record.type,
+                   data=record.data, zone=record.zone, driver=record.driver,
+                   extra=record.extra)
+
+    # Methods are taken from the function objects so they also work on
+    # Python 2 where unbound methods check the type of "self"
+    update = Record.__dict__['update']
+    delete = Record.__dict__['delete']
+    _get_numeric_id = Record.__dict__['_get_numeric_id']
+    __repr__ = Record.__dict__['__repr__']
+
+
 class DNSDriver(BaseDriver):
     """
     A base DNSDriver class to derive from
@@ -64,10 +64,11 @@ class GoogleDNSDriver(DNSDriver):
     }
 
     def __init__(self, user_id, key, project=None, auth_type=None, scopes=None,
-                 **kwargs):
+                 credential_file=None, **kwargs):
         self.auth_type = auth_type
         self.project = project
         self.scopes = scopes
+        self.credential_file = credential_file
         if not self.project:
             raise ValueError('Project name must be specified using '
                              '"project" keyword.')
@@ -341,7 +342,8 @@ class GoogleDNSDriver(DNSDriver):
     def _ex_connection_class_kwargs(self):
         return {'auth_type': self.auth_type,
                 'project': self.project,
-                'scopes': self.scopes}
+                'scopes': self.scopes,
+                'credential_file': self.credential_file}
 
     def _to_zones(self, response):
         zones = []
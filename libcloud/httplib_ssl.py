@@ -18,6 +18,7 @@ verification, depending on libcloud.security settings.
 """
 import os
 import sys
+import time
 import socket
 import ssl
 import base64
@@ -57,6 +58,10 @@ class LibcloudBaseConnection(object):
 
     http_proxy_used = False
 
+    # Dictionary into which DNS resolution, TCP connect and TLS handshake
+    # timings are recorded (None means timings are not recorded)
+    timings = None
+
     def set_http_proxy(self, proxy_url):
         """
         Set a HTTP proxy which will be used with this connection.
@@ -154,6 +159,63 @@ class LibcloudBaseConnection(object):
         self.sock = sock
         self._tunnel()  # pylint: disable=no-member
 
+    def _create_socket(self):
+        """
+        Create a socket connected to the remote host (or the proxy).
+
+        If ``timings`` is set, time spent resolving the host name and
+        establishing the TCP connection is recorded under the ``dns`` and
+        ``connect`` key.
+
+        :rtype: ``socket.socket``
+        """
+        # pylint: disable=no-member
+        address = (self.host, self.port)
+
+        if self.timings is None:
+            # use socket.create_connection (in 2.6+) if possible
+            if getattr(socket, 'create_connection', None):
+                return socket.create_connection(address, self.timeout)
+
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.connect(address)
+            return sock
+
+        start = time.time()
+        addresses = socket.getaddrinfo(address[0], address[1], 0,
+                                       socket.SOCK_STREAM)
+        self.timings['dns'] = time.time() - start
+
+        default_timeout = getattr(socket, '_GLOBAL_DEFAULT_TIMEOUT', None)
+        start = time.time()
+        error = None
+
+        for family, socktype, proto, _, sockaddr in addresses:
+            sock = None
+
+            try:
+                sock = socket.socket(family, socktype, proto)
+
+                if self.timeout is not default_timeout:
+                    sock.settimeout(self.timeout)
+
+                sock.connect(sockaddr)
+            except socket.error:
+                error = sys.exc_info()[1]
+
+                if sock is not None:
+                    sock.close()
+
+                continue
+
+            self.timings['connect'] = time.time() - start
+            return sock
+
+        if error is not None:
+            raise error
+
+        raise socket.error('getaddrinfo returns an empty list')
+
     def _set_hostport(self, host, port):
         """
         Backported from Python stdlib so Proxy support also works with
@@ -188,6 +250,15 @@ class LibcloudHTTPConnection(httplib.HTTPConnection, LibcloudBaseConnection):
         if proxy_url:
             self.set_http_proxy(proxy_url=proxy_url)
 
+    def connect(self):
+        if self.timings is None:
+            return httplib.HTTPConnection.connect(self)
+
+        self.sock = self._create_socket()
+
+        if getattr(self, '_tunnel_host', None):
+            self._tunnel()
+
 
 class LibcloudHTTPSConnection(httplib.HTTPSConnection, LibcloudBaseConnection):
     """
@@ -260,24 +331,23 @@ class LibcloudHTTPSConnection(httplib.HTTPSConnection, LibcloudBaseConnection):
             return httplib.HTTPSConnection.connect(self)
 
         # otherwise, create a connection and verify the hostname
-        # use socket.create_connection (in 2.6+) if possible
-        if getattr(socket, 'create_connection', None):
-            sock = socket.create_connection((self.host, self.port),
-                                            self.timeout)
-        else:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.connect((self.host, self.port))
+        sock = self._create_socket()
 
         # Activate the HTTP proxy
         if self.http_proxy_used:
             self._activate_http_proxy(sock=sock)
 
+        start = time.time()
         self.sock = ssl.wrap_socket(sock,
                                     self.key_file,
                                     self.cert_file,
                                     cert_reqs=ssl.CERT_REQUIRED,
                                     ca_certs=self.ca_cert,
                                     ssl_version=libcloud.security.SSL_VERSION)
+
+        if self.timings is not None:
+            self.timings['tls'] = time.time() - start
+
         cert = self.sock.getpeercert()
         try:
             match_hostname(cert, self.host)
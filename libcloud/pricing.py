@@ -19,6 +19,8 @@ A class which handles loading the pricing files.
 """
 
 import os.path
+import time
+import threading
 from os.path import join as pjoin
 
 try:
@@ -37,6 +39,7 @@ from libcloud.utils.connection import get_response_object
 __all__ = [
     'get_pricing',
     'get_size_price',
+    'get_size_prices',
     'set_pricing',
     'clear_pricing_data',
     'download_pricing_file'
@@ -57,6 +60,116 @@ PRICING_DATA = {
 
 VALID_PRICING_DRIVER_TYPES = ['compute', 'storage']
 
+# Pricing set using set_pricing. It's kept separately from the data loaded
+# from the pricing file so it takes precedence over the file and survives
+# reloading of a modified file.
+_pricing_overrides = {
+    'compute': {},
+    'storage': {}
+}
+
+# How often (in seconds) to check if the pricing file which the cached data
+# has been loaded from has changed
+PRICING_FILE_CHECK_INTERVAL = 10
+
+# Guards loading and invalidation of the pricing data. Lookups of the cached
+# data don't need a lock.
+_pricing_lock = threading.RLock()
+
+# Information about the pricing file which has been loaded into PRICING_DATA
+# (requested path, actual path, (mtime, size))
+_loaded_file = None
+
+# Parsed content of the last read pricing file ((path, (mtime, size)), data)
+_parsed_file = None
+
+# Last time the loaded pricing file has been checked for changes
+_last_check_time = 0
+
+
+def _get_file_stat(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    return (stat.st_mtime, stat.st_size)
+
+
+def _check_pricing_file():
+    """
+    Invalidate the cached pricing data if the pricing file it has been loaded
+    from has been modified (or a custom pricing file has been added or
+    removed).
+
+    The file is only checked every PRICING_FILE_CHECK_INTERVAL seconds.
+    """
+    global _last_check_time
+
+    now = time.time()
+
+    if _loaded_file is None or \
+            now - _last_check_time < PRICING_FILE_CHECK_INTERVAL:
+        return
+
+    with _pricing_lock:
+        _last_check_time = now
+        loaded_file = _loaded_file
+
+        if loaded_file is None:
+            return
+
+        requested_path, file_path, stat = loaded_file
+        current_path = requested_path or get_pricing_file_path()
+
+        if current_path != file_path or _get_file_stat(file_path) != stat:
+            _invalidate_file_pricing_data()
+
+
+def _read_pricing_file(file_path):
+    """
+    Return parsed content of the pricing file. Content of a file which has
+    already been read and hasn't been modified since isn't parsed again.
+
+    Needs to be called with _pricing_lock held.
+    """
+    global _parsed_file
+
+    stat = _get_file_stat(file_path)
+    key = (file_path, stat)
+
+    if _parsed_file is not None and _parsed_file[0] == key and \
+            stat is not None:
+        return _parsed_file[1]
+
+    with open(file_path) as fp:
+        content = fp.read()
+
+    pricing_data = json.loads(content)
+    _parsed_file = (key, pricing_data)
+    return pricing_data
+
+
+def _set_pricing_data(pricing_data, file_path, requested_path=None):
+    """
+    Populate PRICING_DATA with the content of the pricing file.
+
+    Needs to be called with _pricing_lock held.
+    """
+    global _loaded_file, _last_check_time
+
+    for driver_type in VALID_PRICING_DRIVER_TYPES:
+        # pylint: disable=maybe-no-member
+        pricing = pricing_data.get(driver_type, None)
+        if pricing:
+            # Copy so changes to the cache don't modify the parsed content
+            pricing = dict(pricing)
+            pricing.update(_pricing_overrides[driver_type])
+            PRICING_DATA[driver_type] = pricing
+
+    _loaded_file = (requested_path, file_path, _get_file_stat(file_path))
+    _last_check_time = time.time()
+
 
 def get_pricing_file_path(file_path=None):
     if os.path.exists(CUSTOM_PRICING_FILE_PATH) and \
@@ -88,23 +201,32 @@ def get_pricing(driver_type, driver_name, pricing_file_path=None):
     if driver_type not in VALID_PRICING_DRIVER_TYPES:
         raise AttributeError('Invalid driver type: %s', driver_type)
 
-    if driver_name in PRICING_DATA[driver_type]:
-        return PRICING_DATA[driver_type][driver_name]
+    _check_pricing_file()
 
-    if not pricing_file_path:
-        pricing_file_path = get_pricing_file_path(file_path=pricing_file_path)
+    pricing = PRICING_DATA[driver_type].get(driver_name, None)
 
-    with open(pricing_file_path) as fp:
-        content = fp.read()
+    if pricing is not None:
+        return pricing
 
-    pricing_data = json.loads(content)
-    size_pricing = pricing_data[driver_type][driver_name]
+    with _pricing_lock:
+        # Pricing could have been loaded by a different thread in the mean
+        # time
+        pricing = PRICING_DATA[driver_type].get(driver_name, None)
 
-    for driver_type in VALID_PRICING_DRIVER_TYPES:
-        # pylint: disable=maybe-no-member
-        pricing = pricing_data.get(driver_type, None)
-        if pricing:
-            PRICING_DATA[driver_type] = pricing
+        if pricing is not None:
+            return pricing
+
+        requested_path = pricing_file_path
+
+        if not pricing_file_path:
+            pricing_file_path = get_pricing_file_path(
+                file_path=pricing_file_path)
+
+        pricing_data = _read_pricing_file(file_path=pricing_file_path)
+        size_pricing = pricing_data[driver_type][driver_name]
+        _set_pricing_data(pricing_data=pricing_data,
+                          file_path=pricing_file_path,
+                          requested_path=requested_path)
 
     return size_pricing
 
@@ -123,7 +245,9 @@ def set_pricing(driver_type, driver_name, pricing):
     :param pricing: Dictionary where a key is a size ID and a value is a price.
     """
 
-    PRICING_DATA[driver_type][driver_name] = pricing
+    with _pricing_lock:
+        _pricing_overrides[driver_type][driver_name] = pricing
+        PRICING_DATA[driver_type][driver_name] = pricing
 
 
 def get_size_price(driver_type, driver_name, size_id):
@@ -148,12 +272,59 @@ def get_size_price(driver_type, driver_name, size_id):
     return price
 
 
+def get_size_prices(driver_type, driver_name, size_ids):
+    """
+    Return prices for multiple sizes. Pricing for the driver is only looked
+    up once.
+
+    :type driver_type: ``str``
+    :param driver_type: Driver type ('compute' or 'storage')
+
+    :type driver_name: ``str``
+    :param driver_name: Driver name
+
+    :type size_ids: ``list`` of ``str`` or ``int``
+    :param size_ids: Unique size IDs.
+
+    :rtype: ``dict``
+    :return: Dictionary where a key is a size ID and a value is a price.
+
+    :raises KeyError: If there is no price for one of the sizes (same as
+                      :func:`get_size_price`).
+    """
+    pricing = get_pricing(driver_type=driver_type, driver_name=driver_name)
+    prices = {}
+
+    for size_id in size_ids:
+        prices[size_id] = float(pricing[size_id])
+
+    return prices
+
+
 def invalidate_pricing_cache():
     """
     Invalidate pricing cache for all the drivers.
     """
-    PRICING_DATA['compute'] = {}
-    PRICING_DATA['storage'] = {}
+    with _pricing_lock:
+        for driver_type in VALID_PRICING_DRIVER_TYPES:
+            _pricing_overrides[driver_type] = {}
+
+        _invalidate_file_pricing_data()
+
+
+def _invalidate_file_pricing_data():
+    """
+    Invalidate the data loaded from the pricing file, but keep the pricing
+    set using set_pricing.
+    """
+    global _loaded_file, _parsed_file
+
+    with _pricing_lock:
+        for driver_type in VALID_PRICING_DRIVER_TYPES:
+            PRICING_DATA[driver_type] = dict(_pricing_overrides[driver_type])
+
+        _loaded_file = None
+        _parsed_file = None
 
 
 def clear_pricing_data():
@@ -176,8 +347,11 @@ def invalidate_module_pricing_cache(driver_type, driver_name):
     :type driver_name: ``str``
     :param driver_name: Driver name
     """
-    if driver_name in PRICING_DATA[driver_type]:
-        del PRICING_DATA[driver_type][driver_name]
+    with _pricing_lock:
+        _pricing_overrides[driver_type].pop(driver_name, None)
+
+        if driver_name in PRICING_DATA[driver_type]:
+            del PRICING_DATA[driver_type][driver_name]
 
 
 def download_pricing_file(file_url=DEFAULT_FILE_URL,
@@ -21,29 +21,44 @@ Provides base classes for working with storage
 from __future__ import with_statement
 
 import os.path                          # pylint: disable-msg=W0404
+import sys
+import copy
 import hashlib
+import calendar
+import threading
 from os.path import join as pjoin
+from email.utils import parsedate_tz, mktime_tz
 
 from libcloud.utils.py3 import httplib
 from libcloud.utils.py3 import next
 from libcloud.utils.py3 import b
 
 import libcloud.utils.files
+from libcloud.utils.iso8601 import parse_date, ParseError
+from libcloud.utils.compact import intern_value, intern_extra, get_shared
+from libcloud.utils.compact import get_shared_key
+from libcloud.utils.concurrency import iterate_mapped
 from libcloud.common.types import LibcloudError
 from libcloud.common.base import ConnectionUserAndKey, BaseDriver
-from libcloud.storage.types import ObjectDoesNotExistError
+from libcloud.storage.types import ObjectError, ObjectDoesNotExistError
 
 __all__ = [
     'Object',
     'Container',
     'StorageDriver',
 
+    'CompactObject',
+    'CompactContainer',
+
     'CHUNK_SIZE',
     'DEFAULT_CONTENT_TYPE'
 ]
 
 CHUNK_SIZE = 8096
 
+# Size of the chunks in which data staged in a temporary file is uploaded
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 # Default Content-Type which is sent when uploading an object if one is not
 # supplied and can't be detected when using non-strict mode.
 DEFAULT_CONTENT_TYPE = 'application/octet-stream'
@@ -176,6 +191,124 @@ class Container(object):
                 % (self.name, self.driver.name))
 
 
+class CompactContainer(object):
+    """
+    Memory efficient variant of :class:`Container`.
+
+    It uses ``__slots__`` instead of a per instance ``__dict__`` and interns
+    the extra dictionary keys and string values.
+    """
+
+    __slots__ = ('name', 'extra', 'driver', '__weakref__')
+
+    def __init__(self, name, extra, driver):
+        self.name = intern_value(name)
+        self.extra = intern_extra(extra)
+        self.driver = driver
+
+    @classmethod
+    def from_container(cls, container):
+        """
+        :param container: Container to convert.
+        :type container: :class:`Container`
+
+        :rtype: :class:`CompactContainer`
+        """
+        return cls(name=container.name, extra=container.extra,
+                   driver=container.driver)
+
+    # Methods are taken from the function objects so they also work on
+    # Python 2 where unbound methods check the type of "self"
+    iterate_objects = Container.__dict__['iterate_objects']
+    list_objects = Container.__dict__['list_objects']
+    get_cdn_url = Container.__dict__['get_cdn_url']
+    enable_cdn = Container.__dict__['enable_cdn']
+    get_object = Container.__dict__['get_object']
+    upload_object = Container.__dict__['upload_object']
+    upload_object_via_stream = Container.__dict__['upload_object_via_stream']
+    download_object = Container.__dict__['download_object']
+    download_object_as_stream = \
+        Container.__dict__['download_object_as_stream']
+    delete_object = Container.__dict__['delete_object']
+    delete = Container.__dict__['delete']
+    __repr__ = Container.__dict__['__repr__']
+
+
+class CompactObject(object):
+    """
+    Memory efficient variant of :class:`Object` which is useful when a large
+    number of objects is kept in memory.
+
+    It has the same public attributes and methods as :class:`Object`, but it
+    uses ``__slots__`` (no arbitrary attributes can be set) and interns the
+    extra and meta data keys and string values. The referenced container is
+    converted to a :class:`CompactContainer` which is shared by all the
+    objects in the same container.
+    """
+
+    __slots__ = ('name', 'size', 'hash', 'container', 'extra', 'meta_data',
+                 'driver')
+
+    def __init__(self, name, size, hash, extra, meta_data, container,
+                 driver):
+        self.name = name
+        self.size = size
+        self.hash = hash
+        self.container = _get_shared_container(container)
+        self.extra = intern_extra(extra)
+        self.meta_data = intern_extra(meta_data)
+        self.driver = driver
+
+    @classmethod
+    def from_object(cls, obj):
+        """
+        :param obj: Object to convert.
+        :type obj: :class:`Object`
+
+        :rtype: :class:`CompactObject`
+        """
+        return cls(name=obj.name, size=obj.size, hash=obj.hash,
+                   extra=obj.extra, meta_data=obj.meta_data,
+                   container=obj.container, driver=obj.driver)
+
+    get_cdn_url = Object.__dict__['get_cdn_url']
+    enable_cdn = Object.__dict__['enable_cdn']
+    download = Object.__dict__['download']
+    as_stream = Object.__dict__['as_stream']
+    delete = Object.__dict__['delete']
+    __repr__ = Object.__dict__['__repr__']
+
+
+def _get_shared_container(container):
+    """
+    Return a shared compact copy of the provided container.
+    """
+    if not isinstance(container, Container):
+        return container
+
+    key = get_shared_key(CompactContainer, container.driver,
+                         [container.name], container.extra)
+    return get_shared(container, key, CompactContainer.from_container)
+
+
+def _parse_md5_hash(value):
+    """
+    Return the lowercase MD5 hash from a (possibly quoted) hash value or None
+    if the value is not a MD5 hash.
+    """
+    value = (value or '').replace('"', '').lower()
+
+    if len(value) != 32:
+        return None
+
+    try:
+        int(value, 16)
+    except ValueError:
+        return None
+
+    return value
+
+
 class StorageDriver(BaseDriver):
     """
     A base StorageDriver to derive from.
@@ -186,10 +319,29 @@ class StorageDriver(BaseDriver):
     hash_type = 'md5'
     supports_chunked_encoding = False
 
+    # True if the driver implements download_object_range_as_stream
+    supports_range_downloads = False
+
+    # True if object hashes (Object.hash) returned by the driver are MD5
+    # hashes of the object content (and not e.g. opaque ETags)
+    content_md5_hash = False
+
+    # True if copy_object copies objects within the account server side
+    supports_server_side_copy = False
+
     # When strict mode is used, exception will be thrown if no content type is
     # provided and none can be detected when uploading an object
     strict_mode = False
 
+    # Maximum number of requests which are performed at the same time by the
+    # methods which operate on multiple objects (e.g. delete_objects)
+    concurrent_requests = 8
+
+    # Maximum size of the stream data which is buffered in memory when
+    # uploading a stream without chunked encoding. Larger streams are
+    # staged in a temporary file.
+    upload_buffer_memory_limit = 16 * 1024 * 1024
+
     def __init__(self, key, secret=None, secure=True, host=None, port=None,
                  **kwargs):
         super(StorageDriver, self).__init__(key=key, secret=secret,
@@ -282,6 +434,37 @@ class StorageDriver(BaseDriver):
         raise NotImplementedError(
             'get_object not implemented for this driver')
 
+    def get_objects(self, container, names):
+        """
+        Return objects (including their metadata) for multiple object names.
+
+        Drivers which can return object metadata in container listings use
+        them, other drivers fetch the objects concurrently using up to
+        ``concurrent_requests`` requests at the same time.
+
+        :param container: Container instance.
+        :type container: :class:`Container`
+
+        :param names: Object names.
+        :type names: ``list`` of ``str``
+
+        :return: A generator which yields an object or an error (an
+                 :class:`ObjectDoesNotExistError` if the object doesn't
+                 exist) for each name, in the same order as the names.
+        :rtype: ``generator`` of :class:`Object` or :class:`ObjectError`
+        """
+        def get_object(driver, name):
+            try:
+                return driver._get_container_object(container, name)
+            except ObjectError:
+                return sys.exc_info()[1]
+            except Exception:
+                e = sys.exc_info()[1]
+                return ObjectError(value=str(e), object_name=name,
+                                   driver=self)
+
+        return self._iterate_concurrently(get_object, list(names))
+
     def get_object_cdn_url(self, obj):
         """
         Return an object CDN URL.
@@ -360,6 +543,28 @@ class StorageDriver(BaseDriver):
         raise NotImplementedError(
             'download_object_as_stream not implemented for this driver')
 
+    def download_object_range_as_stream(self, obj, start_bytes,
+                                        end_bytes=None, chunk_size=None):
+        """
+        Return a generator which yields a range of the object data.
+
+        :param obj: Object instance
+        :type obj: :class:`Object`
+
+        :param start_bytes: Start byte offset (inclusive).
+        :type start_bytes: ``int``
+
+        :param end_bytes: End byte offset (exclusive). If not provided, data
+                          is read until the end of the object.
+        :type end_bytes: ``int``
+
+        :param chunk_size: Optional chunk size (in bytes).
+        :type chunk_size: ``int``
+        """
+        raise NotImplementedError(
+            'download_object_range_as_stream not implemented for this '
+            'driver')
+
     def upload_object(self, file_path, container, object_name, extra=None,
                       verify_hash=True, headers=None):
         """
@@ -448,6 +653,109 @@ class StorageDriver(BaseDriver):
         raise NotImplementedError(
             'delete_object not implemented for this driver')
 
+    def delete_objects(self, container, objects):
+        """
+        Delete multiple objects from the container.
+
+        Drivers which support deleting multiple objects using a single
+        request use it, other drivers delete the objects concurrently using
+        up to ``concurrent_requests`` requests at the same time.
+
+        Objects which don't exist are not reported as errors.
+
+        :param container: Container instance.
+        :type container: :class:`Container`
+
+        :param objects: Objects (or object names) to delete.
+        :type objects: ``list`` of :class:`Object` or ``str``
+
+        :return: Errors for the objects which couldn't be deleted keyed by
+                 the object name (empty if all the objects have been
+                 deleted).
+        :rtype: ``dict`` of ``str`` to :class:`ObjectError`
+        """
+        objects = self._get_objects_for_names(container, objects)
+
+        def delete_object(driver, obj):
+            try:
+                if not driver.delete_object(obj):
+                    return ObjectError(value='Failed to delete object',
+                                       object_name=obj.name, driver=self)
+            except ObjectDoesNotExistError:
+                pass
+            except Exception:
+                e = sys.exc_info()[1]
+                return ObjectError(value=str(e), object_name=obj.name,
+                                   driver=self)
+
+            return None
+
+        results = self._map_concurrently(delete_object, objects)
+        return dict([(obj.name, error) for obj, error in
+                     zip(objects, results) if error])
+
+    def copy_object(self, obj, destination_container,
+                    destination_object_name, extra=None):
+        """
+        Copy an object.
+
+        Drivers which support server side copy use it so the object data is
+        not transferred through this host. Otherwise (and when the
+        destination container belongs to a different provider or account)
+        the object is downloaded and uploaded again.
+
+        :param obj: Object to copy.
+        :type obj: :class:`Object`
+
+        :param destination_container: Container to copy the object to.
+        :type destination_container: :class:`Container`
+
+        :param destination_object_name: Name of the new object.
+        :type destination_object_name: ``str``
+
+        :param extra: Extra attributes of the new object (content_type,
+                      meta_data). If not provided, attributes of the copied
+                      object are used.
+        :type extra: ``dict``
+
+        :return: The new object.
+        :rtype: :class:`Object`
+        """
+        if extra is None:
+            extra = self._get_copy_extra(obj)
+
+        driver = destination_container.driver
+        iterator = self.download_object_as_stream(obj)
+        return driver.upload_object_via_stream(
+            iterator=iterator, container=destination_container,
+            object_name=destination_object_name, extra=extra)
+
+    def copy_objects(self, copies):
+        """
+        Copy multiple objects using up to ``concurrent_requests`` requests
+        at the same time.
+
+        :param copies: List of (object, destination container, destination
+                       object name) tuples.
+        :type copies: ``list`` of ``tuple``
+
+        :return: The new object or an error for each copy (in the same order
+                 as the copies).
+        :rtype: ``list`` of :class:`Object` or :class:`ObjectError`
+        """
+        def copy_object(driver, copy):
+            obj, destination_container, destination_object_name = copy
+
+            try:
+                return driver.copy_object(obj, destination_container,
+                                          destination_object_name)
+            except Exception:
+                e = sys.exc_info()[1]
+                return ObjectError(value=str(e), object_name=obj.name,
+                                   driver=self)
+
+        return self._map_concurrently(copy_object, list(copies))
+
     def create_container(self, container_name):
         """
         Create a new container.
@@ -636,12 +944,13 @@ class StorageDriver(BaseDriver):
                 upload_func_kwargs['chunked'] = True
             else:
                 # Chunked transfer encoding is not supported. Need to buffer
-                # all the data in memory so we can determine file size.
+                # all the data so we can determine file size.
                 iterator = libcloud.utils.files.read_in_chunks(
                     iterator=iterator)
-                data = libcloud.utils.files.exhaust_iterator(iterator=iterator)
+                data, file_size = libcloud.utils.files.stage_iterator(
+                    iterator=iterator,
+                    max_memory_size=self.upload_buffer_memory_limit)
 
-                file_size = len(data)
                 upload_func_kwargs['data'] = data
         else:
             file_size = os.path.getsize(file_path)
@@ -656,8 +965,16 @@ class StorageDriver(BaseDriver):
                                            headers=headers, raw=True)
 
         upload_func_kwargs['response'] = response
-        success, data_hash, bytes_transferred = upload_func(
-            **upload_func_kwargs)
+
+        try:
+            success, data_hash, bytes_transferred = upload_func(
+                **upload_func_kwargs)
+        finally:
+            data = upload_func_kwargs.get('data', None)
+
+            # Remove the temporary file with the staged data
+            if hasattr(data, 'close'):
+                data.close()
 
         if not success:
             raise LibcloudError(
@@ -674,8 +991,8 @@ class StorageDriver(BaseDriver):
         :param response: RawResponse object.
         :type response: :class:`RawResponse`
 
-        :param data: Data to upload.
-        :type data: ``str``
+        :param data: Data to upload (string or a file object).
+        :type data: ``str`` or ``file``
 
         :param calculate_hash: True to calculate hash of the transferred data.
                                (defaults to True).
@@ -686,6 +1003,10 @@ class StorageDriver(BaseDriver):
                  is the number of transferred bytes.
         :rtype: ``tuple``
         """
+        if hasattr(data, 'read'):
+            return self._upload_file_object(response, data,
+                                            calculate_hash=calculate_hash)
+
         bytes_transferred = 0
         data_hash = None
 
@@ -707,6 +1028,40 @@ class StorageDriver(BaseDriver):
 
         return True, data_hash, bytes_transferred
 
+    def _upload_file_object(self, response, file_object,
+                            calculate_hash=True):
+        """
+        Upload data from a file object (e.g. data staged in a temporary
+        file) in chunks.
+
+        :return: A tuple of (status, checksum, bytes transferred)
+        :rtype: ``tuple``
+        """
+        bytes_transferred = 0
+        data_hash = None
+
+        if calculate_hash:
+            data_hash = self._get_hash_function()
+
+        try:
+            data = file_object.read(UPLOAD_CHUNK_SIZE)
+
+            while data:
+                if calculate_hash:
+                    data_hash.update(data)
+
+                response.connection.connection.send(data)
+                bytes_transferred += len(data)
+                data = file_object.read(UPLOAD_CHUNK_SIZE)
+        except Exception:
+            # Timeout, etc. (consistent with _upload_data)
+            return False, None, bytes_transferred
+
+        if calculate_hash:
+            data_hash = data_hash.hexdigest()
+
+        return True, data_hash, bytes_transferred
+
     def _stream_data(self, response, iterator, chunked=False,
                      calculate_hash=True, chunk_size=None, data=None):
         """
@@ -835,3 +1190,352 @@ class StorageDriver(BaseDriver):
                                (self.hash_type))
 
         return func
+
+    def _get_standard_range_str(self, start_bytes, end_bytes=None):
+        """
+        Return value of the HTTP Range header for the provided byte range
+        (end_bytes is exclusive).
+
+        :rtype: ``str``
+        """
+        if end_bytes is None:
+            return 'bytes=%d-' % (start_bytes)
+
+        return 'bytes=%d-%d' % (start_bytes, end_bytes - 1)
+
+    def _get_upload_part_size(self, size):
+        """
+        Return size of the parts used to upload an object of the provided
+        size in parts (see :meth:`_initiate_part_upload`).
+
+        :return: Part size in bytes or None if the driver doesn't support
+                 uploading objects in parts.
+        :rtype: ``int``
+        """
+        return None
+
+    def _initiate_part_upload(self, container, object_name, extra=None):
+        """
+        Start an upload of an object which data is uploaded in parts. Parts
+        can be uploaded concurrently (each thread using its own driver copy)
+        and in any order.
+
+        :return: Upload state which is passed to the other part upload
+                 methods.
+        :rtype: ``dict``
+        """
+        raise NotImplementedError(
+            'uploading objects in parts is not supported by this driver')
+
+    def _upload_part(self, upload, part_number, data):
+        """
+        Upload a single part. Part numbers start at 1. Integrity of the data
+        is verified by the provider.
+
+        :return: Part token which is passed to
+                 :meth:`_complete_part_upload`.
+        """
+        raise NotImplementedError(
+            'uploading objects in parts is not supported by this driver')
+
+    def _complete_part_upload(self, upload, parts, size, data_hash=None):
+        """
+        Create the object from the uploaded parts.
+
+        :param parts: Part tokens ordered by the part number.
+        :type parts: ``list``
+
+        :param size: Object size.
+        :type size: ``int``
+
+        :param data_hash: MD5 hash (hex digest) of the object data if known.
+        :type data_hash: ``str``
+
+        :rtype: :class:`Object`
+        """
+        raise NotImplementedError(
+            'uploading objects in parts is not supported by this driver')
+
+    def _abort_part_upload(self, upload):
+        """
+        Discard the parts uploaded so far.
+        """
+        pass
+
+    def _get_objects_for_names(self, container, objects):
+        """
+        Return a list of Object instances for the provided objects and object
+        names.
+
+        :rtype: ``list`` of :class:`Object`
+        """
+        result = []
+
+        for obj in objects:
+            if not isinstance(obj, (Object, CompactObject)):
+                obj = Object(name=obj, size=None, hash=None, extra={},
+                             meta_data={}, container=container, driver=self)
+
+            result.append(obj)
+
+        return result
+
+    def _download_object_as_stream_if_changed(self, obj, data_hash,
+                                              chunk_size=None):
+        """
+        Return a stream of the object data unless the object hash is still
+        data_hash.
+
+        Drivers which support conditional requests use a single request with
+        an If-None-Match header. By default the current object metadata is
+        retrieved and its hash is compared first.
+
+        :param obj: Object instance.
+        :type obj: :class:`Object`
+
+        :param data_hash: Hash (ETag) of the object data the caller has. If
+                          None, the data is always returned.
+        :type data_hash: ``str``
+
+        :return: None if the object hasn't changed, otherwise a (hash of the
+                 current data, stream of the data, MD5 hash of the data or
+                 None if it's not known) tuple.
+        :rtype: ``tuple``
+        """
+        if data_hash is None and obj.hash:
+            return (obj.hash,
+                    self.download_object_as_stream(obj, chunk_size=chunk_size),
+                    self._get_content_md5_hash(obj))
+
+        current = self._get_container_object(obj.container, obj.name)
+
+        if current.hash == data_hash:
+            return None
+
+        return (current.hash,
+                self.download_object_as_stream(current, chunk_size=chunk_size),
+                self._get_content_md5_hash(current))
+
+    def _get_container_object(self, container, object_name):
+        """
+        Return an object from the provided container.
+
+        Drivers which can avoid looking up the container again override this
+        method.
+
+        :rtype: :class:`Object`
+        """
+        return self.get_object(container.name, object_name)
+
+    def _get_content_md5_hash(self, obj):
+        """
+        Return MD5 hash of the object content or None if it's not known (e.g.
+        objects uploaded using multipart upload or drivers which don't return
+        content based hashes).
+
+        :rtype: ``str``
+        """
+        value = (obj.extra or {}).get('md5_hash', None)
+
+        if not value and self.content_md5_hash:
+            value = obj.hash
+
+        return _parse_md5_hash(value)
+
+    def _get_modify_time(self, obj):
+        """
+        Return the last modification time of the object (as a UNIX
+        timestamp) or None if it's not known.
+
+        :rtype: ``float``
+        """
+        value = (obj.extra or {}).get('last_modified', None)
+
+        if not value:
+            return None
+
+        parsed = parsedate_tz(value)
+
+        if parsed is not None:
+            return float(mktime_tz(parsed))
+
+        try:
+            value = parse_date(value)
+        except ParseError:
+            return None
+
+        return calendar.timegm(value.utctimetuple()) + \
+            value.microsecond / 1e6
+
+    def _get_copy_extra(self, obj):
+        """
+        Return extra attributes for a copy of the provided object.
+
+        :rtype: ``dict``
+        """
+        extra = {'meta_data': dict(obj.meta_data or {})}
+        content_type = (obj.extra or {}).get('content_type', None)
+
+        if content_type:
+            extra['content_type'] = content_type
+
+        return extra
+
+    def _is_same_account(self, driver):
+        """
+        Return True if the provided driver uses the same provider account
+        (and endpoint) as this driver so objects can be copied server side.
+
+        :rtype: ``bool``
+        """
+        if driver is self:
+            return True
+
+        return (driver.__class__ is self.__class__ and
+                driver.key == self.key and
+                driver.connection.host == self.connection.host)
+
+    def _map_concurrently(self, func, items, workers=None):
+        """
+        Call ``func(driver, item)`` for each item using up to ``workers``
+        (defaults to ``concurrent_requests``) worker threads. Each worker
+        thread uses its own driver copy.
+
+        :return: Results in the same order as the items.
+        :rtype: ``list``
+        """
+        return list(self._iterate_concurrently(func, items, workers=workers))
+
+    def _iterate_concurrently(self, func, items, workers=None):
+        """
+        Same as :meth:`_map_concurrently`, but return a generator which
+        yields the results as soon as they (and all the results before them)
+        are available.
+
+        :rtype: ``generator``
+        """
+        workers = workers or self.concurrent_requests
+
+        if workers <= 1 or len(items) <= 1:
+            return (func(self, item) for item in items)
+
+        pool = self._get_worker_pool()
+
+        def process(item):
+            return func(pool.get_driver(), item)
+
+        return pool.iterate(iterate_mapped(items, process, workers=workers))
+
+    def _get_worker_pool(self):
+        """
+        Return a pool of driver copies for the worker threads of a single
+        concurrent operation.
+
+        :rtype: :class:`_WorkerDriverPool`
+        """
+        return _WorkerDriverPool(self)
+
+    def _get_worker_driver(self):
+        """
+        Return a copy of this driver which uses its own connection and can be
+        used by a worker thread.
+
+        Callers are responsible for closing the connection, prefer
+        :meth:`_get_worker_pool` which does it once the workers are done.
+
+        :rtype: :class:`StorageDriver`
+        """
+        driver = copy.copy(self)
+        driver.connection = self._get_worker_connection()
+        return driver
+
+    def _get_worker_connection(self):
+        """
+        Return a new connection which can be used by a worker thread.
+
+        Connection objects are not thread safe so each thread which performs
+        requests concurrently with other threads needs its own copy.
+
+        :rtype: :class:`libcloud.common.base.Connection`
+        """
+        connection = copy.copy(self.connection)
+        connection.connection = None
+        connection.context = dict(self.connection.context)
+        connection.connect()
+        return connection
+
+
+class _WorkerDriverPool(object):
+    """
+    Driver copies used by the worker threads of a single concurrent
+    operation.
+
+    Each worker thread gets its own copy (and connection) which is reused for
+    all the items the thread processes. Connections of all the copies are
+    closed by :meth:`close`.
+    """
+
+    def __init__(self, driver):
+        """
+        :param driver: Driver which is copied.
+        :type driver: :class:`StorageDriver`
+        """
+        self.driver = driver
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._drivers = []
+
+    def get_driver(self):
+        """
+        Return the driver copy of the current thread.
+
+        :rtype: :class:`StorageDriver`
+        """
+        driver = getattr(self._local, 'driver', None)
+
+        if driver is None:
+            driver = self.driver._get_worker_driver()
+            self._local.driver = driver
+
+            with self._lock:
+                self._drivers.append(driver)
+
+        return driver
+
+    def get_connection(self):
+        """
+        Return the connection of the current thread.
+
+        :rtype: :class:`libcloud.common.base.Connection`
+        """
+        return self.get_driver().connection
+
+    def close(self):
+        """
+        Close the connections of all the driver copies.
+        """
+        with self._lock:
+            drivers = self._drivers
+            self._drivers = []
+
+        for driver in drivers:
+            connection = driver.connection.connection
+
+            if connection is None:
+                continue
+
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def iterate(self, iterator):
+        """
+        Yield items of the provided iterator and close the connections once
+        it's exhausted (or the generator is closed).
+        """
+        try:
+            for item in iterator:
+                yield item
+        finally:
+            self.close()
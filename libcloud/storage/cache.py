@@ -0,0 +1,468 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Read-through cache of downloaded objects on the local disk.
+
+Example usage:
+
+    cache = DownloadCache('/var/cache/artifacts', max_size=10 * 1024 ** 3)
+    driver = CachedStorageDriver(S3StorageDriver(key, secret), cache)
+
+    obj = driver.get_object('builds', 'app.tar.gz')
+    driver.download_object(obj, '/tmp/app.tar.gz', overwrite_existing=True)
+
+Object data is stored keyed by the object hash (ETag), so objects with the
+same content are stored only once and an object which is requested again
+with the same hash is served from the local disk without any request. If
+the hash of the requested object is not known (e.g. the object has been
+created only from its name), data cached for the object name is revalidated
+with a conditional request. The least recently used data is removed when the
+size of the cache grows over its maximum size. If the driver returns MD5
+content hashes, downloaded data which doesn't match the hash is discarded.
+
+The cache relies on the object hash identifying the object content, so it
+shouldn't be used with drivers which don't return content based hashes
+(e.g. the local storage driver).
+"""
+
+from __future__ import with_statement
+
+import os
+import sys
+import time
+import errno
+import shutil
+import hashlib
+import tempfile
+import threading
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+from libcloud.utils.py3 import b
+from libcloud.utils.files import read_file_in_chunks
+from libcloud.common.types import LibcloudError
+from libcloud.storage.base import _parse_md5_hash
+from libcloud.storage.types import ObjectHashMismatchError
+
+__all__ = [
+    'DownloadCache',
+    'CachedStorageDriver'
+]
+
+# Default maximum size of the cached data (in bytes)
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+# Size of the chunks in which the downloaded data is written to the cache
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# How many times data is downloaded again if it's removed from the cache
+# (by another thread or process) before it's opened
+MAX_OPEN_ATTEMPTS = 3
+
+
+class DownloadCache(object):
+    """
+    Object data stored on the local disk.
+
+    Data is stored in files named by the object hash and an SQLite database
+    maps object names to the hash of their cached data and tracks the last
+    access time of each file. A single cache can be shared by multiple
+    drivers, threads and processes.
+    """
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+        """
+        :param path: Path to the cache directory (created if it doesn't
+                     exist).
+        :type path: ``str``
+
+        :param max_size: Maximum size of the cached data in bytes.
+        :type max_size: ``int``
+        """
+        if sqlite3 is None:
+            raise LibcloudError('sqlite3 module is not available')
+
+        self.path = path
+        self.max_size = max_size
+        self._blobs_path = os.path.join(path, 'blobs')
+        self._temp_path = os.path.join(path, 'tmp')
+
+        for folder in [self._blobs_path, self._temp_path]:
+            if not os.path.isdir(folder):
+                os.makedirs(folder)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.path.join(path, 'index.db'),
+                                           check_same_thread=False)
+        self._connection.create_function('blob_id', 2, self._get_blob_id)
+
+        with self._lock:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries (scope TEXT, '
+                'container TEXT, name TEXT, hash TEXT, '
+                'PRIMARY KEY (scope, container, name))')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS blobs (id TEXT PRIMARY KEY, '
+                'size INTEGER, access_time REAL)')
+            self._connection.commit()
+
+    def get_entry(self, scope, container_name, object_name):
+        """
+        Return the hash of the data cached for an object (or None).
+
+        :rtype: ``str``
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                'SELECT hash FROM entries WHERE scope = ? AND container = ? '
+                'AND name = ?', (scope, container_name, object_name))
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        return row[0]
+
+    def update_entry(self, scope, container_name, object_name, data_hash):
+        """
+        Set the hash of the data cached for an object.
+        """
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO entries (scope, container, name, '
+                'hash) VALUES (?, ?, ?, ?)',
+                (scope, container_name, object_name, data_hash))
+            self._connection.commit()
+
+    def get_data_path(self, scope, data_hash):
+        """
+        Return the path to the cached data with the provided hash (or None if
+        it's not cached) and mark the data as recently used.
+
+        :rtype: ``str``
+        """
+        blob_id = self._get_blob_id(scope, data_hash)
+        path = self._get_blob_path(blob_id)
+
+        with self._lock:
+            cursor = self._connection.execute(
+                'UPDATE blobs SET access_time = ? WHERE id = ?',
+                (time.time(), blob_id))
+            self._connection.commit()
+
+        if cursor.rowcount and os.path.isfile(path):
+            return path
+
+        return None
+
+    def store(self, scope, container_name, object_name, data_hash,
+              iterator, verify_hash=False):
+        """
+        Store object data.
+
+        :param iterator: An iterator which yields the object data.
+        :type iterator: ``object``
+
+        :param verify_hash: Verify that the MD5 hash of the data matches
+                            data_hash (if it's a MD5 hash). Data which
+                            doesn't match is not stored.
+        :type verify_hash: ``bool``
+
+        :return: Path to the cached data.
+        :rtype: ``str``
+        """
+        blob_id = self._get_blob_id(scope, data_hash)
+        path = self._get_blob_path(blob_id)
+        fd, temp_path = tempfile.mkstemp(dir=self._temp_path)
+        size = 0
+        expected_hash = None
+        md5_hash = hashlib.md5()
+
+        if verify_hash:
+            expected_hash = _parse_md5_hash(data_hash)
+
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                for data in iterator:
+                    fp.write(data)
+                    size += len(data)
+
+                    if expected_hash is not None:
+                        md5_hash.update(data)
+
+            if expected_hash is not None and \
+                    md5_hash.hexdigest() != expected_hash:
+                raise ObjectHashMismatchError(
+                    value='MD5 hash of the downloaded data does not match '
+                          'the object hash', object_name=object_name,
+                    driver=None)
+
+            if not os.path.isdir(os.path.dirname(path)):
+                try:
+                    os.makedirs(os.path.dirname(path))
+                except OSError:
+                    # Created by another thread or process
+                    pass
+
+            _replace_file(temp_path, path)
+        except:
+            exc_info = sys.exc_info()
+
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+            raise exc_info[1]
+
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO blobs (id, size, access_time) '
+                'VALUES (?, ?, ?)', (blob_id, size, time.time()))
+            self._connection.execute(
+                'INSERT OR REPLACE INTO entries (scope, container, name, '
+                'hash) VALUES (?, ?, ?, ?)',
+                (scope, container_name, object_name, data_hash))
+            self._connection.commit()
+
+        self._evict(keep=blob_id)
+        return path
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self, keep=None):
+        """
+        Remove the least recently used data until the size of the cache
+        doesn't exceed the maximum size.
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                'SELECT id, size FROM blobs ORDER BY access_time')
+            blobs = cursor.fetchall()
+            size = sum([blob_size for _, blob_size in blobs])
+            removed = []
+
+            for blob_id, blob_size in blobs:
+                if size <= self.max_size:
+                    break
+
+                if blob_id == keep:
+                    continue
+
+                try:
+                    os.remove(self._get_blob_path(blob_id))
+                except OSError:
+                    pass
+
+                removed.append((blob_id,))
+                size -= blob_size
+
+            if removed:
+                self._connection.executemany('DELETE FROM blobs WHERE id = ?',
+                                             removed)
+                self._connection.executemany(
+                    'DELETE FROM entries WHERE blob_id(scope, hash) = ?',
+                    removed)
+                self._connection.commit()
+
+    def _get_blob_id(self, scope, data_hash):
+        return hashlib.sha1(b('%s\0%s' % (scope, data_hash))).hexdigest()
+
+    def _get_blob_path(self, blob_id):
+        return os.path.join(self._blobs_path, blob_id[:2], blob_id)
+
+
+class CachedStorageDriver(object):
+    """
+    Storage driver wrapper which serves object downloads through a
+    :class:`DownloadCache`.
+
+    All the other methods and attributes are provided by the wrapped driver.
+    Note that objects returned by the wrapper belong to the wrapped driver,
+    so ``obj.download()`` and ``obj.as_stream()`` don't use the cache.
+    """
+
+    def __init__(self, driver, cache):
+        """
+        :param driver: Storage driver to wrap.
+        :type driver: :class:`StorageDriver`
+
+        :param cache: Cache used for the downloaded data.
+        :type cache: :class:`DownloadCache`
+        """
+        self.driver = driver
+        self.cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def download_object(self, obj, destination_path, overwrite_existing=False,
+                        delete_on_failure=True):
+        """
+        @inherits: :class:`StorageDriver.download_object`
+        """
+        base_name = os.path.basename(destination_path)
+
+        if not base_name and not os.path.exists(destination_path):
+            raise LibcloudError(
+                value='Path %s does not exist' % (destination_path),
+                driver=self.driver)
+
+        if not base_name:
+            file_path = os.path.join(destination_path, obj.name)
+        else:
+            file_path = destination_path
+
+        if os.path.exists(file_path) and not overwrite_existing:
+            raise LibcloudError(
+                value='File %s already exists, but ' % (file_path) +
+                'overwrite_existing=False',
+                driver=self.driver)
+
+        fp, stream = self._open_object_data(obj)
+
+        try:
+            if fp is not None:
+                with fp:
+                    with open(file_path, 'wb') as destination:
+                        shutil.copyfileobj(fp, destination)
+            else:
+                # Data can't be cached, save the downloaded stream
+                with open(file_path, 'wb') as fp:
+                    for data in stream:
+                        fp.write(data)
+        except EnvironmentError:
+            if delete_on_failure:
+                try:
+                    os.unlink(file_path)
+                except Exception:
+                    pass
+            return False
+
+        return True
+
+    def download_object_as_stream(self, obj, chunk_size=None):
+        """
+        @inherits: :class:`StorageDriver.download_object_as_stream`
+
+        Cached data is read using a memory map.
+        """
+        fp, stream = self._open_object_data(obj, chunk_size=chunk_size)
+
+        if fp is None:
+            return stream
+
+        return read_file_in_chunks(fp, chunk_size=chunk_size)
+
+    def _open_object_data(self, obj, chunk_size=None):
+        """
+        Same as :meth:`_get_object_data`, but return the cached data opened
+        for reading instead of its path.
+
+        Data which is removed from the cache before it's opened is downloaded
+        again.
+        """
+        for _ in range(0, MAX_OPEN_ATTEMPTS):
+            path, stream = self._get_object_data(obj, chunk_size=chunk_size)
+
+            if path is None:
+                return None, stream
+
+            try:
+                return open(path, 'rb'), None
+            except EnvironmentError:
+                e = sys.exc_info()[1]
+
+                if e.errno != errno.ENOENT:
+                    raise e
+
+        raise LibcloudError('Cached data of object %s was removed before it '
+                            'could be read' % (obj.name), driver=self.driver)
+
+    def _get_object_data(self, obj, chunk_size=None):
+        """
+        Return a (path to the cached data, stream) tuple for an object.
+
+        Data is downloaded and stored in the cache if needed. Stream is only
+        returned (and path is None) if the data can't be cached because its
+        hash is not known.
+        """
+        scope = self._get_scope()
+        container_name = obj.container.name
+
+        if obj.hash:
+            path = self.cache.get_data_path(scope, obj.hash)
+
+            if path is not None:
+                self.cache.update_entry(scope, container_name, obj.name,
+                                        obj.hash)
+                return path, None
+
+        # If the object hash is not known, revalidate the data cached for
+        # the object name
+        cached_hash = None
+        path = None
+
+        if not obj.hash:
+            cached_hash = self.cache.get_entry(scope, container_name,
+                                               obj.name)
+
+        if cached_hash is not None:
+            path = self.cache.get_data_path(scope, cached_hash)
+
+        if path is None:
+            cached_hash = None
+
+        result = self.driver._download_object_as_stream_if_changed(
+            obj, cached_hash, chunk_size=chunk_size or DOWNLOAD_CHUNK_SIZE)
+
+        if result is None:
+            return path, None
+
+        data_hash, stream, md5_hash = result
+
+        if not data_hash:
+            return None, stream
+
+        path = self.cache.store(scope, container_name, obj.name, data_hash,
+                                stream, verify_hash=md5_hash is not None)
+        return path, None
+
+    def _get_scope(self):
+        # Different accounts can have different objects with the same names
+        return '%s:%s@%s' % (self.driver.name, self.driver.key,
+                             self.driver.connection.host)
+
+
+def _replace_file(source_path, destination_path):
+    """
+    Atomically move a file in place of the destination file.
+    """
+    replace = getattr(os, 'replace', None)
+
+    if replace is not None:
+        replace(source_path, destination_path)
+        return
+
+    if os.name == 'nt' and os.path.exists(destination_path):
+        os.remove(destination_path)
+
+    os.rename(source_path, destination_path)
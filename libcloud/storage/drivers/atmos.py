@@ -38,7 +38,7 @@ from libcloud.common.types import LibcloudError
 from libcloud.storage.base import Object, Container, StorageDriver, CHUNK_SIZE
 from libcloud.storage.types import ContainerAlreadyExistsError, \
     ContainerDoesNotExistError, ContainerIsNotEmptyError, \
-    ObjectDoesNotExistError
+    ObjectError, ObjectDoesNotExistError
 
 
 def collapse(s):
@@ -124,6 +124,8 @@ class AtmosDriver(StorageDriver):
     path = None
     api_name = 'atmos'
     supports_chunked_encoding = True
+    # Hashes are MD5 hashes of the content stored in the object meta data
+    content_md5_hash = True
     website = 'http://atmosonline.com/'
     name = 'atmos'
 
@@ -182,8 +184,12 @@ class AtmosDriver(StorageDriver):
 
     def get_object(self, container_name, object_name):
         container = self.get_container(container_name)
+        return self._get_container_object(container, object_name)
+
+    def _get_container_object(self, container, object_name):
         object_name_cleaned = self._clean_object_name(object_name)
-        path = self._namespace_path(container_name) + '/' + object_name_cleaned
+        path = self._namespace_path(container.name) + '/' + \
+            object_name_cleaned
 
         try:
             result = self.connection.request(path + '?metadata/system')
@@ -197,6 +203,87 @@ class AtmosDriver(StorageDriver):
                 raise
             raise ObjectDoesNotExistError(e, self, object_name)
 
+        return self._to_object(object_name, system_meta, user_meta, container)
+
+    def get_objects(self, container, names):
+        """
+        @inherits: :class:`StorageDriver.get_objects`
+
+        Metadata of the objects is retrieved by listing the directories which
+        contain them (one request per directory instead of two requests per
+        object).
+        """
+        names = list(names)
+        directories = []
+        seen = set()
+
+        for name in names:
+            directory = name[:name.rfind('/') + 1]
+
+            if directory not in seen:
+                seen.add(directory)
+                directories.append(directory)
+
+        def list_directory(driver, directory):
+            try:
+                return dict([(entry['name'], entry) for entry in
+                             driver._iterate_directory(container, directory)])
+            except Exception:
+                return sys.exc_info()[1]
+
+        # Directories are listed concurrently, in the order in which they
+        # are needed
+        listings = self._iterate_concurrently(list_directory, directories)
+        entries = {}
+
+        for name in names:
+            directory = name[:name.rfind('/') + 1]
+
+            if directory not in entries:
+                entries[directory] = next(listings)
+
+            yield self._get_listed_object(container, name,
+                                          entries[directory])
+
+    def _get_listed_object(self, container, name, entries):
+        """
+        Return an object from a directory listing (or an error for it).
+        """
+        if isinstance(entries, AtmosError) and entries.code == 1003:
+            return ObjectDoesNotExistError(entries, self, name)
+        elif isinstance(entries, Exception):
+            return ObjectError(value=str(entries), object_name=name,
+                               driver=self)
+
+        entry = entries.get(name[name.rfind('/') + 1:], None)
+
+        if entry is None or entry['type'] != 'regular':
+            return ObjectDoesNotExistError(None, self, name)
+
+        if self._has_object_meta(entry):
+            return self._to_object(name, entry['system_meta'],
+                                   entry['user_meta'], container)
+
+        # Metadata is not included in the listing
+        try:
+            return self._get_container_object(container, name)
+        except ObjectError:
+            return sys.exc_info()[1]
+        except Exception:
+            return ObjectError(value=str(sys.exc_info()[1]), object_name=name,
+                               driver=self)
+
+    def _has_object_meta(self, entry):
+        """
+        Return True if a directory listing entry includes the metadata
+        needed to create an object.
+        """
+        system_meta = entry['system_meta'] or {}
+        return (entry['user_meta'] is not None and
+                'objectid' in system_meta and 'size' in system_meta and
+                'mtime' in system_meta)
+
+    def _to_object(self, name, system_meta, user_meta, container):
         last_modified = time.strptime(system_meta['mtime'],
                                       '%Y-%m-%dT%H:%M:%SZ')
         last_modified = time.strftime('%a, %d %b %Y %H:%M:%S GMT',
@@ -205,8 +292,9 @@ class AtmosDriver(StorageDriver):
             'object_id': system_meta['objectid'],
             'last_modified': last_modified
         }
+        user_meta = dict(user_meta)
         data_hash = user_meta.pop('md5', '')
-        return Object(object_name, int(system_meta['size']), data_hash, extra,
+        return Object(name, int(system_meta['size']), data_hash, extra,
                       user_meta, container, self)
 
     def upload_object(self, file_path, container, object_name, extra=None,
@@ -438,10 +526,48 @@ class AtmosDriver(StorageDriver):
             entries.append({
                 'id': entry.find(self._emc_tag('ObjectID')).text,
                 'type': file_type,
-                'name': entry.find(self._emc_tag('Filename')).text
+                'name': entry.find(self._emc_tag('Filename')).text,
+                'system_meta': self._emc_meta_list(
+                    entry.find(self._emc_tag('SystemMetadataList'))),
+                'user_meta': self._emc_meta_list(
+                    entry.find(self._emc_tag('UserMetadataList')))
             })
         return entries
 
+    def _emc_meta_list(self, element):
+        """
+        Return metadata from a metadata list element of a directory listing
+        (or None if the listing doesn't include it).
+        """
+        if element is None:
+            return None
+
+        meta = {}
+        for item in element.findall(self._emc_tag('Metadata')):
+            value = item.find(self._emc_tag('Value')).text
+            meta[item.find(self._emc_tag('Name')).text] = value or ''
+        return meta
+
+    def _iterate_directory(self, container, directory):
+        """
+        Return a generator of the entries (including their metadata) of a
+        directory in the container, following the listing pagination.
+        """
+        headers = {'x-emc-include-meta': '1'}
+        path = self._namespace_path(container.name) + '/' + \
+            self._clean_object_name(directory)
+
+        while True:
+            result = self.connection.request(path, headers=dict(headers))
+
+            for entry in self._list_objects(result.object):
+                yield entry
+
+            token = result.headers.get('x-emc-token', None)
+            if not token:
+                break
+            headers['x-emc-token'] = token
+
     def _clean_object_name(self, name):
         return urlquote(name.encode('ascii'))
 
@@ -463,10 +589,16 @@ class AtmosDriver(StorageDriver):
         return dict([x.split('=', 1) for x in meta])
 
     def iterate_container_objects(self, container):
-        headers = {'x-emc-include-meta': '1'}
-        path = self._namespace_path(container.name) + '/'
-        result = self.connection.request(path, headers=headers)
-        entries = self._list_objects(result.object, object_type='regular')
-        for entry in entries:
-            metadata = {'object_id': entry['id']}
-            yield Object(entry['name'], 0, '', {}, metadata, container, self)
+        for entry in self._iterate_directory(container, ''):
+            if entry['type'] != 'regular':
+                continue
+
+            if self._has_object_meta(entry):
+                obj = self._to_object(entry['name'], entry['system_meta'],
+                                      entry['user_meta'], container)
+                obj.meta_data['object_id'] = entry['id']
+                yield obj
+            else:
+                metadata = {'object_id': entry['id']}
+                yield Object(entry['name'], 0, '', {}, metadata, container,
+                             self)
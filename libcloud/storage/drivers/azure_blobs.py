@@ -17,6 +17,7 @@ from __future__ import with_statement
 
 import base64
 import os
+import time
 import binascii
 
 from xml.etree.ElementTree import Element, SubElement
@@ -73,6 +74,9 @@ AZURE_LEASE_PERIOD = 60
 
 AZURE_STORAGE_HOST_SUFFIX = 'blob.core.windows.net'
 
+# How often (in seconds) the status of a pending copy operation is checked
+AZURE_COPY_POLL_INTERVAL = 1
+
 
 class AzureBlobLease(object):
     """
@@ -168,6 +172,8 @@ class AzureBlobsStorageDriver(StorageDriver):
     connectionCls = AzureBlobsConnection
     hash_type = 'md5'
     supports_chunked_encoding = False
+    supports_range_downloads = True
+    supports_server_side_copy = True
     ex_blob_type = 'BlockBlob'
 
     def __init__(self, key, secret=None, secure=True, host=None, port=None,
@@ -573,6 +579,23 @@ class AzureBlobsStorageDriver(StorageDriver):
                                                  'chunk_size': chunk_size},
                                 success_status_code=httplib.OK)
 
+    def download_object_range_as_stream(self, obj, start_bytes,
+                                        end_bytes=None, chunk_size=None):
+        """
+        @inherits: :class:`StorageDriver.download_object_range_as_stream`
+        """
+        obj_path = self._get_object_path(obj.container, obj.name)
+        headers = {'x-ms-range': self._get_standard_range_str(start_bytes,
+                                                              end_bytes)}
+        response = self.connection.request(obj_path, headers=headers,
+                                           raw=True, data=None)
+
+        return self._get_object(obj=obj, callback=read_in_chunks,
+                                response=response,
+                                callback_kwargs={'iterator': response.response,
+                                                 'chunk_size': chunk_size},
+                                success_status_code=httplib.PARTIAL_CONTENT)
+
     def _upload_in_chunks(self, response, data, iterator, object_path,
                           blob_type, lease, calculate_hash=True):
         """
@@ -682,7 +705,7 @@ class AzureBlobsStorageDriver(StorageDriver):
 
         return (True, data_hash, bytes_transferred)
 
-    def _commit_blocks(self, object_path, chunks, lease):
+    def _commit_blocks(self, object_path, chunks, lease, headers=None):
         """
         Makes a final commit of the data.
 
@@ -691,6 +714,12 @@ class AzureBlobsStorageDriver(StorageDriver):
 
         :param upload_id: A list of (chunk_number, chunk_hash) tuples.
         :type upload_id: ``list``
+
+        :param headers: Additional headers (e.g. blob properties).
+        :type headers: ``dict``
+
+        :return: Commit response.
+        :rtype: :class:`AzureResponse`
         """
 
         root = Element('BlockList')
@@ -701,7 +730,7 @@ class AzureBlobsStorageDriver(StorageDriver):
 
         data = tostring(root)
         params = {'comp': 'blocklist'}
-        headers = {}
+        headers = dict(headers or {})
 
         lease.update_headers(headers)
         lease.renew()
@@ -713,6 +742,67 @@ class AzureBlobsStorageDriver(StorageDriver):
         if response.status != httplib.CREATED:
             raise LibcloudError('Error in blocklist commit', driver=self)
 
+        return response
+
+    def _get_upload_part_size(self, size):
+        return AZURE_CHUNK_SIZE
+
+    def _initiate_part_upload(self, container, object_name, extra=None):
+        # Uncommitted blocks are not visible so the upload doesn't need to
+        # be initiated
+        return {'container': container, 'object_name': object_name,
+                'object_path': self._get_object_path(container, object_name),
+                'extra': extra or {}}
+
+    def _upload_part(self, upload, part_number, data):
+        data_hash = self._get_hash_function()
+        data_hash.update(data)
+        data_hash = base64.b64encode(data_hash.digest()).decode('utf-8')
+
+        # Block ids need to have the same length (see _upload_in_chunks)
+        block_id = base64.b64encode(b('%10d' % (part_number)))
+        block_id = block_id.decode('utf-8')
+        params = {'comp': 'block', 'blockid': block_id}
+        headers = {
+            'Content-MD5': data_hash,
+            'Content-Length': len(data)
+        }
+
+        response = self.connection.request(upload['object_path'],
+                                           method='PUT', data=data,
+                                           headers=headers, params=params)
+
+        if response.status != httplib.CREATED:
+            raise LibcloudError('Error uploading block %d. Code: %d' %
+                                (part_number, response.status), driver=self)
+
+        return block_id
+
+    def _complete_part_upload(self, upload, parts, size, data_hash=None):
+        extra = upload['extra']
+        meta_data = extra.get('meta_data', None) or {}
+        content_type = extra.get('content_type', None)
+        headers = {}
+
+        self._update_metadata(headers, meta_data)
+
+        if content_type:
+            headers['x-ms-blob-content-type'] = content_type
+
+        if data_hash:
+            # Azure doesn't calculate hash of the blobs uploaded in blocks
+            data_hash = base64.b64encode(binascii.unhexlify(b(data_hash)))
+            headers['x-ms-blob-content-md5'] = data_hash.decode('utf-8')
+
+        lease = AzureBlobLease(self, upload['object_path'], False)
+        response = self._commit_blocks(upload['object_path'], parts, lease,
+                                       headers=headers)
+
+        return Object(name=upload['object_name'], size=size,
+                      hash=response.headers.get('etag', None), extra=None,
+                      meta_data=meta_data, container=upload['container'],
+                      driver=self)
+
     def _check_values(self, blob_type, object_size):
         """
         Checks if extension arguments are valid
@@ -849,6 +939,68 @@ class AzureBlobsStorageDriver(StorageDriver):
 
         return False
 
+    def copy_object(self, obj, destination_container,
+                    destination_object_name, extra=None):
+        """
+        @inherits: :class:`StorageDriver.copy_object`
+
+        The method waits until the (asynchronous) copy operation completes.
+        Content type of the new object is always the same as the content
+        type of the copied object.
+        """
+        if not self._is_same_account(destination_container.driver):
+            return super(AzureBlobsStorageDriver, self).copy_object(
+                obj, destination_container, destination_object_name,
+                extra=extra)
+
+        source_url = '%s://%s%s' % (self.secure and 'https' or 'http',
+                                    self.connection.host,
+                                    self._get_object_path(obj.container,
+                                                          obj.name))
+        object_path = self._get_object_path(destination_container,
+                                            destination_object_name)
+        headers = {'x-ms-copy-source': source_url}
+
+        if extra is not None:
+            # Meta data of the source object is only copied if none is set
+            self._update_metadata(headers, extra.get('meta_data', None) or {})
+
+        response = self.connection.request(object_path, method='PUT',
+                                           headers=headers)
+
+        if response.status == httplib.NOT_FOUND:
+            raise ObjectDoesNotExistError(value=None, driver=self,
+                                          object_name=obj.name)
+        elif response.status not in [httplib.ACCEPTED, httplib.CREATED]:
+            raise LibcloudError('Unexpected status code: %s' %
+                                (response.status), driver=self)
+
+        status = response.headers.get('x-ms-copy-status', 'success')
+
+        while True:
+            if status == 'pending':
+                time.sleep(AZURE_COPY_POLL_INTERVAL)
+
+            response = self.connection.request(object_path, method='HEAD')
+
+            if response.status != httplib.OK:
+                raise LibcloudError('Unexpected status code: %s' %
+                                    (response.status), driver=self)
+
+            status = response.headers.get('x-ms-copy-status', status)
+
+            if status != 'pending':
+                break
+
+        if status != 'success':
+            raise LibcloudError('Copy operation %s: %s' %
+                                (status, response.headers.get(
+                                    'x-ms-copy-status-description', '')),
+                                driver=self)
+
+        return self._response_to_object(destination_object_name,
+                                        destination_container, response)
+
     def _update_metadata(self, headers, meta_data):
         """
         Update the given metadata in the headers
@@ -29,6 +29,7 @@ except ImportError:
 from libcloud.utils.py3 import PY3
 from libcloud.utils.py3 import b
 from libcloud.utils.py3 import urlquote
+from libcloud.utils.py3 import urlunquote
 
 if PY3:
     from io import FileIO as file
@@ -42,6 +43,7 @@ from libcloud.storage.base import Object, Container, StorageDriver
 from libcloud.storage.types import ContainerAlreadyExistsError
 from libcloud.storage.types import ContainerDoesNotExistError
 from libcloud.storage.types import ContainerIsNotEmptyError
+from libcloud.storage.types import ObjectError
 from libcloud.storage.types import ObjectDoesNotExistError
 from libcloud.storage.types import ObjectHashMismatchError
 from libcloud.storage.types import InvalidContainerNameError
@@ -57,6 +59,10 @@ API_VERSION = 'v1.0'
 INTERNAL_ENDPOINT_KEY = 'internalURL'
 PUBLIC_ENDPOINT_KEY = 'publicURL'
 
+# Maximum number of objects which can be deleted using a single bulk delete
+# request (default value of the Swift bulk middleware)
+DELETE_OBJECTS_BATCH_SIZE = 10000
+
 
 class CloudFilesResponse(Response):
     valid_response_codes = [httplib.NOT_FOUND, httplib.CONFLICT]
@@ -245,6 +251,8 @@ class CloudFilesStorageDriver(StorageDriver, OpenStackDriverMixin):
     connectionCls = CloudFilesConnection
     hash_type = 'md5'
     supports_chunked_encoding = True
+    supports_range_downloads = True
+    supports_server_side_copy = True
 
     def __init__(self, key, secret=None, secure=True, host=None, port=None,
                  region='ord', use_internal_url=False, **kwargs):
@@ -291,7 +299,10 @@ class CloudFilesStorageDriver(StorageDriver, OpenStackDriverMixin):
 
     def get_object(self, container_name, object_name):
         container = self.get_container(container_name)
-        container_name_encoded = self._encode_container_name(container_name)
+        return self._get_container_object(container, object_name)
+
+    def _get_container_object(self, container, object_name):
+        container_name_encoded = self._encode_container_name(container.name)
         object_name_encoded = self._encode_object_name(object_name)
 
         response = self.connection.request('/%s/%s' % (container_name_encoded,
@@ -413,6 +424,50 @@ class CloudFilesStorageDriver(StorageDriver, OpenStackDriverMixin):
                                                  'chunk_size': chunk_size},
                                 success_status_code=httplib.OK)
 
+    def _download_object_as_stream_if_changed(self, obj, data_hash,
+                                              chunk_size=None):
+        container_name = obj.container.name
+        object_name = obj.name
+        headers = {}
+
+        if data_hash is not None:
+            headers['If-None-Match'] = '"%s"' % (data_hash)
+
+        response = self.connection.request('/%s/%s' % (container_name,
+                                                       object_name),
+                                           method='GET', headers=headers,
+                                           raw=True)
+
+        if response.status == httplib.NOT_MODIFIED:
+            return None
+
+        stream = self._get_object(obj=obj, callback=read_in_chunks,
+                                  response=response,
+                                  callback_kwargs={
+                                      'iterator': response.response,
+                                      'chunk_size': chunk_size},
+                                  success_status_code=httplib.OK)
+
+        # ETags of manifest objects are not content hashes
+        return response.headers.get('etag', None), stream, None
+
+    def download_object_range_as_stream(self, obj, start_bytes,
+                                        end_bytes=None, chunk_size=None):
+        container_name = obj.container.name
+        object_name = obj.name
+        headers = {'Range': self._get_standard_range_str(start_bytes,
+                                                         end_bytes)}
+        response = self.connection.request('/%s/%s' % (container_name,
+                                                       object_name),
+                                           method='GET', headers=headers,
+                                           raw=True)
+
+        return self._get_object(obj=obj, callback=read_in_chunks,
+                                response=response,
+                                callback_kwargs={'iterator': response.response,
+                                                 'chunk_size': chunk_size},
+                                success_status_code=httplib.PARTIAL_CONTENT)
+
     def upload_object(self, file_path, container, object_name, extra=None,
                       verify_hash=True, headers=None):
         """
@@ -459,6 +514,125 @@ class CloudFilesStorageDriver(StorageDriver, OpenStackDriverMixin):
 
         raise LibcloudError('Unexpected status code: %s' % (response.status))
 
+    def copy_object(self, obj, destination_container,
+                    destination_object_name, extra=None):
+        """
+        @inherits: :class:`StorageDriver.copy_object`
+        """
+        if not self._is_same_account(destination_container.driver):
+            return super(CloudFilesStorageDriver, self).copy_object(
+                obj, destination_container, destination_object_name,
+                extra=extra)
+
+        source_path = '/%s/%s' % (self._encode_container_name(
+                                  obj.container.name),
+                                  self._encode_object_name(obj.name))
+        request_path = '/%s/%s' % (
+            self._encode_container_name(destination_container.name),
+            self._encode_object_name(destination_object_name))
+        headers = {'X-Copy-From': source_path, 'Content-Length': '0'}
+        meta_data = obj.meta_data
+
+        if extra is not None:
+            meta_data = extra.get('meta_data', None)
+
+            # Replace the meta data of the source object instead of merging
+            headers['X-Fresh-Metadata'] = 'true'
+
+            if extra.get('content_type', None):
+                headers['Content-Type'] = extra['content_type']
+
+            for key, value in list((meta_data or {}).items()):
+                headers['X-Object-Meta-%s' % (key)] = value
+
+        response = self.connection.request(request_path, method='PUT',
+                                           headers=headers)
+
+        if response.status == httplib.CREATED:
+            return Object(name=destination_object_name, size=obj.size,
+                          hash=response.headers.get('etag', None),
+                          extra={'last_modified':
+                                 response.headers.get('last-modified', None)},
+                          meta_data=meta_data,
+                          container=destination_container, driver=self)
+        elif response.status == httplib.NOT_FOUND:
+            raise ObjectDoesNotExistError(value='', object_name=obj.name,
+                                          driver=self)
+
+        raise LibcloudError('Unexpected status code: %s' % (response.status),
+                            driver=self)
+
+    def delete_objects(self, container, objects):
+        """
+        @inherits: :class:`StorageDriver.delete_objects`
+
+        Objects are deleted using bulk delete requests. If the bulk delete
+        middleware is not enabled, objects are deleted one by one.
+        """
+        objects = self._get_objects_for_names(container, objects)
+        errors = {}
+
+        for index in range(0, len(objects), DELETE_OBJECTS_BATCH_SIZE):
+            batch = objects[index:index + DELETE_OBJECTS_BATCH_SIZE]
+            batch_errors = self._bulk_delete_objects(container, batch)
+
+            if batch_errors is None:
+                batch_errors = super(CloudFilesStorageDriver,
+                                     self).delete_objects(container, batch)
+
+            errors.update(batch_errors)
+
+        return errors
+
+    def _bulk_delete_objects(self, container, objects):
+        """
+        Delete objects using a single bulk delete request.
+
+        :return: Errors keyed by the object name or None if bulk delete is
+                 not supported.
+        :rtype: ``dict``
+        """
+        container_name = self._encode_container_name(container.name)
+        paths = {}
+
+        for obj in objects:
+            paths['/%s/%s' % (container.name, obj.name)] = obj.name
+
+        data = '\n'.join(['/%s/%s' % (container_name,
+                                      self._encode_object_name(obj.name))
+                          for obj in objects])
+        headers = {'Content-Type': 'text/plain',
+                   'Accept': 'application/json'}
+
+        # POST is used instead of DELETE so the request is harmless if the
+        # bulk middleware is not enabled
+        response = self.connection.request('', method='POST', data=data,
+                                           headers=headers,
+                                           params={'bulk-delete': 'true'})
+        result = response.object
+
+        if response.status != httplib.OK or not isinstance(result, dict) or \
+                'Number Deleted' not in result:
+            return None
+
+        errors = {}
+
+        for path, status in result.get('Errors', []):
+            name = paths.get(urlunquote(path), urlunquote(path))
+            errors[name] = ObjectError(value=status, object_name=name,
+                                       driver=self)
+
+        status = result.get('Response Status', '200 OK')
+
+        if not errors and not status.startswith('2'):
+            # Request failed as a whole
+            for obj in objects:
+                errors[obj.name] = ObjectError(value=status,
+                                               object_name=obj.name,
+                                               driver=self)
+
+        return errors
+
     def ex_purge_object_from_cdn(self, obj, email=None):
         """
         Purge edge cache for the specified object.
@@ -134,4 +134,7 @@ class GoogleStorageDriver(BaseS3StorageDriver):
     namespace = NAMESPACE
     supports_chunked_encoding = False
     supports_s3_multipart_upload = False
+    supports_s3_multi_object_delete = False
+    # ETags of composite objects are not MD5 hashes
+    content_md5_hash = False
     http_vendor_prefix = 'x-goog'
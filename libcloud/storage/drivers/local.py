@@ -22,7 +22,9 @@ from __future__ import with_statement
 import errno
 import os
 import shutil
+import stat as stat_module
 import sys
+import tempfile
 
 try:
     import lockfile
@@ -31,11 +33,11 @@ except ImportError:
     raise ImportError('Missing lockfile dependency, you can install it '
                       'using pip: pip install lockfile')
 
-from libcloud.utils.files import read_in_chunks
-from libcloud.utils.py3 import relpath
+from libcloud.utils.files import read_in_chunks, read_file_in_chunks
 from libcloud.utils.py3 import u
 from libcloud.common.base import Connection
 from libcloud.storage.base import Object, Container, StorageDriver
+from libcloud.storage.base import CHUNK_SIZE
 from libcloud.common.types import LibcloudError
 from libcloud.storage.types import ContainerAlreadyExistsError
 from libcloud.storage.types import ContainerDoesNotExistError
@@ -44,7 +46,51 @@ from libcloud.storage.types import ObjectError
 from libcloud.storage.types import ObjectDoesNotExistError
 from libcloud.storage.types import InvalidContainerNameError
 
-IGNORE_FOLDERS = ['.lock', '.hash']
+# Name of the folder (inside each container) where the content hashes are
+# cached
+HASH_FOLDER = '.hash'
+
+# Name of the folder (inside each container) where the objects are written
+# before they are atomically moved in place
+TEMP_FOLDER = '.tmp'
+
+IGNORE_FOLDERS = ['.lock', HASH_FOLDER, TEMP_FOLDER]
+
+
+def _scandir(path):
+    """
+    Yield (name, is_dir, stat) tuples for the entries of a directory.
+
+    os.scandir is used when available, so the file type is read from the
+    directory entry itself. Symbolic links to directories are skipped (like
+    os.walk does by default) and stat is None for directories.
+    """
+    scandir = getattr(os, 'scandir', None)
+
+    if scandir is not None:
+        for entry in scandir(path):
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    yield entry.name, True, None
+            else:
+                yield entry.name, False, entry.stat()
+
+        return
+
+    for name in os.listdir(path):
+        full_path = os.path.join(path, name)
+        stat = os.lstat(full_path)
+
+        if stat_module.S_ISLNK(stat.st_mode):
+            if os.path.isdir(full_path):
+                continue
+
+            stat = os.stat(full_path)
+
+        if stat_module.S_ISDIR(stat.st_mode):
+            yield name, True, None
+        else:
+            yield name, False, stat
 
 
 class LockLocalStorage(object):
@@ -74,18 +120,45 @@ class LocalStorageDriver(StorageDriver):
     Implementation of local file-system based storage. This is helpful
     where the user would want to use the same code (using libcloud) and
     switch between cloud storage and local storage
+
+    Objects are written to a temporary file in the container which is then
+    atomically renamed, so concurrent readers and writers never see a
+    partially written object and uploads don't need to be locked. Because
+    the driver never modifies a stored file in place, copies of objects
+    inside the storage are hard links when the file system supports them.
     """
 
     connectionCls = Connection
     name = 'Local Storage'
     website = 'http://example.com'
     hash_type = 'md5'
+    supports_range_downloads = True
+    supports_server_side_copy = True
+
+    # File system operations don't benefit from concurrent requests and
+    # parent directories of deleted objects are removed when they are empty
+    concurrent_requests = 1
 
     def __init__(self, key, secret=None, secure=True, host=None, port=None,
-                 **kwargs):
+                 ex_content_hash=False, **kwargs):
+        """
+        :param    key: Path to the storage.
+        :type     key: ``str``
+
+        :param    ex_content_hash: True to use the MD5 hash of the object
+                                   content as the object hash instead of a
+                                   hash of the modification time. Content
+                                   hashes are cached in the ``.hash`` folder
+                                   of each container and recalculated when
+                                   the file size or modification time
+                                   changes.
+        :type     ex_content_hash: ``bool``
+        """
 
         # Use the key as the path to the storage
         self.base_path = key
+        self.content_hash = ex_content_hash
+        self.content_md5_hash = ex_content_hash
 
         if not os.path.isdir(self.base_path):
             raise LibcloudError('The base path is not a directory')
@@ -148,7 +221,7 @@ class LocalStorageDriver(StorageDriver):
 
         return Container(name=container_name, extra=extra, driver=self)
 
-    def _make_object(self, container, object_name):
+    def _make_object(self, container, object_name, stat=None):
         """
         Create an object instance
 
@@ -158,27 +231,35 @@ class LocalStorageDriver(StorageDriver):
         :param object_name: Object name.
         :type object_name: ``str``
 
+        :param stat: (optional) Result of os.stat for the object file, if
+                     it is already known.
+        :type stat: ``os.stat_result``
+
         :return: Object instance.
         :rtype: :class:`Object`
         """
 
         full_path = os.path.join(self.base_path, container.name, object_name)
 
-        if os.path.isdir(full_path):
-            raise ObjectError(value=None, driver=self, object_name=object_name)
+        if stat is None:
+            try:
+                stat = os.stat(full_path)
+            except Exception:
+                raise ObjectDoesNotExistError(value=None, driver=self,
+                                              object_name=object_name)
 
-        try:
-            stat = os.stat(full_path)
-        except Exception:
-            raise ObjectDoesNotExistError(value=None, driver=self,
-                                          object_name=object_name)
+        if stat_module.S_ISDIR(stat.st_mode):
+            raise ObjectError(value=None, driver=self, object_name=object_name)
 
-        # Make a hash for the file based on the metadata. We can safely
-        # use only the mtime attribute here. If the file contents change,
-        # the underlying file-system will change mtime
-        data_hash = self._get_hash_function()
-        data_hash.update(u(stat.st_mtime).encode('ascii'))
-        data_hash = data_hash.hexdigest()
+        if self.content_hash:
+            data_hash = self._get_content_hash(container, object_name, stat)
+        else:
+            # Make a hash for the file based on the metadata. We can safely
+            # use only the mtime attribute here. If the file contents change,
+            # the underlying file-system will change mtime
+            data_hash = self._get_hash_function()
+            data_hash.update(u(stat.st_mtime).encode('ascii'))
+            data_hash = data_hash.hexdigest()
 
         extra = {}
         extra['creation_time'] = stat.st_ctime
@@ -189,6 +270,97 @@ class LocalStorageDriver(StorageDriver):
                       driver=self, container=container, hash=data_hash,
                       meta_data=None)
 
+    def _get_modify_time(self, obj):
+        return (obj.extra or {}).get('modify_time', None)
+
+    def _get_hash_path(self, container, object_name):
+        """
+        Return the path of the file which caches the content hash of an
+        object.
+        """
+        return os.path.join(self.base_path, container.name, HASH_FOLDER,
+                            object_name)
+
+    def _get_content_hash(self, container, object_name, stat):
+        """
+        Return the MD5 hash of the object content.
+
+        The cached hash is used if the size and the modification time of the
+        file still match the ones it was calculated for, otherwise the file
+        is read and the cache is updated.
+        """
+        hash_path = self._get_hash_path(container, object_name)
+        key = '%d %r' % (stat.st_size, stat.st_mtime)
+
+        try:
+            with open(hash_path, 'r') as fp:
+                cached_key, data_hash = fp.read().rsplit(' ', 1)
+        except (IOError, OSError, ValueError):
+            cached_key, data_hash = None, None
+
+        if cached_key == key and data_hash:
+            return data_hash
+
+        full_path = os.path.join(self.base_path, container.name, object_name)
+        data_hash = self._get_hash_function()
+
+        with open(full_path, 'rb') as fp:
+            for data in read_in_chunks(fp, chunk_size=CHUNK_SIZE):
+                data_hash.update(data)
+
+        data_hash = data_hash.hexdigest()
+        self._store_content_hash(container, object_name, stat, data_hash)
+
+        return data_hash
+
+    def _store_content_hash(self, container, object_name, stat, data_hash):
+        """
+        Store the content hash of an object in the hash cache.
+
+        The cache is only an optimization, so the errors are ignored.
+        """
+        hash_path = self._get_hash_path(container, object_name)
+        temp_path = None
+
+        try:
+            self._make_path(os.path.dirname(hash_path))
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(hash_path),
+                                             suffix='.tmp')
+
+            with os.fdopen(fd, 'w') as fp:
+                fp.write('%d %r %s' % (stat.st_size, stat.st_mtime,
+                                       data_hash))
+
+            # Readers never see a partially written hash
+            self._replace_file(temp_path, hash_path)
+        except (IOError, OSError):
+            if temp_path is not None:
+                self._remove_file(temp_path)
+
+    def _remove_content_hash(self, container, object_name):
+        """
+        Remove the cached content hash of an object together with the empty
+        parent folders.
+        """
+        hash_path = self._get_hash_path(container, object_name)
+        hash_folder = os.path.join(self.base_path, container.name,
+                                   HASH_FOLDER)
+
+        try:
+            os.remove(hash_path)
+        except OSError:
+            return
+
+        path = os.path.dirname(hash_path)
+
+        while path != hash_folder:
+            try:
+                os.rmdir(path)
+            except OSError:
+                break
+
+            path = os.path.dirname(path)
+
     def iterate_containers(self):
         """
         Return a generator of containers.
@@ -203,36 +375,74 @@ class LocalStorageDriver(StorageDriver):
                 continue
             yield self._make_container(container_name)
 
-    def _get_objects(self, container):
+    def _get_objects(self, container, prefix=None):
         """
-        Recursively iterate through the file-system and return the object names
+        Recursively iterate through the file-system and return the objects
+
+        If a prefix is given, only the objects whose name starts with it are
+        returned and the folders which can't contain such objects are not
+        visited.
         """
 
         cpath = self.get_container_cdn_url(container, check=True)
+        prefix = prefix or ''
+
+        # Stack of the folders (relative to the container) left to visit
+        folders = ['']
+
+        while folders:
+            folder = folders.pop()
+            subfolders = []
 
-        for folder, subfolders, files in os.walk(cpath, topdown=True):
-            # Remove unwanted subfolders
-            for subf in IGNORE_FOLDERS:
-                if subf in subfolders:
-                    subfolders.remove(subf)
+            for name, is_dir, stat in _scandir(os.path.join(cpath, folder)):
+                object_name = os.path.join(folder, name)
 
-            for name in files:
-                full_path = os.path.join(folder, name)
-                object_name = relpath(full_path, start=cpath)
-                yield self._make_object(container, object_name)
+                if is_dir:
+                    if name in IGNORE_FOLDERS:
+                        continue
 
-    def iterate_container_objects(self, container):
+                    folder_name = os.path.join(object_name, '')
+
+                    if folder_name.startswith(prefix) or \
+                            prefix.startswith(folder_name):
+                        subfolders.append(object_name)
+                elif object_name.startswith(prefix):
+                    yield self._make_object(container, object_name, stat=stat)
+
+            # Visit the subfolders in the order they were listed
+            folders.extend(reversed(subfolders))
+
+    def iterate_container_objects(self, container, ex_prefix=None):
         """
         Returns a generator of objects for the given container.
 
         :param container: Container instance
         :type container: :class:`Container`
 
+        :param ex_prefix: Only return objects starting with ex_prefix
+        :type ex_prefix: ``str``
+
         :return: A generator of Object instances.
         :rtype: ``generator`` of :class:`Object`
         """
 
-        return self._get_objects(container)
+        return self._get_objects(container, prefix=ex_prefix)
+
+    def list_container_objects(self, container, ex_prefix=None):
+        """
+        Return a list of objects for the given container.
+
+        :param container: Container instance.
+        :type container: :class:`Container`
+
+        :param ex_prefix: Only return objects starting with ex_prefix
+        :type ex_prefix: ``str``
+
+        :return: A list of Object instances.
+        :rtype: ``list`` of :class:`Object`
+        """
+        return list(self.iterate_container_objects(container,
+                                                   ex_prefix=ex_prefix))
 
     def get_container(self, container_name):
         """
@@ -379,14 +589,19 @@ class LocalStorageDriver(StorageDriver):
                 'overwrite_existing=False',
                 driver=self)
 
+        # The data is written to a temporary file next to the destination,
+        # so a failed download never leaves a partial file behind
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(file_path) or '.',
+            prefix='.%s.' % (os.path.basename(file_path)), suffix='.tmp')
+        os.close(fd)
+
         try:
-            shutil.copy(obj_path, file_path)
-        except IOError:
-            if delete_on_failure:
-                try:
-                    os.unlink(file_path)
-                except Exception:
-                    pass
+            self._copy_file(obj_path, temp_path)
+            shutil.copymode(obj_path, temp_path)
+            self._replace_file(temp_path, file_path)
+        except EnvironmentError:
+            self._remove_file(temp_path)
             return False
 
         return True
@@ -405,9 +620,16 @@ class LocalStorageDriver(StorageDriver):
         :rtype: ``object``
         """
         path = self.get_object_cdn_url(obj)
-        with open(path, 'rb') as obj_file:
-            for data in read_in_chunks(obj_file, chunk_size=chunk_size):
-                yield data
+        return read_file_in_chunks(path, chunk_size=chunk_size)
+
+    def download_object_range_as_stream(self, obj, start_bytes,
+                                        end_bytes=None, chunk_size=None):
+        """
+        @inherits: :class:`StorageDriver.download_object_range_as_stream`
+        """
+        path = self.get_object_cdn_url(obj)
+        return read_file_in_chunks(path, start_bytes=start_bytes,
+                                   end_bytes=end_bytes, chunk_size=chunk_size)
 
     def upload_object(self, file_path, container, object_name, extra=None,
                       verify_hash=True):
@@ -432,16 +654,9 @@ class LocalStorageDriver(StorageDriver):
         :rtype: ``object``
         """
 
-        path = self.get_container_cdn_url(container, check=True)
-        obj_path = os.path.join(path, object_name)
-        base_path = os.path.dirname(obj_path)
-
-        self._make_path(base_path)
-
-        with LockLocalStorage(obj_path):
-            shutil.copy(file_path, obj_path)
-
-        os.chmod(obj_path, int('664', 8))
+        self._store_file(container, object_name,
+                         lambda temp_path: self._copy_file(file_path,
+                                                           temp_path))
 
         return self._make_object(container, object_name)
 
@@ -482,17 +697,176 @@ class LocalStorageDriver(StorageDriver):
 
         :rtype: ``object``
         """
-        path = self.get_container_cdn_url(container, check=True)
-        obj_path = os.path.join(path, object_name)
-        base_path = os.path.dirname(obj_path)
-        self._make_path(base_path)
-        with LockLocalStorage(obj_path):
-            with open(obj_path, 'wb') as obj_file:
+        data_hash = None
+
+        if self.content_hash:
+            data_hash = self._get_hash_function()
+
+        def write(temp_path):
+            with open(temp_path, 'wb') as obj_file:
                 for data in iterator:
                     obj_file.write(data)
-        os.chmod(obj_path, int('664', 8))
+
+                    if data_hash is not None:
+                        data_hash.update(data)
+
+        stat = self._store_file(container, object_name, write)
+
+        if data_hash is not None:
+            # The content hash is already known, don't read the file again
+            self._store_content_hash(container, object_name, stat,
+                                     data_hash.hexdigest())
+
         return self._make_object(container, object_name)
 
+    def copy_object(self, obj, destination_container,
+                    destination_object_name, extra=None):
+        """
+        Copy an object.
+
+        The new object is a hard link to the source file when the file system
+        supports it. Otherwise on platforms which support it, the data is
+        copied by the kernel (copy-on-write clone on the file systems which
+        support it).
+
+        :type obj: :class:`Object`
+        :param obj: Object instance.
+
+        :param destination_container: Destination container.
+        :type destination_container: :class:`Container`
+
+        :param destination_object_name: Name of the new object.
+        :type destination_object_name: ``str``
+
+        :param extra: Ignored, local storage doesn't support object
+                      attributes.
+        :type extra: ``dict``
+
+        :rtype: :class:`Object`
+        """
+        if not self._is_same_account(destination_container.driver):
+            return super(LocalStorageDriver, self).copy_object(
+                obj, destination_container, destination_object_name,
+                extra=extra)
+
+        source_path = self.get_object_cdn_url(obj)
+
+        if not os.path.isfile(source_path):
+            raise ObjectDoesNotExistError(value=None, driver=self,
+                                          object_name=obj.name)
+
+        def write(temp_path):
+            try:
+                os.remove(temp_path)
+                os.link(source_path, temp_path)
+            except (AttributeError, OSError):
+                self._copy_file(source_path, temp_path)
+                return False
+
+            return True
+
+        self._store_file(destination_container, destination_object_name,
+                         write)
+
+        return self._make_object(destination_container,
+                                 destination_object_name)
+
+    def _store_file(self, container, object_name, write):
+        """
+        Store an object file.
+
+        write is called with the path of a temporary file in the container
+        which is then atomically moved in place of the object. It returns
+        True if the temporary file is a hard link to an existing file, whose
+        permissions are kept (the file can belong to another user).
+
+        :return: Result of os.stat for the stored file.
+        :rtype: ``os.stat_result``
+        """
+        path = self.get_container_cdn_url(container, check=True)
+        obj_path = os.path.join(path, object_name)
+        temp_folder = os.path.join(path, TEMP_FOLDER)
+
+        self._make_path(temp_folder)
+        fd, temp_path = tempfile.mkstemp(dir=temp_folder)
+        os.close(fd)
+
+        try:
+            if not write(temp_path):
+                os.chmod(temp_path, int('664', 8))
+
+            stat = os.stat(temp_path)
+            self._replace_file(temp_path, obj_path)
+        except:
+            self._remove_file(temp_path)
+            raise
+
+        return stat
+
+    def _replace_file(self, source_path, destination_path):
+        """
+        Atomically move a file in place of the destination file, creating the
+        destination folder if needed.
+        """
+        replace = getattr(os, 'replace', None)
+
+        # Retry if the folder is removed by a concurrent delete_object
+        # which found it empty
+        for attempt in range(3):
+            self._make_path(os.path.dirname(destination_path))
+
+            try:
+                if replace is not None:
+                    replace(source_path, destination_path)
+                else:
+                    if os.name == 'nt' and os.path.exists(destination_path):
+                        os.remove(destination_path)
+
+                    os.rename(source_path, destination_path)
+
+                return
+            except OSError:
+                exp = sys.exc_info()[1]
+                if exp.errno != errno.ENOENT or attempt == 2:
+                    raise exp
+
+    def _remove_file(self, path):
+        """
+        Remove a file, ignoring the errors.
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _copy_file(self, source_path, destination_path):
+        """
+        Copy file data, using os.copy_file_range when available.
+        """
+        copy_file_range = getattr(os, 'copy_file_range', None)
+
+        if copy_file_range is None:
+            shutil.copyfile(source_path, destination_path)
+            return
+
+        with open(source_path, 'rb') as source:
+            with open(destination_path, 'wb') as destination:
+                remaining = os.fstat(source.fileno()).st_size
+
+                try:
+                    while remaining > 0:
+                        copied = copy_file_range(source.fileno(),
+                                                 destination.fileno(),
+                                                 remaining)
+
+                        if copied == 0:
+                            break
+
+                        remaining -= copied
+                except OSError:
+                    # Not supported by the file system, copy the rest
+                    shutil.copyfileobj(source, destination)
+
     def delete_object(self, obj):
         """
         Delete an object.
@@ -506,11 +880,14 @@ class LocalStorageDriver(StorageDriver):
 
         path = self.get_object_cdn_url(obj)
 
-        with LockLocalStorage(path):
-            try:
-                os.unlink(path)
-            except Exception:
-                return False
+        # Objects are replaced atomically, so no lock is needed
+        try:
+            os.unlink(path)
+        except Exception:
+            return False
+
+        if self.content_hash:
+            self._remove_content_hash(obj.container, obj.name)
 
         # Check and delete all the empty parent folders
         path = os.path.dirname(path)
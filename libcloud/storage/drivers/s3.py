@@ -19,7 +19,7 @@ import base64
 import hmac
 import sys
 
-from hashlib import sha1
+from hashlib import sha1, md5
 
 try:
     from lxml.etree import Element, SubElement
@@ -34,14 +34,17 @@ from libcloud.utils.py3 import tostring
 
 from libcloud.utils.xml import fixxpath, findtext
 from libcloud.utils.files import read_in_chunks
+from libcloud.utils.concurrency import iterate_sharded
 from libcloud.common.types import InvalidCredsError, LibcloudError
 from libcloud.common.base import ConnectionUserAndKey, RawResponse
 from libcloud.common.aws import AWSBaseResponse, AWSDriver, AWSTokenConnection
 
 from libcloud.storage.base import Object, Container, StorageDriver
+from libcloud.storage.base import _parse_md5_hash
 from libcloud.storage.types import ContainerIsNotEmptyError
 from libcloud.storage.types import InvalidContainerNameError
 from libcloud.storage.types import ContainerDoesNotExistError
+from libcloud.storage.types import ObjectError
 from libcloud.storage.types import ObjectDoesNotExistError
 from libcloud.storage.types import ObjectHashMismatchError
 
@@ -67,6 +70,22 @@ CHUNK_SIZE = 5 * 1024 * 1024
 # ex_iterate_multipart_uploads.
 RESPONSES_PER_REQUEST = 100
 
+# Maximum number of objects which can be deleted using a single request
+DELETE_OBJECTS_BATCH_SIZE = 1000
+
+# Objects larger than 5GB can only be copied using multipart upload
+COPY_MULTIPART_THRESHOLD = 5 * 1024 * 1024 * 1024
+
+# Size of the parts used by multipart copy
+COPY_CHUNK_SIZE = 512 * 1024 * 1024
+
+# Server side encryption types for which the ETag is the MD5 hash of the data
+# (objects encrypted using SSE-KMS or SSE-C have other ETags)
+MD5_ETAG_SERVER_SIDE_ENCRYPTION = [None, 'AES256']
+
+# Maximum number of parts of a multipart upload
+MAX_UPLOAD_PARTS = 10000
+
 
 class S3Response(AWSBaseResponse):
     namespace = None
@@ -226,6 +245,14 @@ class BaseS3StorageDriver(StorageDriver):
     hash_type = 'md5'
     supports_chunked_encoding = False
     supports_s3_multipart_upload = True
+    supports_s3_multi_object_delete = True
+    supports_range_downloads = True
+    supports_server_side_copy = True
+    # ETags of objects uploaded using multipart upload are not MD5 hashes,
+    # but they are never valid MD5 hashes either. ETags of objects encrypted
+    # using SSE-KMS or SSE-C look like MD5 hashes, but they aren't (see
+    # _get_content_md5_hash)
+    content_md5_hash = True
     ex_location_name = ''
     namespace = NAMESPACE
     http_vendor_prefix = 'x-amz'
@@ -240,7 +267,8 @@ class BaseS3StorageDriver(StorageDriver):
         raise LibcloudError('Unexpected status code: %s' % (response.status),
                             driver=self)
 
-    def list_container_objects(self, container, ex_prefix=None):
+    def list_container_objects(self, container, ex_prefix=None,
+                               ex_delimiter=None):
         """
         Return a list of objects for the given container.
 
@@ -250,13 +278,19 @@ class BaseS3StorageDriver(StorageDriver):
         :param ex_prefix: Only return objects starting with ex_prefix
         :type ex_prefix: ``str``
 
+        :param ex_delimiter: Only return objects which names don't contain
+                             the delimiter after the prefix (see
+                             :meth:`iterate_container_objects`).
+        :type ex_delimiter: ``str``
+
         :return: A list of Object instances.
         :rtype: ``list`` of :class:`Object`
         """
         return list(self.iterate_container_objects(container,
-                    ex_prefix=ex_prefix))
+                    ex_prefix=ex_prefix, ex_delimiter=ex_delimiter))
 
-    def iterate_container_objects(self, container, ex_prefix=None):
+    def iterate_container_objects(self, container, ex_prefix=None,
+                                  ex_delimiter=None):
         """
         Return a generator of objects for the given container.
 
@@ -266,38 +300,253 @@ class BaseS3StorageDriver(StorageDriver):
         :param ex_prefix: Only return objects starting with ex_prefix
         :type ex_prefix: ``str``
 
+        :param ex_delimiter: Only return objects which names don't contain
+                             the delimiter after the prefix (objects in the
+                             "directory" specified by the prefix). Use
+                             :meth:`ex_iterate_container_prefixes` to list
+                             the "subdirectories".
+        :type ex_delimiter: ``str``
+
+        :return: A generator of Object instances.
+        :rtype: ``generator`` of :class:`Object`
+        """
+        for objects, _ in self._iterate_listing_pages(container,
+                                                      prefix=ex_prefix,
+                                                      delimiter=ex_delimiter):
+            for obj in objects:
+                yield obj
+
+    def ex_iterate_container_prefixes(self, container, prefix=None,
+                                      delimiter='/'):
+        """
+        Return a generator of common prefixes ("directories") of the object
+        names which start with the provided prefix.
+
+        For example, if the container contains objects "a/1", "a/b/2" and
+        "c/3", prefixes "a/" and "c/" are returned for an empty prefix and
+        "a/b/" for prefix "a/".
+
+        :param container: Container instance
+        :type container: :class:`Container`
+
+        :param prefix: Only return prefixes starting with this prefix.
+        :type prefix: ``str``
+
+        :param delimiter: Character which separates the "directories".
+        :type delimiter: ``str``
+
+        :return: A generator of prefixes.
+        :rtype: ``generator`` of ``str``
+        """
+        for _, prefixes in self._iterate_listing_pages(container,
+                                                       prefix=prefix,
+                                                       delimiter=delimiter):
+            for value in prefixes:
+                yield value
+
+    def ex_iterate_container_objects_parallel(self, container, prefix=None,
+                                              split_points=None,
+                                              delimiter='/', workers=8,
+                                              ordered=True,
+                                              max_pending_pages=4):
+        """
+        Return a generator of objects for the given container which lists
+        multiple parts (shards) of the key space concurrently.
+
+        The key space is split either by the provided split points or by the
+        "directories" directly under the prefix (which requires a listing of
+        the prefix with a delimiter first). For containers which don't use
+        the delimiter in object names (or which contain many objects
+        directly under the prefix), split points should be provided.
+
+        :param container: Container instance
+        :type container: :class:`Container`
+
+        :param prefix: Only return objects starting with this prefix.
+        :type prefix: ``str``
+
+        :param split_points: Object names which split the key space into
+                             shards. Shard boundaries are exclusive on the
+                             left and inclusive on the right side (an object
+                             named "m" belongs to the shard which ends with
+                             "m").
+        :type split_points: ``list`` of ``str``
+
+        :param delimiter: Delimiter used to split the key space when split
+                          points are not provided.
+        :type delimiter: ``str``
+
+        :param workers: Number of shards listed at the same time.
+        :type workers: ``int``
+
+        :param ordered: If True, objects are returned ordered by name (the
+                        same order as :meth:`iterate_container_objects`).
+                        Otherwise objects are returned as soon as they are
+                        listed.
+        :type ordered: ``bool``
+
+        :param max_pending_pages: Maximum number of listing pages (1000
+                                  objects) buffered for each shard.
+        :type max_pending_pages: ``int``
+
         :return: A generator of Object instances.
         :rtype: ``generator`` of :class:`Object`
         """
+        if split_points:
+            shards = self._get_split_point_shards(prefix=prefix,
+                                                  split_points=split_points)
+        else:
+            shards = self._get_delimiter_shards(container, prefix=prefix,
+                                                delimiter=delimiter)
+
+        pool = self._get_worker_pool()
+
+        def list_shard(shard):
+            if shard[0] == 'objects':
+                return [shard[1]]
+
+            _, shard_prefix, shard_delimiter, marker, end_key = shard
+            connection = pool.get_connection()
+            pages = self._iterate_listing_pages(container,
+                                                prefix=shard_prefix,
+                                                delimiter=shard_delimiter,
+                                                marker=marker,
+                                                end_key=end_key,
+                                                connection=connection)
+            return (objects for objects, _ in pages)
+
+        return pool.iterate(iterate_sharded(
+            shards, list_shard, workers=workers, ordered=ordered,
+            max_pending_pages=max_pending_pages))
+
+    def _get_split_point_shards(self, prefix, split_points):
+        """
+        Return shards for the key ranges between the split points.
+        """
+        split_points = sorted(set(split_points))
+        boundaries = [None] + split_points + [None]
+
+        return [('range', prefix, None, boundaries[index],
+                 boundaries[index + 1])
+                for index in range(0, len(boundaries) - 1)]
+
+    def _get_delimiter_shards(self, container, prefix, delimiter):
+        """
+        Return a shard for each common prefix under the provided prefix.
+
+        Objects which are located directly under the prefix are returned as
+        is if they fit in a single listing page. Otherwise the ranges between
+        the common prefixes which contain objects are listed again as
+        separate shards so they are never all held in memory.
+        """
+        pages = self._iterate_listing_pages(container, prefix=prefix,
+                                            delimiter=delimiter)
+
+        # Ordered list of [common prefix or None, objects which follow it]
+        gaps = [[None, []]]
+        page_count = 0
+
+        for objects, prefixes in pages:
+            page_count += 1
+            items = [(obj.name, obj) for obj in objects] + \
+                [(value, None) for value in prefixes]
+
+            for name, obj in sorted(items, key=lambda item: item[0]):
+                if obj is None:
+                    gaps.append([name, []])
+                elif page_count == 1:
+                    gaps[-1][1].append(obj)
+                else:
+                    # Only remember that the gap contains objects
+                    gaps[-1][1] = True
+
+        shards = []
+
+        for index, (common_prefix, objects) in enumerate(gaps):
+            if common_prefix is not None:
+                shards.append(('range', common_prefix, None, None, None))
+
+            if objects is True or (objects and page_count > 1):
+                end_key = None
+
+                if index + 1 < len(gaps):
+                    end_key = gaps[index + 1][0]
+
+                shards.append(('range', prefix, delimiter, common_prefix,
+                               end_key))
+            elif objects:
+                shards.append(('objects', objects))
+
+        return shards
+
+    def _iterate_listing_pages(self, container, prefix=None, delimiter=None,
+                               marker=None, end_key=None, connection=None):
+        """
+        Return a generator of (objects, common prefixes) tuples for each page
+        of the container listing.
+
+        :param marker: Only list objects which names sort after the marker.
+        :type marker: ``str``
+
+        :param end_key: Stop listing after this object name (inclusive).
+        :type end_key: ``str``
+
+        :param connection: Connection used to perform the requests (defaults
+                           to the driver connection).
+        :type connection: :class:`libcloud.common.base.Connection`
+        """
+        connection = connection or self.connection
+
         params = {}
-        if ex_prefix:
-            params['prefix'] = ex_prefix
+        if prefix:
+            params['prefix'] = prefix
+
+        if delimiter:
+            params['delimiter'] = delimiter
 
-        last_key = None
-        exhausted = False
         container_path = self._get_container_path(container)
 
-        while not exhausted:
-            if last_key:
-                params['marker'] = last_key
+        while True:
+            if marker:
+                params['marker'] = marker
 
-            response = self.connection.request(container_path,
-                                               params=params)
+            response = connection.request(container_path, params=params)
 
             if response.status != httplib.OK:
                 raise LibcloudError('Unexpected status code: %s' %
                                     (response.status), driver=self)
 
-            objects = self._to_objs(obj=response.object,
-                                    xpath='Contents', container=container)
-            is_truncated = response.object.findtext(fixxpath(
+            body = response.object
+            objects = self._to_objs(obj=body, xpath='Contents',
+                                    container=container)
+            prefixes = [element.text for element in
+                        body.findall(fixxpath(xpath='CommonPrefixes/Prefix',
+                                              namespace=self.namespace))]
+            is_truncated = body.findtext(fixxpath(
                 xpath='IsTruncated', namespace=self.namespace)).lower()
             exhausted = (is_truncated == 'false')
 
-            last_key = None
-            for obj in objects:
-                last_key = obj.name
-                yield obj
+            # NextMarker is only returned when a delimiter is used
+            next_marker = body.findtext(fixxpath(xpath='NextMarker',
+                                                 namespace=self.namespace))
+
+            if not next_marker and (objects or prefixes):
+                next_marker = max([obj.name for obj in objects[-1:]] +
+                                  prefixes[-1:])
+
+            if end_key is not None:
+                count = len(objects) + len(prefixes)
+                objects = [obj for obj in objects if obj.name <= end_key]
+                prefixes = [value for value in prefixes if value <= end_key]
+                exhausted = exhausted or \
+                    (len(objects) + len(prefixes) < count)
+
+            yield objects, prefixes
+
+            if exhausted or not next_marker:
+                break
+
+            marker = next_marker
 
     def get_container(self, container_name):
         try:
@@ -430,6 +679,55 @@ class BaseS3StorageDriver(StorageDriver):
                                                  'chunk_size': chunk_size},
                                 success_status_code=httplib.OK)
 
+    def _download_object_as_stream_if_changed(self, obj, data_hash,
+                                              chunk_size=None):
+        """
+        @inherits: :class:`StorageDriver._download_object_as_stream_if_changed`
+        """
+        obj_path = self._get_object_path(obj.container, obj.name)
+        headers = {}
+
+        if data_hash is not None:
+            headers['If-None-Match'] = '"%s"' % (data_hash.replace('"', ''))
+
+        response = self.connection.request(obj_path, method='GET',
+                                           headers=headers, raw=True)
+
+        if response.status == httplib.NOT_MODIFIED:
+            return None
+
+        stream = self._get_object(obj=obj, callback=read_in_chunks,
+                                  response=response,
+                                  callback_kwargs={
+                                      'iterator': response.response,
+                                      'chunk_size': chunk_size},
+                                  success_status_code=httplib.OK)
+        etag = response.headers.get('etag', None)
+        md5_hash = None
+
+        if etag:
+            etag = etag.replace('"', '')
+
+            if self.content_md5_hash and self._is_md5_etag(
+                    self._get_encryption_extra(response.headers)):
+                md5_hash = _parse_md5_hash(etag)
+
+        return etag, stream, md5_hash
+
+    def download_object_range_as_stream(self, obj, start_bytes,
+                                        end_bytes=None, chunk_size=None):
+        obj_path = self._get_object_path(obj.container, obj.name)
+        headers = {'Range': self._get_standard_range_str(start_bytes,
+                                                         end_bytes)}
+        response = self.connection.request(obj_path, method='GET',
+                                           headers=headers, raw=True)
+
+        return self._get_object(obj=obj, callback=read_in_chunks,
+                                response=response,
+                                callback_kwargs={'iterator': response.response,
+                                                 'chunk_size': chunk_size},
+                                success_status_code=httplib.PARTIAL_CONTENT)
+
     def upload_object(self, file_path, container, object_name, extra=None,
                       verify_hash=True, ex_storage_class=None):
         """
@@ -634,6 +932,68 @@ class BaseS3StorageDriver(StorageDriver):
             raise LibcloudError('Error in multipart abort. status_code=%d' %
                                 (resp.status), driver=self)
 
+    def _get_upload_part_size(self, size):
+        if not self.supports_s3_multipart_upload:
+            return None
+
+        # Parts need to be bigger for very large objects
+        return max(CHUNK_SIZE, -(-int(size or 0) // MAX_UPLOAD_PARTS))
+
+    def _initiate_part_upload(self, container, object_name, extra=None):
+        object_path = self._get_object_path(container, object_name)
+        headers = self._get_copy_headers(extra)
+        response = self.connection.request(object_path + '?uploads',
+                                           method='POST', headers=headers)
+
+        if response.status != httplib.OK:
+            raise LibcloudError('Error initiating multipart upload. '
+                                'status_code=%s' % (response.status),
+                                driver=self)
+
+        upload_id = findtext(element=response.object, xpath='UploadId',
+                             namespace=self.namespace)
+        return {'container': container, 'object_name': object_name,
+                'object_path': object_path, 'upload_id': upload_id,
+                'extra': extra or {}}
+
+    def _upload_part(self, upload, part_number, data):
+        data_hash = md5(data)
+        params = {'partNumber': part_number, 'uploadId': upload['upload_id']}
+        request_path = '?'.join((upload['object_path'], urlencode(params)))
+        headers = {'Content-MD5': base64.b64encode(data_hash.digest())
+                   .decode('utf-8')}
+        response = self.connection.request(request_path, method='PUT',
+                                           data=data, headers=headers)
+
+        if response.status != httplib.OK:
+            raise LibcloudError('Error uploading part %s' % (part_number),
+                                driver=self)
+
+        etag = response.headers['etag']
+        encryption = self._get_encryption_extra(response.headers)
+
+        if self._is_md5_etag(encryption) and \
+                etag.replace('"', '') != data_hash.hexdigest():
+            raise ObjectHashMismatchError(
+                value='MD5 hash of part %s does not match' % (part_number),
+                object_name=upload['object_name'], driver=self)
+
+        return (part_number, etag)
+
+    def _complete_part_upload(self, upload, parts, size, data_hash=None):
+        etag = self._commit_multipart(upload['object_path'],
+                                      upload['upload_id'], parts)
+        extra = upload['extra']
+
+        return Object(name=upload['object_name'], size=size,
+                      hash=etag.replace('"', ''),
+                      extra={'acl': extra.get('acl', None)},
+                      meta_data=extra.get('meta_data', None),
+                      container=upload['container'], driver=self)
+
+    def _abort_part_upload(self, upload):
+        self._abort_multipart(upload['object_path'], upload['upload_id'])
+
     def upload_object_via_stream(self, iterator, container, object_name,
                                  extra=None, ex_storage_class=None):
         """
@@ -686,6 +1046,239 @@ class BaseS3StorageDriver(StorageDriver):
 
         return False
 
+    def copy_object(self, obj, destination_container,
+                    destination_object_name, extra=None):
+        """
+        @inherits: :class:`StorageDriver.copy_object`
+
+        Objects larger than 5 GB are copied using multipart upload with the
+        parts copied concurrently.
+        """
+        if not self._is_same_account(destination_container.driver):
+            return super(BaseS3StorageDriver, self).copy_object(
+                obj, destination_container, destination_object_name,
+                extra=extra)
+
+        object_path = self._get_object_path(destination_container,
+                                            destination_object_name)
+        source_path = self._get_object_path(obj.container, obj.name)
+
+        if self.supports_s3_multipart_upload and obj.size and \
+                int(obj.size) > COPY_MULTIPART_THRESHOLD:
+            if extra is None:
+                # Multipart upload doesn't copy the object meta data
+                source = self.get_object(obj.container.name, obj.name)
+                extra = self._get_copy_extra(source)
+
+            headers = self._get_copy_headers(extra)
+            etag = self._copy_object_multipart(object_path, source_path,
+                                               int(obj.size), headers)
+            last_modified = None
+        else:
+            headers = self._get_copy_headers(extra)
+            headers[self.http_vendor_prefix + '-copy-source'] = source_path
+
+            if extra is not None:
+                key = self.http_vendor_prefix + '-metadata-directive'
+                headers[key] = 'REPLACE'
+
+            response = self.connection.request(object_path, method='PUT',
+                                               headers=headers)
+            body = response.object
+
+            # Copy can fail after the response status has already been sent
+            if response.status != httplib.OK or body.tag.endswith('Error'):
+                raise LibcloudError('Failed to copy object: %s' %
+                                    (response.body), driver=self)
+
+            etag = findtext(element=body, xpath='ETag',
+                            namespace=self.namespace)
+            last_modified = findtext(element=body, xpath='LastModified',
+                                     namespace=self.namespace)
+
+        if extra is None:
+            meta_data = obj.meta_data
+        else:
+            meta_data = extra.get('meta_data', None)
+
+        return Object(name=destination_object_name, size=obj.size,
+                      hash=(etag or '').replace('"', ''),
+                      extra={'last_modified': last_modified},
+                      meta_data=meta_data, container=destination_container,
+                      driver=self)
+
+    def _get_copy_headers(self, extra):
+        """
+        Return headers with the attributes of the new object for a copy
+        request.
+        """
+        headers = {}
+
+        if extra is None:
+            return headers
+
+        content_type = extra.get('content_type', None)
+        meta_data = extra.get('meta_data', None)
+        acl = extra.get('acl', None)
+
+        if content_type:
+            headers['Content-Type'] = content_type
+
+        for key, value in list((meta_data or {}).items()):
+            headers[self.http_vendor_prefix + '-meta-%s' % (key)] = value
+
+        if acl:
+            headers[self.http_vendor_prefix + '-acl'] = acl
+
+        return headers
+
+    def _copy_object_multipart(self, object_path, source_path, size,
+                               headers):
+        """
+        Copy an object using multipart upload where each part is copied
+        from a range of the source object.
+
+        :return: ETag of the new object.
+        :rtype: ``str``
+        """
+        response = self.connection.request(object_path + '?uploads',
+                                           method='POST', headers=headers)
+
+        if response.status != httplib.OK:
+            raise LibcloudError('Error initiating multipart copy. '
+                                'status_code=%s' % (response.status),
+                                driver=self)
+
+        upload_id = findtext(element=response.object, xpath='UploadId',
+                             namespace=self.namespace)
+        ranges = [(index // COPY_CHUNK_SIZE + 1, index,
+                   min(index + COPY_CHUNK_SIZE, size) - 1)
+                  for index in range(0, size, COPY_CHUNK_SIZE)]
+
+        pool = self._get_worker_pool()
+
+        def copy_part(part):
+            part_number, start, end = part
+            connection = pool.get_connection()
+            params = {'partNumber': part_number, 'uploadId': upload_id}
+            request_path = '?'.join((object_path, urlencode(params)))
+            part_headers = {
+                self.http_vendor_prefix + '-copy-source': source_path,
+                self.http_vendor_prefix + '-copy-source-range':
+                'bytes=%d-%d' % (start, end)
+            }
+            response = connection.request(request_path, method='PUT',
+                                          headers=part_headers)
+
+            if response.status != httplib.OK or \
+                    response.object.tag.endswith('Error'):
+                raise LibcloudError('Error copying part %s' % (part_number),
+                                    driver=self)
+
+            etag = findtext(element=response.object, xpath='ETag',
+                            namespace=self.namespace)
+            return [[(part_number, etag)]]
+
+        try:
+            chunks = list(iterate_sharded(ranges, copy_part,
+                                          workers=self.concurrent_requests))
+            return self._commit_multipart(object_path, upload_id, chunks)
+        except Exception:
+            exc = sys.exc_info()[1]
+            self._abort_multipart(object_path, upload_id)
+            raise exc
+        finally:
+            pool.close()
+
+    def delete_objects(self, container, objects):
+        """
+        @inherits: :class:`StorageDriver.delete_objects`
+
+        Objects are deleted using multi-object delete requests (up to 1000
+        objects per request) if the provider supports them. If a request
+        fails, all the objects in it are reported as errors.
+        """
+        if not self.supports_s3_multi_object_delete:
+            return super(BaseS3StorageDriver, self).delete_objects(container,
+                                                                   objects)
+
+        names = [obj.name for obj in
+                 self._get_objects_for_names(container, objects)]
+        batches = [names[index:index + DELETE_OBJECTS_BATCH_SIZE] for index
+                   in range(0, len(names), DELETE_OBJECTS_BATCH_SIZE)]
+
+        if len(batches) == 1:
+            errors = self._try_delete_objects_batch(container, batches[0])
+        else:
+            pool = self._get_worker_pool()
+
+            def delete_batch(batch):
+                connection = pool.get_connection()
+                return [self._try_delete_objects_batch(
+                    container, batch, connection=connection)]
+
+            errors = pool.iterate(iterate_sharded(
+                batches, delete_batch, workers=self.concurrent_requests,
+                ordered=False))
+
+        return dict(errors)
+
+    def _try_delete_objects_batch(self, container, names, connection=None):
+        """
+        Same as :meth:`_delete_objects_batch`, but report all the objects as
+        errors if the request fails.
+        """
+        try:
+            return self._delete_objects_batch(container, names,
+                                              connection=connection)
+        except Exception:
+            e = sys.exc_info()[1]
+            return [(name, ObjectError(value=str(e), object_name=name,
+                                       driver=self))
+                    for name in names]
+
+    def _delete_objects_batch(self, container, names, connection=None):
+        """
+        Delete objects using a single multi-object delete request.
+
+        :return: A list of (object name, error) tuples for the objects which
+                 couldn't be deleted.
+        :rtype: ``list`` of ``tuple``
+        """
+        connection = connection or self.connection
+
+        root = Element('Delete')
+        quiet = SubElement(root, 'Quiet')
+        quiet.text = 'true'
+
+        for name in names:
+            key = SubElement(SubElement(root, 'Object'), 'Key')
+            key.text = name
+
+        data = tostring(root)
+        headers = {'Content-MD5': base64.b64encode(md5(b(data)).digest())
+                   .decode('utf-8'),
+                   'Content-Type': 'application/xml'}
+        request_path = self._get_container_path(container) + '?delete'
+        response = connection.request(request_path, data=data,
+                                      headers=headers, method='POST')
+
+        if response.status != httplib.OK:
+            raise LibcloudError('Unexpected status code: %s' %
+                                (response.status), driver=self)
+
+        errors = []
+        for element in response.object.findall(fixxpath(
+                xpath='Error', namespace=self.namespace)):
+            name, code, message = [findtext(element=element, xpath=xpath,
+                                            namespace=self.namespace)
+                                   for xpath in ['Key', 'Code', 'Message']]
+            error = ObjectError(value='%s (%s)' % (message, code),
+                                object_name=name, driver=self)
+            errors.append((name, error))
+
+        return errors
+
     def ex_iterate_multipart_uploads(self, container, prefix=None,
                                      delimiter=None):
         """
@@ -837,15 +1430,18 @@ class BaseS3StorageDriver(StorageDriver):
         headers = response.headers
         response = response.response
         server_hash = headers['etag'].replace('"', '')
+        obj_extra = self._get_encryption_extra(headers)
+        obj_extra['acl'] = acl
 
-        if (verify_hash and result_dict['data_hash'] != server_hash):
+        if (verify_hash and self._is_md5_etag(obj_extra) and
+                result_dict['data_hash'] != server_hash):
             raise ObjectHashMismatchError(
                 value='MD5 hash checksum does not match',
                 object_name=object_name, driver=self)
         elif response.status == httplib.OK:
             obj = Object(
                 name=object_name, size=bytes_transferred, hash=server_hash,
-                extra={'acl': acl}, meta_data=meta_data, container=container,
+                extra=obj_extra, meta_data=meta_data, container=container,
                 driver=self)
 
             return obj
@@ -854,6 +1450,47 @@ class BaseS3StorageDriver(StorageDriver):
                 'Unexpected status code, status_code=%s' % (response.status),
                 driver=self)
 
+    def _get_encryption_extra(self, headers):
+        """
+        Return the server side encryption information from the object
+        response headers.
+
+        :rtype: ``dict``
+        """
+        prefix = self.http_vendor_prefix + '-server-side-encryption'
+        return {
+            'server_side_encryption': headers.get(prefix, None),
+            'sse_customer_algorithm': headers.get(
+                prefix + '-customer-algorithm', None)
+        }
+
+    def _is_md5_etag(self, extra):
+        """
+        Return True if the ETag of an object with the provided encryption
+        information (see _get_encryption_extra) is the MD5 hash of its data.
+
+        :rtype: ``bool``
+        """
+        return (extra.get('server_side_encryption', None) in
+                MD5_ETAG_SERVER_SIDE_ENCRYPTION and
+                not extra.get('sse_customer_algorithm', None))
+
+    def _get_content_md5_hash(self, obj):
+        """
+        @inherits: :class:`StorageDriver._get_content_md5_hash`
+
+        Object listings don't include the server side encryption of the
+        objects so only the ETags of objects returned by get_object and
+        uploads are used.
+        """
+        extra = obj.extra or {}
+
+        if 'server_side_encryption' not in extra or \
+                not self._is_md5_etag(extra):
+            return None
+
+        return super(BaseS3StorageDriver, self)._get_content_md5_hash(obj)
+
     def _to_containers(self, obj, xpath):
         for element in obj.findall(fixxpath(xpath=xpath,
                                    namespace=self.namespace)):
@@ -879,8 +1516,9 @@ class BaseS3StorageDriver(StorageDriver):
 
     def _headers_to_object(self, object_name, container, headers):
         hash = headers['etag'].replace('"', '')
-        extra = {'content_type': headers['content-type'],
-                 'etag': headers['etag']}
+        extra = self._get_encryption_extra(headers)
+        extra['content_type'] = headers['content-type']
+        extra['etag'] = headers['etag']
         meta_data = {}
 
         if 'last-modified' in headers:
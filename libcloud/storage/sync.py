@@ -0,0 +1,532 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Incremental synchronization of local directories and containers.
+
+Only the files (objects) which have been added or changed since the last
+synchronization are transferred. Optionally, objects which don't exist in the
+source anymore are deleted.
+
+Example usage:
+
+    manifest = SyncManifest('/var/lib/backup/manifest.db')
+    result = sync_directory('/srv/www', container, prefix='www/',
+                            delete=True, manifest=manifest)
+    print(result.transferred, result.errors)
+
+When a manifest is used, the state of the destination is read from the
+manifest so the destination container doesn't need to be listed again.
+Changes which are made to the destination container by other clients are
+not detected in this case.
+"""
+
+from __future__ import with_statement
+
+import os
+import sys
+import hashlib
+import threading
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+from libcloud.common.types import LibcloudError
+from libcloud.storage.base import Container
+from libcloud.storage.transfer import _get_md5_hash
+
+__all__ = [
+    'SyncManifest',
+    'SyncResult',
+
+    'sync_directory',
+    'sync_containers'
+]
+
+# Size of the chunks in which the files are read when calculating the hash
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class SyncManifest(object):
+    """
+    SQLite database which stores the state of the synchronized objects after
+    the last synchronization.
+
+    A single manifest can be used for multiple synchronizations (each
+    source, destination container and prefix combination is stored
+    separately).
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path to the database file (created if it doesn't
+                     exist).
+        :type path: ``str``
+        """
+        if sqlite3 is None:
+            raise LibcloudError('sqlite3 module is not available')
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries (scope TEXT, name TEXT, '
+                'size INTEGER, mtime REAL, hash TEXT, '
+                'PRIMARY KEY (scope, name))')
+            self._connection.commit()
+
+    def get_entries(self, scope):
+        """
+        Return all the entries for the provided scope.
+
+        :return: Dictionary of object name to (size, mtime, hash) tuple.
+        :rtype: ``dict``
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                'SELECT name, size, mtime, hash FROM entries WHERE scope = ?',
+                (scope,))
+            return dict([(row[0], tuple(row[1:])) for row in cursor])
+
+    def update_entries(self, scope, entries):
+        """
+        Add or update entries.
+
+        :param entries: List of (object name, size, mtime, hash) tuples.
+        :type entries: ``list`` of ``tuple``
+        """
+        with self._lock:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO entries (scope, name, size, mtime, '
+                'hash) VALUES (?, ?, ?, ?, ?)',
+                [(scope,) + tuple(entry) for entry in entries])
+            self._connection.commit()
+
+    def remove_entries(self, scope, names):
+        """
+        Remove entries for the provided object names.
+
+        :type names: ``list`` of ``str``
+        """
+        with self._lock:
+            self._connection.executemany(
+                'DELETE FROM entries WHERE scope = ? AND name = ?',
+                [(scope, name) for name in names])
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class SyncResult(object):
+    """
+    Result of a synchronization.
+    """
+
+    def __init__(self):
+        # Names of the objects which have been uploaded or copied
+        self.transferred = []
+
+        # Names of the objects which have been deleted
+        self.deleted = []
+
+        # Number of objects which haven't changed
+        self.unchanged = 0
+
+        # Errors keyed by the object name
+        self.errors = {}
+
+    def __repr__(self):
+        return ('<SyncResult: transferred=%s, deleted=%s, unchanged=%s, '
+                'errors=%s>' % (len(self.transferred), len(self.deleted),
+                                self.unchanged, len(self.errors)))
+
+
+def sync_directory(path, container, prefix='', delete=False, manifest=None,
+                   checksum=True, workers=None):
+    """
+    Synchronize a local directory tree to a container.
+
+    File is uploaded if the object doesn't exist or if its size or content
+    hash differs. If the object content hash is not known, file is uploaded
+    if it has been modified after the object. When a manifest is used,
+    files are only compared to the state stored in the manifest (size and
+    modification time) after the first synchronization.
+
+    :param path: Path to the local directory.
+    :type path: ``str``
+
+    :param container: Destination container.
+    :type container: :class:`Container`
+
+    :param prefix: Prefix which is added to the object names (e.g.
+                   "backup/").
+    :type prefix: ``str``
+
+    :param delete: Delete objects under the prefix which don't exist in the
+                   local directory.
+    :type delete: ``bool``
+
+    :param manifest: Manifest with the state of the last synchronization.
+    :type manifest: :class:`SyncManifest`
+
+    :param checksum: Compare hashes of the files which have the same size as
+                     the objects (only for the objects which have a MD5
+                     content hash). Otherwise the size and modification
+                     time are compared.
+    :type checksum: ``bool``
+
+    :param workers: Number of concurrent uploads (defaults to the driver
+                    ``concurrent_requests``).
+    :type workers: ``int``
+
+    :rtype: :class:`SyncResult`
+    """
+    driver = container.driver
+    scope = 'directory:%s|%s' % (os.path.abspath(path),
+                                 _get_scope(container, prefix))
+    result = SyncResult()
+
+    entries, objects = _get_destination_state(container, prefix, manifest,
+                                              scope)
+    files = {}
+    transfers = []
+    unchanged = []
+
+    for name, file_path, size, mtime in _walk_directory(path):
+        name = prefix + name
+        files[name] = file_path
+
+        if objects is None:
+            entry = entries.get(name, None)
+            changed = entry is None or entry[0] != size or entry[1] != mtime
+        else:
+            obj = objects.get(name, None)
+            changed = obj is None or \
+                _is_file_changed(file_path, size, mtime, obj,
+                                 checksum=checksum)
+
+            if not changed:
+                unchanged.append((name, size, mtime, obj.hash))
+
+        if changed:
+            transfers.append((name, file_path, size, mtime))
+        else:
+            result.unchanged += 1
+
+    def upload(driver, transfer):
+        name, file_path, _, _ = transfer
+
+        try:
+            return driver.upload_object(file_path, container, name)
+        except Exception:
+            return sys.exc_info()[1]
+
+    results = driver._map_concurrently(upload, transfers, workers=workers)
+    _update_result(result, manifest, scope, transfers, results, unchanged,
+                   lambda transfer, obj: (transfer[0], transfer[2],
+                                          transfer[3], obj.hash))
+
+    if delete:
+        existing = entries if objects is None else objects
+        names = [name for name in existing if name not in files]
+        _delete_objects(result, manifest, scope, container, names)
+
+    return result
+
+
+def sync_containers(source_container, destination_container, prefix='',
+                    destination_prefix=None, delete=False, manifest=None,
+                    workers=None):
+    """
+    Synchronize objects from one container to another. The containers can
+    belong to different drivers (providers).
+
+    Objects are copied using server side copy if both containers use the
+    same provider account, otherwise they are streamed through this host.
+
+    :param source_container: Source container.
+    :type source_container: :class:`Container`
+
+    :param destination_container: Destination container.
+    :type destination_container: :class:`Container`
+
+    :param prefix: Only synchronize objects with this prefix.
+    :type prefix: ``str``
+
+    :param destination_prefix: Prefix of the destination objects which
+                               replaces the source prefix (defaults to the
+                               source prefix).
+    :type destination_prefix: ``str``
+
+    :param delete: Delete destination objects under the destination prefix
+                   which don't exist in the source container.
+    :type delete: ``bool``
+
+    :param manifest: Manifest with the state of the last synchronization.
+    :type manifest: :class:`SyncManifest`
+
+    :param workers: Number of concurrent copies (defaults to the source
+                    driver ``concurrent_requests``).
+    :type workers: ``int``
+
+    :rtype: :class:`SyncResult`
+    """
+    if destination_prefix is None:
+        destination_prefix = prefix
+
+    source_driver = source_container.driver
+    scope = 'container:%s|%s' % (_get_scope(source_container, prefix),
+                                 _get_scope(destination_container,
+                                            destination_prefix))
+    result = SyncResult()
+
+    entries, objects = _get_destination_state(destination_container,
+                                              destination_prefix, manifest,
+                                              scope)
+    names = set()
+    transfers = []
+    unchanged = []
+
+    for obj in _iterate_objects(source_container, prefix):
+        name = destination_prefix + obj.name[len(prefix):]
+        names.add(name)
+
+        if objects is None:
+            entry = entries.get(name, None)
+            changed = entry is None or entry[0] != obj.size or \
+                entry[2] != obj.hash
+        else:
+            destination = objects.get(name, None)
+            changed = destination is None or \
+                _is_object_changed(obj, destination)
+
+            if not changed:
+                unchanged.append((name, obj.size, None, obj.hash))
+
+        if changed:
+            transfers.append((name, obj))
+        else:
+            result.unchanged += 1
+
+    local = threading.local()
+    pool = destination_container.driver._get_worker_pool()
+
+    def copy(driver, transfer):
+        name, obj = transfer
+
+        # Each worker thread needs its own destination connection too
+        container = getattr(local, 'container', None)
+
+        if container is None and driver is source_driver:
+            # Serial copy, the original driver can be used
+            container = destination_container
+        elif container is None:
+            container = Container(name=destination_container.name,
+                                  extra=destination_container.extra,
+                                  driver=pool.get_driver())
+            local.container = container
+
+        try:
+            copied = driver.copy_object(obj, container, name)
+        except Exception:
+            return sys.exc_info()[1]
+
+        copied.container = destination_container
+        copied.driver = destination_container.driver
+        return copied
+
+    try:
+        results = source_driver._map_concurrently(copy, transfers,
+                                                  workers=workers)
+    finally:
+        pool.close()
+
+    _update_result(result, manifest, scope, transfers, results, unchanged,
+                   lambda transfer, copied: (transfer[0], transfer[1].size,
+                                             None, transfer[1].hash))
+
+    if delete:
+        existing = entries if objects is None else objects
+        deletions = [name for name in existing if name not in names]
+        _delete_objects(result, manifest, scope, destination_container,
+                        deletions)
+
+    return result
+
+
+def _get_scope(container, prefix):
+    driver = container.driver
+    return '%s:%s@%s:%s:%s' % (driver.name, driver.key,
+                               driver.connection.host, container.name, prefix)
+
+
+def _get_destination_state(container, prefix, manifest, scope):
+    """
+    Return a (manifest entries, destination objects) tuple. Destination
+    objects are None if the state is read from the manifest.
+    """
+    entries = {}
+
+    if manifest is not None:
+        entries = manifest.get_entries(scope)
+
+    if entries:
+        return entries, None
+
+    # First synchronization, destination state needs to be listed
+    objects = dict([(obj.name, obj) for obj in
+                    _iterate_objects(container, prefix)])
+    return entries, objects
+
+
+def _update_result(result, manifest, scope, transfers, results, unchanged,
+                   get_entry):
+    entries = list(unchanged)
+
+    for transfer, value in zip(transfers, results):
+        if isinstance(value, Exception):
+            result.errors[transfer[0]] = value
+            continue
+
+        result.transferred.append(transfer[0])
+        entries.append(get_entry(transfer, value))
+
+    if manifest is not None and entries:
+        manifest.update_entries(scope, entries)
+
+
+def _delete_objects(result, manifest, scope, container, names):
+    if not names:
+        return
+
+    errors = container.driver.delete_objects(container, names)
+    result.errors.update(errors)
+    result.deleted = [name for name in names if name not in errors]
+
+    if manifest is not None:
+        manifest.remove_entries(scope, result.deleted)
+
+
+def _iterate_objects(container, prefix):
+    """
+    Return a generator of objects in the container which names start with
+    the prefix.
+    """
+    driver = container.driver
+    objects = None
+
+    if prefix:
+        try:
+            objects = driver.iterate_container_objects(container,
+                                                       ex_prefix=prefix)
+        except TypeError:
+            # Driver doesn't support listing by prefix
+            pass
+
+    if objects is None:
+        objects = driver.iterate_container_objects(container)
+
+    for obj in objects:
+        if obj.name.startswith(prefix):
+            yield obj
+
+
+def _walk_directory(path):
+    """
+    Return a generator of (relative name, path, size, mtime) tuples for all
+    the files in the directory tree. Relative names use "/" as the
+    separator. Symbolic links to directories are not followed.
+    """
+    scandir = getattr(os, 'scandir', None)
+    directories = ['']
+
+    while directories:
+        relative = directories.pop()
+        directory = os.path.join(path, relative)
+
+        if scandir is not None:
+            for entry in scandir(directory):
+                name = relative + entry.name
+
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(name + '/')
+                elif entry.is_file():
+                    stat = entry.stat()
+                    yield name, entry.path, stat.st_size, stat.st_mtime
+
+            continue
+
+        for filename in os.listdir(directory):
+            file_path = os.path.join(directory, filename)
+            name = relative + filename
+
+            if os.path.isdir(file_path) and not os.path.islink(file_path):
+                directories.append(name + '/')
+            elif os.path.isfile(file_path):
+                stat = os.stat(file_path)
+                yield name, file_path, stat.st_size, stat.st_mtime
+
+
+def _is_file_changed(file_path, size, mtime, obj, checksum=True):
+    if obj.size is not None and int(obj.size) != size:
+        return True
+
+    remote_hash = checksum and _get_md5_hash(obj)
+
+    if not remote_hash:
+        return _is_modified_after(mtime, obj)
+
+    file_hash = hashlib.md5()
+
+    with open(file_path, 'rb') as fp:
+        for data in iter(lambda: fp.read(HASH_CHUNK_SIZE), b''):
+            file_hash.update(data)
+
+    return file_hash.hexdigest() != remote_hash
+
+
+def _is_object_changed(source, destination):
+    if source.size is not None and destination.size is not None and \
+            int(source.size) != int(destination.size):
+        return True
+
+    source_hash = _get_md5_hash(source)
+    destination_hash = _get_md5_hash(destination)
+
+    if source_hash and destination_hash:
+        return source_hash != destination_hash
+
+    return _is_modified_after(source.driver._get_modify_time(source),
+                              destination)
+
+
+def _is_modified_after(mtime, obj):
+    """
+    Return True if the modification time is later than the modification
+    time of the object. Only the size can be compared if either of them is
+    not known.
+    """
+    obj_mtime = obj.driver._get_modify_time(obj)
+
+    if mtime is None or obj_mtime is None:
+        return False
+
+    return mtime > obj_mtime
@@ -0,0 +1,529 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Transfer of objects between containers of different providers.
+
+Object data is streamed through this host in parts so whole objects are
+never kept in memory. When the destination driver supports uploading objects
+in parts (e.g. S3 multipart upload and Azure block blobs), parts are uploaded
+concurrently. If the source driver also supports ranged downloads, parts are
+downloaded concurrently too.
+
+MD5 hash of the transferred data is compared to the MD5 hash of the source
+object content (if the source driver provides one) before the upload is
+completed so a corrupted transfer never replaces the destination object.
+
+Example usage:
+
+    budget = TransferBudget(max_requests=32, max_bandwidth=50 * 1024 * 1024)
+    results = transfer_objects([(obj, container, obj.name) for obj in
+                                 source_container.list_objects()],
+                                budget=budget)
+"""
+
+from __future__ import with_statement
+
+import sys
+import time
+import hashlib
+import threading
+
+from libcloud.utils.py3 import b
+from libcloud.utils.py3 import next
+from libcloud.utils.misc import get_secure_random_string
+from libcloud.utils.files import read_in_chunks
+from libcloud.utils.concurrency import iterate_sharded
+from libcloud.common.types import LibcloudError
+from libcloud.storage.types import ObjectError, ObjectHashMismatchError
+
+__all__ = [
+    'TransferBudget',
+
+    'transfer_object',
+    'transfer_objects'
+]
+
+# Number of parts of a single object which are transferred at the same time
+DEFAULT_PART_WORKERS = 4
+
+# Maximum number of parts of a single object which are kept in memory
+DEFAULT_MAX_PENDING_PARTS = 8
+
+# Number of objects which are transferred at the same time
+DEFAULT_TRANSFER_WORKERS = 8
+
+# Name of the temporary object the data is uploaded to before its hash is
+# verified when the destination driver doesn't support uploading parts
+TEMP_OBJECT_NAME_FORMAT = '%s.transfer-%s'
+
+# How often (in seconds) workers waiting for a free buffer check if the
+# transfer has been aborted
+POLL_INTERVAL = 0.1
+
+
+class TransferBudget(object):
+    """
+    Concurrency and bandwidth budget which can be shared by multiple
+    transfers running at the same time.
+    """
+
+    def __init__(self, max_requests=16, max_bandwidth=None):
+        """
+        :param max_requests: Maximum number of part transfers in progress at
+                             the same time.
+        :type max_requests: ``int``
+
+        :param max_bandwidth: Maximum number of bytes transferred per
+                              second. None means no limit.
+        :type max_bandwidth: ``int``
+        """
+        self.max_requests = max_requests
+        self.max_bandwidth = max_bandwidth
+
+        self._semaphore = threading.Semaphore(max_requests)
+        self._lock = threading.Lock()
+        self._tokens = float(max_bandwidth or 0)
+        self._updated = time.time()
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self._semaphore.release()
+
+    def consume(self, size):
+        """
+        Record transferred data and wait if the bandwidth limit has been
+        exceeded.
+
+        :param size: Number of transferred bytes.
+        :type size: ``int``
+
+        :return: Number of seconds spent waiting.
+        :rtype: ``float``
+        """
+        if not self.max_bandwidth:
+            return 0
+
+        with self._lock:
+            now = time.time()
+            elapsed = max(0, now - self._updated)
+            self._tokens = min(self.max_bandwidth,
+                               self._tokens + elapsed * self.max_bandwidth)
+            self._updated = now
+            self._tokens -= size
+
+            # Each caller waits until the data it has consumed is paid off
+            wait = max(0.0, -self._tokens / self.max_bandwidth)
+
+        if wait:
+            time.sleep(wait)
+
+        return wait
+
+
+def transfer_object(obj, destination_container, destination_object_name=None,
+                    extra=None, verify_hash=True,
+                    workers=DEFAULT_PART_WORKERS,
+                    max_pending_parts=DEFAULT_MAX_PENDING_PARTS, budget=None):
+    """
+    Transfer an object to a container which can belong to a different
+    provider.
+
+    Objects are copied server side if both containers use the same provider
+    account (see :meth:`StorageDriver.copy_object`).
+
+    :param obj: Object to transfer.
+    :type obj: :class:`Object`
+
+    :param destination_container: Destination container.
+    :type destination_container: :class:`Container`
+
+    :param destination_object_name: Name of the new object (defaults to the
+                                    name of the source object).
+    :type destination_object_name: ``str``
+
+    :param extra: Extra attributes of the new object (content_type,
+                  meta_data). If not provided, attributes of the source
+                  object are used.
+    :type extra: ``dict``
+
+    :param verify_hash: Verify that the MD5 hash of the transferred data
+                        matches the MD5 hash of the source object content
+                        (if the source driver provides it).
+    :type verify_hash: ``bool``
+
+    :param workers: Number of parts transferred at the same time.
+    :type workers: ``int``
+
+    :param max_pending_parts: Maximum number of parts kept in memory.
+    :type max_pending_parts: ``int``
+
+    :param budget: Budget shared with other transfers.
+    :type budget: :class:`TransferBudget`
+
+    :return: The new object.
+    :rtype: :class:`Object`
+    """
+    transfer = _ObjectTransfer(obj.driver, obj, destination_container.driver,
+                               destination_container,
+                               destination_object_name or obj.name,
+                               extra=extra, verify_hash=verify_hash,
+                               workers=workers,
+                               max_pending_parts=max_pending_parts,
+                               budget=budget)
+    return transfer.run()
+
+
+def transfer_objects(transfers, workers=DEFAULT_TRANSFER_WORKERS, budget=None,
+                     **kwargs):
+    """
+    Transfer multiple objects at the same time.
+
+    :param transfers: List of (object, destination container, destination
+                      object name) tuples. Name can be None.
+    :type transfers: ``list`` of ``tuple``
+
+    :param workers: Number of objects transferred at the same time.
+    :type workers: ``int``
+
+    :param budget: Budget shared by all the transfers. Defaults to a budget
+                   without a bandwidth limit.
+    :type budget: :class:`TransferBudget`
+
+    Other keyword arguments are passed to :func:`transfer_object`.
+
+    :return: The new object or an error for each transfer (in the same
+             order as the transfers).
+    :rtype: ``list`` of :class:`Object` or :class:`ObjectError`
+    """
+    transfers = list(transfers)
+    budget = budget or TransferBudget()
+    results = [None] * len(transfers)
+
+    # Each thread uses its own copy of every driver
+    pools = {}
+
+    for obj, container, _ in transfers:
+        for driver in [obj.driver, container.driver]:
+            if id(driver) not in pools:
+                pools[id(driver)] = driver._get_worker_pool()
+
+    def get_worker_driver(driver):
+        return pools[id(driver)].get_driver()
+
+    def process(index):
+        obj, container, name = transfers[index]
+
+        try:
+            transfer = _ObjectTransfer(get_worker_driver(obj.driver), obj,
+                                       get_worker_driver(container.driver),
+                                       container, name or obj.name,
+                                       budget=budget, **kwargs)
+            result = transfer.run()
+            result.driver = container.driver
+        except Exception:
+            e = sys.exc_info()[1]
+            result = ObjectError(value=str(e), object_name=obj.name,
+                                 driver=obj.driver)
+
+        return [[(index, result)]]
+
+    try:
+        for index, result in iterate_sharded(range(0, len(transfers)),
+                                             process, workers=workers,
+                                             ordered=False):
+            results[index] = result
+    finally:
+        for pool in pools.values():
+            pool.close()
+
+    return results
+
+
+def _get_md5_hash(obj):
+    """
+    Return MD5 hash of the object content or None if it's not known (see
+    :meth:`StorageDriver._get_content_md5_hash`).
+    """
+    return obj.driver._get_content_md5_hash(obj)
+
+
+class _WorkerDrivers(object):
+    """
+    Copies of the source and destination drivers used by the worker threads.
+
+    Copies are created on first use by each thread and their connections are
+    closed by :meth:`close`.
+    """
+
+    def __init__(self, source_driver, destination_driver):
+        self._source = source_driver._get_worker_pool()
+        self._destination = destination_driver._get_worker_pool()
+
+    @property
+    def source(self):
+        return self._source.get_driver()
+
+    @property
+    def destination(self):
+        return self._destination.get_driver()
+
+    def close(self):
+        self._source.close()
+        self._destination.close()
+
+
+class _ObjectTransfer(object):
+    """
+    Transfer of a single object.
+    """
+
+    def __init__(self, source_driver, obj, destination_driver,
+                 destination_container, object_name, extra=None,
+                 verify_hash=True, workers=DEFAULT_PART_WORKERS,
+                 max_pending_parts=DEFAULT_MAX_PENDING_PARTS, budget=None):
+        self.source_driver = source_driver
+        self.obj = obj
+        self.destination_driver = destination_driver
+        self.destination_container = destination_container
+        self.object_name = object_name
+        self.extra = extra
+        self.workers = workers
+        self.max_pending_parts = max(1, max_pending_parts)
+        self.budget = budget or TransferBudget(max_requests=workers)
+
+        self.size = None
+        self.expected_hash = None
+
+        if obj.size is not None:
+            self.size = int(obj.size)
+
+        if verify_hash:
+            self.expected_hash = _get_md5_hash(obj)
+
+    def run(self):
+        if self.source_driver._is_same_account(self.destination_driver):
+            return self.source_driver.copy_object(
+                self.obj, self.destination_container, self.object_name,
+                extra=self.extra)
+
+        if self.extra is None:
+            self.extra = self.source_driver._get_copy_extra(self.obj)
+
+        part_size = self.destination_driver._get_upload_part_size(self.size)
+
+        if part_size is None:
+            return self._transfer_stream()
+        elif self.source_driver.supports_range_downloads and \
+                self.size is not None:
+            return self._transfer_ranges(part_size)
+
+        return self._transfer_sequential(part_size)
+
+    def _transfer_stream(self):
+        """
+        Transfer the object using upload_object_via_stream (destination
+        driver doesn't support uploading parts).
+
+        To verify the hash, data is uploaded to a temporary object which is
+        copied server side in place of the destination object once the hash
+        matches. Hash is not verified if the destination driver doesn't
+        support server side copy.
+        """
+        verify_hash = self.expected_hash and \
+            self.destination_driver.supports_server_side_copy
+        object_name = self.object_name
+        data_hash = hashlib.md5()
+
+        if verify_hash:
+            object_name = TEMP_OBJECT_NAME_FORMAT % \
+                (self.object_name, get_secure_random_string(16))
+
+        def iterate_data():
+            for data in self.source_driver.download_object_as_stream(
+                    self.obj):
+                self.budget.consume(len(data))
+                data_hash.update(data)
+                yield data
+
+        with self.budget:
+            result = self.destination_driver.upload_object_via_stream(
+                iterator=iterate_data(), container=self.destination_container,
+                object_name=object_name, extra=self.extra)
+
+        if not verify_hash:
+            return result
+
+        try:
+            self._check_hash(data_hash.hexdigest())
+            return self.destination_driver.copy_object(
+                result, self.destination_container, self.object_name,
+                extra=self.extra)
+        finally:
+            try:
+                self.destination_driver.delete_object(result)
+            except Exception:
+                # Original error is more useful
+                pass
+
+    def _transfer_ranges(self, part_size):
+        """
+        Download and upload the parts concurrently.
+        """
+        parts = [(index // part_size + 1, index,
+                  min(index + part_size, self.size))
+                 for index in range(0, self.size, part_size)] or [(1, 0, 0)]
+        drivers = _WorkerDrivers(self.source_driver, self.destination_driver)
+        window = threading.Condition()
+        state = {'consumed': 0, 'stopped': False}
+
+        def process(part):
+            part_number, start, end = part
+
+            # Parts are consumed in order so the parts which are ahead of
+            # the consumer wait for free buffers
+            with window:
+                while part_number > state['consumed'] + \
+                        self.max_pending_parts:
+                    if state['stopped']:
+                        return []
+
+                    window.wait(POLL_INTERVAL)
+
+            with self.budget:
+                data = b('')
+
+                if end > start:
+                    data = b('').join(
+                        drivers.source.download_object_range_as_stream(
+                            self.obj, start, end))
+
+                self.budget.consume(len(data))
+
+                if len(data) != end - start:
+                    raise LibcloudError('Unexpected size of part %d: %d' %
+                                        (part_number, len(data)),
+                                        driver=self.source_driver)
+
+                token = drivers.destination._upload_part(upload, part_number,
+                                                         data)
+
+            return [[(data, token)]]
+
+        upload = self.destination_driver._initiate_part_upload(
+            self.destination_container, self.object_name, self.extra)
+        data_hash = hashlib.md5()
+        tokens = []
+
+        try:
+            for data, token in iterate_sharded(parts, process,
+                                               workers=self.workers,
+                                               max_pending_pages=1):
+                data_hash.update(data)
+                tokens.append(token)
+
+                with window:
+                    state['consumed'] += 1
+                    window.notify_all()
+
+            data_hash = data_hash.hexdigest()
+            self._check_hash(data_hash)
+            return self.destination_driver._complete_part_upload(
+                upload, tokens, self.size, data_hash)
+        except Exception:
+            e = sys.exc_info()[1]
+            self._abort(upload)
+            raise e
+        finally:
+            with window:
+                state['stopped'] = True
+                window.notify_all()
+
+            drivers.close()
+
+    def _transfer_sequential(self, part_size):
+        """
+        Read the object sequentially and upload the parts concurrently.
+        """
+        iterator = self.source_driver.download_object_as_stream(
+            self.obj, chunk_size=part_size)
+        chunks = read_in_chunks(iterator, chunk_size=part_size,
+                                fill_size=True, yield_empty=True)
+        drivers = _WorkerDrivers(self.source_driver, self.destination_driver)
+        lock = threading.Lock()
+        state = {'part_number': 0, 'size': 0}
+        data_hash = hashlib.md5()
+
+        def process(_):
+            while True:
+                # Parts are read and hashed in order
+                with lock:
+                    try:
+                        data = next(chunks)
+                    except StopIteration:
+                        return
+
+                    state['part_number'] += 1
+                    state['size'] += len(data)
+                    part_number = state['part_number']
+                    data_hash.update(data)
+
+                with self.budget:
+                    self.budget.consume(len(data))
+                    token = drivers.destination._upload_part(
+                        upload, part_number, data)
+
+                yield [(part_number, token)]
+
+        upload = self.destination_driver._initiate_part_upload(
+            self.destination_container, self.object_name, self.extra)
+
+        try:
+            parts = sorted(iterate_sharded(range(0, self.workers), process,
+                                           workers=self.workers,
+                                           ordered=False))
+
+            if self.size is not None and state['size'] != self.size:
+                raise LibcloudError('Unexpected object size: %d' %
+                                    (state['size']),
+                                    driver=self.source_driver)
+
+            self._check_hash(data_hash.hexdigest())
+            return self.destination_driver._complete_part_upload(
+                upload, [token for (_, token) in parts], state['size'],
+                data_hash.hexdigest())
+        except Exception:
+            e = sys.exc_info()[1]
+            self._abort(upload)
+            raise e
+        finally:
+            drivers.close()
+
+    def _check_hash(self, data_hash):
+        if self.expected_hash and data_hash != self.expected_hash:
+            raise ObjectHashMismatchError(
+                value='MD5 hash of the transferred data does not match the '
+                      'source object', object_name=self.object_name,
+                driver=self.destination_driver)
+
+    def _abort(self, upload):
+        try:
+            self.destination_driver._abort_part_upload(upload)
+        except Exception:
+            # Original error is more useful
+            pass
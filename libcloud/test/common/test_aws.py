@@ -4,6 +4,7 @@ from datetime import datetime
 
 import mock
 
+from libcloud.common import aws
 from libcloud.common.aws import SignedAWSConnection
 from libcloud.common.aws import AWSRequestSignerAlgorithmV4
 from libcloud.test import LibcloudTestCase
@@ -122,6 +123,26 @@ class AWSRequestSignerAlgorithmV4TestCase(LibcloudTestCase):
 
         self.assertEqual(key, 'AWS4my_secret|20150304|my_region|my_service|aws4_request')
 
+    def test_get_key_to_sign_with_is_cached(self):
+        with mock.patch('libcloud.common.aws._sign') as mock_sign:
+            mock_sign.return_value = 'my_key'
+            self.signer._get_key_to_sign_with(self.now)
+            self.signer._get_key_to_sign_with(self.now)
+            self.assertEqual(mock_sign.call_count, 4)
+
+            # Key needs to be derived again once the date changes
+            self.signer._get_key_to_sign_with(datetime(2015, 3, 5))
+            self.assertEqual(mock_sign.call_count, 8)
+
+    def test_get_key_to_sign_with_returns_same_key_when_cached(self):
+        key1 = self.signer._get_key_to_sign_with(self.now)
+        key2 = self.signer._get_key_to_sign_with(self.now)
+        self.assertEqual(key1, key2)
+
+        SignedAWSConnection.service_name = 'my_other_service'
+        key3 = self.signer._get_key_to_sign_with(self.now)
+        self.assertNotEqual(key1, key3)
+
     def test_get_signed_headers_contains_all_headers_lowercased(self):
         headers = {'Content-Type': 'text/plain', 'Host': 'my_host', 'X-Special-Header': ''}
         signed_headers = self.signer._get_signed_headers(headers)
@@ -214,6 +235,14 @@ class AWSRequestSignerAlgorithmV4TestCase(LibcloudTestCase):
         self.assertEqual('Action=a~b.c_d-e',
                          self.signer._get_request_params({'Action': 'a~b.c_d-e'}))
 
+    def test_get_request_params_does_not_cache_long_values(self):
+        user_data = 'secret' * 100
+        self.assertEqual(self.signer._get_request_params({'UserData': user_data}),
+                         'UserData=' + user_data)
+        self.assertFalse(any(value == user_data for (value, _) in
+                             aws._quoted_values_cache))
+        self.assertTrue(('UserData', '') in aws._quoted_values_cache)
+
     def test_get_payload_hash_returns_digest_of_empty_string_for_GET_requests(self):
         SignedAWSConnection.method = 'GET'
         self.assertEqual(self.signer._get_payload_hash(),
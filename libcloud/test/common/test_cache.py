@@ -0,0 +1,275 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+from mock import Mock
+
+from libcloud.utils.py3 import httplib
+from libcloud.common.base import Connection
+from libcloud.common.cache import CachedHTTPResponse
+from libcloud.common.cache import ResponseCacheEntry
+from libcloud.common.cache import MemoryResponseCache
+from libcloud.common.cache import FileResponseCache
+from libcloud.test import unittest
+
+
+def get_entry(path='/servers', body='body', ttl=60, headers=None):
+    return ResponseCacheEntry(status=httplib.OK, reason='OK',
+                              headers=headers or {}, body=body, path=path,
+                              expires=time.time() + ttl)
+
+
+class MemoryResponseCacheTestCase(unittest.TestCase):
+    def get_cache(self, **kwargs):
+        return MemoryResponseCache(**kwargs)
+
+    def test_get_ttl(self):
+        cache = self.get_cache(ttl_policies={'DescribeRegions': 100,
+                                             '*/flavors*': 200})
+        self.assertEqual(cache.get_ttl('/', {'Action': 'DescribeRegions'}),
+                         100)
+        self.assertEqual(cache.get_ttl('/', {'Action': 'DescribeImages'}), 0)
+        self.assertEqual(cache.get_ttl('/v2/1337/flavors/detail'), 200)
+        self.assertEqual(cache.get_ttl('/v2/1337/servers'), 0)
+
+    def test_get_ttl_mutating_actions_are_not_cached(self):
+        cache = self.get_cache(ttl_policies={'*': 100})
+        self.assertEqual(cache.get_ttl('/', {'Action': 'DescribeImages'}),
+                         100)
+        self.assertEqual(cache.get_ttl('/', {'Action': 'RunInstances'}), 0)
+        self.assertEqual(cache.get_ttl('/', {'Action': 'RebootInstances'}),
+                         0)
+
+    def test_is_read_only_request(self):
+        cache = self.get_cache()
+        self.assertTrue(cache.is_read_only_request('GET'))
+        self.assertTrue(cache.is_read_only_request('HEAD'))
+        self.assertTrue(cache.is_read_only_request(
+            'GET', {'Action': 'DescribeImages'}))
+        self.assertFalse(cache.is_read_only_request(
+            'GET', {'Action': 'TerminateInstances'}))
+        self.assertFalse(cache.is_read_only_request('POST'))
+
+    def test_set_and_get(self):
+        cache = self.get_cache()
+        self.assertEqual(cache.get('key1'), None)
+
+        cache.set('key1', get_entry(body='body1'))
+        self.assertEqual(cache.get('key1').body, 'body1')
+
+        cache.delete('key1')
+        self.assertEqual(cache.get('key1'), None)
+
+    def test_invalidate(self):
+        cache = self.get_cache()
+        cache.set('key1', get_entry(path='/servers'))
+        cache.set('key2', get_entry(path='/servers/1'))
+        cache.set('key3', get_entry(path='/servers/1/ips'))
+        cache.set('key4', get_entry(path='/servers/2'))
+        cache.set('key5', get_entry(path='/images'))
+
+        cache.invalidate('/servers/1')
+
+        self.assertEqual(cache.get('key1'), None)
+        self.assertEqual(cache.get('key2'), None)
+        self.assertEqual(cache.get('key3'), None)
+        self.assertTrue(cache.get('key4') is not None)
+        self.assertTrue(cache.get('key5') is not None)
+
+    def test_clear(self):
+        cache = self.get_cache()
+        cache.set('key1', get_entry())
+        cache.clear()
+        self.assertEqual(cache.get('key1'), None)
+
+    def test_lru_eviction(self):
+        cache = self.get_cache(max_size=2)
+        cache.set('key1', get_entry())
+        cache.set('key2', get_entry())
+
+        # Mark key1 as recently used
+        cache.get('key1')
+        cache.set('key3', get_entry())
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.get('key1') is not None)
+        self.assertEqual(cache.get('key2'), None)
+        self.assertTrue(cache.get('key3') is not None)
+
+
+class FileResponseCacheTestCase(MemoryResponseCacheTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_cache(self, **kwargs):
+        return FileResponseCache(directory=self.directory, **kwargs)
+
+    def test_lru_eviction(self):
+        pass
+
+    def test_expired_entries_are_pruned(self):
+        cache = self.get_cache()
+        cache.set('key1', get_entry(path='/servers', ttl=-1))
+        cache.set('key2', get_entry(path='/servers'))
+
+        self.assertEqual(cache.get('key1'), None)
+        self.assertTrue(cache.get('key2') is not None)
+
+        # Reference to the removed entry is removed as well
+        path_directory = os.path.join(cache.paths_directory,
+                                      cache._hash('/servers'))
+        self.assertEqual(sorted(os.listdir(path_directory)),
+                         sorted(['.path', cache._hash('key2')]))
+
+    def test_entries_expiring_first_are_removed_when_full(self):
+        cache = self.get_cache(max_size=2)
+        cache.set('key1', get_entry(ttl=60))
+        cache.set('key2', get_entry(ttl=30))
+        cache.set('key3', get_entry(ttl=90))
+
+        self.assertEqual(len(os.listdir(cache.entries_directory)), 2)
+        self.assertTrue(cache.get('key1') is not None)
+        self.assertEqual(cache.get('key2'), None)
+        self.assertTrue(cache.get('key3') is not None)
+
+    def test_entries_are_shared_between_instances(self):
+        cache1 = self.get_cache()
+        cache1.set('key1', get_entry(body='body1',
+                                     headers={'etag': '"abcd"'}))
+
+        cache2 = self.get_cache()
+        entry = cache2.get('key1')
+        self.assertEqual(entry.body, 'body1')
+        self.assertEqual(entry.etag, '"abcd"')
+
+
+class ConnectionResponseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.originalConnect = Connection.connect
+        Connection.connect = Mock()
+
+        self.con = Connection()
+        self.con.connection = Mock()
+        self.con.response_cache = MemoryResponseCache(
+            ttl_policies={'/servers*': 60})
+
+    def tearDown(self):
+        Connection.connect = self.originalConnect
+
+    def _set_response(self, status=httplib.OK, body='body', headers=None):
+        response = CachedHTTPResponse(status=status,
+                                      reason=httplib.responses[status],
+                                      headers=headers or {}, body=body)
+        self.con.connection.getresponse.return_value = response
+
+    def test_get_requests_are_cached(self):
+        self._set_response(body='body1')
+        response = self.con.request('/servers', params={'foo': 'bar'})
+        self.assertEqual(response.body, 'body1')
+
+        self._set_response(body='body2')
+        response = self.con.request('/servers', params={'foo': 'bar'})
+        self.assertEqual(response.body, 'body1')
+        self.assertEqual(self.con.connection.request.call_count, 1)
+
+        # Different params are cached separately
+        response = self.con.request('/servers', params={'foo': 'baz'})
+        self.assertEqual(response.body, 'body2')
+        self.assertEqual(self.con.connection.request.call_count, 2)
+
+    def test_requests_not_matching_ttl_policy_are_not_cached(self):
+        self.con.response_cache = MemoryResponseCache(
+            ttl_policies={'DescribeRegions': 60})
+
+        self._set_response(body='body1')
+        self.con.request('/', params={'Action': 'DescribeImages'})
+        self.con.request('/', params={'Action': 'DescribeImages'})
+        self.assertEqual(self.con.connection.request.call_count, 2)
+
+        self.con.request('/', params={'Action': 'DescribeRegions'})
+        self.con.request('/', params={'Action': 'DescribeRegions'})
+        self.assertEqual(self.con.connection.request.call_count, 3)
+
+    def test_mutating_requests_invalidate_cache(self):
+        self._set_response(body='body1')
+        self.con.request('/servers')
+
+        self.con.request('/servers/1', method='DELETE')
+
+        self._set_response(body='body2')
+        response = self.con.request('/servers')
+        self.assertEqual(response.body, 'body2')
+        self.assertEqual(self.con.connection.request.call_count, 3)
+
+    def test_mutating_actions_invalidate_cache(self):
+        self.con.response_cache = MemoryResponseCache(
+            ttl_policies={'Describe*': 60})
+
+        self._set_response(body='body1')
+        self.con.request('/', params={'Action': 'DescribeInstances'})
+        self.con.request('/', params={'Action': 'DescribeInstances'})
+        self.assertEqual(self.con.connection.request.call_count, 1)
+
+        # Mutating action sent as a GET request is never served from the
+        # cache and invalidates the cached responses
+        self.con.request('/', params={'Action': 'TerminateInstances'})
+        self.con.request('/', params={'Action': 'TerminateInstances'})
+        self.assertEqual(self.con.connection.request.call_count, 3)
+
+        self.con.request('/', params={'Action': 'DescribeInstances'})
+        self.assertEqual(self.con.connection.request.call_count, 4)
+
+    def test_expired_entry_is_revalidated(self):
+        self._set_response(body='body1', headers={'etag': '"abcd"'})
+        self.con.request('/servers')
+
+        key = list(self.con.response_cache._entries.keys())[0]
+        self.con.response_cache._entries[key].expires = time.time() - 1
+
+        self._set_response(status=httplib.NOT_MODIFIED, body='')
+        response = self.con.request('/servers')
+        self.assertEqual(response.body, 'body1')
+
+        call_kwargs = self.con.connection.request.call_args[1]
+        self.assertEqual(call_kwargs['headers']['If-None-Match'], '"abcd"')
+
+        # Entry has been refreshed
+        self.assertFalse(self.con.response_cache.get(key).is_expired())
+
+    def test_expired_entry_without_validators_is_refetched(self):
+        self._set_response(body='body1')
+        self.con.request('/servers')
+
+        key = list(self.con.response_cache._entries.keys())[0]
+        self.con.response_cache._entries[key].expires = time.time() - 1
+
+        self._set_response(body='body2')
+        response = self.con.request('/servers')
+        self.assertEqual(response.body, 'body2')
+
+        call_kwargs = self.con.connection.request.call_args[1]
+        self.assertTrue('If-None-Match' not in call_kwargs['headers'])
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
@@ -0,0 +1,237 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import gzip
+import threading
+
+from io import BytesIO
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from libcloud.utils.py3 import b
+from libcloud.utils.py3 import StringIO
+from libcloud.utils.py3 import httplib
+from libcloud.common.base import Connection
+from libcloud.common.debug import redact_headers
+from libcloud.common.debug import redact_url
+from libcloud.common.debug import redact_body
+from libcloud.common.debug import StructuredLoggingConnection
+from libcloud.common.debug import StructuredLoggingHTTPConnection
+from libcloud.test import unittest
+
+
+class DebugHTTPRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/gzip':
+            data = BytesIO()
+            f = gzip.GzipFile(fileobj=data, mode='wb')
+            f.write(b('compressed body'))
+            f.close()
+            self._send(httplib.OK, data.getvalue(),
+                       headers={'Content-Encoding': 'gzip'})
+        elif self.path == '/error':
+            self._send(httplib.NOT_FOUND, b('not found'))
+        else:
+            self._send(httplib.OK, b('0123456789' * 10))
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        self._send(httplib.OK, self.rfile.read(length))
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'session=secret')
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StructuredLoggingConnectionTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), DebugHTTPRequestHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.log = StringIO()
+        StructuredLoggingConnection.log = self.log
+        StructuredLoggingConnection.sample_rate = 1.0
+        StructuredLoggingConnection.max_body_size = 4096
+        StructuredLoggingConnection.log_bodies = True
+
+        self.con = Connection(secure=False, host='127.0.0.1',
+                              port=self.server.server_address[1])
+        self.con.conn_classes = (StructuredLoggingHTTPConnection, None)
+
+    def tearDown(self):
+        StructuredLoggingConnection.log = None
+        StructuredLoggingConnection.sample_rate = 1.0
+        StructuredLoggingConnection.max_body_size = 4096
+        StructuredLoggingConnection.log_bodies = False
+
+    def _get_records(self):
+        return [json.loads(line) for line in
+                self.log.getvalue().splitlines()]
+
+    def test_request_is_logged(self):
+        response = self.con.request('/test',
+                                    headers={'X-Auth-Token': 'secret'})
+        self.assertEqual(response.body, '0123456789' * 10)
+
+        records = self._get_records()
+        self.assertEqual(len(records), 1)
+
+        record = records[0]
+        self.assertEqual(record['method'], 'GET')
+        self.assertEqual(record['url'], '/test')
+        self.assertEqual(record['status'], httplib.OK)
+        self.assertEqual(record['request_headers']['X-Auth-Token'],
+                         '<redacted>')
+        self.assertEqual(record['response_headers']['Set-Cookie'],
+                         '<redacted>')
+        self.assertEqual(record['response_body'], '0123456789' * 10)
+        self.assertEqual(record['response_body_size'], 100)
+        self.assertFalse(record['response_body_truncated'])
+        self.assertTrue('duration' in record)
+        self.assertTrue('first_byte' in record)
+
+    def test_bodies_are_truncated(self):
+        StructuredLoggingConnection.max_body_size = 5
+
+        self.con.request('/test', data='abcdefgh', method='POST')
+        record = self._get_records()[0]
+
+        self.assertEqual(record['request_body'], 'abcde')
+        self.assertEqual(record['request_body_size'], 8)
+        self.assertEqual(record['response_body'], 'abcde')
+        self.assertEqual(record['response_body_size'], 8)
+        self.assertTrue(record['response_body_truncated'])
+
+    def test_bodies_are_not_logged_by_default(self):
+        StructuredLoggingConnection.log_bodies = False
+
+        self.con.request('/test', data='password=secret', method='POST')
+        record = self._get_records()[0]
+
+        self.assertEqual(record['request_body'], None)
+        self.assertEqual(record['request_body_size'], 15)
+        self.assertEqual(record['response_body'], None)
+        self.assertEqual(record['response_body_size'], 15)
+
+    def test_credentials_are_redacted(self):
+        self.con.request('/test', params={'Signature': 'abcd', 'foo': 'bar'},
+                         data='{"password": "secret"}', method='POST')
+        record = self._get_records()[0]
+
+        self.assertEqual(record['url'], '/test?Signature=<redacted>&foo=bar')
+        self.assertEqual(record['request_body'], '{"password": "<redacted>"}')
+        self.assertEqual(record['response_body'],
+                         '{"password": "<redacted>"}')
+
+    def test_compressed_body_is_logged_decompressed(self):
+        response = self.con.request('/gzip')
+        self.assertEqual(response.body, 'compressed body')
+
+        record = self._get_records()[0]
+        self.assertEqual(record['response_body'], 'compressed body')
+
+    def test_sampling(self):
+        StructuredLoggingConnection.sample_rate = 0.0
+
+        self.con.request('/test')
+        self.assertEqual(self._get_records(), [])
+
+        # Errors are logged regardless of the sample rate
+        self.assertRaises(Exception, self.con.request, '/error')
+        records = self._get_records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['status'], httplib.NOT_FOUND)
+
+    def test_raw_request_is_logged_once_body_is_consumed(self):
+        response = self.con.request('/test', raw=True)
+        self.assertEqual(self._get_records(), [])
+
+        self.assertEqual(b('').join(response.response), b('0123456789' * 10))
+        record = self._get_records()[0]
+        self.assertEqual(record['response_body_size'], 100)
+
+
+class RedactHeadersTestCase(unittest.TestCase):
+    def test_redact_headers(self):
+        headers = redact_headers({'Authorization': 'Basic Zm9vOmJhcg==',
+                                  'Content-Type': 'text/plain'})
+        self.assertEqual(headers, {'Authorization': '<redacted>',
+                                   'Content-Type': 'text/plain'})
+
+        headers = redact_headers([('X-Custom', 'foo')],
+                                 redacted_headers=['x-custom'])
+        self.assertEqual(headers, {'X-Custom': '<redacted>'})
+
+
+class RedactTestCase(unittest.TestCase):
+    def test_redact_url(self):
+        self.assertEqual(redact_url('/test'), '/test')
+        self.assertEqual(
+            redact_url('/?Action=DescribeImages&AWSAccessKeyId=AKIA'
+                       '&Signature=abc%3D'),
+            '/?Action=DescribeImages&AWSAccessKeyId=<redacted>'
+            '&Signature=<redacted>')
+        self.assertEqual(redact_url('/client/api?apiKey=foo&command=list'),
+                         '/client/api?apiKey=<redacted>&command=list')
+        self.assertEqual(redact_url('/?a=1&b=2', redacted_fields=['b']),
+                         '/?a=1&b=<redacted>')
+
+    def test_redact_body(self):
+        body = ('{"auth": {"passwordCredentials": {"username": "user", '
+                '"password": "pass\\"word"}}}')
+        self.assertEqual(redact_body(body),
+                         '{"auth": {"passwordCredentials": {"username": '
+                         '"user", "password": "<redacted>"}}}')
+
+        body = 'grant_type=refresh_token&refresh_token=abcd&client_id=id'
+        self.assertEqual(redact_body(body),
+                         'grant_type=refresh_token&refresh_token=<redacted>'
+                         '&client_id=id')
+
+        # Truncated body
+        self.assertEqual(redact_body('{"access_token": "ya29.abc'),
+                         '{"access_token": "<redacted>"')
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
@@ -16,10 +16,16 @@
 Tests for Google Connection classes.
 """
 import datetime
+import shutil
 import sys
+import socket
+import tempfile
+import time
 import unittest
 import os
 
+import mock
+
 try:
     import simplejson as json
 except ImportError:
@@ -28,12 +34,14 @@ except ImportError:
 from libcloud.utils.py3 import httplib
 
 from libcloud.test import MockHttp, LibcloudTestCase
+from libcloud.common import google
 from libcloud.common.google import (GoogleAuthError,
                                     GoogleBaseAuthConnection,
                                     GoogleInstalledAppAuthConnection,
                                     GoogleServiceAcctAuthConnection,
                                     GoogleGCEServiceAcctAuthConnection,
-                                    GoogleBaseConnection)
+                                    GoogleBaseConnection,
+                                    GoogleTokenStore)
 
 
 # Skip some tests if PyCrypto is unavailable
@@ -151,14 +159,22 @@ class GoogleBaseConnectionTest(LibcloudTestCase):
         GoogleBaseAuthConnection.conn_classes = (GoogleAuthMockHttp,
                                                  GoogleAuthMockHttp)
         self.mock_scopes = ['https://www.googleapis.com/auth/foo']
-        kwargs = {'scopes': self.mock_scopes, 'auth_type': 'IA'}
+        self.tmp_dir = tempfile.mkdtemp()
+        self.credential_file = os.path.join(self.tmp_dir, 'credentials')
+        kwargs = {'scopes': self.mock_scopes, 'auth_type': 'IA',
+                  'credential_file': self.credential_file}
         self.conn = GoogleBaseConnection(*GCE_PARAMS, **kwargs)
 
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
     def test_auth_type(self):
         self.assertRaises(GoogleAuthError, GoogleBaseConnection, *GCE_PARAMS,
-                          **{'auth_type': 'XX'})
+                          **{'auth_type': 'XX',
+                             'credential_file': self.credential_file})
 
-        kwargs = {'scopes': self.mock_scopes}
+        kwargs = {'scopes': self.mock_scopes,
+                  'credential_file': self.credential_file}
 
         if SHA256:
             kwargs['auth_type'] = 'SA'
@@ -245,6 +261,137 @@ class GoogleBaseConnectionTest(LibcloudTestCase):
         self.assertEqual(request1, expected_request)
         self.assertEqual(request2, expected_request)
 
+    def test_refresh_token_info_uses_newer_token_from_store(self):
+        token_info = {'access_token': 'fromfile', 'token_type': 'Bearer',
+                      'expire_time': '2013-06-26T21:00:00Z'}
+        self.conn._get_token_info_from_file = lambda: token_info
+        self.conn._refresh_token_info()
+
+        self.assertEqual(self.conn.token_info['access_token'], 'fromfile')
+        self.assertEqual(self.conn.token_expire_time,
+                         datetime.datetime(2013, 6, 26, 21, 0, 0))
+
+    def test_refresh_token_info_ignores_older_token_from_store(self):
+        token_info = {'access_token': 'fromfile', 'token_type': 'Bearer',
+                      'expire_time': '2013-06-26T18:00:00Z'}
+        self.conn._get_token_info_from_file = lambda: token_info
+        self.conn._refresh_token_info()
+
+        self.assertEqual(self.conn.token_info['access_token'],
+                         'refreshrefresh')
+
+    def test_pre_connect_hook_refreshes_token_in_background(self):
+        self.conn.token_expire_time = datetime.datetime(2013, 6, 26, 19, 1, 0)
+        new_params, new_headers = self.conn.pre_connect_hook({}, {})
+
+        # Current token is used while the new one is being retrieved
+        self.assertEqual(new_headers, {'Authorization': 'Bearer installedapp'})
+        self.conn._token_refresh_thread.join()
+        self.assertEqual(self.conn.token_info['access_token'],
+                         'refreshrefresh')
+
+    def test_pre_connect_hook_retries_failed_background_refresh(self):
+        self.conn.token_expire_time = datetime.datetime(2013, 6, 26, 19, 1, 0)
+        refresh_token = self.conn.auth_conn.refresh_token
+
+        with mock.patch.object(self.conn.auth_conn, 'refresh_token',
+                               side_effect=socket.error):
+            self.conn.pre_connect_hook({}, {})
+            self.conn._token_refresh_thread.join()
+
+        self.assertTrue(self.conn._token_refresh_failed)
+
+        # Next request refreshes the token synchronously
+        with mock.patch.object(self.conn.auth_conn, 'refresh_token',
+                               wraps=refresh_token) as refresh:
+            new_params, new_headers = self.conn.pre_connect_hook({}, {})
+
+        self.assertEqual(refresh.call_count, 1)
+        self.assertFalse(self.conn._token_refresh_failed)
+        self.assertEqual(new_headers,
+                         {'Authorization': 'Bearer refreshrefresh'})
+
+    def test_pre_connect_hook_refreshes_expired_token(self):
+        self.conn.token_expire_time = datetime.datetime(2013, 6, 26, 18, 0, 0)
+        new_params, new_headers = self.conn.pre_connect_hook({}, {})
+
+        self.assertEqual(new_headers,
+                         {'Authorization': 'Bearer refreshrefresh'})
+        self.assertEqual(self.conn._token_refresh_thread, None)
+
+
+class GoogleTokenStoreTest(LibcloudTestCase):
+    """
+    Tests for GoogleTokenStore
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'credentials')
+        self.store = GoogleTokenStore(filename=self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_get_store_returns_shared_instance(self):
+        store1 = GoogleTokenStore.get_store(self.filename)
+        store2 = GoogleTokenStore.get_store(self.filename)
+        self.assertTrue(store1 is store2)
+
+    def test_read_missing_file(self):
+        self.assertEqual(self.store.read(), None)
+
+    def test_read_invalid_file(self):
+        with open(self.filename, 'w') as f:
+            f.write('{"access_token": ')
+
+        self.assertEqual(self.store.read(), None)
+
+    def test_write_and_read(self):
+        token_info = {'access_token': 'tokentoken',
+                      'expire_time': '2013-06-26T20:00:00Z'}
+        self.store.write(token_info)
+        self.assertEqual(self.store.read(), token_info)
+
+        token_info['access_token'] = 'newtoken'
+        self.store.write(token_info)
+        self.assertEqual(self.store.read(), token_info)
+
+        # Temporary files should have been renamed
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)),
+                         ['credentials', 'credentials.lock'])
+
+    def test_acquire_times_out(self):
+        if not google.fcntl:
+            return
+
+        # Lock held by another process which waits for a stalled token
+        # request
+        other_store = GoogleTokenStore(filename=self.filename)
+        self.assertTrue(other_store.acquire())
+
+        try:
+            started = time.time()
+            self.assertFalse(self.store.acquire(timeout=0.2))
+            self.assertTrue(time.time() - started < 5)
+
+            # Store can still be used without the lock
+            self.store.write({'access_token': 'tokentoken'})
+            self.assertEqual(self.store.read(),
+                             {'access_token': 'tokentoken'})
+            self.store.release()
+        finally:
+            other_store.release()
+
+        self.assertTrue(self.store.acquire())
+        self.store.release()
+
+    def test_lock_is_reentrant(self):
+        with self.store:
+            with self.store:
+                self.store.write({'access_token': 'tokentoken'})
+            self.assertEqual(self.store.read(),
+                             {'access_token': 'tokentoken'})
+
 
 class GoogleAuthMockHttp(MockHttp):
     """
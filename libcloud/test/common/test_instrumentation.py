@@ -0,0 +1,157 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import socket
+
+from mock import Mock
+
+from libcloud.utils.py3 import httplib
+from libcloud.common.base import Connection
+from libcloud.common.cache import CachedHTTPResponse
+from libcloud.common.cache import MemoryResponseCache
+from libcloud.common.types import LibcloudError
+from libcloud.common.instrumentation import register_observer
+from libcloud.common.instrumentation import unregister_observer
+from libcloud.common.instrumentation import get_observers
+from libcloud.httplib_ssl import LibcloudHTTPConnection
+from libcloud.test import unittest
+
+
+class RequestInstrumentationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.originalConnect = Connection.connect
+        Connection.connect = Mock()
+
+        self.con = Connection()
+        self.con.driver = Mock()
+        self.con.driver.name = 'Dummy'
+        self.con.connection = Mock()
+
+        self.metrics = []
+        register_observer(self.metrics.append)
+
+    def tearDown(self):
+        Connection.connect = self.originalConnect
+        unregister_observer(self.metrics.append)
+
+    def _set_response(self, status=httplib.OK, body='body', headers=None):
+        response = CachedHTTPResponse(status=status,
+                                      reason=httplib.responses[status],
+                                      headers=headers or {}, body=body)
+        self.con.connection.getresponse.return_value = response
+
+    def test_register_and_unregister_observer(self):
+        def observer(metrics):
+            pass
+
+        register_observer(observer)
+        self.assertTrue(observer in get_observers())
+
+        unregister_observer(observer)
+        self.assertFalse(observer in get_observers())
+
+    def test_observer_is_called_with_metrics(self):
+        self._set_response(body='hello world',
+                           headers={'content-length': '11'})
+        self.con.request('/', params={'Action': 'DescribeInstances'},
+                         data='data', method='POST')
+
+        self.assertEqual(len(self.metrics), 1)
+        metrics = self.metrics[0]
+        self.assertEqual(metrics.driver_name, 'Dummy')
+        self.assertEqual(metrics.operation, 'DescribeInstances')
+        self.assertEqual(metrics.method, 'POST')
+        self.assertEqual(metrics.status, httplib.OK)
+        self.assertEqual(metrics.bytes_received, 11)
+        self.assertTrue(metrics.bytes_sent > len('data'))
+        self.assertFalse(metrics.from_cache)
+        self.assertTrue('first_byte' in metrics.timings)
+        self.assertTrue('total' in metrics.timings)
+
+        # Underlying connection doesn't keep recording into these metrics
+        self.assertEqual(self.con.connection.timings, None)
+
+    def test_operation_defaults_to_action(self):
+        self._set_response()
+        self.con.request('/servers/detail')
+        self.assertEqual(self.metrics[0].operation, '/servers/detail')
+        self.assertEqual(self.metrics[0].bytes_received, len('body'))
+
+    def test_observer_is_called_on_error(self):
+        self._set_response(status=httplib.INTERNAL_SERVER_ERROR)
+        self.assertRaises(Exception, self.con.request, '/servers')
+
+        self.assertEqual(len(self.metrics), 1)
+        self.assertEqual(self.metrics[0].status,
+                         httplib.INTERNAL_SERVER_ERROR)
+        self.assertTrue(self.metrics[0].exception is not None)
+
+    def test_cached_responses_are_reported(self):
+        self.con.response_cache = MemoryResponseCache(
+            ttl_policies={'/servers*': 60})
+        self._set_response()
+        self.con.request('/servers')
+        self.con.request('/servers')
+
+        self.assertEqual(len(self.metrics), 2)
+        self.assertFalse(self.metrics[0].from_cache)
+        self.assertTrue(self.metrics[1].from_cache)
+        self.assertEqual(self.metrics[1].status, httplib.OK)
+
+    def test_failing_observer_doesnt_break_request(self):
+        def observer(metrics):
+            raise LibcloudError('failure')
+
+        register_observer(observer)
+
+        try:
+            self._set_response()
+            response = self.con.request('/')
+            self.assertEqual(response.body, 'body')
+        finally:
+            unregister_observer(observer)
+
+
+class ConnectionTimingsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_dns_and_connect_timings_are_recorded(self):
+        port = self.server.getsockname()[1]
+        connection = LibcloudHTTPConnection('127.0.0.1', port)
+        connection.timings = {}
+        connection.connect()
+        connection.close()
+
+        self.assertTrue('dns' in connection.timings)
+        self.assertTrue('connect' in connection.timings)
+
+    def test_timings_are_not_recorded_by_default(self):
+        port = self.server.getsockname()[1]
+        connection = LibcloudHTTPConnection('127.0.0.1', port)
+        connection.connect()
+        connection.close()
+
+        self.assertEqual(connection.timings, None)
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
@@ -24,6 +24,7 @@ except ImportError:
 from mock import Mock
 
 from libcloud.utils.py3 import httplib
+from libcloud.common.types import LibcloudError
 from libcloud.common.openstack import OpenStackBaseConnection
 from libcloud.common.openstack_identity import AUTH_TOKEN_EXPIRES_GRACE_SECONDS
 from libcloud.common.openstack_identity import get_class_for_auth_version
@@ -491,6 +492,65 @@ class OpenStackServiceCatalogTestCase(unittest.TestCase):
                          'https://storage101.ord1.clouddrive.com/v1/MossoCloudFS_11111-111111111-1111111111-1111111']
         self.assertEqual(public_urls, expected_urls)
 
+    def test_get_endpoints(self):
+        data = self.fixtures.load('_v2_0__auth.json')
+        data = json.loads(data)
+        service_catalog = data['access']['serviceCatalog']
+
+        catalog = OpenStackServiceCatalog(service_catalog=service_catalog,
+                                          auth_version='2.0')
+
+        endpoints = catalog.get_endpoints()
+        self.assertEqual(len(endpoints), 13)
+
+        endpoints = catalog.get_endpoints(service_type='object-store')
+        self.assertEqual(len(endpoints), 4)
+        self.assertEqual(sorted(set([e.region for e in endpoints])),
+                         ['LON', 'ORD'])
+
+        endpoints = catalog.get_endpoints(service_type='compute',
+                                          name='cloudServers')
+        self.assertEqual(len(endpoints), 1)
+        self.assertEqual(endpoints[0].url,
+                         'https://servers.api.rackspacecloud.com/v1.0/1337')
+
+        endpoints = catalog.get_endpoints(service_type='invalid')
+        self.assertEqual(endpoints, [])
+
+        # Returned list is a copy and mutating it shouldn't affect the catalog
+        endpoints = catalog.get_endpoints(service_type='object-store')
+        endpoints.pop()
+        endpoints = catalog.get_endpoints(service_type='object-store')
+        self.assertEqual(len(endpoints), 4)
+
+    def test_get_endpoint(self):
+        data = self.fixtures.load('_v2_0__auth.json')
+        data = json.loads(data)
+        service_catalog = data['access']['serviceCatalog']
+
+        catalog = OpenStackServiceCatalog(service_catalog=service_catalog,
+                                          auth_version='2.0')
+
+        endpoint = catalog.get_endpoint(service_type='object-store',
+                                        name='cloudFiles', region='LON')
+        self.assertEqual(endpoint.url,
+                         'https://storage101.lon1.clouddrive.com/v1/MossoCloudFS_11111-111111111-1111111111-1111111')
+        self.assertEqual(endpoint.endpoint_type, 'external')
+
+        endpoint = catalog.get_endpoint(service_type='object-store',
+                                        name='cloudFiles', region='LON',
+                                        endpoint_type='internal')
+        self.assertEqual(endpoint.url,
+                         'https://snet-storage101.lon1.clouddrive.com/v1/MossoCloudFS_11111-111111111-1111111111-1111111')
+
+        # Multiple matching endpoints
+        self.assertRaises(ValueError, catalog.get_endpoint,
+                          service_type='object-store')
+
+        # No matching endpoint
+        self.assertRaises(LibcloudError, catalog.get_endpoint,
+                          service_type='object-store', region='invalid')
+
     def test_get_regions(self):
         data = self.fixtures.load('_v2_0__auth.json')
         data = json.loads(data)
@@ -0,0 +1,205 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import time
+import threading
+
+from email.utils import formatdate
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from mock import patch
+
+from libcloud.utils.py3 import b
+from libcloud.utils.py3 import httplib
+from libcloud.common.base import Connection
+from libcloud.common.ratelimit import AdaptiveRateLimiter
+from libcloud.common.ratelimit import get_rate_limiter, parse_retry_after
+from libcloud.test import unittest
+
+
+class ThrottlingHTTPRequestHandler(BaseHTTPRequestHandler):
+    # Number of requests which are throttled before a request succeeds
+    throttled_count = 0
+    throttled_status = 429
+    requests = []
+
+    def do_GET(self):
+        cls = ThrottlingHTTPRequestHandler
+        cls.requests.append(self.path)
+
+        if len(cls.requests) <= cls.throttled_count:
+            self._send(cls.throttled_status, b('slow down'),
+                       headers={'Retry-After': '0'})
+        else:
+            self._send(httplib.OK, b('ok'))
+
+    do_POST = do_GET
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class AdaptiveRateLimiterTestCase(unittest.TestCase):
+    def test_acquire_waits_for_tokens(self):
+        limiter = AdaptiveRateLimiter(rate=100, burst=2)
+        self.assertEqual(limiter.acquire(), 0)
+        self.assertEqual(limiter.acquire(), 0)
+
+        sleep = time.sleep
+
+        with patch('libcloud.common.ratelimit.time.sleep') as mock_sleep:
+            mock_sleep.side_effect = sleep
+            self.assertTrue(limiter.acquire() > 0)
+            self.assertTrue(mock_sleep.call_count >= 1)
+
+    def test_rate_adapts_to_responses(self):
+        limiter = AdaptiveRateLimiter(rate=10, min_rate=1, max_rate=20,
+                                      increase_step=1)
+
+        self.assertEqual(limiter.get_retry_delay(status=httplib.OK), None)
+        self.assertEqual(limiter.rate, 10.1)
+
+        delay = limiter.get_retry_delay(status=429)
+        self.assertTrue(delay is not None)
+        self.assertEqual(limiter.rate, 5.05)
+
+        # Concurrently throttled requests only decrease the rate once
+        limiter.get_retry_delay(status=httplib.SERVICE_UNAVAILABLE,
+                                method='GET')
+        self.assertEqual(limiter.rate, 5.05)
+
+        for _ in range(0, 1000):
+            limiter.on_success()
+
+        self.assertEqual(limiter.rate, 20)
+
+    def test_retry_limits(self):
+        limiter = AdaptiveRateLimiter(max_retries=2, backoff_max=1)
+        self.assertTrue(limiter.get_retry_delay(status=429, attempt=1) <= 1)
+        self.assertEqual(limiter.get_retry_delay(status=429, attempt=2), None)
+
+        # Retry-After beyond the deadline
+        self.assertEqual(limiter.get_retry_delay(status=429, retry_after='60',
+                                                 deadline=time.time() + 10),
+                         None)
+
+    def test_service_unavailable_is_only_retried_for_idempotent_requests(
+            self):
+        limiter = AdaptiveRateLimiter(rate=10)
+        status = httplib.SERVICE_UNAVAILABLE
+
+        self.assertTrue(limiter.get_retry_delay(status=status,
+                                                method='GET') is not None)
+        self.assertEqual(limiter.get_retry_delay(status=status,
+                                                 method='POST'), None)
+        self.assertEqual(limiter.get_retry_delay(status=status), None)
+        self.assertTrue(limiter.get_retry_delay(status=429,
+                                                method='POST') is not None)
+
+        # Non-idempotent requests still slow down the rate
+        self.assertTrue(limiter.rate < 10)
+
+    def test_retry_after_blocks_all_requests(self):
+        limiter = AdaptiveRateLimiter(rate=100)
+        limiter.on_throttle(retry_after=0.2)
+
+        start = time.time()
+        limiter.acquire()
+        self.assertTrue(time.time() - start >= 0.15)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('5'), 5)
+        self.assertEqual(parse_retry_after('invalid'), None)
+        self.assertEqual(parse_retry_after(None), None)
+
+        now = time.time()
+        value = parse_retry_after(formatdate(now + 30, usegmt=True), now=now)
+        self.assertTrue(29 <= value <= 31)
+
+    def test_get_rate_limiter_is_shared(self):
+        limiter = get_rate_limiter('test-shared', rate=5)
+        self.assertTrue(get_rate_limiter('test-shared') is limiter)
+        self.assertEqual(limiter.rate, 5)
+
+
+class RateLimitedConnectionTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0),
+                                ThrottlingHTTPRequestHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ThrottlingHTTPRequestHandler.requests = []
+        ThrottlingHTTPRequestHandler.throttled_status = 429
+        self.con = Connection(secure=False, host='127.0.0.1',
+                              port=self.server.server_address[1])
+        self.con.rate_limiter = AdaptiveRateLimiter(rate=100,
+                                                    backoff_base=0.01)
+
+    def test_throttled_request_is_retried(self):
+        ThrottlingHTTPRequestHandler.throttled_count = 2
+
+        response = self.con.request('/test')
+        self.assertEqual(response.status, httplib.OK)
+        self.assertEqual(response.body, 'ok')
+        self.assertEqual(len(ThrottlingHTTPRequestHandler.requests), 3)
+
+    def test_service_unavailable_post_request_is_not_retried(self):
+        ThrottlingHTTPRequestHandler.throttled_count = 1
+        ThrottlingHTTPRequestHandler.throttled_status = \
+            httplib.SERVICE_UNAVAILABLE
+
+        self.assertRaises(Exception, self.con.request, '/test',
+                          method='POST')
+        self.assertEqual(len(ThrottlingHTTPRequestHandler.requests), 1)
+
+        ThrottlingHTTPRequestHandler.requests = []
+        response = self.con.request('/test')
+        self.assertEqual(response.status, httplib.OK)
+        self.assertEqual(len(ThrottlingHTTPRequestHandler.requests), 2)
+
+    def test_throttled_response_is_returned_after_max_retries(self):
+        ThrottlingHTTPRequestHandler.throttled_count = 10
+        self.con.rate_limiter.max_retries = 1
+
+        self.assertRaises(Exception, self.con.request, '/test')
+        self.assertEqual(len(ThrottlingHTTPRequestHandler.requests), 2)
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
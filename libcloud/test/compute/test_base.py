@@ -20,6 +20,8 @@ from libcloud.common.base import Connection, ConnectionKey, ConnectionUserAndKey
 from libcloud.common.types import LibcloudError
 from libcloud.compute.base import Node, NodeSize, NodeImage, NodeDriver, StorageVolume
 from libcloud.compute.base import NodeAuthSSHKey, NodeAuthPassword
+from libcloud.compute.base import CompactNode, CompactNodeSize
+from libcloud.compute.base import CompactNodeImage, CompactStorageVolume
 from libcloud.compute.types import StorageVolumeState
 
 from libcloud.test import MockResponse           # pylint: disable-msg=E0611
@@ -61,6 +63,94 @@ class BaseTests(unittest.TestCase):
         Connection(timeout=10)
 
 
+class CompactModelsTests(unittest.TestCase):
+    def setUp(self):
+        self.driver = FakeDriver()
+        self.driver.reboot_node = lambda node: node
+        self.image = NodeImage(id='ami-1', name='image', driver=self.driver,
+                               extra={'architecture': 'x86_64'})
+        self.size = NodeSize(id='m3.large', name='m3.large', ram=1024,
+                             disk=10, bandwidth=0, price=0.1,
+                             driver=self.driver)
+
+    def _get_node(self, id):
+        return Node(id=id, name='node', state=0, public_ips=['1.2.3.4'],
+                    private_ips=[], driver=self.driver, size=self.size,
+                    image=self.image, extra={'zone': 'us-east-1a'})
+
+    def test_compact_node(self):
+        node = self._get_node(id='i-1')
+        compact = CompactNode.from_node(node)
+
+        for attribute in ['id', 'name', 'state', 'public_ips',
+                          'private_ips', 'driver', 'extra', 'uuid']:
+            self.assertEqual(getattr(compact, attribute),
+                             getattr(node, attribute))
+
+        self.assertFalse(hasattr(compact, '__dict__'))
+        self.assertRaises(AttributeError, setattr, compact, 'foo', 'bar')
+        self.assertTrue(compact.reboot() is compact)
+
+        # Node extra stays mutable
+        compact.extra['foo'] = 'bar'
+
+    def test_compact_node_shares_size_and_image(self):
+        compact1 = CompactNode.from_node(self._get_node(id='i-1'))
+        compact2 = CompactNode.from_node(self._get_node(id='i-2'))
+
+        self.assertTrue(isinstance(compact1.size, CompactNodeSize))
+        self.assertTrue(isinstance(compact1.image, CompactNodeImage))
+        self.assertTrue(compact1.size is compact2.size)
+        self.assertTrue(compact1.image is compact2.image)
+        self.assertEqual(compact1.image.uuid, self.image.uuid)
+        self.assertEqual(compact1.image.extra, {'architecture': 'x86_64'})
+
+        # Shared extra dictionaries are immutable
+        self.assertRaises(TypeError, compact1.image.extra.__setitem__,
+                          'foo', 'bar')
+
+    def test_compact_node_shares_only_identical_images(self):
+        compact1 = CompactNode.from_node(self._get_node(id='i-1'))
+
+        # Image which only has an id doesn't replace the full image
+        node = self._get_node(id='i-2')
+        node.image = NodeImage(id='ami-1', name=None, driver=self.driver)
+        compact2 = CompactNode.from_node(node)
+
+        self.assertFalse(compact1.image is compact2.image)
+        self.assertEqual(compact1.image.name, 'image')
+        self.assertEqual(compact2.image.name, None)
+        self.assertEqual(compact2.image.extra, {})
+
+        # Images with unhashable extra values are also shared
+        self.image.extra = {'tags': ['foo']}
+        compact3 = CompactNode.from_node(self._get_node(id='i-3'))
+        compact4 = CompactNode.from_node(self._get_node(id='i-4'))
+        self.assertTrue(compact3.image is compact4.image)
+        self.assertEqual(compact3.image.extra, {'tags': ['foo']})
+
+    def test_compact_node_doesnt_share_images_between_drivers(self):
+        compact1 = CompactNode.from_node(self._get_node(id='i-1'))
+
+        self.driver = FakeDriver()
+        self.image.driver = self.driver
+        compact2 = CompactNode.from_node(self._get_node(id='i-2'))
+
+        self.assertFalse(compact1.image is compact2.image)
+        self.assertTrue(compact2.image.driver is self.driver)
+
+    def test_compact_storage_volume(self):
+        volume = StorageVolume(id='vol-1', name='volume', size=10,
+                               driver=self.driver,
+                               state=StorageVolumeState.AVAILABLE)
+        compact = CompactStorageVolume.from_volume(volume)
+
+        self.assertEqual(compact.id, 'vol-1')
+        self.assertEqual(compact.extra, None)
+        self.assertEqual(compact.state, StorageVolumeState.AVAILABLE)
+        self.assertEqual(compact.uuid, volume.uuid)
+
+
 class TestValidateAuth(unittest.TestCase):
 
     def test_get_auth_ssh(self):
@@ -0,0 +1,75 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+
+from libcloud.compute.base import NodeSize
+from libcloud.compute.catalog import NodeSizeCatalog
+from libcloud.test import unittest
+
+
+class NodeSizeCatalogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.sizes = [
+            NodeSize(id='large', name='large', ram=8192, disk=100,
+                     bandwidth=None, price=0.4, driver=None,
+                     extra={'cpu': 4}),
+            NodeSize(id='small', name='small', ram=1024, disk=10,
+                     bandwidth=None, price=0.05, driver=None,
+                     extra={'cpu': 1}),
+            NodeSize(id='medium', name='medium', ram=4096, disk=50,
+                     bandwidth=None, price=0.2, driver=None),
+            NodeSize(id='unpriced', name='unpriced', ram=16384, disk=200,
+                     bandwidth=None, price=None, driver=None,
+                     extra={'cpu': 8})
+        ]
+        self.catalog = NodeSizeCatalog(self.sizes)
+
+    def test_get(self):
+        self.assertEqual(len(self.catalog), 4)
+        self.assertTrue('small' in self.catalog)
+        self.assertTrue(self.catalog.get('small') is self.sizes[1])
+        self.assertEqual(self.catalog.get('invalid'), None)
+        self.assertEqual(self.catalog.to_list(), self.sizes)
+
+    def test_filter(self):
+        ids = [size.id for size in self.catalog.filter()]
+        self.assertEqual(ids, ['small', 'medium', 'large', 'unpriced'])
+
+        ids = [size.id for size in self.catalog.filter(min_ram=4096)]
+        self.assertEqual(ids, ['medium', 'large', 'unpriced'])
+
+        ids = [size.id for size in self.catalog.filter(min_ram=2048,
+                                                       max_price=0.3)]
+        self.assertEqual(ids, ['medium'])
+
+        ids = [size.id for size in self.catalog.filter(min_cpus=2)]
+        self.assertEqual(ids, ['large', 'unpriced'])
+
+        ids = [size.id for size in self.catalog.filter(min_disk=60)]
+        self.assertEqual(ids, ['large', 'unpriced'])
+
+    def test_get_cheapest(self):
+        self.assertEqual(self.catalog.get_cheapest().id, 'small')
+        self.assertEqual(self.catalog.get_cheapest(min_ram=2000).id, 'medium')
+        self.assertEqual(self.catalog.get_cheapest(min_cpus=2).id, 'large')
+        self.assertEqual(self.catalog.get_cheapest(min_ram=10000).id,
+                         'unpriced')
+        self.assertEqual(self.catalog.get_cheapest(min_ram=10000,
+                                                   max_price=1), None)
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
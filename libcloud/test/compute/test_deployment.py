@@ -30,6 +30,7 @@ from libcloud.compute.deployment import SSHKeyDeployment, ScriptDeployment
 from libcloud.compute.deployment import ScriptFileDeployment, FileDeployment
 from libcloud.compute.base import Node
 from libcloud.compute.types import NodeState, DeploymentError, LibcloudError
+from libcloud.compute import ssh
 from libcloud.compute.ssh import BaseSSHClient
 from libcloud.compute.drivers.rackspace import RackspaceFirstGenNodeDriver as Rackspace
 
@@ -455,6 +456,21 @@ class DeploymentTests(unittest.TestCase):
         node = self.driver.deploy_node(deploy=Mock())
         self.assertEqual(self.node.id, node.id)
 
+    def test_exception_is_thrown_if_paramiko_can_not_be_imported(self):
+        self.driver.features = {'create_node': ['password']}
+        self.driver.create_node = Mock()
+        self.driver.create_node.return_value = self.node
+
+        # paramiko is found, but fails to import
+        with patch.object(ssh, 'have_paramiko', True):
+            with patch.object(ssh, 'SSHClient', ssh.ParamikoSSHClient):
+                with patch.dict(sys.modules, {'paramiko': None}):
+                    self.assertRaises(RuntimeError, self.driver.deploy_node,
+                                      deploy=Mock())
+
+                self.assertFalse(ssh.have_paramiko)
+                self.assertEqual(ssh.SSHClient, ssh.MockSSHClient)
+
 
 class RackspaceMockHttp(MockHttp):
     fixtures = ComputeFileFixtures('openstack')
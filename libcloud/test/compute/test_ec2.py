@@ -40,6 +40,8 @@ from libcloud.compute.drivers.ec2 import EC2NetworkSubnet
 from libcloud.compute.base import Node, NodeImage, NodeSize, NodeLocation
 from libcloud.compute.base import StorageVolume, VolumeSnapshot
 from libcloud.compute.types import KeyPairDoesNotExistError, StorageVolumeState
+from libcloud.pricing import get_pricing, set_pricing
+from libcloud.pricing import invalidate_pricing_cache
 
 from libcloud.test import MockHttpTestCase, LibcloudTestCase
 from libcloud.test.compute import TestCaseMixin
@@ -217,6 +219,25 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
                          '2013-12-02T15:58:29.000Z')
         self.assertTrue('instance_type' in ret_node2.extra)
 
+    def test_list_nodes_lazy_extra(self):
+        nodes = self.driver.list_nodes()
+
+        self.driver.lazy_extra = True
+        lazy_nodes = self.driver.list_nodes()
+
+        self.assertFalse(lazy_nodes[0].extra.is_loaded('groups'))
+        self.assertEqual(len(lazy_nodes[0].extra['groups']), 2)
+
+        for node, lazy_node in zip(nodes, lazy_nodes):
+            self.assertEqual(node.name, lazy_node.name)
+            self.assertEqual(sorted(node.extra.keys()),
+                             sorted(lazy_node.extra.keys()))
+            self.assertEqual(node.extra['launch_time'],
+                             lazy_node.extra['launch_time'])
+            self.assertEqual(node.extra['block_device_mapping'],
+                             lazy_node.extra['block_device_mapping'])
+            self.assertEqual(node.extra['tags'], lazy_node.extra['tags'])
+
     def test_ex_list_reserved_nodes(self):
         node = self.driver.ex_list_reserved_nodes()[0]
         self.assertEqual(node.id, '93bbbca2-c500-49d0-9ede-9d8737400498')
@@ -399,6 +420,39 @@ class EC2Tests(LibcloudTestCase, TestCaseMixin):
 
         self.driver.region_name = region_old
 
+    def test_list_sizes_are_cached(self):
+        sizes1 = self.driver.list_sizes()
+        sizes2 = self.driver.list_sizes()
+        self.assertTrue(sizes1 is not sizes2)
+        self.assertTrue(sizes1[0] is sizes2[0])
+
+        # Sizes are rebuilt when the pricing data changes
+        size_id = sizes1[0].id
+        pricing = dict(get_pricing(driver_type='compute',
+                                   driver_name=self.driver.api_name))
+        pricing[size_id] = 100.0
+        set_pricing(driver_type='compute', driver_name=self.driver.api_name,
+                    pricing=pricing)
+
+        try:
+            sizes3 = self.driver.list_sizes()
+            self.assertFalse(sizes1[0] is sizes3[0])
+            self.assertEqual(sizes3[0].id, size_id)
+            self.assertEqual(sizes3[0].price, 100.0)
+        finally:
+            invalidate_pricing_cache()
+
+    def test_ex_get_size_catalog(self):
+        catalog = self.driver.ex_get_size_catalog()
+        self.assertEqual(len(catalog), len(self.driver.list_sizes()))
+        self.assertEqual(catalog.get('m1.small').ram, 1740)
+
+        size = catalog.get_cheapest(min_ram=4000)
+        self.assertTrue(size.ram >= 4000)
+
+        for other in catalog.filter(min_ram=4000):
+            self.assertTrue(other.price is None or size.price <= other.price)
+
     def test_ex_create_node_with_ex_iam_profile(self):
         iamProfile = {
             'id': 'AIDGPMS9RO4H3FEXAMPLE',
@@ -15,7 +15,10 @@
 """
 Tests for Google Compute Engine Driver
 """
+import os
 import sys
+import shutil
+import tempfile
 import unittest
 import datetime
 
@@ -64,8 +67,13 @@ class GCENodeDriverTest(LibcloudTestCase, TestCaseMixin):
         kwargs = GCE_KEYWORD_PARAMS.copy()
         kwargs['auth_type'] = 'IA'
         kwargs['datacenter'] = self.datacenter
+        self.tmp_dir = tempfile.mkdtemp()
+        kwargs['credential_file'] = os.path.join(self.tmp_dir, 'credentials')
         self.driver = GCENodeDriver(*GCE_PARAMS, **kwargs)
 
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
     def test_default_scopes(self):
         self.assertEqual(self.driver.scopes, None)
 
@@ -254,6 +262,19 @@ class GCENodeDriverTest(LibcloudTestCase, TestCaseMixin):
         names = [n.name for n in nodes_all]
         self.assertTrue('node-name' in names)
 
+    def test_list_nodes_lazy_extra(self):
+        nodes = self.driver.list_nodes()
+
+        self.driver.lazy_extra = True
+        lazy_nodes = self.driver.list_nodes()
+        self.assertFalse(lazy_nodes[0].extra.is_loaded('zone'))
+
+        extra, lazy_extra = nodes[0].extra, lazy_nodes[0].extra
+        self.assertEqual(sorted(extra.keys()), sorted(lazy_extra.keys()))
+        self.assertEqual(extra['zone'].name, lazy_extra['zone'].name)
+        self.assertEqual(extra['boot_disk'].name, lazy_extra['boot_disk'].name)
+        self.assertEqual(extra['image'], lazy_extra['image'])
+
     def test_ex_list_regions(self):
         regions = self.driver.ex_list_regions()
         self.assertEqual(len(regions), 3)
@@ -790,6 +790,14 @@ class OpenStack_1_1_Tests(unittest.TestCase, TestCaseMixin):
         self.assertEqual(node.extra.get('progress'), 25)
         self.assertEqual(node.extra.get('fault')['id'], 1234)
 
+    def test_list_nodes_lazy_extra(self):
+        nodes = self.driver.list_nodes()
+
+        self.driver.lazy_extra = True
+        lazy_nodes = self.driver.list_nodes()
+        self.assertFalse(lazy_nodes[0].extra.is_loaded('uri'))
+        self.assertEqual(nodes[0].extra, lazy_nodes[0].extra)
+
     def test_list_nodes_no_image_id_attribute(self):
         # Regression test for LIBCLOD-455
         self.driver_klass.connectionCls.conn_classes[0].type = 'ERROR_STATE_NO_IMAGE_ID'
@@ -20,7 +20,7 @@ import tempfile
 from mock import Mock
 
 from libcloud.test import unittest
-from libcloud.dns.base import DNSDriver, Zone, Record
+from libcloud.dns.base import DNSDriver, Zone, Record, CompactRecord
 from libcloud.dns.types import RecordType
 
 
@@ -103,6 +103,22 @@ class BaseTestCase(unittest.TestCase):
             self.assertRegexpMatches(lines[10], r'example.com\.\s+900\s+IN\s+MX\s+10\s+mx.example.com')
             self.assertRegexpMatches(lines[11], r'example.com\.\s+900\s+IN\s+SRV\s+20\s+10 3333 example.com')
 
+    def test_compact_record(self):
+        zone = Zone(id=1, domain='example.com', type='master', ttl=900,
+                    driver=self.driver)
+        record = Record(id=10, name='www', type=RecordType.A,
+                        data='127.0.0.1', zone=zone, driver=self.driver,
+                        extra={'ttl': 300})
+        compact = CompactRecord.from_record(record)
+
+        for attribute in ['id', 'name', 'type', 'data', 'zone', 'driver',
+                          'extra']:
+            self.assertEqual(getattr(compact, attribute),
+                             getattr(record, attribute))
+
+        self.assertEqual(compact._get_numeric_id(), 10)
+        self.assertFalse(hasattr(compact, '__dict__'))
+
 
 if __name__ == '__main__':
     sys.exit(unittest.main())
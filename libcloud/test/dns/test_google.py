@@ -12,7 +12,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 
+import os
 import sys
+import shutil
+import tempfile
 import unittest
 
 from libcloud.utils.py3 import httplib
@@ -44,8 +47,13 @@ class GoogleTests(LibcloudTestCase):
         GoogleDNSMockHttp.type = None
         kwargs = DNS_KEYWORD_PARAMS_GOOGLE.copy()
         kwargs['auth_type'] = 'IA'
+        self.tmp_dir = tempfile.mkdtemp()
+        kwargs['credential_file'] = os.path.join(self.tmp_dir, 'credentials')
         self.driver = GoogleDNSDriver(*DNS_PARAMS_GOOGLE, **kwargs)
 
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
     def test_default_scopes(self):
         self.assertEqual(self.driver.scopes, None)
 
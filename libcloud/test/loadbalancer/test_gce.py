@@ -15,7 +15,10 @@
 """
 Tests for Google Compute Engine Load Balancer Driver
 """
+import os
 import sys
+import shutil
+import tempfile
 import unittest
 
 from libcloud.common.google import (GoogleBaseAuthConnection,
@@ -47,8 +50,13 @@ class GCELoadBalancerTest(LibcloudTestCase):
         kwargs = GCE_KEYWORD_PARAMS.copy()
         kwargs['auth_type'] = 'IA'
         kwargs['datacenter'] = self.datacenter
+        self.tmp_dir = tempfile.mkdtemp()
+        kwargs['credential_file'] = os.path.join(self.tmp_dir, 'credentials')
         self.driver = GCELBDriver(*GCE_PARAMS, **kwargs)
 
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
     def test_get_node_from_ip(self):
         ip = '23.236.58.15'
         expected_name = 'node-name'
@@ -188,6 +188,48 @@ class AtmosTests(unittest.TestCase):
         else:
             self.fail('Exception was not thrown')
 
+    def test_get_objects(self):
+        container = Container(name='test_container', extra={},
+                              driver=self.driver)
+        AtmosMockHttp.type = 'META'
+
+        results = list(self.driver.get_objects(
+            container, ['file2', 'missing', 'dir/file3', 'file1', 'subdir']))
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0].name, 'file2')
+        self.assertEqual(results[0].hash, 'd41d8cd98f00b204e9800998ecf8427e')
+        self.assertEqual(results[0].size, 0)
+
+        for index, name in [(1, 'missing'), (2, 'dir/file3'),
+                            (4, 'subdir')]:
+            self.assertTrue(isinstance(results[index],
+                                       ObjectDoesNotExistError))
+            self.assertEqual(results[index].object_name, name)
+
+        obj = results[3]
+        self.assertEqual(obj.name, 'file1')
+        self.assertEqual(obj.size, 555)
+        self.assertEqual(obj.hash, '6b21c4a111ac178feacf9ec9d0c71f17')
+        self.assertEqual(obj.meta_data, {'foo-bar': 'test 1'})
+        self.assertEqual(obj.extra['object_id'],
+                         '651eae32634bf84529c74eabd555fda48c7cead6')
+        self.assertEqual(obj.extra['last_modified'],
+                         'Tue, 25 Jan 2011 22:01:49 GMT')
+
+    def test_list_container_objects_meta(self):
+        container = Container(name='test_container', extra={},
+                              driver=self.driver)
+        AtmosMockHttp.type = 'META'
+
+        objects = self.driver.list_container_objects(container=container)
+
+        self.assertEqual([obj.name for obj in objects], ['file1', 'file2'])
+        self.assertEqual(objects[0].size, 555)
+        self.assertEqual(objects[0].meta_data['foo-bar'], 'test 1')
+        self.assertEqual(objects[0].meta_data['object_id'],
+                         '651eae32634bf84529c74eabd555fda48c7cead6')
+
     def test_delete_object_success(self):
         container = Container(name='foo_bar_container', extra={},
                               driver=self.driver)
@@ -514,6 +556,22 @@ class AtmosMockHttp(StorageMockHttp, unittest.TestCase):
         body = self.fixtures.load('list_containers.xml')
         return (httplib.OK, body, {}, httplib.responses[httplib.OK])
 
+    def _rest_namespace_test_container_META(self, method, url, body,
+                                            headers):
+        if headers.get('x-emc-token', None) == 'page2':
+            body = self.fixtures.load('list_objects_meta_2.xml')
+            return (httplib.OK, body, {}, httplib.responses[httplib.OK])
+
+        body = self.fixtures.load('list_objects_meta.xml')
+        return (httplib.OK, body, {'x-emc-token': 'page2'},
+                httplib.responses[httplib.OK])
+
+    def _rest_namespace_test_container_dir_META(self, method, url, body,
+                                                headers):
+        body = self.fixtures.load('not_found.xml')
+        return (httplib.NOT_FOUND, body, {},
+                httplib.responses[httplib.NOT_FOUND])
+
     def _rest_namespace_test_container__metadata_system(
         self, method, url, body,
             headers):
@@ -17,10 +17,14 @@ from __future__ import with_statement
 
 import os
 import sys
+import base64
 import unittest
 import tempfile
 
+import mock
+
 from libcloud.utils.py3 import httplib
+from libcloud.utils.py3 import b
 from libcloud.utils.py3 import urlparse
 from libcloud.utils.py3 import parse_qs
 
@@ -230,6 +234,27 @@ class AzureBlobsMockHttp(StorageMockHttp, MockHttpTestCase):
                 headers,
                 httplib.responses[httplib.NOT_FOUND])
 
+    def _foo_bar_container_copied_object(self, method, url, body, headers):
+        # test_copy_object
+        if method == 'PUT':
+            self.assertEqual(headers['x-ms-copy-source'],
+                             'https://%s/foo_bar_container/foo_bar_object' %
+                             (self.host))
+            self.__class__.copy_status_checks = 0
+            headers = {'x-ms-copy-status': 'pending'}
+            return (httplib.ACCEPTED, '', headers,
+                    httplib.responses[httplib.ACCEPTED])
+
+        # Copy is pending for the first check
+        self.__class__.copy_status_checks += 1
+        status = self.copy_status_checks > 1 and 'success' or 'pending'
+        headers = {'content-length': '12345',
+                   'etag': '0x8CFB877BB56A6FB',
+                   'last-modified': 'Fri, 04 Jan 2013 09:48:06 GMT',
+                   'x-ms-blob-type': 'BlockBlob',
+                   'x-ms-copy-status': status}
+        return (httplib.OK, '', headers, httplib.responses[httplib.OK])
+
     def _foo_bar_container_foo_bar_object_NOT_FOUND(self, method, url, body,
                                                     headers):
         # test_delete_object_not_found
@@ -924,6 +949,36 @@ class AzureBlobsTests(unittest.TestCase):
         else:
             self.fail('Exception was not thrown')
 
+    @mock.patch('libcloud.storage.drivers.azure_blobs.time.sleep')
+    def test_copy_object(self, mock_sleep):
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=12345, hash=None, extra=None,
+                     meta_data=None, container=container, driver=self.driver)
+
+        result = self.driver.copy_object(obj, container, 'copied_object')
+        self.assertEqual(result.name, 'copied_object')
+        self.assertEqual(result.size, 12345)
+        self.assertEqual(result.hash, '0x8CFB877BB56A6FB')
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_upload_parts(self):
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        upload = self.driver._initiate_part_upload(
+            container, 'foo_test_upload',
+            extra={'content_type': 'text/plain', 'meta_data': {'a': 'b'}})
+
+        block_id = self.driver._upload_part(upload, 1, b('abc'))
+        self.assertEqual(base64.b64decode(b(block_id)), b('%10d' % (1)))
+
+        obj = self.driver._complete_part_upload(
+            upload, [block_id], 3, '900150983cd24fb0d6963f7d28e17f72')
+        self.assertEqual(obj.name, 'foo_test_upload')
+        self.assertEqual(obj.size, 3)
+        self.assertEqual(obj.hash, '0x8CFB877BB56A6FB')
+        self.assertEqual(obj.meta_data, {'a': 'b'})
+
     def test_delete_object_success(self):
         container = Container(name='foo_bar_container', extra={},
                               driver=self.driver)
@@ -15,8 +15,9 @@
 
 import sys
 import hashlib
+import tempfile
 
-from mock import Mock
+from mock import Mock, patch
 
 from libcloud.utils.py3 import StringIO
 from libcloud.utils.py3 import PY3
@@ -25,8 +26,13 @@ from libcloud.utils.py3 import b
 if PY3:
     from io import FileIO as file
 
+from libcloud.utils import concurrency
+from libcloud.common.types import LibcloudError
 from libcloud.storage.base import StorageDriver
+from libcloud.storage.base import Container, Object
+from libcloud.storage.base import CompactObject, CompactContainer
 from libcloud.storage.base import DEFAULT_CONTENT_TYPE
+from libcloud.storage.types import ObjectDoesNotExistError
 
 from libcloud.test import unittest
 from libcloud.test import StorageMockHttp
@@ -138,6 +144,51 @@ class BaseStorageTests(unittest.TestCase):
         self.assertEqual(bytes_transferred, (len(data)))
         self.assertEqual(self.send_called, 1)
 
+    def test__upload_data_file_object(self):
+        sent = []
+        response = Mock()
+        response.connection.connection.send = sent.append
+
+        data = b('1234567890') * 100
+        file_object = tempfile.TemporaryFile()
+        file_object.write(data)
+        file_object.seek(0)
+
+        success, data_hash, bytes_transferred = \
+            self.driver1._upload_data(response=response, data=file_object,
+                                      calculate_hash=True)
+        file_object.close()
+
+        self.assertTrue(success)
+        self.assertEqual(data_hash, hashlib.md5(data).hexdigest())
+        self.assertEqual(bytes_transferred, len(data))
+        self.assertEqual(b('').join(sent), data)
+
+    def test__upload_object_stages_large_streams(self):
+        staged = []
+
+        def upload_func(response, data):
+            staged.append(data)
+            return True, None, len(data.read())
+
+        self.driver2.connection = Mock()
+        self.driver2.upload_buffer_memory_limit = 10
+        iterator = iter([b('12345678'), b('12345678')])
+
+        result = self.driver2._upload_object(object_name='test',
+                                             content_type='text/plain',
+                                             upload_func=upload_func,
+                                             upload_func_kwargs={},
+                                             request_path='/',
+                                             iterator=iterator)
+
+        headers = self.driver2.connection.request.call_args[-1]['headers']
+        self.assertEqual(headers['Content-Length'], 16)
+        self.assertEqual(result['bytes_transferred'], 16)
+
+        # Temporary file is closed (removed) after the upload
+        self.assertTrue(staged[0].closed)
+
     def test__get_hash_function(self):
         self.driver1.hash_type = 'md5'
         func = self.driver1._get_hash_function()
@@ -188,6 +239,124 @@ class BaseStorageTests(unittest.TestCase):
                                 request_path='/',
                                 iterator=iterator)
 
+    def test_compact_object(self):
+        container = Container(name='test', extra={}, driver=self.driver1)
+        objects = [Object(name='obj%d' % (index), size=index, hash='abcd',
+                          extra={'content_type': 'text/plain'},
+                          meta_data={'owner': 'tomaz'}, container=container,
+                          driver=self.driver1)
+                   for index in range(0, 2)]
+        compacts = [CompactObject.from_object(obj) for obj in objects]
+
+        for attribute in ['name', 'size', 'hash', 'extra', 'meta_data',
+                          'driver']:
+            self.assertEqual(getattr(compacts[0], attribute),
+                             getattr(objects[0], attribute))
+
+        self.assertTrue(isinstance(compacts[0].container, CompactContainer))
+        self.assertTrue(compacts[0].container is compacts[1].container)
+        self.assertEqual(compacts[0].container.name, 'test')
+        self.assertFalse(hasattr(compacts[0], '__dict__'))
+
+    def test_delete_objects_fallback(self):
+        container = Container(name='test', extra={}, driver=self.driver1)
+        connections = []
+
+        def delete_object(driver, obj):
+            connections.append(driver.connection)
+
+            if obj.name == 'missing':
+                raise ObjectDoesNotExistError(value=None, driver=driver,
+                                              object_name=obj.name)
+            elif obj.name == 'error':
+                raise LibcloudError('Unexpected status code: 500')
+
+            return obj.name != 'failed'
+
+        names = ['obj%d' % (index) for index in range(0, 20)]
+        names += ['missing', 'error', 'failed']
+
+        with patch.object(StorageDriver, 'delete_object', delete_object):
+            errors = self.driver1.delete_objects(container, names)
+
+        self.assertEqual(sorted(errors.keys()), ['error', 'failed'])
+        self.assertTrue('500' in str(errors['error']))
+        self.assertEqual(len(connections), len(names))
+
+        # Each worker thread uses its own connection
+        self.assertFalse(self.driver1.connection in connections)
+
+    def test_map_concurrently_reuses_and_closes_worker_connections(self):
+        connections = []
+
+        def func(driver, item):
+            connections.append(driver.connection)
+            return item
+
+        with patch.object(StorageDriver, '_get_worker_connection',
+                          lambda driver: Mock(connection=Mock())):
+            results = self.driver1._map_concurrently(func, range(0, 50),
+                                                     workers=4)
+
+        self.assertEqual(results, list(range(0, 50)))
+
+        # Each worker thread uses a single connection which is closed once
+        # all the items have been processed
+        unique = list(dict([(id(connection), connection)
+                            for connection in connections]).values())
+        self.assertTrue(1 <= len(unique) <= 4)
+
+        for connection in unique:
+            self.assertEqual(connection.connection.close.call_count, 1)
+
+    def test_map_concurrently_many_items(self):
+        created = []
+        queue_class = concurrency.queue.Queue
+
+        def counting_queue(*args, **kwargs):
+            created.append(None)
+            return queue_class(*args, **kwargs)
+
+        with patch.object(StorageDriver, '_get_worker_connection',
+                          lambda driver: Mock(connection=Mock())):
+            with patch.object(concurrency.queue, 'Queue', counting_queue):
+                results = self.driver1._map_concurrently(
+                    lambda driver, item: item, range(0, 20000), workers=8)
+
+        self.assertEqual(results, list(range(0, 20000)))
+
+        # Number of queues (and buffered results) doesn't grow with the
+        # number of items
+        self.assertTrue(len(created) <= 2)
+
+    def test_get_objects(self):
+        container = Container(name='test', extra={}, driver=self.driver1)
+
+        def get_object(driver, container_name, object_name):
+            if object_name == 'missing':
+                raise ObjectDoesNotExistError(value=None, driver=driver,
+                                              object_name=object_name)
+            elif object_name == 'error':
+                raise LibcloudError('Unexpected status code: 500')
+
+            return Object(name=object_name, size=1, hash=None, extra={},
+                          meta_data={'name': object_name},
+                          container=container, driver=driver)
+
+        names = ['obj%d' % (index) for index in range(0, 20)]
+        names += ['missing', 'error']
+
+        with patch.object(StorageDriver, 'get_object', get_object):
+            results = self.driver1.get_objects(container, names)
+            self.assertFalse(isinstance(results, list))
+            results = list(results)
+
+        self.assertEqual([obj.meta_data['name'] for obj in results[:20]],
+                         names[:20])
+        self.assertTrue(isinstance(results[20], ObjectDoesNotExistError))
+        self.assertEqual(results[21].object_name, 'error')
+        self.assertTrue('500' in str(results[21]))
+
 
 if __name__ == '__main__':
     sys.exit(unittest.main())
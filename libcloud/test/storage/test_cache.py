@@ -0,0 +1,250 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import with_statement
+
+import os
+import sys
+import shutil
+import hashlib
+import tempfile
+import itertools
+
+from mock import patch
+
+from libcloud.utils.py3 import b
+
+from libcloud.common.types import LibcloudError
+from libcloud.storage.base import Container, Object
+from libcloud.storage.types import ObjectHashMismatchError
+from libcloud.storage.cache import DownloadCache, CachedStorageDriver
+
+from libcloud.test import unittest
+from libcloud.test import StorageMockHttp
+from libcloud.test.storage.test_sync import MemoryStorageDriver
+
+
+class CachingStorageDriver(MemoryStorageDriver):
+    """
+    Memory driver which records the downloads and supports conditional
+    downloads.
+    """
+
+    def download_object_as_stream(self, obj, chunk_size=None):
+        self.operations.append(('download', obj.name))
+        yield self.objects[obj.name]
+
+    def _download_object_as_stream_if_changed(self, obj, data_hash,
+                                              chunk_size=None):
+        self.operations.append(('conditional', data_hash))
+        current = self._get_object(obj.container, obj.name)
+
+        if current.hash == data_hash:
+            return None
+
+        return (current.hash, self.download_object_as_stream(current),
+                self._get_content_md5_hash(current))
+
+
+class DownloadCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        MemoryStorageDriver.connectionCls.conn_classes = (None,
+                                                          StorageMockHttp)
+
+        self.path = tempfile.mkdtemp()
+        self.cache = DownloadCache(os.path.join(self.path, 'cache'),
+                                   max_size=10)
+        self.driver = CachingStorageDriver('username', 'key',
+                                           host='localhost')
+        self.cached_driver = CachedStorageDriver(self.driver, self.cache)
+        self.container = Container(name='test', extra={}, driver=self.driver)
+
+        self.driver.objects = {'a': b('aaaa'), 'b': b('bbbb'),
+                               'copy': b('aaaa')}
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.path)
+
+    def _get_object(self, name, with_hash=True):
+        obj = self.driver._get_object(self.container, name)
+
+        if not with_hash:
+            obj.hash = None
+
+        return obj
+
+    def _download(self, obj):
+        return b('').join(self.cached_driver.download_object_as_stream(obj))
+
+    def test_download_object_as_stream(self):
+        self.assertEqual(self._download(self._get_object('a')), b('aaaa'))
+        self.assertEqual(self._download(self._get_object('a')), b('aaaa'))
+
+        # Objects with the same content are stored only once
+        self.assertEqual(self._download(self._get_object('copy')),
+                         b('aaaa'))
+        self.assertEqual(self.driver.operations, [('conditional', None),
+                                                  ('download', 'a')])
+
+    def test_revalidation(self):
+        self._download(self._get_object('a'))
+        self.driver.operations = []
+
+        # Hash of the object is not known, cached data is revalidated
+        obj = self._get_object('a', with_hash=False)
+        self.assertEqual(self._download(obj), b('aaaa'))
+        self.assertEqual(self.driver.operations,
+                         [('conditional', self._get_object('a').hash)])
+
+        self.driver.objects['a'] = b('changed')
+        self.assertEqual(self._download(obj), b('changed'))
+        self.assertEqual(self._download(obj), b('changed'))
+        self.assertEqual(len([op for op in self.driver.operations
+                              if op[0] == 'download']), 1)
+
+    def test_eviction(self):
+        clock = itertools.count()
+
+        with patch('time.time', lambda: next(clock)):
+            self._download(self._get_object('a'))
+            self._download(self._get_object('b'))
+
+            # Least recently used data is removed when the cache is full
+            self._download(self._get_object('a'))
+            self.driver.objects['c'] = b('cccc')
+            self._download(self._get_object('c'))
+
+        # Entries of the removed data are removed too
+        scope = self.cached_driver._get_scope()
+        self.assertEqual(self.cache.get_entry(scope, 'test', 'b'), None)
+        self.assertEqual(self.cache.get_entry(scope, 'test', 'a'),
+                         self._get_object('a').hash)
+
+        self.driver.operations = []
+        self._download(self._get_object('a'))
+        self._download(self._get_object('b'))
+        self.assertEqual(self.driver.operations, [('conditional', None),
+                                                  ('download', 'b')])
+
+    def test_scope_of_other_account(self):
+        self._download(self._get_object('a'))
+
+        driver = CachingStorageDriver('other', 'key', host='localhost')
+        driver.objects = {'a': b('other')}
+        cached_driver = CachedStorageDriver(driver, self.cache)
+        scope = cached_driver._get_scope()
+
+        self.assertNotEqual(scope, self.cached_driver._get_scope())
+        self.assertEqual(self.cache.get_entry(scope, 'test', 'a'), None)
+
+        obj = driver._get_object(self.container, 'a')
+        self.assertEqual(b('').join(
+            cached_driver.download_object_as_stream(obj)), b('other'))
+        self.assertEqual(driver.operations, [('conditional', None),
+                                             ('download', 'a')])
+
+    def test_evicted_before_open(self):
+        self._download(self._get_object('a'))
+        self.driver.operations = []
+        get_data_path = self.cache.get_data_path
+        removed = []
+
+        def remove_after_get_data_path(scope, data_hash):
+            path = get_data_path(scope, data_hash)
+
+            # Data is removed by another process before it's opened
+            if path is not None and not removed:
+                os.remove(path)
+                removed.append(path)
+
+            return path
+
+        self.cache.get_data_path = remove_after_get_data_path
+
+        self.assertEqual(self._download(self._get_object('a')), b('aaaa'))
+        self.assertEqual(len(removed), 1)
+        self.assertEqual(self.driver.operations, [('conditional', None),
+                                                  ('download', 'a')])
+
+    def test_hash_mismatch(self):
+        def download_object_as_stream_if_changed(obj, data_hash,
+                                                 chunk_size=None):
+            data_hash = hashlib.md5(b('aaaa')).hexdigest()
+            md5_hash = None
+
+            if self.driver.content_md5_hash:
+                md5_hash = data_hash
+
+            return data_hash, iter([b('corrupted')]), md5_hash
+
+        self.driver._download_object_as_stream_if_changed = \
+            download_object_as_stream_if_changed
+        obj = self._get_object('a', with_hash=False)
+
+        self.assertRaises(ObjectHashMismatchError, self._download, obj)
+        self.assertEqual(os.listdir(os.path.join(self.path, 'cache', 'tmp')),
+                         [])
+        self.assertEqual(self.cache.get_entry(
+            self.cached_driver._get_scope(), 'test', 'a'), None)
+
+        # Hashes which are not content hashes are not verified
+        self.driver.content_md5_hash = False
+        self.assertEqual(self._download(obj), b('corrupted'))
+
+    def test_download_object(self):
+        destination_path = os.path.join(self.path, 'a')
+        obj = self._get_object('a')
+
+        self.assertTrue(self.cached_driver.download_object(obj,
+                                                           destination_path))
+        self.assertRaises(LibcloudError, self.cached_driver.download_object,
+                          obj, destination_path)
+        self.assertTrue(self.cached_driver.download_object(
+            obj, destination_path, overwrite_existing=True))
+
+        with open(destination_path, 'rb') as fp:
+            self.assertEqual(fp.read(), b('aaaa'))
+
+        self.assertEqual(self.driver.operations, [('conditional', None),
+                                                  ('download', 'a')])
+
+    def test_download_object_without_hash(self):
+        def download_object_as_stream_if_changed(obj, data_hash,
+                                                 chunk_size=None):
+            return None, iter([self.driver.objects[obj.name]]), None
+
+        self.driver._download_object_as_stream_if_changed = \
+            download_object_as_stream_if_changed
+        obj = self._get_object('a', with_hash=False)
+
+        # Data can't be cached if its hash is not known
+        self.assertEqual(self._download(obj), b('aaaa'))
+        self.assertEqual(os.listdir(os.path.join(self.path, 'cache', 'tmp')),
+                         [])
+        self.assertEqual(self.cache.get_entry(
+            self.cached_driver._get_scope(), 'test', 'a'), None)
+
+    def test_attributes_of_wrapped_driver(self):
+        self.assertEqual(self.cached_driver.name, 'Memory')
+        objects = list(self.cached_driver.iterate_container_objects(
+            self.container))
+        self.assertEqual(len(objects), 3)
+        self.assertTrue(isinstance(objects[0], Object))
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
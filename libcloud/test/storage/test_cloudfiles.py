@@ -21,6 +21,11 @@ import math
 import sys
 import copy
 
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
 import mock
 
 import libcloud.utils.files
@@ -244,6 +249,24 @@ class CloudFilesTests(unittest.TestCase):
         else:
             self.fail('Exception was not thrown')
 
+    def test_get_objects(self):
+        container = Container(name='test_container', extra={},
+                              driver=self.driver)
+
+        with mock.patch.object(self.driver, 'get_container') as get_container:
+            results = self.driver.get_objects(
+                container, ['test_object', 'not_found', 'test_object'])
+            results = list(results)
+
+        self.assertEqual(get_container.call_count, 0)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0].name, 'test_object')
+        self.assertEqual(results[0].size, 555)
+        self.assertEqual(results[0].meta_data['foo-bar'], 'test 1')
+        self.assertTrue(isinstance(results[1], ObjectDoesNotExistError))
+        self.assertEqual(results[1].object_name, 'not_found')
+        self.assertEqual(results[2].hash, '6b21c4a111ac178feacf9ec9d0c71f17')
+
     def test_create_container_success(self):
         container = self.driver.create_container(
             container_name='test_create_container')
@@ -543,6 +566,32 @@ class CloudFilesTests(unittest.TestCase):
         else:
             self.fail('Object does not exist but an exception was not thrown')
 
+    def test_copy_object(self):
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000, hash=None, extra={},
+                     container=container, meta_data=None, driver=self.driver)
+        result = self.driver.copy_object(obj, container, 'copied_object',
+                                         extra={'meta_data': {'foo': 'bar'}})
+        self.assertEqual(result.name, 'copied_object')
+        self.assertEqual(result.size, 1000)
+        self.assertEqual(result.hash, '9b2cf535f27731c974343645a3985328')
+        self.assertEqual(result.meta_data, {'foo': 'bar'})
+
+    def test_delete_objects_bulk(self):
+        CloudFilesMockHttp.type = 'BULK_DELETE'
+        container = Container(name='foo_bar_container', extra={}, driver=self)
+        errors = self.driver.delete_objects(container, ['foo_bar_object',
+                                                        'locked object'])
+        self.assertEqual(list(errors.keys()), ['locked object'])
+        self.assertTrue('409 Conflict' in str(errors['locked object']))
+
+    def test_delete_objects_bulk_not_supported(self):
+        # Objects are deleted one by one
+        container = Container(name='foo_bar_container', extra={}, driver=self)
+        errors = self.driver.delete_objects(container, ['foo_bar_object'])
+        self.assertEqual(errors, {})
+
     def test_ex_get_meta_data(self):
         meta_data = self.driver.ex_get_meta_data()
         self.assertTrue(isinstance(meta_data, dict))
@@ -920,6 +969,37 @@ class CloudFilesMockHttp(StorageMockHttp, MockHttpTestCase):
             status_code = httplib.NO_CONTENT
         return (status_code, body, headers, httplib.responses[httplib.OK])
 
+    def _v1_MossoCloudFS_BULK_DELETE(self, method, url, body, headers):
+        # test_delete_objects_bulk
+        self.assertEqual(method, 'POST')
+        self.assertTrue('bulk-delete' in url)
+        self.assertEqual(body.split('\n'),
+                         ['/foo_bar_container/foo_bar_object',
+                          '/foo_bar_container/locked%20object'])
+
+        body = json.dumps({'Number Deleted': 1, 'Number Not Found': 0,
+                           'Response Status': '400 Bad Request',
+                           'Response Body': '',
+                           'Errors': [['/foo_bar_container/locked%20object',
+                                       '409 Conflict']]})
+        return (httplib.OK,
+                body,
+                self.base_headers,
+                httplib.responses[httplib.OK])
+
+    def _v1_MossoCloudFS_foo_bar_container_copied_object(self, method, url,
+                                                         body, headers):
+        # test_copy_object
+        self.assertEqual(method, 'PUT')
+        self.assertEqual(headers['X-Copy-From'],
+                         '/foo_bar_container/foo_bar_object')
+        self.assertEqual(headers['X-Fresh-Metadata'], 'true')
+        self.assertEqual(headers['X-Object-Meta-foo'], 'bar')
+
+        headers = {'etag': '9b2cf535f27731c974343645a3985328'}
+        return (httplib.CREATED, '', headers,
+                httplib.responses[httplib.CREATED])
+
     def _v1_MossoCloudFS_not_found(self, method, url, body, headers):
         # test_get_object_not_found
         if method == 'HEAD':
@@ -16,9 +16,13 @@
 import sys
 import unittest
 
+from mock import patch
+
 from libcloud.utils.py3 import httplib
 
+from libcloud.storage.base import Container
 from libcloud.storage.drivers.google_storage import GoogleStorageDriver
+from libcloud.storage.drivers.google_storage import NAMESPACE
 from libcloud.test.storage.test_s3 import S3Tests, S3MockHttp
 
 from libcloud.test.file_fixtures import StorageFileFixtures
@@ -27,6 +31,8 @@ from libcloud.test.secrets import STORAGE_GOOGLE_STORAGE_PARAMS
 
 class GoogleStorageMockHttp(S3MockHttp):
     fixtures = StorageFileFixtures('google_storage')
+    namespace = NAMESPACE
+    http_vendor_prefix = 'x-goog'
 
     def _test2_test_get_object(self, method, url, body, headers):
         # test_get_object
@@ -58,6 +64,27 @@ class GoogleStorageTests(S3Tests):
         # Not supported on Google Storage
         pass
 
+    def test_delete_objects(self):
+        # Multi-object delete is not supported, objects are deleted one by
+        # one
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+
+        with patch.object(GoogleStorageDriver, '_delete_objects_batch') \
+                as delete_objects_batch:
+            with patch.object(GoogleStorageDriver, 'delete_object',
+                              return_value=True) as delete_object:
+                errors = self.driver.delete_objects(container,
+                                                    ['foo', 'bar'])
+
+        self.assertEqual(errors, {})
+        self.assertEqual(delete_object.call_count, 2)
+        self.assertEqual(delete_objects_batch.call_count, 0)
+
+    def test_delete_objects_failed_batch(self):
+        # Multi-object delete is not supported
+        pass
+
 
 if __name__ == '__main__':
     sys.exit(unittest.main())
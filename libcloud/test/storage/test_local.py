@@ -18,6 +18,7 @@ from __future__ import with_statement
 import os
 import sys
 import shutil
+import hashlib
 import unittest
 import tempfile
 
@@ -310,6 +311,177 @@ class LocalTests(unittest.TestCase):
         container.delete()
         self.remove_tmp_file(tmppath)
 
+    def test_download_object_range_as_stream_success(self):
+        tmppath = self.make_tmp_file()
+        container = self.driver.create_container('test6')
+        obj = container.upload_object(tmppath, 'test')
+
+        with open(tmppath, 'rb') as fp:
+            data = fp.read()
+
+        stream = self.driver.download_object_range_as_stream(
+            obj=obj, start_bytes=10, end_bytes=3000, chunk_size=1024)
+        self.assertEqual(b''.join(stream), data[10:3000])
+
+        stream = self.driver.download_object_range_as_stream(
+            obj=obj, start_bytes=4000)
+        self.assertEqual(b''.join(stream), data[4000:])
+
+        obj.delete()
+        container.delete()
+        self.remove_tmp_file(tmppath)
+
+    def test_copy_object_success(self):
+        tmppath = self.make_tmp_file()
+        container = self.driver.create_container('test7')
+        obj = container.upload_object(tmppath, 'test')
+
+        copied = self.driver.copy_object(obj, container, 'dir/copy')
+        self.assertEqual(copied.name, 'dir/copy')
+        self.assertEqual(copied.size, 4096)
+        self.assertEqual(b''.join(copied.as_stream()), b'blah' * 1024)
+
+        # Copy to a different local storage
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        driver = self.driver_type(path, None)
+        other_container = driver.create_container('test8')
+        copied = self.driver.copy_object(obj, other_container, 'copy')
+        self.assertEqual(copied.driver, driver)
+        self.assertEqual(b''.join(copied.as_stream()), b'blah' * 1024)
+
+        driver.delete_objects(other_container, ['copy'])
+        other_container.delete()
+
+        errors = self.driver.delete_objects(container, [obj, 'dir/copy'])
+        self.assertEqual(errors, {})
+        container.delete()
+        self.remove_tmp_file(tmppath)
+
+    def test_list_container_objects_prefix(self):
+        tmppath = self.make_tmp_file()
+        container = self.driver.create_container('test9')
+
+        for name in ['a', 'path/b', 'path/to/c', 'pathname/d', 'other/e']:
+            container.upload_object(tmppath, name)
+
+        names = [obj.name for obj in
+                 self.driver.list_container_objects(container,
+                                                    ex_prefix='path/')]
+        self.assertEqual(sorted(names), ['path/b', 'path/to/c'])
+
+        names = [obj.name for obj in
+                 self.driver.list_container_objects(container,
+                                                    ex_prefix='path')]
+        self.assertEqual(sorted(names),
+                         ['path/b', 'path/to/c', 'pathname/d'])
+
+        # Folders outside of the prefix are not visited
+        with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+            objects = self.driver.list_container_objects(container,
+                                                         ex_prefix='path/to')
+        self.assertEqual([obj.name for obj in objects], ['path/to/c'])
+        self.assertEqual(sorted([os.path.relpath(call[0][0],
+                                                 container.get_cdn_url())
+                                 for call in scandir.call_args_list]),
+                         ['.', 'path', 'path/to'])
+
+        self.remove_tmp_file(tmppath)
+
+    def test_content_hash(self):
+        tmppath = self.make_tmp_file()
+        driver = self.driver_type(self.key, None, ex_content_hash=True)
+        container = driver.create_container('test10')
+
+        obj = container.upload_object(tmppath, 'path/object')
+        self.assertEqual(obj.hash, hashlib.md5(b'blah' * 1024).hexdigest())
+
+        with open(tmppath, 'rb') as fp:
+            obj = container.upload_object_via_stream(fp, 'stream')
+        self.assertEqual(obj.hash, hashlib.md5(b'blah' * 1024).hexdigest())
+
+        # The cached hash is used while the file doesn't change
+        with mock.patch.object(driver, '_get_hash_function') as hash_func:
+            objects = driver.list_container_objects(container)
+        self.assertEqual(hash_func.call_count, 0)
+        self.assertEqual(sorted([o.name for o in objects]),
+                         ['path/object', 'stream'])
+
+        obj_path = obj.get_cdn_url()
+        with open(obj_path, 'wb') as fp:
+            fp.write(b'changed')
+
+        obj = driver.get_object('test10', 'stream')
+        self.assertEqual(obj.hash, hashlib.md5(b'changed').hexdigest())
+        self.assertEqual(driver._get_content_md5_hash(obj), obj.hash)
+
+        # Hashes returned by default are not content hashes
+        obj = self.driver.get_object('test10', 'stream')
+        self.assertEqual(self.driver._get_content_md5_hash(obj), None)
+
+        hash_path = os.path.join(container.get_cdn_url(), '.hash', 'path')
+        self.assertTrue(os.path.isdir(hash_path))
+        driver.get_object('test10', 'path/object').delete()
+        self.assertFalse(os.path.exists(hash_path))
+
+        self.remove_tmp_file(tmppath)
+
+    def test_upload_object_atomic(self):
+        tmppath = self.make_tmp_file()
+        container = self.driver.create_container('test11')
+        obj = container.upload_object(tmppath, 'path/object')
+
+        def iterator():
+            yield b'partial'
+            raise IOError('stream error')
+
+        # Uploads don't take a lock and a failed upload leaves the existing
+        # object untouched
+        with mock.patch.object(LockLocalStorage, '__enter__',
+                               side_effect=LibcloudError('Lock timeout')):
+            self.assertRaises(IOError, container.upload_object_via_stream,
+                              iterator(), 'path/object')
+            self.assertEqual(b''.join(obj.as_stream()), b'blah' * 1024)
+
+            obj = container.upload_object_via_stream(iter([b'new']),
+                                                     'path/object')
+            self.assertEqual(b''.join(obj.as_stream()), b'new')
+
+        temp_folder = os.path.join(container.get_cdn_url(), '.tmp')
+        self.assertEqual(os.listdir(temp_folder), [])
+        self.assertEqual([o.name for o in container.list_objects()],
+                         ['path/object'])
+
+        obj.delete()
+        self.remove_tmp_file(tmppath)
+
+    def test_copy_object_link(self):
+        tmppath = self.make_tmp_file()
+        container = self.driver.create_container('test12')
+        obj = container.upload_object(tmppath, 'test')
+
+        # Permissions of the linked file (possibly owned by another user)
+        # are not changed
+        with mock.patch('os.chmod') as chmod:
+            copied = self.driver.copy_object(obj, container, 'copy')
+        self.assertEqual(chmod.call_count, 0)
+        self.assertEqual(os.stat(copied.get_cdn_url()).st_ino,
+                         os.stat(obj.get_cdn_url()).st_ino)
+
+        # Replacing the copy doesn't change the source object
+        container.upload_object_via_stream(iter([b'new']), 'copy')
+        self.assertEqual(b''.join(obj.as_stream()), b'blah' * 1024)
+
+        self.remove_tmp_file(tmppath)
+
+    def test_download_object_as_stream_empty(self):
+        container = self.driver.create_container('test13')
+        obj = container.upload_object_via_stream(iter([]), 'empty')
+
+        self.assertEqual(b''.join(obj.as_stream()), b'')
+        self.assertEqual(b''.join(self.driver.download_object_range_as_stream(
+            obj, start_bytes=0, end_bytes=10)), b'')
+
     @mock.patch("lockfile.mkdirlockfile.MkdirLockFile.acquire",
                 mock.MagicMock(side_effect=LockTimeout))
     def test_proper_lockfile_imports(self):
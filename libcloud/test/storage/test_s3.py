@@ -14,7 +14,9 @@
 # limitations under the License.
 
 import os
+import re
 import sys
+import hashlib
 import unittest
 
 try:
@@ -22,7 +24,10 @@ try:
 except ImportError:
     from xml.etree import ElementTree as ET
 
+from mock import patch
+
 from libcloud.utils.py3 import httplib
+from libcloud.utils.py3 import b
 from libcloud.utils.py3 import urlparse
 from libcloud.utils.py3 import parse_qs
 
@@ -38,7 +43,8 @@ from libcloud.storage.drivers.s3 import S3StorageDriver, S3USWestStorageDriver
 from libcloud.storage.drivers.s3 import S3EUWestStorageDriver
 from libcloud.storage.drivers.s3 import S3APSEStorageDriver
 from libcloud.storage.drivers.s3 import S3APNEStorageDriver
-from libcloud.storage.drivers.s3 import CHUNK_SIZE
+from libcloud.storage.drivers.s3 import CHUNK_SIZE, MAX_UPLOAD_PARTS
+from libcloud.storage.drivers.s3 import NAMESPACE as S3_NAMESPACE
 from libcloud.storage.drivers.dummy import DummyIterator
 
 from libcloud.test import StorageMockHttp, MockRawResponse  # pylint: disable-msg=E0611
@@ -46,11 +52,17 @@ from libcloud.test import MockHttpTestCase  # pylint: disable-msg=E0611
 from libcloud.test.file_fixtures import StorageFileFixtures  # pylint: disable-msg=E0611
 from libcloud.test.secrets import STORAGE_S3_PARAMS
 
+SHARDED_KEYS = ['1', 'a/1', 'a/2', 'a/b/3', 'a0', 'b/1', 'b/2', 'b/3', 'c',
+                'd/1', 'e', 'f', 'g']
+
 
 class S3MockHttp(StorageMockHttp, MockHttpTestCase):
 
     fixtures = StorageFileFixtures('s3')
     base_headers = {}
+    namespace = S3_NAMESPACE
+    http_vendor_prefix = 'x-amz'
+    deleted_keys = []
 
     def _UNAUTHORIZED(self, method, url, body, headers):
         return (httplib.UNAUTHORIZED,
@@ -113,6 +125,164 @@ class S3MockHttp(StorageMockHttp, MockHttpTestCase):
                 self.base_headers,
                 httplib.responses[httplib.OK])
 
+    def _sharded_container(self, method, url, body, headers):
+        # Generates listing of SHARDED_KEYS using at most 2 keys per page
+        params = dict([(key, value[0]) for key, value in
+                       parse_qs(urlparse.urlparse(url).query).items()])
+        prefix = params.get('prefix', '')
+        delimiter = params.get('delimiter', None)
+        marker = params.get('marker', '')
+
+        items = []
+        for key in SHARDED_KEYS:
+            if not key.startswith(prefix) or key <= marker:
+                continue
+
+            index = key.find(delimiter, len(prefix)) if delimiter else -1
+
+            if index == -1:
+                items.append(('Contents', key))
+            elif (items[-1:] or [None])[0] != \
+                    ('CommonPrefixes', key[:index + 1]):
+                if key[:index + 1] > marker:
+                    items.append(('CommonPrefixes', key[:index + 1]))
+
+        is_truncated = len(items) > 2
+        items = items[:2]
+
+        body = ['<?xml version="1.0" encoding="UTF-8"?>',
+                '<ListBucketResult xmlns="%s">' % (self.namespace),
+                '<IsTruncated>%s</IsTruncated>' % (str(is_truncated).lower())]
+
+        if is_truncated and delimiter:
+            body.append('<NextMarker>%s</NextMarker>' % (items[-1][1]))
+
+        for kind, key in items:
+            if kind == 'Contents':
+                body.append('<Contents><Key>%s</Key><ETag>"hash"</ETag>'
+                            '<Size>1</Size></Contents>' % (key))
+            else:
+                body.append('<CommonPrefixes><Prefix>%s</Prefix>'
+                            '</CommonPrefixes>' % (key))
+
+        body.append('</ListBucketResult>')
+        return (httplib.OK,
+                ''.join(body),
+                self.base_headers,
+                httplib.responses[httplib.OK])
+
+    def _foo_bar_container_DELETE_OBJECTS(self, method, url, body, headers):
+        # test_delete_objects
+        self.assertEqual(method, 'POST')
+        self.assertTrue(url.endswith('?delete') or '?delete&' in url)
+        self.assertTrue('Content-MD5' in headers)
+
+        keys = re.findall('<Key>(.*?)</Key>', body)
+
+        if [key for key in keys if key.startswith('fail')]:
+            return (httplib.INTERNAL_SERVER_ERROR,
+                    '',
+                    self.base_headers,
+                    httplib.responses[httplib.INTERNAL_SERVER_ERROR])
+
+        self.__class__.deleted_keys.extend(keys)
+
+        errors = ['<Error><Key>%s</Key><Code>AccessDenied</Code>'
+                  '<Message>Access Denied</Message></Error>' % (key)
+                  for key in keys if key.startswith('denied')]
+        body = ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<DeleteResult xmlns="%s">%s</DeleteResult>' %
+                (self.namespace, ''.join(errors)))
+        return (httplib.OK,
+                body,
+                self.base_headers,
+                httplib.responses[httplib.OK])
+
+    def _foo_bar_container_copied_object(self, method, url, body, headers):
+        # test_copy_object
+        ns = self.namespace
+        source = headers[self.http_vendor_prefix + '-copy-source']
+        self.assertEqual(source, '/foo_bar_container/foo_bar_object')
+
+        if 'partNumber' in url:
+            range_key = self.http_vendor_prefix + '-copy-source-range'
+            self.assertTrue(headers[range_key].startswith('bytes='))
+            body = ('<CopyPartResult xmlns="%s"><ETag>"part"</ETag>'
+                    '</CopyPartResult>' % (ns))
+        else:
+            body = ('<CopyObjectResult xmlns="%s">'
+                    '<LastModified>2015-06-01T10:00:00.000Z</LastModified>'
+                    '<ETag>"9b2cf535f27731c974343645a3985328"</ETag>'
+                    '</CopyObjectResult>' % (ns))
+
+        return (httplib.OK,
+                body,
+                self.base_headers,
+                httplib.responses[httplib.OK])
+
+    def _foo_bar_container_copied_object_MULTIPART(self, method, url, body,
+                                                   headers):
+        # test_copy_object_multipart
+        if method == 'POST' and 'uploads' in url:
+            self.assertEqual(headers['Content-Type'], 'text/plain')
+            body = ('<InitiateMultipartUploadResult xmlns="%s">'
+                    '<UploadId>copy_upload</UploadId>'
+                    '</InitiateMultipartUploadResult>' % (self.namespace))
+        elif method == 'POST':
+            self.assertTrue('uploadId=copy_upload' in url)
+            self.assertEqual(body.count('<PartNumber>'), 12)
+            body = ('<CompleteMultipartUploadResult xmlns="%s">'
+                    '<ETag>"multipart-12"</ETag>'
+                    '</CompleteMultipartUploadResult>' % (self.namespace))
+        else:
+            return self._foo_bar_container_copied_object(method, url, body,
+                                                         headers)
+
+        return (httplib.OK,
+                body,
+                self.base_headers,
+                httplib.responses[httplib.OK])
+
+    def _foo_bar_container_foo_parts_PARTS(self, method, url, body, headers):
+        # test_upload_parts
+        ns = self.namespace
+        response_headers = {}
+
+        if method == 'POST' and 'uploads' in url:
+            self.assertEqual(headers['Content-Type'], 'text/plain')
+            body = ('<InitiateMultipartUploadResult xmlns="%s">'
+                    '<UploadId>parts_upload</UploadId>'
+                    '</InitiateMultipartUploadResult>' % (ns))
+        elif method == 'PUT':
+            self.assertTrue('uploadId=parts_upload' in url)
+            self.assertTrue('Content-MD5' in headers)
+
+            if 'partNumber=2' in url:
+                # Corrupted part
+                response_headers['etag'] = '"foo"'
+            elif 'partNumber=3' in url:
+                # ETag of a SSE-KMS encrypted part is not a MD5 hash
+                response_headers['etag'] = '"%s"' % ('1' * 32)
+                response_headers['x-amz-server-side-encryption'] = 'aws:kms'
+            else:
+                response_headers['etag'] = '"%s"' % \
+                    (hashlib.md5(body).hexdigest())
+
+            body = ''
+        elif method == 'POST':
+            self.assertEqual(body.count('<PartNumber>'), 1)
+            body = ('<CompleteMultipartUploadResult xmlns="%s">'
+                    '<ETag>"parts-1"</ETag>'
+                    '</CompleteMultipartUploadResult>' % (ns))
+        else:
+            return (httplib.NO_CONTENT, '', response_headers,
+                    httplib.responses[httplib.NO_CONTENT])
+
+        return (httplib.OK,
+                body,
+                response_headers,
+                httplib.responses[httplib.OK])
+
     def _test2_get_object(self, method, url, body, headers):
         body = self.fixtures.load('list_container_objects.xml')
         return (httplib.OK,
@@ -346,6 +516,48 @@ class S3MockRawResponse(MockRawResponse):
                 headers,
                 httplib.responses[httplib.OK])
 
+    def _foo_bar_container_foo_bar_object_NOT_MODIFIED(self, method, url,
+                                                       body, headers):
+        # test_download_object_as_stream_if_changed
+        return (httplib.NOT_MODIFIED,
+                '',
+                {},
+                httplib.responses[httplib.NOT_MODIFIED])
+
+    def _foo_bar_container_foo_bar_object_ETAG(self, method, url, body,
+                                               headers):
+        # test_download_object_as_stream_if_changed
+        return (httplib.OK,
+                'data',
+                {'etag': '"e31208wqsdoj329jd"'},
+                httplib.responses[httplib.OK])
+
+    def _foo_bar_container_foo_bar_object_MD5_ETAG(self, method, url, body,
+                                                   headers):
+        # test_download_object_as_stream_if_changed
+        return (httplib.OK,
+                'data',
+                {'etag': '"%s"' % (hashlib.md5(b('data')).hexdigest())},
+                httplib.responses[httplib.OK])
+
+    def _foo_bar_container_foo_bar_object_KMS_ETAG(self, method, url, body,
+                                                   headers):
+        # test_download_object_as_stream_if_changed
+        return (httplib.OK,
+                'data',
+                {'etag': '"%s"' % (hashlib.md5(b('data')).hexdigest()),
+                 'x-amz-server-side-encryption': 'aws:kms'},
+                httplib.responses[httplib.OK])
+
+    def _foo_bar_container_foo_bar_object_RANGE(self, method, url, body,
+                                                headers):
+        # test_download_object_range_as_stream
+        body = 'bcd'
+        return (httplib.PARTIAL_CONTENT,
+                body,
+                {},
+                httplib.responses[httplib.PARTIAL_CONTENT])
+
     def _foo_bar_container_foo_test_upload_INVALID_HASH1(self, method, url,
                                                          body, headers):
         body = ''
@@ -529,6 +741,45 @@ class S3Tests(unittest.TestCase):
         self.assertEqual(obj.container.name, 'test_container')
         self.assertTrue('owner' in obj.meta_data)
 
+    def test_list_container_objects_with_delimiter(self):
+        container = Container(name='sharded_container', extra={},
+                              driver=self.driver)
+        objects = self.driver.list_container_objects(container=container,
+                                                     ex_prefix='a/',
+                                                     ex_delimiter='/')
+        self.assertEqual([obj.name for obj in objects], ['a/1', 'a/2'])
+
+        prefixes = self.driver.ex_iterate_container_prefixes(container)
+        self.assertEqual(list(prefixes), ['a/', 'b/', 'd/'])
+
+    def test_iterate_container_objects_parallel(self):
+        container = Container(name='sharded_container', extra={},
+                              driver=self.driver)
+        expected = [obj.name for obj in
+                    self.driver.iterate_container_objects(container)]
+        self.assertEqual(expected, SHARDED_KEYS)
+
+        objects = self.driver.ex_iterate_container_objects_parallel(
+            container, workers=3)
+        self.assertEqual([obj.name for obj in objects], expected)
+
+        objects = self.driver.ex_iterate_container_objects_parallel(
+            container, split_points=['b/2', 'a/1', 'e'], workers=2)
+        self.assertEqual([obj.name for obj in objects], expected)
+
+        objects = self.driver.ex_iterate_container_objects_parallel(
+            container, prefix='a/', ordered=False)
+        self.assertEqual(sorted([obj.name for obj in objects]),
+                         ['a/1', 'a/2', 'a/b/3'])
+
+    def test_iterate_container_objects_parallel_error(self):
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        self.mock_response_klass.type = 'NOT_FOUND'
+        objects = self.driver.ex_iterate_container_objects_parallel(
+            container, split_points=['a'])
+        self.assertRaises(LibcloudError, list, objects)
+
     def test_get_container_doesnt_exist(self):
         self.mock_response_klass.type = 'get_container'
         try:
@@ -699,6 +950,64 @@ class S3Tests(unittest.TestCase):
                                                        chunk_size=None)
         self.assertTrue(hasattr(stream, '__iter__'))
 
+    def test_download_object_range_as_stream(self):
+        self.mock_raw_response_klass.type = 'RANGE'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000, hash=None, extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+
+        connection = self.driver.connection
+
+        with patch.object(connection, 'request',
+                          wraps=connection.request) as request:
+            stream = self.driver.download_object_range_as_stream(obj, 1, 4)
+
+        self.assertEqual(b('').join(stream), b('bcd'))
+        self.assertEqual(request.call_args[1]['headers'],
+                         {'Range': 'bytes=1-3'})
+
+    def test_download_object_as_stream_if_changed(self):
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1000, hash=None, extra={},
+                     container=container, meta_data=None,
+                     driver=self.driver_type)
+        connection = self.driver.connection
+
+        self.mock_raw_response_klass.type = 'NOT_MODIFIED'
+        with patch.object(connection, 'request',
+                          wraps=connection.request) as request:
+            result = self.driver._download_object_as_stream_if_changed(
+                obj, 'e31208wqsdoj329jd')
+
+        self.assertEqual(result, None)
+        self.assertEqual(request.call_args[1]['headers'],
+                         {'If-None-Match': '"e31208wqsdoj329jd"'})
+
+        self.mock_raw_response_klass.type = 'ETAG'
+        data_hash, stream, md5_hash = \
+            self.driver._download_object_as_stream_if_changed(obj, None)
+        self.assertEqual(data_hash, 'e31208wqsdoj329jd')
+        self.assertEqual(b('').join(stream), b('data'))
+        self.assertEqual(md5_hash, None)
+
+        if not self.driver.content_md5_hash:
+            return
+
+        self.mock_raw_response_klass.type = 'MD5_ETAG'
+        data_hash, stream, md5_hash = \
+            self.driver._download_object_as_stream_if_changed(obj, None)
+        self.assertEqual(md5_hash, hashlib.md5(b('data')).hexdigest())
+
+        # ETags of SSE-KMS encrypted objects are not MD5 hashes
+        self.mock_raw_response_klass.type = 'KMS_ETAG'
+        data_hash, stream, md5_hash = \
+            self.driver._download_object_as_stream_if_changed(obj, None)
+        self.assertEqual(data_hash, hashlib.md5(b('data')).hexdigest())
+        self.assertEqual(md5_hash, None)
+
     def test_upload_object_invalid_ex_storage_class(self):
         # Invalid hash is detected on the amazon side and BAD_REQUEST is
         # returned
@@ -958,6 +1267,144 @@ class S3Tests(unittest.TestCase):
         result = self.driver.delete_object(obj=obj)
         self.assertTrue(result)
 
+    def test_copy_object(self):
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1234, hash=None, extra=None,
+                     meta_data={'foo': 'bar'}, container=container,
+                     driver=self.driver)
+
+        result = self.driver.copy_object(obj, container, 'copied_object')
+        self.assertEqual(result.name, 'copied_object')
+        self.assertEqual(result.size, 1234)
+        self.assertEqual(result.hash, '9b2cf535f27731c974343645a3985328')
+        self.assertEqual(result.meta_data, {'foo': 'bar'})
+        self.assertEqual(result.extra['last_modified'],
+                         '2015-06-01T10:00:00.000Z')
+
+        results = self.driver.copy_objects([(obj, container, 'copied_object'),
+                                            (obj, container, 'copied_object')])
+        self.assertEqual([result.name for result in results],
+                         ['copied_object', 'copied_object'])
+
+    def test_copy_object_multipart(self):
+        if not self.driver.supports_s3_multipart_upload:
+            return
+
+        self.mock_response_klass.type = 'MULTIPART'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=6 * 1024 * 1024 * 1024,
+                     hash=None, extra=None, meta_data=None,
+                     container=container, driver=self.driver)
+
+        result = self.driver.copy_object(obj, container, 'copied_object',
+                                         extra={'content_type': 'text/plain'})
+        self.assertEqual(result.hash, 'multipart-12')
+        self.assertEqual(result.size, obj.size)
+
+    def test_upload_parts(self):
+        if not self.driver.supports_s3_multipart_upload:
+            return
+
+        self.assertEqual(self.driver._get_upload_part_size(100), CHUNK_SIZE)
+        self.assertTrue(self.driver._get_upload_part_size(
+            MAX_UPLOAD_PARTS * CHUNK_SIZE + 1) > CHUNK_SIZE)
+
+        self.mock_response_klass.type = 'PARTS'
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        upload = self.driver._initiate_part_upload(
+            container, 'foo_parts', extra={'content_type': 'text/plain'})
+        self.assertEqual(upload['upload_id'], 'parts_upload')
+
+        part = self.driver._upload_part(upload, 1, b('abc'))
+        self.assertEqual(part[0], 1)
+        self.assertRaises(ObjectHashMismatchError, self.driver._upload_part,
+                          upload, 2, b('def'))
+        self.assertEqual(self.driver._upload_part(upload, 3, b('ghi'))[0], 3)
+
+        obj = self.driver._complete_part_upload(upload, [part], 3)
+        self.assertEqual(obj.name, 'foo_parts')
+        self.assertEqual(obj.hash, 'parts-1')
+        self.assertEqual(obj.size, 3)
+
+        self.driver._abort_part_upload(upload)
+
+    def test_get_content_md5_hash(self):
+        if not self.driver.content_md5_hash:
+            return
+
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        md5_hash = hashlib.md5(b('foo')).hexdigest()
+        headers = {'etag': '"%s"' % (md5_hash), 'content-length': '3',
+                   'content-type': 'text/plain'}
+
+        def get_hash(**encryption_headers):
+            object_headers = headers.copy()
+
+            for key, value in encryption_headers.items():
+                key = 'x-amz-' + key.replace('_', '-')
+                object_headers[key] = value
+
+            obj = self.driver._headers_to_object('foo', container,
+                                                 object_headers)
+            return self.driver._get_content_md5_hash(obj)
+
+        self.assertEqual(get_hash(), md5_hash)
+        self.assertEqual(get_hash(server_side_encryption='AES256'), md5_hash)
+        self.assertEqual(get_hash(server_side_encryption='aws:kms'), None)
+        self.assertEqual(get_hash(
+            server_side_encryption_customer_algorithm='AES256'), None)
+
+        # Encryption of the objects is not known in listings
+        obj = Object(name='foo', size=3, hash=md5_hash,
+                     extra={'last_modified': None}, meta_data=None,
+                     container=container, driver=self.driver)
+        self.assertEqual(self.driver._get_content_md5_hash(obj), None)
+
+    def test_delete_objects(self):
+        self.mock_response_klass.type = 'DELETE_OBJECTS'
+        self.mock_response_klass.deleted_keys = []
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+        obj = Object(name='foo_bar_object', size=1234, hash=None, extra=None,
+                     meta_data=None, container=container, driver=self.driver)
+
+        errors = self.driver.delete_objects(container, [obj, 'denied_1'])
+        self.assertEqual(list(errors.keys()), ['denied_1'])
+        self.assertTrue('AccessDenied' in str(errors['denied_1']))
+        self.assertEqual(self.mock_response_klass.deleted_keys,
+                         ['foo_bar_object', 'denied_1'])
+
+        # Objects are split into multiple requests
+        self.mock_response_klass.deleted_keys = []
+        names = ['object_%d' % (index) for index in range(0, 2500)]
+        errors = self.driver.delete_objects(container, names)
+        self.assertEqual(errors, {})
+        self.assertEqual(sorted(self.mock_response_klass.deleted_keys),
+                         sorted(names))
+
+    def test_delete_objects_failed_batch(self):
+        self.mock_response_klass.type = 'DELETE_OBJECTS'
+        self.mock_response_klass.deleted_keys = []
+        container = Container(name='foo_bar_container', extra={},
+                              driver=self.driver)
+
+        # Objects of the failed request are reported as errors, the other
+        # requests are not affected
+        names = ['fail'] + ['object_%d' % (index) for index in range(0, 1500)]
+        errors = self.driver.delete_objects(container, names)
+        self.assertEqual(sorted(errors.keys()), sorted(names[:1000]))
+        self.assertTrue('500' in str(errors['fail']))
+        self.assertEqual(sorted(self.mock_response_klass.deleted_keys),
+                         sorted(names[1000:]))
+
+        self.mock_response_klass.deleted_keys = []
+        errors = self.driver.delete_objects(container, ['fail'])
+        self.assertEqual(list(errors.keys()), ['fail'])
+
 
 class S3USWestTests(S3Tests):
     driver_type = S3USWestStorageDriver
@@ -0,0 +1,289 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import with_statement
+
+import os
+import sys
+import shutil
+import hashlib
+import tempfile
+
+from libcloud.utils.py3 import b
+
+from libcloud.storage.base import StorageDriver
+from libcloud.storage.base import Container, Object
+from libcloud.storage.types import ObjectDoesNotExistError
+from libcloud.storage.sync import SyncManifest
+from libcloud.storage.sync import sync_directory, sync_containers
+
+from libcloud.test import unittest
+from libcloud.test import StorageMockHttp
+
+
+class MemoryStorageDriver(StorageDriver):
+    """
+    Driver which stores objects in a dictionary (shared by all the driver
+    copies) and records the performed operations.
+    """
+    name = 'Memory'
+    content_md5_hash = True
+
+    def __init__(self, *args, **kwargs):
+        super(MemoryStorageDriver, self).__init__(*args, **kwargs)
+        self.objects = {}
+        self.last_modified = {}
+        self.operations = []
+
+    def _get_object(self, container, name):
+        data = self.objects[name]
+        extra = {'last_modified': self.last_modified.get(name, None)}
+        return Object(name=name, size=len(data),
+                      hash=hashlib.md5(data).hexdigest(), extra=extra,
+                      meta_data={}, container=container, driver=self)
+
+    def iterate_container_objects(self, container, ex_prefix=None):
+        self.operations.append(('list', ex_prefix))
+
+        for name in sorted(self.objects.keys()):
+            if name.startswith(ex_prefix or ''):
+                yield self._get_object(container, name)
+
+    def download_object_as_stream(self, obj, chunk_size=None):
+        yield self.objects[obj.name]
+
+    def upload_object(self, file_path, container, object_name, extra=None,
+                      verify_hash=True):
+        with open(file_path, 'rb') as fp:
+            self.objects[object_name] = fp.read()
+
+        self.operations.append(('upload', object_name))
+        return self._get_object(container, object_name)
+
+    def upload_object_via_stream(self, iterator, container, object_name,
+                                 extra=None):
+        self.objects[object_name] = b('').join(iterator)
+        self.operations.append(('upload', object_name))
+        return self._get_object(container, object_name)
+
+    def delete_object(self, obj):
+        if obj.name not in self.objects:
+            raise ObjectDoesNotExistError(value=None, driver=self,
+                                          object_name=obj.name)
+
+        del self.objects[obj.name]
+        self.operations.append(('delete', obj.name))
+        return True
+
+
+class SyncTests(unittest.TestCase):
+
+    def setUp(self):
+        MemoryStorageDriver.connectionCls.conn_classes = (None,
+                                                          StorageMockHttp)
+
+        self.driver = MemoryStorageDriver('username', 'key', host='localhost')
+        self.container = Container(name='test', extra={}, driver=self.driver)
+        self.path = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(tempfile.mkdtemp(), 'manifest.db')
+
+        self._write_file('a.txt', 'a')
+        self._write_file('dir/b.txt', 'bb')
+        self._write_file('dir/sub/c.txt', 'ccc')
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        shutil.rmtree(os.path.dirname(self.manifest_path))
+
+    def _write_file(self, name, data):
+        file_path = os.path.join(self.path, *name.split('/'))
+
+        if not os.path.exists(os.path.dirname(file_path)):
+            os.makedirs(os.path.dirname(file_path))
+
+        with open(file_path, 'wb') as fp:
+            fp.write(b(data))
+
+    def _get_operations(self, kind):
+        return sorted([name for (operation, name) in self.driver.operations
+                       if operation == kind])
+
+    def test_sync_directory(self):
+        self.driver.objects = {'backup/a.txt': b('a'),
+                               'backup/dir/b.txt': b('xx'),
+                               'backup/old.txt': b('old'),
+                               'other.txt': b('other')}
+
+        result = sync_directory(self.path, self.container, prefix='backup/',
+                                delete=True, workers=2)
+
+        self.assertEqual(sorted(result.transferred),
+                         ['backup/dir/b.txt', 'backup/dir/sub/c.txt'])
+        self.assertEqual(result.deleted, ['backup/old.txt'])
+        self.assertEqual(result.unchanged, 1)
+        self.assertEqual(result.errors, {})
+        self.assertEqual(self.driver.objects,
+                         {'backup/a.txt': b('a'),
+                          'backup/dir/b.txt': b('bb'),
+                          'backup/dir/sub/c.txt': b('ccc'),
+                          'other.txt': b('other')})
+
+    def test_sync_directory_without_content_hash(self):
+        self.driver.content_md5_hash = False
+        self.driver.objects = {'a.txt': b('x'), 'dir/b.txt': b('xx'),
+                               'dir/sub/c.txt': b('xxx')}
+        self.driver.last_modified = {
+            'a.txt': 'Fri, 01 Jan 2100 00:00:00 GMT',
+            'dir/b.txt': '2000-01-01T00:00:00.000Z'}
+
+        # Files modified after the objects are uploaded, modification time
+        # of c.txt is not known so only its size is compared
+        result = sync_directory(self.path, self.container)
+
+        self.assertEqual(result.transferred, ['dir/b.txt'])
+        self.assertEqual(result.unchanged, 2)
+        self.assertEqual(self.driver.objects['a.txt'], b('x'))
+
+    def test_sync_directory_manifest_scope(self):
+        manifest = SyncManifest(self.manifest_path)
+        sync_directory(self.path, self.container, manifest=manifest)
+
+        # Containers of other accounts are synchronized separately
+        driver = MemoryStorageDriver('username2', 'key', host='localhost')
+        container = Container(name='test', extra={}, driver=driver)
+        result = sync_directory(self.path, container, manifest=manifest)
+
+        self.assertEqual(len(result.transferred), 3)
+        self.assertEqual(len(self._get_scopes(manifest)), 2)
+        manifest.close()
+
+    def test_sync_directory_without_delete(self):
+        self.driver.objects = {'old.txt': b('old')}
+
+        result = sync_directory(self.path, self.container)
+
+        self.assertEqual(result.deleted, [])
+        self.assertEqual(len(result.transferred), 3)
+        self.assertTrue('old.txt' in self.driver.objects)
+
+    def test_sync_directory_manifest(self):
+        manifest = SyncManifest(self.manifest_path)
+
+        result = sync_directory(self.path, self.container, delete=True,
+                                manifest=manifest)
+        self.assertEqual(len(result.transferred), 3)
+        self.assertEqual(self._get_operations('list'), [None])
+
+        # Only the changed files are uploaded and the container is not
+        # listed again
+        self.driver.operations = []
+        self._write_file('dir/b.txt', 'changed')
+        self._write_file('d.txt', 'd')
+        os.remove(os.path.join(self.path, 'a.txt'))
+
+        manifest.close()
+        manifest = SyncManifest(self.manifest_path)
+        result = sync_directory(self.path, self.container, delete=True,
+                                manifest=manifest)
+
+        self.assertEqual(sorted(result.transferred), ['d.txt', 'dir/b.txt'])
+        self.assertEqual(result.deleted, ['a.txt'])
+        self.assertEqual(result.unchanged, 1)
+        self.assertEqual(self._get_operations('list'), [])
+        self.assertEqual(self.driver.objects['dir/b.txt'], b('changed'))
+        self.assertFalse('a.txt' in self.driver.objects)
+
+        entries = manifest.get_entries(self._get_scopes(manifest)[0])
+        self.assertEqual(sorted(entries.keys()),
+                         ['d.txt', 'dir/b.txt', 'dir/sub/c.txt'])
+        manifest.close()
+
+    def _get_scopes(self, manifest):
+        cursor = manifest._connection.execute(
+            'SELECT DISTINCT scope FROM entries')
+        return [row[0] for row in cursor]
+
+    def test_sync_directory_upload_error(self):
+        manifest = SyncManifest(self.manifest_path)
+        upload_object = self.driver.upload_object
+
+        def failing_upload_object(file_path, container, object_name,
+                                  **kwargs):
+            if object_name == 'a.txt':
+                raise Exception('upload failed')
+
+            return upload_object(file_path, container, object_name, **kwargs)
+
+        self.driver.upload_object = failing_upload_object
+        result = sync_directory(self.path, self.container, manifest=manifest,
+                                workers=1)
+
+        self.assertEqual(list(result.errors.keys()), ['a.txt'])
+        self.assertEqual(len(result.transferred), 2)
+
+        # Failed upload is retried by the next synchronization
+        self.driver.upload_object = upload_object
+        result = sync_directory(self.path, self.container, manifest=manifest)
+
+        self.assertEqual(result.transferred, ['a.txt'])
+        self.assertEqual(result.errors, {})
+        manifest.close()
+
+    def test_sync_containers(self):
+        destination_driver = MemoryStorageDriver('username2', 'key',
+                                                 host='localhost')
+        destination = Container(name='destination', extra={},
+                                driver=destination_driver)
+
+        self.driver.objects = {'data/a.txt': b('a'), 'data/b.txt': b('b'),
+                               'other.txt': b('other')}
+        destination_driver.objects = {'copy/b.txt': b('b'),
+                                      'copy/old.txt': b('old')}
+
+        result = sync_containers(self.container, destination, prefix='data/',
+                                 destination_prefix='copy/', delete=True)
+
+        self.assertEqual(result.transferred, ['copy/a.txt'])
+        self.assertEqual(result.deleted, ['copy/old.txt'])
+        self.assertEqual(result.unchanged, 1)
+        self.assertEqual(destination_driver.objects,
+                         {'copy/a.txt': b('a'), 'copy/b.txt': b('b')})
+
+    def test_sync_containers_manifest(self):
+        destination_driver = MemoryStorageDriver('username2', 'key',
+                                                 host='localhost')
+        destination = Container(name='destination', extra={},
+                                driver=destination_driver)
+        manifest = SyncManifest(self.manifest_path)
+
+        self.driver.objects = {'a.txt': b('a'), 'b.txt': b('b')}
+        result = sync_containers(self.container, destination,
+                                 manifest=manifest)
+        self.assertEqual(sorted(result.transferred), ['a.txt', 'b.txt'])
+
+        destination_driver.operations = []
+        self.driver.objects['b.txt'] = b('changed')
+        result = sync_containers(self.container, destination,
+                                 manifest=manifest)
+
+        self.assertEqual(result.transferred, ['b.txt'])
+        self.assertEqual(result.unchanged, 1)
+        self.assertEqual(destination_driver.objects['b.txt'], b('changed'))
+        self.assertFalse(('list', None) in destination_driver.operations)
+        manifest.close()
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
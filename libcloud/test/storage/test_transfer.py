@@ -0,0 +1,237 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+
+from mock import patch
+
+from libcloud.utils.py3 import b
+
+from libcloud.storage.base import Container
+from libcloud.storage.types import ObjectError, ObjectHashMismatchError
+from libcloud.storage.transfer import TransferBudget
+from libcloud.storage.transfer import transfer_object, transfer_objects
+
+from libcloud.test import unittest
+from libcloud.test import StorageMockHttp
+from libcloud.test.storage.test_sync import MemoryStorageDriver
+
+
+class PartsStorageDriver(MemoryStorageDriver):
+    """
+    Memory driver which supports ranged downloads and uploads in parts.
+    """
+    supports_range_downloads = True
+    supports_server_side_copy = True
+    part_size = 4
+
+    def copy_object(self, obj, destination_container,
+                    destination_object_name, extra=None):
+        self.objects[destination_object_name] = self.objects[obj.name]
+        self.operations.append(('copy', destination_object_name))
+        return self._get_object(destination_container,
+                                destination_object_name)
+
+    def download_object_range_as_stream(self, obj, start_bytes,
+                                        end_bytes=None, chunk_size=None):
+        self.operations.append(('range', (start_bytes, end_bytes)))
+        yield self.objects[obj.name][start_bytes:end_bytes]
+
+    def _get_upload_part_size(self, size):
+        return self.part_size
+
+    def _initiate_part_upload(self, container, object_name, extra=None):
+        self.operations.append(('initiate', object_name))
+        return {'container': container, 'object_name': object_name,
+                'parts': {}}
+
+    def _upload_part(self, upload, part_number, data):
+        upload['parts'][part_number] = data
+        return part_number
+
+    def _complete_part_upload(self, upload, parts, size, data_hash=None):
+        name = upload['object_name']
+        self.objects[name] = b('').join([upload['parts'][part_number] for
+                                         part_number in parts])
+        self.operations.append(('upload', name))
+        return self._get_object(upload['container'], name)
+
+    def _abort_part_upload(self, upload):
+        self.operations.append(('abort', upload['object_name']))
+
+
+class TransferTests(unittest.TestCase):
+
+    def setUp(self):
+        MemoryStorageDriver.connectionCls.conn_classes = (None,
+                                                          StorageMockHttp)
+
+        self.source_driver = PartsStorageDriver('username', 'key',
+                                                host='localhost')
+        self.source = Container(name='source', extra={},
+                                driver=self.source_driver)
+        self.destination_driver = PartsStorageDriver('username2', 'key',
+                                                     host='localhost')
+        self.destination = Container(name='destination', extra={},
+                                     driver=self.destination_driver)
+
+        self.source_driver.objects = {'a': b('0123456789'), 'empty': b('')}
+
+    def _get_object(self, name):
+        return self.source_driver._get_object(self.source, name)
+
+    def test_transfer_object_ranges(self):
+        obj = transfer_object(self._get_object('a'), self.destination,
+                              'b', workers=2, max_pending_parts=1)
+
+        self.assertEqual(obj.name, 'b')
+        self.assertEqual(self.destination_driver.objects['b'],
+                         b('0123456789'))
+        ranges = sorted([value for (operation, value) in
+                         self.source_driver.operations
+                         if operation == 'range'])
+        self.assertEqual(ranges, [(0, 4), (4, 8), (8, 10)])
+
+    def test_transfer_object_empty(self):
+        transfer_object(self._get_object('empty'), self.destination)
+        self.assertEqual(self.destination_driver.objects['empty'], b(''))
+
+    def test_transfer_object_sequential(self):
+        self.source_driver.supports_range_downloads = False
+
+        transfer_object(self._get_object('a'), self.destination, workers=3)
+
+        self.assertEqual(self.destination_driver.objects['a'],
+                         b('0123456789'))
+        self.assertFalse('range' in [operation for (operation, _) in
+                                     self.source_driver.operations])
+
+    def test_transfer_object_stream(self):
+        self.destination_driver.part_size = None
+
+        transfer_object(self._get_object('a'), self.destination)
+
+        self.assertEqual(self.destination_driver.objects,
+                         {'a': b('0123456789')})
+        self.assertFalse(('initiate', 'a') in
+                         self.destination_driver.operations)
+        self.assertTrue(('copy', 'a') in self.destination_driver.operations)
+
+    def test_transfer_object_stream_without_server_side_copy(self):
+        self.destination_driver.part_size = None
+        self.destination_driver.supports_server_side_copy = False
+        obj = self._get_object('a')
+        obj.hash = 'd41d8cd98f00b204e9800998ecf8427e'
+
+        # Hash can't be verified before the object is replaced
+        transfer_object(obj, self.destination)
+
+        self.assertEqual(self.destination_driver.objects,
+                         {'a': b('0123456789')})
+        self.assertEqual(self.destination_driver.operations,
+                         [('upload', 'a')])
+
+    def test_transfer_object_same_account(self):
+        destination = Container(name='destination', extra={},
+                                driver=self.source_driver)
+
+        with patch.object(PartsStorageDriver, 'copy_object') as copy_object:
+            transfer_object(self._get_object('a'), destination, 'b')
+
+        self.assertEqual(copy_object.call_count, 1)
+
+    def test_transfer_object_hash_mismatch(self):
+        obj = self._get_object('a')
+        obj.hash = 'd41d8cd98f00b204e9800998ecf8427e'
+
+        for supports_range_downloads in [True, False]:
+            self.source_driver.supports_range_downloads = \
+                supports_range_downloads
+            self.destination_driver.operations = []
+
+            self.assertRaises(ObjectHashMismatchError, transfer_object, obj,
+                              self.destination)
+            self.assertEqual(self.destination_driver.operations,
+                             [('initiate', 'a'), ('abort', 'a')])
+            self.assertFalse('a' in self.destination_driver.objects)
+
+        # Hash verification can be disabled
+        transfer_object(obj, self.destination, verify_hash=False)
+        self.assertTrue('a' in self.destination_driver.objects)
+
+    def test_transfer_object_hash_mismatch_stream(self):
+        self.destination_driver.part_size = None
+        obj = self._get_object('a')
+        obj.hash = 'd41d8cd98f00b204e9800998ecf8427e'
+
+        self.destination_driver.objects = {'a': b('old')}
+
+        self.assertRaises(ObjectHashMismatchError, transfer_object, obj,
+                          self.destination)
+
+        # Existing object is not replaced nor deleted
+        self.assertEqual(self.destination_driver.objects, {'a': b('old')})
+
+    def test_transfer_object_without_content_hash(self):
+        self.source_driver.content_md5_hash = False
+        obj = self._get_object('a')
+        obj.hash = 'd41d8cd98f00b204e9800998ecf8427e'
+
+        # Hash which is not a content hash is not verified
+        transfer_object(obj, self.destination)
+        self.assertEqual(self.destination_driver.objects['a'],
+                         b('0123456789'))
+
+        # MD5 hash provided in the extra attributes always is
+        obj.extra['md5_hash'] = obj.hash
+        self.assertRaises(ObjectHashMismatchError, transfer_object, obj,
+                          self.destination, 'b')
+
+    def test_transfer_objects(self):
+        missing = self._get_object('a')
+        missing.name = 'missing'
+        budget = TransferBudget(max_requests=2)
+
+        results = transfer_objects([(self._get_object('a'), self.destination,
+                                     'b'),
+                                    (missing, self.destination, None),
+                                    (self._get_object('empty'),
+                                     self.destination, None)],
+                                   workers=2, budget=budget)
+
+        self.assertEqual(results[0].name, 'b')
+        self.assertEqual(results[0].driver, self.destination_driver)
+        self.assertTrue(isinstance(results[1], ObjectError))
+        self.assertEqual(results[1].object_name, 'missing')
+        self.assertEqual(results[2].name, 'empty')
+        self.assertEqual(sorted(self.destination_driver.objects.keys()),
+                         ['b', 'empty'])
+
+    def test_transfer_budget_bandwidth(self):
+        budget = TransferBudget(max_bandwidth=100)
+
+        with patch('time.sleep') as sleep:
+            self.assertEqual(budget.consume(50), 0)
+            waited = budget.consume(100)
+
+        self.assertTrue(0 < waited <= 0.5)
+        self.assertEqual(sleep.call_count, 1)
+
+        budget = TransferBudget()
+        self.assertEqual(budget.consume(10 ** 9), 0)
+
+
+if __name__ == '__main__':
+    sys.exit(unittest.main())
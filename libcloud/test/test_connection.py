@@ -18,6 +18,8 @@ import os
 import socket
 import sys
 import ssl
+import threading
+import time
 
 from mock import Mock, call, patch
 
@@ -259,6 +261,104 @@ class ConnectionClassTestCase(unittest.TestCase):
 
         self.assertEqual(con.context, {})
 
+    def _perform_concurrent_requests(self, con, side_effect=None):
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def responseCls(connection, response):
+            started.set()
+            release.wait()
+
+            if side_effect:
+                raise side_effect
+
+            return object()
+
+        def request():
+            try:
+                results.append(con.request('/test', params={'foo': 'bar'}))
+            except Exception:
+                results.append(sys.exc_info()[1])
+
+        con.responseCls = responseCls
+
+        thread1 = threading.Thread(target=request)
+        thread1.start()
+        started.wait()
+
+        # Second request is started while the first one is still in progress
+        thread2 = threading.Thread(target=request)
+        thread2.start()
+        time.sleep(0.1)
+        release.set()
+
+        thread1.join()
+        thread2.join()
+        return results
+
+    def test_coalesce_requests(self):
+        con = Connection()
+        con.connection = Mock()
+        con.coalesce_requests = True
+
+        results = self._perform_concurrent_requests(con=con)
+
+        self.assertEqual(con.connection.request.call_count, 1)
+        self.assertEqual(len(results), 2)
+        self.assertTrue(results[0] is results[1])
+
+        # Completed request is not re-used
+        results = self._perform_concurrent_requests(con=con)
+        self.assertEqual(con.connection.request.call_count, 2)
+
+    def test_coalesce_requests_waiter_does_not_reset_context(self):
+        con = Connection()
+        con.connection = Mock()
+        con.coalesce_requests = True
+        con.reset_context = Mock(wraps=con.reset_context)
+
+        self._perform_concurrent_requests(con=con)
+
+        # Context is only reset by the request which has been performed
+        self.assertEqual(con.reset_context.call_count, 1)
+
+    def test_coalesce_requests_exception_is_propagated(self):
+        con = Connection()
+        con.connection = Mock()
+        con.coalesce_requests = True
+
+        results = self._perform_concurrent_requests(
+            con=con, side_effect=ValueError('failed'))
+
+        self.assertEqual(con.connection.request.call_count, 1)
+        self.assertEqual(len(results), 2)
+        self.assertTrue(isinstance(results[0], ValueError))
+        self.assertTrue(isinstance(results[1], ValueError))
+
+    def test_coalesce_requests_disabled(self):
+        con = Connection()
+        con.connection = Mock()
+
+        results = self._perform_concurrent_requests(con=con)
+
+        self.assertEqual(con.connection.request.call_count, 2)
+        self.assertFalse(results[0] is results[1])
+
+    def test_coalesce_requests_only_get_requests(self):
+        con = Connection()
+        con.connection = Mock()
+        con.coalesce_requests = True
+        con._coalesced_request = Mock()
+
+        con.request('/test', method='POST')
+        con.request('/test', method='GET', data='foo')
+        con.request('/test', method='GET', raw=True)
+        self.assertEqual(con._coalesced_request.call_count, 0)
+
+        con.request('/test', method='GET')
+        self.assertEqual(con._coalesced_request.call_count, 1)
+
     def test_log_curl(self):
         url = '/test/path'
         body = None
@@ -13,10 +13,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import os.path
 import sys
+import shutil
+import tempfile
+import threading
 import unittest
 
+from mock import patch
+
 import libcloud.pricing
 
 PRICING_FILE_PATH = os.path.join(os.path.dirname(__file__), 'pricing_test.json')
@@ -102,5 +108,100 @@ class PricingTestCase(unittest.TestCase):
                                      pricing={'foo': 1})
         self.assertTrue('foo' in libcloud.pricing.PRICING_DATA['compute'])
 
+    def test_get_size_prices(self):
+        libcloud.pricing.PRICING_DATA['compute']['foo'] = {2: 2, '3': '3'}
+        prices = libcloud.pricing.get_size_prices(driver_type='compute',
+                                                  driver_name='foo',
+                                                  size_ids=[2, '3'])
+        self.assertEqual(prices, {2: 2.0, '3': 3.0})
+        self.assertRaises(KeyError, libcloud.pricing.get_size_prices,
+                          driver_type='compute', driver_name='foo',
+                          size_ids=[2, '4'])
+
+
+class PricingFileTestCase(unittest.TestCase):
+    def setUp(self):
+        libcloud.pricing.invalidate_pricing_cache()
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, 'pricing.json')
+        shutil.copy(PRICING_FILE_PATH, self.file_path)
+
+    def tearDown(self):
+        libcloud.pricing.invalidate_pricing_cache()
+        shutil.rmtree(self.tmp_dir)
+
+    def _get_pricing(self, driver_name='foo'):
+        return libcloud.pricing.get_pricing(driver_type='compute',
+                                            driver_name=driver_name,
+                                            pricing_file_path=self.file_path)
+
+    def test_file_is_only_parsed_once(self):
+        self._get_pricing()
+        libcloud.pricing.invalidate_module_pricing_cache(driver_type='compute',
+                                                         driver_name='foo')
+
+        with patch('libcloud.pricing.json.loads') as mock_loads:
+            pricing = self._get_pricing()
+            self.assertEqual(mock_loads.call_count, 0)
+
+        self.assertEqual(pricing['1'], 1.0)
+        self.assertRaises(KeyError, self._get_pricing, 'inexistent')
+
+    def test_modified_file_is_reloaded(self):
+        self.assertEqual(self._get_pricing()['1'], 1.0)
+
+        with open(self.file_path, 'w') as fp:
+            fp.write('{"compute": {"foo": {"1": 5.0}}, "updated": 1}')
+
+        # Make sure mtime is different even on file systems with a coarse
+        # timestamp resolution
+        mtime = os.path.getmtime(self.file_path) + 10
+        os.utime(self.file_path, (mtime, mtime))
+
+        with patch('libcloud.pricing.PRICING_FILE_CHECK_INTERVAL', 0):
+            self.assertEqual(self._get_pricing()['1'], 5.0)
+
+    def test_set_pricing_survives_reload(self):
+        self._get_pricing()
+        libcloud.pricing.set_pricing(driver_type='compute',
+                                     driver_name='bar', pricing={'1': 3.0})
+
+        with open(self.file_path, 'w') as fp:
+            fp.write('{"compute": {"foo": {"1": 5.0}}, "updated": 1}')
+
+        mtime = os.path.getmtime(self.file_path) + 10
+        os.utime(self.file_path, (mtime, mtime))
+
+        with patch('libcloud.pricing.PRICING_FILE_CHECK_INTERVAL', 0):
+            self.assertEqual(self._get_pricing()['1'], 5.0)
+            self.assertEqual(self._get_pricing('bar'), {'1': 3.0})
+
+        # Explicit invalidation also removes the pricing which has been set
+        libcloud.pricing.invalidate_pricing_cache()
+        self.assertRaises(KeyError, self._get_pricing, 'bar')
+
+    def test_concurrent_lookups(self):
+        results = []
+
+        def lookup():
+            for _ in range(0, 100):
+                results.append(libcloud.pricing.get_size_price(
+                    driver_type='compute', driver_name='foo', size_id='2'))
+
+        # Default pricing file doesn't contain the "foo" driver
+        with patch('libcloud.pricing.get_pricing_file_path',
+                   lambda file_path=None: self.file_path):
+            threads = [threading.Thread(target=lookup)
+                       for _ in range(0, 10)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results, [2.0] * 1000)
+
 if __name__ == '__main__':
     sys.exit(unittest.main())
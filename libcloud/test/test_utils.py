@@ -19,13 +19,20 @@ import socket
 import codecs
 import unittest
 import warnings
+import tempfile
 import os.path
+import time
+import threading
 
 from itertools import chain
+from xml.etree import ElementTree as ET
+
+from mock import patch
 
 # In Python > 2.7 DeprecationWarnings are disabled by default
 warnings.simplefilter('default')
 
+import libcloud
 import libcloud.utils.files
 
 from libcloud.utils.misc import get_driver, set_driver
@@ -44,6 +51,12 @@ from libcloud.utils.networking import is_private_subnet
 from libcloud.utils.networking import is_valid_ip_address
 from libcloud.utils.networking import join_ipv4_segments
 from libcloud.utils.networking import increment_ipv4_segments
+from libcloud.utils.xml import fixxpath, findattr, findattrs
+from libcloud.utils.xml import XPathExtractor
+from libcloud.utils.iso8601 import parse_date, parse_date_lazy
+from libcloud.utils.iso8601 import _parse_date_regex
+from libcloud.utils.lazy import LazyDict
+from libcloud.utils.concurrency import iterate_sharded, iterate_mapped
 from libcloud.storage.drivers.dummy import DummyIterator
 
 
@@ -87,6 +100,28 @@ class TestUtils(unittest.TestCase):
         else:
             self.fail('Invalid provider, but an exception was not thrown')
 
+    def test_get_driver_is_cached(self):
+        drivers = {'testing': ('libcloud.storage.drivers.dummy',
+                               'DummyStorageDriver')}
+        driver = get_driver(drivers=drivers, provider='testing')
+
+        with patch('libcloud.utils.misc.__import__', create=True) as mock:
+            self.assertTrue(get_driver(drivers=drivers,
+                                       provider='testing') is driver)
+            self.assertEqual(mock.call_count, 0)
+
+        # Driver which is registered under the same name is picked up
+        drivers['testing'] = ('libcloud.compute.drivers.dummy',
+                              'DummyNodeDriver')
+        self.assertEqual(get_driver(drivers=drivers,
+                                    provider='testing').__name__,
+                         'DummyNodeDriver')
+
+    def test_is_module_available(self):
+        self.assertTrue(libcloud._is_module_available('os'))
+        self.assertTrue(libcloud._is_module_available('xml'))
+        self.assertFalse(libcloud._is_module_available('libcloud_missing'))
+
     def test_set_driver(self):
         # Set an existing driver
         try:
@@ -242,6 +277,55 @@ class TestUtils(unittest.TestCase):
         result = libcloud.utils.files.exhaust_iterator(iterator=iterator)
         self.assertEqual(result, b(data))
 
+    def test_stage_iterator(self):
+        data, size = libcloud.utils.files.stage_iterator(
+            iterator=iter(['aa', 'bb']), max_memory_size=4)
+        self.assertEqual(data, b('aabb'))
+        self.assertEqual(size, 4)
+
+        # Data which doesn't fit the memory limit is staged in a file
+        data, size = libcloud.utils.files.stage_iterator(
+            iterator=iter(['aa', 'bb', 'cc']), max_memory_size=4)
+        self.assertEqual(data.read(), b('aabbcc'))
+        self.assertEqual(size, 6)
+        data.close()
+
+        data, size = libcloud.utils.files.stage_iterator(iterator=iter([]))
+        self.assertEqual(data, b(''))
+        self.assertEqual(size, 0)
+
+    def test_read_file_in_chunks(self):
+        read_file_in_chunks = libcloud.utils.files.read_file_in_chunks
+        fd, path = tempfile.mkstemp()
+
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(b('0123456789'))
+
+        chunks = list(read_file_in_chunks(path, chunk_size=4))
+        self.assertEqual(chunks, [b('0123'), b('4567'), b('89')])
+
+        chunks = list(read_file_in_chunks(path, start_bytes=3, end_bytes=8,
+                                          chunk_size=4))
+        self.assertEqual(chunks, [b('3456'), b('7')])
+
+        # Files which can't be memory mapped are read
+        with patch('mmap.mmap', side_effect=ValueError):
+            chunks = list(read_file_in_chunks(path, start_bytes=8,
+                                              end_bytes=20))
+        self.assertEqual(chunks, [b('89')])
+
+        # Open files are read and closed
+        fp = open(path, 'rb')
+        chunks = list(read_file_in_chunks(fp, chunk_size=8))
+        self.assertEqual(chunks, [b('01234567'), b('89')])
+        self.assertTrue(fp.closed)
+
+        with open(path, 'wb'):
+            pass
+
+        self.assertEqual(list(read_file_in_chunks(path)), [])
+        os.remove(path)
+
     def test_unicode_urlquote(self):
         # Regression tests for LIBCLOUD-429
         if PY3:
@@ -281,6 +365,231 @@ class TestUtils(unittest.TestCase):
             self.assertEqual(bchr(97), 'a')
 
 
+class XmlUtilsTestCase(unittest.TestCase):
+    namespace = 'http://ec2.amazonaws.com/doc/2013-10-15/'
+
+    def setUp(self):
+        self.element = ET.XML(
+            '<item xmlns="%s">'
+            '<instanceId>i-1</instanceId>'
+            '<ipAddress/>'
+            '<instanceState><code>16</code><name>running</name>'
+            '</instanceState>'
+            '<groupSet><item><groupId>sg-1</groupId></item>'
+            '<item><groupId>sg-2</groupId></item></groupSet>'
+            '</item>' % (self.namespace))
+
+    def test_fixxpath(self):
+        self.assertEqual(fixxpath('instanceState/name'),
+                         'instanceState/name')
+        self.assertEqual(fixxpath('instanceState/name', self.namespace),
+                         '{%s}instanceState/{%s}name' % (self.namespace,
+                                                        self.namespace))
+
+        # Cached value is returned the second time
+        self.assertTrue(fixxpath('instanceState/name', self.namespace) is
+                        fixxpath('instanceState/name', self.namespace))
+
+    def test_findattrs_matches_findattr(self):
+        xpaths = ['instanceId', 'ipAddress', 'instanceState/name',
+                  'instanceState/code', 'groupSet/item/groupId',
+                  'missing', 'instanceState/missing']
+
+        result = findattrs(element=self.element, xpaths=xpaths,
+                           namespace=self.namespace)
+
+        for xpath in xpaths:
+            self.assertEqual(result[xpath],
+                             findattr(element=self.element, xpath=xpath,
+                                      namespace=self.namespace))
+
+        self.assertEqual(result['groupSet/item/groupId'], 'sg-1')
+        self.assertEqual(result['ipAddress'], '')
+        self.assertEqual(result['missing'], None)
+
+    def test_xpath_extractor_can_be_reused(self):
+        extractor = XPathExtractor(xpaths=['instanceId', 'instanceId'],
+                                   namespace=self.namespace)
+        element = ET.XML('<item xmlns="%s"><instanceId>i-2</instanceId>'
+                         '</item>' % (self.namespace))
+
+        self.assertEqual(extractor.extract(self.element),
+                         {'instanceId': 'i-1'})
+        self.assertEqual(extractor.extract(element), {'instanceId': 'i-2'})
+
+
+class Iso8601TestCase(unittest.TestCase):
+    def test_parse_date_fast_path_matches_regex_parser(self):
+        values = [
+            '2013-10-09T05:41:37Z',
+            '2013-10-09T05:41:37.000Z',
+            '2013-10-09T05:41:37.123Z',
+            '2013-10-09 05:41:37.123456Z',
+            '2013-10-09T05:41:37.1234567Z',
+            '2013-10-09T05:41:37+02:00',
+            '2013-10-09T05:41:37.5-07:30',
+            '2013-10-09T05:41:37'
+        ]
+
+        for value in values:
+            self.assertEqual(parse_date(value), _parse_date_regex(value))
+            self.assertEqual(parse_date(value).tzinfo,
+                             _parse_date_regex(value).tzinfo)
+
+    def test_parse_date_timezones_are_cached(self):
+        date1 = parse_date('2013-10-09T05:41:37+02:00')
+        date2 = parse_date('2014-01-01T00:00:00+02:00')
+        self.assertTrue(date1.tzinfo is date2.tzinfo)
+
+    def test_parse_date_lazy(self):
+        value = parse_date_lazy('2013-10-09T05:41:37.000Z')
+        self.assertEqual(value._datetime, None)
+
+        self.assertEqual(value.year, 2013)
+        self.assertEqual(value, parse_date('2013-10-09T05:41:37.000Z'))
+        self.assertTrue(value < parse_date_lazy('2013-10-10T00:00:00Z'))
+        self.assertEqual((value - parse_date('2013-10-09T05:41:36Z')).seconds,
+                         1)
+
+
+class LazyDictTestCase(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def _loader(self, value):
+        def loader():
+            self.calls.append(value)
+            return value
+        return loader
+
+    def test_values_are_loaded_on_first_access(self):
+        extra = LazyDict(a=1)
+        extra.set_lazy('b', self._loader(2))
+
+        self.assertEqual(len(extra), 2)
+        self.assertTrue('b' in extra)
+        self.assertFalse(extra.is_loaded('b'))
+        self.assertEqual(self.calls, [])
+
+        self.assertEqual(extra['b'], 2)
+        self.assertEqual(extra.get('b'), 2)
+        self.assertTrue(extra.is_loaded('b'))
+        self.assertEqual(self.calls, [2])
+
+    def test_group_loader_is_called_once(self):
+        extra = LazyDict()
+        extra.set_lazy_group(['a', 'b', 'c'],
+                             self._loader({'a': 1, 'b': 2}))
+
+        self.assertEqual(extra['a'], 1)
+        self.assertEqual(extra['b'], 2)
+        self.assertEqual(extra['c'], None)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_overwritten_values_are_not_loaded(self):
+        extra = LazyDict()
+        extra.set_lazy_group(['a', 'b'], self._loader({'a': 1, 'b': 2}))
+        extra.set_lazy('c', self._loader(3))
+
+        extra['a'] = 10
+        del extra['c']
+        self.assertEqual(extra, {'a': 10, 'b': 2})
+        self.assertFalse('c' in extra)
+        self.assertRaises(KeyError, extra.__getitem__, 'c')
+
+    def test_behaves_like_dict(self):
+        extra = LazyDict(a=1)
+        extra.set_lazy('b', self._loader(2))
+
+        self.assertEqual(sorted(extra.keys()), ['a', 'b'])
+        self.assertEqual(dict(extra), {'a': 1, 'b': 2})
+        self.assertEqual(extra.copy(), {'a': 1, 'b': 2})
+        self.assertEqual(type(extra.copy()), dict)
+        self.assertEqual(repr(extra), repr({'a': 1, 'b': 2}))
+
+        extra = LazyDict()
+        extra.set_lazy('a', self._loader(1))
+        self.assertEqual(dict(**extra), {'a': 1})
+
+        extra = LazyDict()
+        extra.set_lazy('a', self._loader(1))
+        self.assertEqual(extra.pop('a'), 1)
+        self.assertEqual(len(extra), 0)
+
+    def test_loader_error_is_raised_on_access(self):
+        def loader():
+            raise ValueError('invalid')
+
+        extra = LazyDict()
+        extra.set_lazy('a', loader)
+        self.assertRaises(ValueError, extra.__getitem__, 'a')
+        self.assertFalse(extra.is_loaded('a'))
+
+
+class ConcurrencyUtilsTestCase(unittest.TestCase):
+    def _get_pages(self, shard):
+        # Each shard is split into pages with 2 items
+        return [shard[index:index + 2] for index in range(0, len(shard), 2)]
+
+    def test_iterate_sharded_ordered(self):
+        shards = [[1, 2, 3], [], [4, 5], [6, 7, 8, 9, 10]]
+        result = iterate_sharded(shards, self._get_pages, workers=2,
+                                 max_pending_pages=1)
+        self.assertEqual(list(result), list(range(1, 11)))
+
+    def test_iterate_sharded_unordered(self):
+        shards = [[1, 2, 3], [4, 5], [6, 7, 8, 9, 10]]
+        result = iterate_sharded(shards, self._get_pages, ordered=False)
+        self.assertEqual(sorted(result), list(range(1, 11)))
+
+    def test_iterate_sharded_error(self):
+        def get_pages(shard):
+            if shard == 'invalid':
+                raise ValueError('invalid shard')
+
+            return [[shard]]
+
+        result = iterate_sharded(['a', 'invalid', 'c'], get_pages)
+        self.assertEqual(next(result), 'a')
+        self.assertRaises(ValueError, next, result)
+
+    def test_iterate_mapped(self):
+        lock = threading.Lock()
+        state = {'started': 0, 'max_pending': 0}
+        yielded = []
+
+        def func(item):
+            with lock:
+                state['started'] += 1
+                state['max_pending'] = max(state['max_pending'],
+                                           state['started'] - len(yielded))
+
+            # Later items finish first
+            time.sleep(0.001 * (item % 3))
+            return item * 2
+
+        for result in iterate_mapped(iter(range(0, 200)), func, workers=4,
+                                     window=8):
+            yielded.append(result)
+
+        self.assertEqual(yielded, [item * 2 for item in range(0, 200)])
+
+        # Items are only queued a window ahead of the consumer
+        self.assertTrue(state['max_pending'] <= 8)
+        self.assertEqual(list(iterate_mapped([], func)), [])
+
+    def test_iterate_mapped_error(self):
+        def func(item):
+            if item == 'invalid':
+                raise ValueError('invalid item')
+
+            return item
+
+        result = iterate_mapped(['a', 'invalid', 'c'], func, workers=2)
+        self.assertEqual(next(result), 'a')
+        self.assertRaises(ValueError, next, result)
+
+
 class NetworkingUtilsTestCase(unittest.TestCase):
     def test_is_public_and_is_private_subnet(self):
         public_ips = [
@@ -0,0 +1,209 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers used by the memory efficient ("compact") model classes.
+"""
+
+import weakref
+
+from libcloud.utils.py3 import PY3
+from libcloud.utils.py3 import basestring
+
+if PY3:
+    from sys import intern as _intern
+else:
+    _intern = intern  # NOQA
+
+__all__ = [
+    'ImmutableDict',
+
+    'intern_value',
+    'intern_extra',
+    'freeze_extra',
+    'get_shared',
+    'get_shared_key'
+]
+
+# Maximum number of (non interned) strings kept in the string pool
+STRING_POOL_MAX_SIZE = 100000
+
+# Pool for the strings which can't be interned using intern() (unicode
+# strings on Python 2)
+_string_pool = {}
+
+# Shared frozen extra dictionaries (keyed by their content)
+_shared_extras = weakref.WeakValueDictionary()
+
+# Shared compact objects (e.g. images and sizes referenced by many nodes)
+_shared_objects = weakref.WeakValueDictionary()
+
+
+class ImmutableDict(dict):
+    """
+    Dictionary which can't be modified after it has been created so it can be
+    safely shared between multiple objects.
+    """
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('%s object is immutable' % (self.__class__.__name__))
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def __repr__(self):
+        return 'ImmutableDict(%s)' % (dict.__repr__(self))
+
+
+def intern_value(value):
+    """
+    Return an interned copy of the provided string so equal strings are only
+    stored once. Other values are returned unchanged.
+    """
+    if not isinstance(value, basestring):
+        return value
+
+    try:
+        return _intern(value)
+    except TypeError:
+        pass
+
+    # Unicode and str subclasses can't be interned
+    try:
+        return _string_pool[value]
+    except KeyError:
+        pass
+
+    if len(_string_pool) >= STRING_POOL_MAX_SIZE:
+        _string_pool.clear()
+
+    _string_pool[value] = value
+    return value
+
+
+def intern_extra(extra):
+    """
+    Return a copy of the provided extra dictionary with interned keys and
+    string values.
+
+    :rtype: ``dict``
+    """
+    return dict([(intern_value(key), intern_value(value))
+                 for key, value in (extra or {}).items()])
+
+
+def freeze_extra(extra):
+    """
+    Return an immutable copy of the provided extra dictionary with interned
+    keys and string values.
+
+    Extra dictionaries with the same (hashable) content are shared.
+
+    :rtype: :class:`ImmutableDict`
+    """
+    if isinstance(extra, ImmutableDict):
+        return extra
+
+    items = [(intern_value(key), intern_value(value))
+             for key, value in (extra or {}).items()]
+    key = _get_items_key(items)
+
+    if key is None:
+        # Unhashable values (e.g. lists) - dictionary can't be shared
+        return ImmutableDict(items)
+
+    frozen = _shared_extras.get(key, None)
+
+    if frozen is None:
+        frozen = ImmutableDict(items)
+        _shared_extras[key] = frozen
+
+    return frozen
+
+
+def get_shared_key(cls, driver, values, extra=None):
+    """
+    Return a key identifying a shared object with the provided content.
+
+    The key references the driver weakly, so a key of a driver which has
+    been garbage collected never matches an object of a new driver.
+
+    :param cls: Class (or factory) of the shared object.
+    :param driver: Driver the object belongs to.
+    :param values: Attribute values of the object (e.g. id and name).
+    :type values: ``tuple``
+    :param extra: Extra dictionary of the object.
+    :type extra: ``dict``
+    """
+    try:
+        driver_key = weakref.ref(driver)
+    except TypeError:
+        # None and objects which don't support weak references
+        driver_key = driver
+
+    items = list((extra or {}).items())
+    extra_key = _get_items_key(items)
+
+    if extra_key is None:
+        # Unhashable values, fall back to the representation
+        items.sort(key=lambda item: repr(item[0]))
+        extra_key = repr(items)
+
+    return (cls, driver_key, tuple(values), extra_key)
+
+
+def get_shared(obj, key, factory):
+    """
+    Return a shared instance for the provided key. If there is no such
+    instance yet, it's created by calling ``factory(obj)``.
+
+    :param obj: Object which is converted.
+    :param key: Key identifying the object (e.g. class, id and driver).
+    :param factory: Callable which returns a (compact) copy of the object.
+    """
+    shared = _shared_objects.get(key, None)
+
+    if shared is None:
+        shared = factory(obj)
+        _shared_objects[key] = shared
+
+    return shared
+
+
+def _get_items_key(items):
+    """
+    Return a hashable key for the provided (name, value) items or None if
+    some of the values are not hashable.
+    """
+    try:
+        # Type is part of the key so e.g. 1 and True are not treated as equal
+        return frozenset([(name, type(value), value)
+                          for name, value in items])
+    except TypeError:
+        return None
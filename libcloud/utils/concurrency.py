@@ -0,0 +1,265 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers for running driver operations in multiple threads.
+"""
+
+import sys
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from libcloud.utils.py3 import next
+
+__all__ = [
+    'iterate_sharded',
+    'iterate_mapped'
+]
+
+DEFAULT_WORKERS = 8
+
+# Maximum number of pages which are buffered for each shard
+DEFAULT_MAX_PENDING_PAGES = 4
+
+# Number of results per worker which can be pending (being processed or
+# waiting for the results of the previous items) when mapping items in order
+DEFAULT_WINDOW_PER_WORKER = 4
+
+# How often (in seconds) blocked workers check if the consumer has stopped
+POLL_INTERVAL = 0.1
+
+_PAGE = 0
+_DONE = 1
+_ERROR = 2
+
+
+def iterate_sharded(shards, func, workers=DEFAULT_WORKERS, ordered=True,
+                    max_pending_pages=DEFAULT_MAX_PENDING_PAGES):
+    """
+    Process shards concurrently and return a generator which yields items
+    from all the shards as a single stream.
+
+    Only a limited number of pages is buffered so memory usage is bounded
+    regardless of the total number of items. If the generator is closed
+    before it's exhausted, workers stop after their current page.
+
+    :param shards: Shards to process.
+    :type shards: ``list``
+
+    :param func: Function which is called with a shard and returns an
+                 iterator of pages (lists of items) for that shard.
+    :type func: ``callable``
+
+    :param workers: Maximum number of shards processed at the same time.
+    :type workers: ``int``
+
+    :param ordered: If True, items are yielded in the order of shards (all
+                    the items of the first shard, then all the items of the
+                    second shard, ...). Otherwise pages are yielded as soon
+                    as they are available.
+    :type ordered: ``bool``
+
+    :param max_pending_pages: Maximum number of pages buffered per shard
+                              (or in total if ordered is False).
+    :type max_pending_pages: ``int``
+
+    :return: A generator of items.
+    :rtype: ``generator``
+    """
+    shards = list(shards)
+
+    if not shards:
+        return
+
+    stop = threading.Event()
+    pending = queue.Queue()
+
+    for index in range(0, len(shards)):
+        pending.put(index)
+
+    if ordered:
+        # Each shard has its own buffer so items of the shards which are
+        # not consumed yet don't block the current one
+        results = [queue.Queue(max_pending_pages) for _ in shards]
+    else:
+        results = [queue.Queue(max_pending_pages)] * len(shards)
+
+    def put(index, item):
+        while not stop.is_set():
+            try:
+                results[index].put(item, timeout=POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+
+        return False
+
+    def worker():
+        while not stop.is_set():
+            try:
+                index = pending.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                for page in func(shards[index]):
+                    if not put(index, (_PAGE, page)):
+                        return
+            except Exception:
+                put(index, (_ERROR, sys.exc_info()[1]))
+                return
+
+            put(index, (_DONE, None))
+
+    for _ in range(0, min(workers, len(shards))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+    try:
+        if ordered:
+            for index in range(0, len(shards)):
+                for item in _iterate_results(results[index], 1):
+                    yield item
+        else:
+            for item in _iterate_results(results[0], len(shards)):
+                yield item
+    finally:
+        stop.set()
+
+
+def iterate_mapped(items, func, workers=DEFAULT_WORKERS, window=None):
+    """
+    Call a function for each item concurrently and return a generator which
+    yields the results in the order of the items.
+
+    Items are handed to a fixed number of workers through a work queue which
+    is only filled up to ``window`` items ahead of the last yielded result,
+    so memory usage doesn't depend on the number of items. If the generator
+    is closed before it's exhausted, workers stop after their current item.
+
+    :param items: Items to process (can be an iterator).
+    :type items: ``iterable``
+
+    :param func: Function which is called with an item.
+    :type func: ``callable``
+
+    :param workers: Number of worker threads.
+    :type workers: ``int``
+
+    :param window: Maximum number of items which are processed or buffered
+                   at the same time (defaults to ``workers *
+                   DEFAULT_WINDOW_PER_WORKER``).
+    :type window: ``int``
+
+    :return: A generator of results. Exception raised by the function is
+             raised when its result would be yielded.
+    :rtype: ``generator``
+    """
+    window = max(window or workers * DEFAULT_WINDOW_PER_WORKER, 1)
+    items = iter(items)
+    stop = threading.Event()
+
+    # Both queues hold at most ``window`` entries because no more items are
+    # queued until the results of the queued ones are consumed
+    tasks = queue.Queue()
+    results = queue.Queue()
+
+    def worker():
+        while not stop.is_set():
+            try:
+                task = tasks.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+            if task is None:
+                return
+
+            index, item = task
+
+            try:
+                result = (_PAGE, func(item))
+            except Exception:
+                result = (_ERROR, sys.exc_info()[1])
+
+            results.put((index, result))
+
+    threads = []
+
+    try:
+        queued = 0
+        exhausted = False
+        next_index = 0
+        buffered = {}
+
+        while True:
+            while not exhausted and queued - next_index < window:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+
+                tasks.put((queued, item))
+                queued += 1
+
+                if len(threads) < workers:
+                    thread = threading.Thread(target=worker)
+                    thread.daemon = True
+                    thread.start()
+                    threads.append(thread)
+
+            if next_index == queued:
+                return
+
+            # Results which arrive out of order wait in a buffer limited by
+            # the window size
+            while next_index not in buffered:
+                index, result = results.get()
+                buffered[index] = result
+
+            kind, value = buffered.pop(next_index)
+            next_index += 1
+
+            if kind == _ERROR:
+                raise value
+
+            yield value
+    finally:
+        stop.set()
+
+        for _ in threads:
+            tasks.put(None)
+
+
+def _iterate_results(results, count):
+    """
+    Yield items from the result queue until ``count`` shards are done.
+    """
+    while count:
+        kind, value = results.get()
+
+        if kind == _ERROR:
+            raise value
+        elif kind == _DONE:
+            count -= 1
+            continue
+
+        for item in value:
+            yield item
@@ -14,6 +14,8 @@
 # limitations under the License.
 
 import os
+import mmap
+import tempfile
 import mimetypes
 
 from libcloud.utils.py3 import PY3
@@ -28,7 +30,9 @@ CHUNK_SIZE = 8096
 
 __all__ = [
     'read_in_chunks',
+    'read_file_in_chunks',
     'exhaust_iterator',
+    'stage_iterator',
     'guess_file_mime_type'
 ]
 
@@ -83,7 +87,7 @@ def read_in_chunks(iterator, chunk_size=None, fill_size=False,
             if empty and yield_empty:
                 yield b('')
 
-            raise StopIteration
+            return
 
         if fill_size:
             if empty or len(data) >= chunk_size:
@@ -94,6 +98,77 @@ def read_in_chunks(iterator, chunk_size=None, fill_size=False,
             data = b('')
 
 
+def read_file_in_chunks(path, start_bytes=0, end_bytes=None,
+                        chunk_size=None):
+    """
+    Return a generator which yields the file data between start_bytes and
+    end_bytes (exclusive) in chunks.
+
+    The file is memory mapped when possible, so the chunks are sliced from
+    the page cache without a read call for each of them.
+
+    :param path: Path to the file or a file object opened in binary mode
+                 (which is closed once the data is read).
+    :type path: ``str`` or ``file``
+
+    :param start_bytes: Offset of the first byte to read.
+    :type start_bytes: ``int``
+
+    :param end_bytes: Offset after the last byte to read (None means the end
+                      of the file).
+    :type end_bytes: ``int``
+
+    :param chunk_size: Optional chunk size (defaults to ``CHUNK_SIZE``).
+    :type chunk_size: ``int``
+
+    :rtype: ``generator``
+    """
+    chunk_size = chunk_size or CHUNK_SIZE
+
+    if hasattr(path, 'fileno'):
+        fp = path
+    else:
+        fp = open(path, 'rb')
+
+    with fp:
+        size = os.fstat(fp.fileno()).st_size
+
+        if end_bytes is None or end_bytes > size:
+            end_bytes = size
+
+        if start_bytes >= end_bytes:
+            return
+
+        try:
+            mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (EnvironmentError, ValueError):
+            mapped = None
+
+        if mapped is None:
+            fp.seek(start_bytes)
+            remaining = end_bytes - start_bytes
+
+            while remaining > 0:
+                data = fp.read(min(chunk_size, remaining))
+
+                if not data:
+                    break
+
+                remaining -= len(data)
+                yield data
+
+            return
+
+        try:
+            offset = start_bytes
+
+            while offset < end_bytes:
+                yield mapped[offset:min(offset + chunk_size, end_bytes)]
+                offset += chunk_size
+        finally:
+            mapped.close()
+
+
 def exhaust_iterator(iterator):
     """
     Exhaust an iterator and return all data returned by it.
@@ -123,6 +198,60 @@ def exhaust_iterator(iterator):
     return data
 
 
+def stage_iterator(iterator, max_memory_size=None):
+    """
+    Read all the data returned by an iterator so its size is known.
+
+    Data is kept in memory as long as its size doesn't exceed
+    max_memory_size, larger data is written to a temporary file.
+
+    :type iterator: :class:`object` which implements iterator interface.
+    :param iterator: An object which implements an iterator interface.
+
+    :param max_memory_size: Maximum number of bytes kept in memory. None
+                            means no limit.
+    :type max_memory_size: ``int``
+
+    :rtype: ``tuple``
+    :return: A (data, size) tuple. Data is either a ``str`` or a temporary
+             file object positioned at the beginning (the file is deleted
+             when it's closed).
+    """
+    chunks = []
+    size = 0
+    staged = None
+
+    try:
+        for chunk in iterator:
+            chunk = b(chunk)
+            size += len(chunk)
+
+            if staged is None and max_memory_size is not None and \
+                    size > max_memory_size:
+                staged = tempfile.TemporaryFile()
+
+                for buffered in chunks:
+                    staged.write(buffered)
+
+                chunks = []
+
+            if staged is None:
+                chunks.append(chunk)
+            else:
+                staged.write(chunk)
+    except Exception:
+        if staged is not None:
+            staged.close()
+
+        raise
+
+    if staged is None:
+        return b('').join(chunks), size
+
+    staged.seek(0)
+    return staged, size
+
+
 def guess_file_mime_type(file_path):
     filename = os.path.basename(file_path)
     (mimetype, encoding) = mimetypes.guess_type(filename)
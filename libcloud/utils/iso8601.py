@@ -33,7 +33,7 @@ datetime.datetime(2007, 1, 25, 12, 0, tzinfo=<iso8601.iso8601.Utc ...>)
 from datetime import datetime, timedelta, tzinfo
 import re
 
-__all__ = ["parse_date", "ParseError"]
+__all__ = ["parse_date", "parse_date_lazy", "LazyDateTime", "ParseError"]
 
 # Adapted from http://delete.me.uk/2005/03/iso8601.html
 ISO8601_REGEX = re.compile(
@@ -42,6 +42,11 @@ ISO8601_REGEX = re.compile(
     r"(?P<timezone>Z|(([-+])([0-9]{2}):([0-9]{2})))?)?)?)?")
 TIMEZONE_REGEX = re.compile("(?P<prefix>[+-])(?P<hours>[0-9]{2}).(?P<minutes>[0-9]{2})")  # NOQA
 
+# Maximum number of parsed time zones which are cached
+TIMEZONE_CACHE_MAX_SIZE = 128
+
+_timezone_cache = {}
+
 
 class ParseError(Exception):
     """Raised when there is a problem parsing a date string"""
@@ -97,13 +102,22 @@ def parse_timezone(tzstring, default_timezone=UTC):
     # Addresses issue 4.
     if tzstring is None:
         return default_timezone
+    # tzinfo objects are immutable so the same instance can be shared by all
+    # the parsed dates
+    tz = _timezone_cache.get(tzstring, None)
+    if tz is not None:
+        return tz
     m = TIMEZONE_REGEX.match(tzstring)
     prefix, hours, minutes = m.groups()
     hours, minutes = int(hours), int(minutes)
     if prefix == "-":
         hours = -hours
         minutes = -minutes
-    return FixedOffset(hours, minutes, tzstring)
+    tz = FixedOffset(hours, minutes, tzstring)
+    if len(_timezone_cache) >= TIMEZONE_CACHE_MAX_SIZE:
+        _timezone_cache.clear()
+    _timezone_cache[tzstring] = tz
+    return tz
 
 
 def parse_date(datestring, default_timezone=UTC):
@@ -113,6 +127,47 @@ def parse_date(datestring, default_timezone=UTC):
     have dates without a timezone (not strictly correct). In this case the
     default timezone specified in default_timezone is used. This is UTC by
     default.
+    """
+    # Fast path for the most common YYYY-MM-DDTHH:MM:SS[.fff]Z layout which
+    # avoids running the regular expression
+    if len(datestring) >= 20 and datestring[-1] == "Z" and \
+            datestring[4] == "-" and datestring[7] == "-" and \
+            datestring[13] == ":" and datestring[16] == ":":
+        value = _parse_date_utc_layout(datestring, default_timezone)
+        if value is not None:
+            return value
+
+    return _parse_date_regex(datestring, default_timezone=default_timezone)
+
+
+def _parse_date_utc_layout(datestring, default_timezone):
+    """Parses YYYY-MM-DDTHH:MM:SS[.fff]Z dates
+
+    Returns None if the date string doesn't match the layout.
+    """
+    digits = (datestring[0:4] + datestring[5:7] + datestring[8:10] +
+              datestring[11:13] + datestring[14:16] + datestring[17:19])
+    if not digits.isdigit():
+        return None
+    fraction = datestring[20:-1]
+    if len(datestring) == 20:
+        fraction = 0
+    elif datestring[19] != "." or not fraction.isdigit():
+        return None
+    elif len(fraction) <= 3:
+        # Milliseconds (integer math gives the same result as the float
+        # conversion below)
+        fraction = int(fraction) * 10 ** (6 - len(fraction))
+    else:
+        fraction = int(float("0.%s" % fraction) * 1e6)
+    return datetime(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]),
+                    int(digits[8:10]), int(digits[10:12]), int(digits[12:14]),
+                    fraction, default_timezone)
+
+
+def _parse_date_regex(datestring, default_timezone=UTC):
+    """Parses ISO 8601 dates using the generic regular expression
+
     """
     m = ISO8601_REGEX.match(datestring)
     if not m:
@@ -127,3 +182,80 @@ def parse_date(datestring, default_timezone=UTC):
                     int(groups["day"]), int(groups["hour"]),
                     int(groups["minute"]), int(groups["second"]),
                     int(groups["fraction"]), tz)
+
+
+def parse_date_lazy(datestring, default_timezone=UTC):
+    """Returns a LazyDateTime which parses the date on first access
+
+    Useful for large listings where most of the dates are never used.
+    """
+    return LazyDateTime(datestring, default_timezone=default_timezone)
+
+
+class LazyDateTime(object):
+    """Proxy for a datetime which is only parsed on first access
+
+    Attribute access, comparison and arithmetic are delegated to the parsed
+    datetime object. Use the ``datetime`` attribute to get the real object.
+    """
+
+    __slots__ = ("datestring", "default_timezone", "_datetime")
+
+    def __init__(self, datestring, default_timezone=UTC):
+        self.datestring = datestring
+        self.default_timezone = default_timezone
+        self._datetime = None
+
+    @property
+    def datetime(self):
+        if self._datetime is None:
+            self._datetime = parse_date(self.datestring,
+                                        default_timezone=self.default_timezone)
+        return self._datetime
+
+    def __getattr__(self, name):
+        return getattr(self.datetime, name)
+
+    def __repr__(self):
+        return "<LazyDateTime %r>" % self.datestring
+
+    def __str__(self):
+        return str(self.datetime)
+
+    def __hash__(self):
+        return hash(self.datetime)
+
+    def __eq__(self, other):
+        return self.datetime == _unwrap(other)
+
+    def __ne__(self, other):
+        return self.datetime != _unwrap(other)
+
+    def __lt__(self, other):
+        return self.datetime < _unwrap(other)
+
+    def __le__(self, other):
+        return self.datetime <= _unwrap(other)
+
+    def __gt__(self, other):
+        return self.datetime > _unwrap(other)
+
+    def __ge__(self, other):
+        return self.datetime >= _unwrap(other)
+
+    def __add__(self, other):
+        return self.datetime + other
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.datetime - _unwrap(other)
+
+    def __rsub__(self, other):
+        return other - self.datetime
+
+
+def _unwrap(value):
+    if isinstance(value, LazyDateTime):
+        return value.datetime
+    return value
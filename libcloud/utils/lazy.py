@@ -0,0 +1,234 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Dictionary which values are computed on first access. Used by the drivers to
+defer parsing of the "extra" attributes until they are actually used.
+"""
+
+from libcloud.utils.py3 import PY3
+
+__all__ = [
+    'LazyDict'
+]
+
+
+class LazyDict(dict):
+    """
+    Dictionary which values can be provided by a loader function which is
+    only called when the value is accessed for the first time.
+
+    A single loader can also provide values for multiple keys (e.g. when all
+    of them are extracted from the response in one pass), in which case it's
+    called once when any of those keys is accessed.
+
+    Operations which need all the values (iteration, comparison, ``repr``,
+    copying, ...) load all the pending values first, so the dictionary
+    behaves the same way as a regular ``dict``.
+    """
+
+    __slots__ = ('_loaders',)
+
+    def __init__(self, *args, **kwargs):
+        super(LazyDict, self).__init__(*args, **kwargs)
+        self._loaders = {}
+
+    def set_lazy(self, key, loader):
+        """
+        Set value for the provided key which is returned by the loader.
+
+        :param key: Dictionary key.
+
+        :param loader: Callable without arguments which returns the value.
+        :type loader: ``callable``
+        """
+        dict.pop(self, key, None)
+        self._loaders[key] = (loader, None)
+
+    def set_lazy_group(self, keys, loader):
+        """
+        Set values for multiple keys which are all returned by a single
+        loader.
+
+        :param keys: Dictionary keys.
+        :type keys: ``list``
+
+        :param loader: Callable without arguments which returns a dictionary
+                       with values for the provided keys. Missing keys are set
+                       to ``None``.
+        :type loader: ``callable``
+        """
+        entry = (loader, tuple(keys))
+
+        for key in entry[1]:
+            dict.pop(self, key, None)
+            self._loaders[key] = entry
+
+    def is_loaded(self, key):
+        """
+        Return True if the value for the provided key doesn't need to be
+        loaded anymore.
+
+        :rtype: ``bool``
+        """
+        return key not in self._loaders
+
+    def materialize(self):
+        """
+        Load all the pending values.
+        """
+        while self._loaders:
+            for key in self._loaders:
+                self._load(key)
+                break
+
+    def _load(self, key):
+        entry = self._loaders[key]
+        loader, keys = entry
+        value = loader()
+
+        if keys is None:
+            del self._loaders[key]
+            dict.__setitem__(self, key, value)
+            return
+
+        for name in keys:
+            # Values which have been overwritten in the mean time are kept
+            if self._loaders.get(name, None) is entry:
+                del self._loaders[name]
+                dict.__setitem__(self, name, value.get(name, None))
+
+    def __getitem__(self, key):
+        if key in self._loaders:
+            self._load(key)
+
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self._loaders:
+            self._load(key)
+
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return key in self._loaders or dict.__contains__(self, key)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._loaders)
+
+    def __setitem__(self, key, value):
+        self._loaders.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if key in self._loaders:
+            del self._loaders[key]
+            return
+
+        dict.__delitem__(self, key)
+
+    def setdefault(self, key, default=None):
+        if key in self._loaders:
+            self._load(key)
+
+        return dict.setdefault(self, key, default)
+
+    def pop(self, key, *args):
+        if key in self._loaders:
+            self._load(key)
+
+        return dict.pop(self, key, *args)
+
+    def popitem(self):
+        self.materialize()
+        return dict.popitem(self)
+
+    def update(self, *args, **kwargs):
+        values = dict(*args, **kwargs)
+
+        for key in values:
+            self._loaders.pop(key, None)
+
+        dict.update(self, values)
+
+    def clear(self):
+        self._loaders.clear()
+        dict.clear(self)
+
+    def keys(self):
+        self.materialize()
+        return dict.keys(self)
+
+    def values(self):
+        self.materialize()
+        return dict.values(self)
+
+    def items(self):
+        self.materialize()
+        return dict.items(self)
+
+    def __iter__(self):
+        self.materialize()
+        return dict.__iter__(self)
+
+    if not PY3:
+        def has_key(self, key):
+            return self.__contains__(key)
+
+        def iterkeys(self):
+            self.materialize()
+            return dict.iterkeys(self)
+
+        def itervalues(self):
+            self.materialize()
+            return dict.itervalues(self)
+
+        def iteritems(self):
+            self.materialize()
+            return dict.iteritems(self)
+
+    def copy(self):
+        """
+        Return a regular dictionary with all the values loaded.
+
+        :rtype: ``dict``
+        """
+        self.materialize()
+        return dict(dict.items(self))
+
+    def __eq__(self, other):
+        self.materialize()
+
+        if isinstance(other, LazyDict):
+            other.materialize()
+
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+
+        if result is NotImplemented:
+            return result
+
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        self.materialize()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        return (self.__class__, (self.copy(),))
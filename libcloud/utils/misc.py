@@ -47,6 +47,9 @@ __all__ = [
     'ReprMixin'
 ]
 
+# Driver classes resolved by get_driver() keyed by (module name, class name)
+_driver_cache = {}
+
 
 def find(l, predicate):
     results = [x for x in l if predicate(x)]
@@ -57,14 +60,28 @@ def get_driver(drivers, provider):
     """
     Get a driver.
 
+    Resolved driver classes are cached so the driver module is only imported
+    once.
+
     :param drivers: Dictionary containing valid providers.
     :param provider: Id of provider to get driver
     :type provider: :class:`libcloud.types.Provider`
     """
     if provider in drivers:
-        mod_name, driver_name = drivers[provider]
+        # Cache is keyed by the module and class name so changes to the
+        # drivers dictionary are picked up
+        key = drivers[provider]
+
+        try:
+            return _driver_cache[key]
+        except KeyError:
+            pass
+
+        mod_name, driver_name = key
         _mod = __import__(mod_name, globals(), locals(), [driver_name])
-        return getattr(_mod, driver_name)
+        driver = getattr(_mod, driver_name)
+        _driver_cache[key] = driver
+        return driver
 
     raise AttributeError('Provider %s does not exist' % (provider))
 
@@ -15,7 +15,6 @@
 
 import socket
 import struct
-import platform
 
 __all__ = [
     'is_private_subnet',
@@ -75,6 +74,7 @@ def is_valid_ip_address(address, family=socket.AF_INET):
 
     :return: ``bool`` True if the provided address is valid.
     """
+    import platform
     is_windows = platform.system() == 'Windows'
 
     if is_windows and family == socket.AF_INET6:
@@ -17,16 +17,37 @@ __all__ = [
     'fixxpath',
     'findtext',
     'findattr',
-    'findall'
+    'findall',
+    'findattrs',
+
+    'XPathExtractor'
 ]
 
+# Maximum number of namespaced xpaths which are cached by fixxpath
+XPATH_CACHE_MAX_SIZE = 1024
+
+_xpath_cache = {}
+
 
 def fixxpath(xpath, namespace=None):
     # ElementTree wants namespaces in its xpaths, so here we add them.
     if not namespace:
         return xpath
 
-    return '/'.join(['{%s}%s' % (namespace, e) for e in xpath.split('/')])
+    key = (namespace, xpath)
+
+    try:
+        return _xpath_cache[key]
+    except KeyError:
+        pass
+
+    value = '/'.join(['{%s}%s' % (namespace, e) for e in xpath.split('/')])
+
+    if len(_xpath_cache) >= XPATH_CACHE_MAX_SIZE:
+        _xpath_cache.clear()
+
+    _xpath_cache[key] = value
+    return value
 
 
 def findtext(element, xpath, namespace=None, no_text_value=''):
@@ -48,3 +69,97 @@ def findattr(element, xpath, namespace=None):
 
 def findall(element, xpath, namespace=None):
     return element.findall(fixxpath(xpath=xpath, namespace=namespace))
+
+
+def findattrs(element, xpaths, namespace=None):
+    """
+    Return text values for multiple xpaths using a single walk over the
+    element tree.
+
+    Values are the same as the ones returned by :func:`findattr` (``None`` if
+    the xpath doesn't match any element).
+
+    :param xpaths: Simple xpaths (e.g. ``instanceState/name``) without any
+                   predicates.
+    :type xpaths: ``list`` of ``str``
+
+    :rtype: ``dict``
+    """
+    return XPathExtractor(xpaths=xpaths, namespace=namespace).extract(element)
+
+
+class XPathExtractor(object):
+    """
+    Pre-compiled set of simple xpaths which are all extracted in a single
+    walk over the element tree.
+
+    Create it once (e.g. per resource type) and re-use it for all the
+    elements.
+    """
+
+    def __init__(self, xpaths, namespace=None):
+        """
+        :param xpaths: Simple xpaths (e.g. ``instanceState/name``) without any
+                       predicates.
+        :type xpaths: ``list`` of ``str``
+
+        :param namespace: Namespace of all the elements.
+        :type namespace: ``str``
+        """
+        self.xpaths = []
+        self.namespace = namespace
+
+        for xpath in xpaths:
+            if xpath not in self.xpaths:
+                self.xpaths.append(xpath)
+
+        # Tree of the path components. Every node maps a (namespaced) tag to
+        # a tuple of (xpaths ending at this tag, children nodes).
+        self._tree = {}
+
+        for xpath in self.xpaths:
+            node = self._tree
+            parts = [fixxpath(xpath=part, namespace=namespace)
+                     for part in xpath.split('/')]
+
+            for index, part in enumerate(parts):
+                if part not in node:
+                    node[part] = ([], {})
+
+                if index == len(parts) - 1:
+                    node[part][0].append(xpath)
+
+                node = node[part][1]
+
+    def extract(self, element):
+        """
+        :param element: Element to extract the values from.
+        :type element: :class:`xml.etree.ElementTree.Element`
+
+        :return: Dictionary mapping xpath to the text value.
+        :rtype: ``dict``
+        """
+        result = dict.fromkeys(self.xpaths)
+        self._walk(element, self._tree, result, [len(self.xpaths)])
+        return result
+
+    def _walk(self, element, tree, result, remaining):
+        for child in element:
+            node = tree.get(child.tag, None)
+
+            if node is None:
+                continue
+
+            xpaths, children = node
+
+            for xpath in xpaths:
+                # First matching element wins (same as findtext)
+                if result[xpath] is None:
+                    result[xpath] = child.text or ''
+                    remaining[0] -= 1
+
+            if children:
+                self._walk(child, children, result, remaining)
+
+            if remaining[0] == 0:
+                return